@@ -19,9 +19,14 @@
 
 
 # an external module should find here all the needed objects
+from ..datamodel import CATA as _CATA
 from ..datamodel import FileAttr
 from ..datamodel.engine import Engine
 from ..datamodel.result import StateOptions
 
 from .execution import Calculation
 from .parametric import ParametricCalculation
+
+# the headless API only imports the catalog commands that it uses
+# (if the catalog is not already read)
+_CATA.set_lazy()
@@ -78,6 +78,13 @@ class Calculation:
         while not calc.is_finished():
             print("Current state is", calc.state_name)
 
+    or wait for its completion, possibly from a coroutine::
+
+        calc.start()
+        calc.wait(timeout=600)
+        # or
+        await calc.wait_async()
+
     Check the state::
 
         assert calc.state & StateOptions.Success
@@ -307,6 +314,31 @@ class Calculation:
         self._assign_run_case()
         self._watcher.run()
 
+    def wait(self, timeout=None):
+        """Wait for the end of the calculation started by `start()`.
+
+        Arguments:
+            timeout (float): Maximum waiting time in seconds.
+
+        Returns:
+            bool: *True* if the calculation ended or expired, *False* if
+            *timeout* was reached before.
+        """
+        return self._watcher.wait(timeout)
+
+    async def wait_async(self, timeout=None):
+        """Wait for the end of the calculation started by `start()` without
+        blocking the *asyncio* event loop.
+
+        Arguments:
+            timeout (float): Maximum waiting time in seconds.
+
+        Returns:
+            bool: *True* if the calculation ended or expired, *False* if
+            *timeout* was reached before.
+        """
+        return await self._watcher.wait_async(timeout)
+
     def logfiles(self):
         """Returns the list of pathnames of the logfiles.
 
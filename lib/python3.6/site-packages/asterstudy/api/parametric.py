@@ -24,23 +24,91 @@ Setup of parametric studies.
 
 
 import hashlib
+import os
 import os.path as osp
 import pickle
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy
 
 from ..common import (debug_message, debug_mode, get_absolute_path, make_dirs,
                       no_new_attributes, remove_path, valid_file_name)
-from ..datamodel import FileAttr
+from ..datamodel import FileAttr, History
 from ..datamodel.engine.engine_utils import default_parameters
+from ..datamodel.engine.local_scheduler import job_requirements
 from ..datamodel.parametric import INPUTS, OUTPUTS
 from ..datamodel.result import StateOptions as SO
 from .execution import Calculation
+from .result_cache import case_fingerprint, default_cache
+
+
+class ParametricTemplate:
+    """Case of a parametric study imported once, to be cloned for each
+    evaluated point.
+
+    Arguments:
+        casedir (str): Path to the directory containing the
+            'parametric.export' file.
+
+    Attributes:
+        case (Case): Case imported from the export file.
+        params (dict): Execution parameters read from the export file.
+    """
+
+    casedir = case = params = _hist = None
+
+    __setattr__ = no_new_attributes(object.__setattr__)
+
+    def __init__(self, casedir):
+        """Initialization."""
+        self.casedir = get_absolute_path(casedir)
+        self._hist = History()
+        self._hist.folder = self.casedir
+        export = osp.join(self.casedir, 'parametric.export')
+        self.case, self.params = self._hist.import_case(export, replace=True,
+                                                        force_text=True)
+        debug_message("ParametricTemplate case: {0}".format(self.case))
+
+    def check(self):
+        """Check that the case reads the input values and writes the
+        output values.
+
+        Raises:
+            ValueError: If the input or output file is not used.
+        """
+        names = set(osp.basename(info.filename or "")
+                    for stage in self.case.stages
+                    for info in stage.handle2info.values())
+        for required in (INPUTS, OUTPUTS):
+            if required not in names:
+                raise ValueError("the parametric case does not use {0!r}"
+                                 .format(required))
+
+    def clone(self, case):
+        """Fill a Case with copies of the stages of the template.
+
+        Arguments:
+            case (Case): Empty Case to be filled.
+        """
+        case.in_dir = self.case.in_dir
+        case.out_dir = self.case.out_dir
+        for orig in self.case.stages:
+            stage = case.create_stage(orig.name)
+            stage.use_text_mode()
+            stage.set_text(orig.get_text())
+            for unit, info in orig.handle2info.items():
+                stage.handle2info[unit].copy_from(info)
 
 
 class ParametricCalculation(Calculation):
     """Object to execute a parametric calculation.
 
+    Several points can be evaluated at once by :meth:`run_many`.
+
+    The output values of the points already evaluated can be read from a
+    cache (see :mod:`asterstudy.api.result_cache`) instead of being computed
+    again.
+
     Arguments:
         casedir (str): Path to the directory containing the Case description.
             The Case is defined by a file named 'parametric.export' in this
@@ -50,7 +118,7 @@ class ParametricCalculation(Calculation):
     """
 
     basedir = runcdir = names = inputs = outputs = None
-    _rcname = _del = None
+    _rcname = _del = _cache = _cached = None
 
     __setattr__ = no_new_attributes(object.__setattr__)
 
@@ -64,30 +132,80 @@ class ParametricCalculation(Calculation):
         self.outputs = []
         self.basedir = casedir
         self.runcdir = osp.join(self.basedir, self.run_case_name())
+        self._cache = default_cache()
+        self._cached = False
         make_dirs(self.runcdir)
 
+    def set_cache(self, cache):
+        """Define the cache of the output values.
+
+        Arguments:
+            cache (ResultCache): Cache object, *None* to disable the cache.
+        """
+        self._cache = cache
+
     def run(self):
-        """Execute the calculation and wait until its completion."""
+        """Execute the calculation and wait until its completion.
+
+        If the point is found in the cache, the calculation is not executed.
+        """
+        key = None
+        if self._cache is not None:
+            key = self._cache.key(case_fingerprint(self._case, self._params),
+                                  self.names, self.inputs)
+            results = self._cache.get(key)
+            if results is not None:
+                self.log("Output values read from the cache")
+                self._cached = True
+                self._set_outputs(results)
+                if self._del and not debug_mode():
+                    self.delete_files()
+                return
+
         self.use_interactive()
         super().run()
 
         self.log("Execution state: {0}".format(self.state_name))
 
-        self.read_output_file()
-        if self.state & SO.Success and self._del and not debug_mode():
-            self.delete_files()
+        results = self.read_output_file()
+        if self.state & SO.Success:
+            if key is not None and results is not None:
+                self._cache.put(key, results)
+            if self._del and not debug_mode():
+                self.delete_files()
+
+    @property
+    def state(self):
+        """Attribute that *holds* the current state of the execution."""
+        if self._cached:
+            return SO.Success
+        return super().state
+
+    @property
+    def state_name(self):
+        """Attribute that *holds* the label of the state of the execution."""
+        return SO.name(self.state)
 
     def output_values(self):
         """Return output values."""
         return self.outputs
 
-    def setup(self):
+    def setup(self, template=None):
         """Set up the *Case* from its export file.
+
+        Arguments:
+            template (ParametricTemplate): Case already imported from the
+                export file. If it is not provided, the export file is read.
         """
-        export = osp.join(self.basedir, 'parametric.export')
-        self._case, params = self._hist.import_case(export, replace=True,
-                                                    force_text=True)
-        debug_message("ParametricCalculation case: {0}".format(self._case))
+        if template is None:
+            export = osp.join(self.basedir, 'parametric.export')
+            self._case, params = self._hist.import_case(export, replace=True,
+                                                        force_text=True)
+            debug_message("ParametricCalculation case: {0}"
+                          .format(self._case))
+        else:
+            template.clone(self._case)
+            params = template.params
 
         self.create_input_file()
         # use different input/output files for each run
@@ -104,6 +222,81 @@ class ParametricCalculation(Calculation):
         self._params.update(params)
         self._params['no_database'] = True
 
+    @classmethod
+    def run_many(cls, casedir, names, samples, max_workers=None,
+                 keep_results=False, logger=None, cache=False, **parameters):
+        """Evaluate several points of a parametric study.
+
+        The case is imported and checked once, then the points are executed
+        concurrently, at most *max_workers* at a time. Identical points are
+        only evaluated once.
+
+        Arguments:
+            casedir (str): Path to the directory containing the
+                'parametric.export' file.
+            names (list[str]): List of the names of the input variables.
+            samples (list[list[float]]): Values of the input variables, one
+                line per point.
+            max_workers (int): Maximum number of simultaneous executions.
+                By default, the number of processors divided by the number
+                of processors used by an execution.
+            keep_results (bool): Keep the results directories.
+            logger (function): Logger function (*logfunc(str)*).
+            cache (ResultCache): Cache of the output values. By default, the
+                cache enabled by the environment is used. *None* disables
+                the cache.
+            parameters (dict): Execution parameters, see :meth:`use`.
+
+        Returns:
+            tuple: Array of the output values, with shape *(n_samples,
+            n_outputs)* (*NaN* for the failed points), and list of the states
+            (*StateOptions*) of the points.
+        """
+        template = ParametricTemplate(casedir)
+        template.check()
+        samples = [tuple(float(i) for i in point) for point in samples]
+        points = list(dict.fromkeys(samples))
+        if max_workers is None:
+            params = dict(template.params)
+            params.update(parameters)
+            max_workers = (os.cpu_count() or 1) // job_requirements(params)[0]
+        max_workers = max(1, min(max_workers, len(points) or 1))
+
+        def _evaluate(point):
+            calc = cls(template.casedir, names, list(point),
+                       keep_results=keep_results)
+            if logger:
+                calc.set_logger(logger)
+            if cache is not False:
+                calc.set_cache(cache)
+            try:
+                calc.setup(template)
+                calc.use(**parameters)
+                calc.run()
+            except Exception as exc: # pragma pylint: disable=broad-except
+                calc.log("ERROR: point {0} failed: {1}".format(point, exc))
+                return SO.Error, numpy.array([])
+            values = numpy.array(calc.output_values(), dtype=float)
+            if values.ndim == 2:
+                # one column per variable: keep the first line
+                values = values[:, 0]
+            return calc.state, values
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            evaluated = dict(zip(points, executor.map(_evaluate, points)))
+
+        nbout = max([len(values) for _, values in evaluated.values()] or [0])
+        outputs = numpy.full((len(samples), nbout), numpy.nan)
+        states = []
+        for i, point in enumerate(samples):
+            state, values = evaluated[point]
+            if state & SO.Success and len(values) == nbout:
+                outputs[i] = values
+            else:
+                state = (state & ~SO.Success) | SO.Error
+            states.append(state)
+        return outputs, states
+
     def use(self, **kwargs):
         """Set some execution parameters.
 
@@ -127,12 +320,22 @@ class ParametricCalculation(Calculation):
             pickle.dump(self.inputs, pick)
 
     def read_output_file(self):
-        """Read the output file to extract results."""
+        """Read the output file to extract results.
+
+        Returns:
+            numpy.ndarray: Content of the output file, *None* if it does
+            not exist.
+        """
         filename = osp.join(self.runcdir, OUTPUTS)
         if not osp.exists(filename):
             self.log("ERROR: no such file '{0}'".format(filename))
-            return
+            return None
         results = numpy.load(filename)
+        self._set_outputs(results)
+        return results
+
+    def _set_outputs(self, results):
+        """Extract the output values from the content of the output file."""
         nbline, nbvar = results.shape
         self.log("Raw output values - {0} variable(s), {1} line(s):"
                  .format(nbvar, nbline))
@@ -0,0 +1,393 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2016 EDF R&D
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License Version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, you may download a copy of license
+# from https://www.gnu.org/licenses/gpl-3.0.
+
+"""
+Result cache
+~~~~~~~~~~~~
+
+Cache of the output values of the points of parametric studies.
+
+A point is identified by a key computed from the texts of the stages, the
+content of the input data files, the code_aster version, the execution
+parameters that may change the results and the input values. The output
+values of the evaluated points are stored in a directory, one file per
+point. When the size of the directory exceeds its limit, the least recently
+used points are removed.
+
+The cache is disabled by default. It is enabled for all the parametric
+calculations by setting the ``ASTERSTUDY_PARAMETRIC_CACHE`` environment
+variable, that may contain the path of the cache directory (or ``1`` to use
+the default directory). The maximum size (in MB) is defined by
+``ASTERSTUDY_PARAMETRIC_CACHE_SIZE``.
+
+The cache can be inspected and pruned from the command line::
+
+    python -m asterstudy.api.result_cache stats
+    python -m asterstudy.api.result_cache prune --max-size 100
+
+"""
+
+
+import argparse
+import hashlib
+import json
+import os
+import os.path as osp
+import threading
+import time
+
+import numpy
+
+from ..common import CFG, debug_message, make_dirs, remove_path
+from ..datamodel import FileAttr
+from ..datamodel.parametric import INPUTS
+
+#: Version of the format of the keys.
+FORMAT = 1
+
+#: Execution parameters that may change the output values.
+PARAMETERS = ('server', 'version', 'execmode', 'mpicpu', 'nodes', 'threads',
+              'language', 'args', 'extra')
+
+_HASH = hashlib.sha1
+_SUFFIX = ".npy"
+_STATS = "stats.json"
+_CHECKSUMS = {}
+
+
+def file_checksum(path):
+    """Return the checksum of the content of a file or a directory.
+
+    The checksums are kept in memory while the files are not modified.
+
+    Arguments:
+        path (str): Path of the file or directory.
+
+    Returns:
+        str: Checksum, *None* if the file does not exist.
+    """
+    if osp.isdir(path):
+        digest = _HASH()
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                fpath = osp.join(dirpath, filename)
+                digest.update(repr((osp.relpath(fpath, path),
+                                    file_checksum(fpath))).encode())
+        return digest.hexdigest()
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    memo = (path, stat.st_mtime_ns, stat.st_size)
+    if memo not in _CHECKSUMS:
+        digest = _HASH()
+        with open(path, 'rb') as fobj:
+            for block in iter(lambda: fobj.read(1 << 20), b''):
+                digest.update(block)
+        _CHECKSUMS[memo] = digest.hexdigest()
+    return _CHECKSUMS[memo]
+
+
+def case_fingerprint(case, params):
+    """Return the fingerprint of a parametric case.
+
+    The output files and the file of the input values are ignored.
+
+    Arguments:
+        case (Case): Parametric case.
+        params (dict): Execution parameters.
+
+    Returns:
+        str: Fingerprint of the case.
+    """
+    digest = _HASH()
+    digest.update(repr((FORMAT, [(key, params.get(key))
+                                 for key in PARAMETERS])).encode())
+    for stage in case.stages:
+        digest.update(stage.get_text().encode())
+        for unit, info in sorted(stage.handle2info.items(),
+                                 key=lambda item: str(item[0])):
+            filename = info.filename or ""
+            if info.attr & FileAttr.Out or osp.basename(filename) == INPUTS:
+                continue
+            digest.update(repr((unit, osp.basename(filename),
+                                file_checksum(filename))).encode())
+    if case.in_dir:
+        digest.update(repr(file_checksum(case.in_dir)).encode())
+    return digest.hexdigest()
+
+
+def default_path():
+    """Return the path of the default cache directory."""
+    return osp.join(osp.dirname(CFG.userrc), "asterstudy_parametric_cache")
+
+
+def default_cache():
+    """Return the cache enabled by the environment.
+
+    Returns:
+        ResultCache: Cache object, *None* if the cache is not enabled.
+    """
+    path = os.getenv("ASTERSTUDY_PARAMETRIC_CACHE", "")
+    if path in ("", "0"):
+        return None
+    if path == "1":
+        path = default_path()
+    max_size = os.getenv("ASTERSTUDY_PARAMETRIC_CACHE_SIZE")
+    return ResultCache(path, max_size=float(max_size) if max_size else None)
+
+
+class ResultCache:
+    """Cache of the output values of parametric points.
+
+    Arguments:
+        path (str): Path of the cache directory.
+        max_size (float): Maximum size in MB (default: 512 MB).
+
+    Attributes:
+        hits (int): Number of points found by this object.
+        misses (int): Number of points not found by this object.
+    """
+
+    def __init__(self, path=None, max_size=None):
+        self.path = path or default_path()
+        self.max_size = max_size or 512.
+        self.hits = self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(fingerprint, names, values):
+        """Return the key of a point.
+
+        Arguments:
+            fingerprint (str): Fingerprint of the case, as returned by
+                `case_fingerprint()`.
+            names (list[str]): Names of the input variables.
+            values (list[float]): Values of the input variables.
+
+        Returns:
+            str: Key of the point.
+        """
+        point = [(name, float(value)) for name, value in zip(names, values)]
+        return _HASH(repr((fingerprint, point)).encode()).hexdigest()
+
+    def _filename(self, key):
+        """Return the path of the file of a point."""
+        return osp.join(self.path, key[:2], key + _SUFFIX)
+
+    def get(self, key):
+        """Return the output values of a point.
+
+        Arguments:
+            key (str): Key of the point.
+
+        Returns:
+            numpy.ndarray: Output values, *None* if the point is not in the
+            cache.
+        """
+        filename = self._filename(key)
+        try:
+            values = numpy.load(filename)
+            # mark as recently used
+            os.utime(filename)
+        except (OSError, ValueError):
+            values = None
+        self._record(values is not None)
+        return values
+
+    def put(self, key, values):
+        """Store the output values of a point.
+
+        Errors are ignored: the point will just be evaluated again.
+
+        Arguments:
+            key (str): Key of the point.
+            values (numpy.ndarray): Output values.
+        """
+        filename = self._filename(key)
+        tmpfile = "{0}.{1}.{2}.tmp".format(filename, os.getpid(),
+                                           threading.get_ident())
+        try:
+            make_dirs(osp.dirname(filename))
+            with open(tmpfile, 'wb') as fobj:
+                numpy.save(fobj, numpy.asarray(values))
+            os.replace(tmpfile, filename)
+        except OSError as exc:
+            debug_message("can not store the parametric point:", exc)
+            return
+        self.prune()
+
+    def entries(self):
+        """Return the points stored in the cache.
+
+        Returns:
+            list[tuple]: Key, size (in bytes) and time of last use of each
+            point, from the least recently used.
+        """
+        entries = []
+        if not osp.isdir(self.path):
+            return entries
+        for subdir in os.scandir(self.path):
+            if not subdir.is_dir():
+                continue
+            for entry in os.scandir(subdir.path):
+                if not entry.name.endswith(_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((entry.name[:-len(_SUFFIX)], stat.st_size,
+                                stat.st_mtime))
+        entries.sort(key=lambda entry: entry[2])
+        return entries
+
+    def prune(self, max_size=None, older_than=None):
+        """Remove the least recently used points.
+
+        Arguments:
+            max_size (float): Size (in MB) to reach, the maximum size of the
+                cache by default.
+            older_than (float): Also remove the points not used since this
+                number of days.
+
+        Returns:
+            int: Number of removed points.
+        """
+        limit = (self.max_size if max_size is None else max_size) * 1024 ** 2
+        entries = self.entries()
+        size = sum(entry[1] for entry in entries)
+        oldest = time.time() - older_than * 86400 if older_than else None
+        removed = 0
+        for key, fsize, mtime in entries:
+            if size <= limit and (oldest is None or mtime >= oldest):
+                break
+            try:
+                os.remove(self._filename(key))
+            except OSError:
+                continue
+            size -= fsize
+            removed += 1
+        return removed
+
+    def clear(self):
+        """Remove all the points and the statistics."""
+        remove_path(self.path)
+        self.hits = self.misses = 0
+
+    def _record(self, hit):
+        """Count a hit or a miss."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            stats = self._read_stats()
+            stats['hits' if hit else 'misses'] += 1
+            try:
+                make_dirs(self.path)
+                tmpfile = "{0}.{1}.{2}".format(osp.join(self.path, _STATS),
+                                               os.getpid(),
+                                               threading.get_ident())
+                with open(tmpfile, 'w') as fobj:
+                    json.dump(stats, fobj)
+                os.replace(tmpfile, osp.join(self.path, _STATS))
+            except OSError:
+                pass
+
+    def _read_stats(self):
+        """Read the statistics stored with the cache."""
+        stats = dict(hits=0, misses=0)
+        try:
+            with open(osp.join(self.path, _STATS)) as fobj:
+                stats.update(json.load(fobj))
+        except (OSError, ValueError):
+            pass
+        return stats
+
+    def stats(self):
+        """Return the statistics of the cache.
+
+        Returns:
+            dict: Number of hits and misses (since the creation of the cache
+            directory), number of points and size (in bytes).
+        """
+        entries = self.entries()
+        stats = self._read_stats()
+        stats['entries'] = len(entries)
+        stats['size'] = sum(entry[1] for entry in entries)
+        return stats
+
+
+def main(argv=None):
+    """Inspect and prune the cache of the parametric points."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--path', default=None,
+                        help="cache directory (default: {0})"
+                        .format(default_path()))
+    subparsers = parser.add_subparsers(dest='action')
+    subparsers.required = True
+    subparsers.add_parser('stats', help="show the statistics of the cache")
+    subparsers.add_parser('list', help="list the points, from the least "
+                                       "recently used")
+    prune = subparsers.add_parser('prune', help="remove the least recently "
+                                                "used points")
+    prune.add_argument('--max-size', type=float, default=None,
+                       help="size to reach in MB")
+    prune.add_argument('--older-than', type=float, default=None,
+                       help="remove the points not used since this number "
+                            "of days")
+    subparsers.add_parser('clear', help="remove all the points")
+    args = parser.parse_args(argv)
+
+    path = args.path
+    if path is None:
+        path = os.getenv("ASTERSTUDY_PARAMETRIC_CACHE", "")
+        path = path if path not in ("", "0", "1") else None
+    cache = ResultCache(path)
+    if args.action == 'stats':
+        stats = cache.stats()
+        total = stats['hits'] + stats['misses']
+        print("path:     {0}".format(cache.path))
+        print("points:   {0}".format(stats['entries']))
+        print("size:     {0:.1f} MB".format(stats['size'] / 1024 ** 2))
+        print("hits:     {0}".format(stats['hits']))
+        print("misses:   {0}".format(stats['misses']))
+        print("hit rate: {0:.1%}".format(stats['hits'] / total
+                                          if total else 0.))
+    elif args.action == 'list':
+        for key, size, mtime in cache.entries():
+            print("{0}  {1:>10}  {2}".format(
+                key, size, time.strftime("%Y-%m-%d %H:%M:%S",
+                                         time.localtime(mtime))))
+    elif args.action == 'prune':
+        max_size = args.max_size
+        if max_size is None and args.older_than is None:
+            max_size = cache.max_size
+        removed = cache.prune(max_size=max_size if max_size is not None
+                              else float('inf'),
+                              older_than=args.older_than)
+        print("{0} point(s) removed".format(removed))
+    else:
+        cache.clear()
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
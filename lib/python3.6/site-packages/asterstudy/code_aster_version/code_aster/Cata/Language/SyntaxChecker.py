@@ -86,6 +86,48 @@ def fromTypeName(typename):
     return fromTypeName.convTypes.get(typename, [])
 
 
+# sequences shorter than this size are checked value by value
+FAST_CHECK_SIZE = 32
+
+
+def _numeric_values(values, validType):
+    """Return the values of a homogeneous numeric sequence as an array.
+
+    Only the sequences that can be checked without looking at each value are
+    converted: the sequences of Python ints and floats or numpy arrays of
+    numbers, with only numeric expected types and without any value that
+    needs a specific treatment (non-finite floats, floats for integers).
+
+    Returns:
+        numpy.ndarray: Array of the values, *None* if the sequence must be
+        checked value by value.
+    """
+    numeric = fromTypeName('R')
+    if any(typ not in numeric for typ in validType):
+        return None
+    if isinstance(values, numpy.ndarray):
+        if values.ndim != 1 or values.dtype.kind not in 'iuf':
+            return None
+        types = {values.dtype.type}
+    else:
+        types = set(map(type, values))
+        if not types.issubset((int, float)):
+            return None
+    for typ in types:
+        if typ not in validType and not issubclass(typ, tuple(validType)):
+            # for example, floats for integers (valid if integral)
+            return None
+    try:
+        array = numpy.asarray(values,
+                              dtype=None if isinstance(values, numpy.ndarray)
+                              else float if float in types else numpy.int64)
+    except (OverflowError, ValueError, TypeError):
+        return None
+    if float in types and not numpy.isfinite(array).all():
+        return None
+    return array
+
+
 def _gettype(obj):
     """Return the type of an object"""
     # AsterStudy: for Command, use gettype()
@@ -268,8 +310,12 @@ class SyntaxCheckerVisitor:
         else:
             skwValue = [skwValue]
 
+        # large numeric sequences are checked at once, value by value only
+        # if an error must be reported
+        checked = self._checkNumericSequence(step, skwValue, validType,
+                                             valMin, valMax)
         # Vérification du type et des bornes des valeurs
-        for i in skwValue:
+        for i in (() if checked else skwValue):
             if complex in validType:
                 i = old_complex(i)
             # AsterStudy: for PythonVariable
@@ -331,6 +377,31 @@ class SyntaxCheckerVisitor:
         for valid in force_list(step.definition.get('validators', [])):
             valid.check(skwValue)
 
+    def _checkNumericSequence(self, step, values, validType, valMin, valMax):
+        """Check a large homogeneous numeric sequence with array operations.
+
+        Returns:
+            bool: *True* if all the values are valid, *False* if the sequence
+            can not be checked at once or if a value is invalid (so that the
+            error is reported as when values are checked one by one).
+        """
+        if len(values) < FAST_CHECK_SIZE:
+            return False
+        array = _numeric_values(values, validType)
+        if array is None:
+            return False
+        if "into" in step.definition:
+            into = step.definition["into"]
+            if not all(type(i) in (int, float) for i in into):
+                return False
+            if not numpy.isin(array, into).all():
+                return False
+        if valMax is not None and (array > valMax).any():
+            return False
+        if valMin is not None and (array < valMin).any():
+            return False
+        return True
+
     def _visitComposite(self, step, userDict):
         """Visit a composite object (containing BLOC, FACT and SIMP objects)
         Check that :
@@ -371,13 +442,15 @@ class SyntaxCheckerVisitor:
             if not self._default_command:
                 userOcc = mixedcopy(userOcc)
                 step.addDefaultKeywords(userOcc, ctxt)
+            # blocks, keywords and rules are resolved once per occurrence
+            resolution = step.resolve(userOcc, ctxt)
             # check rules
-            for rule in step.getRules(userOcc, ctxt):
+            for rule in step.getRules(userOcc, ctxt, resolution):
                 self._stack.append(rule)
                 rule.check(userOcc)
                 self._stack.pop()
             # check that the required keywords are provided by the user
-            step.checkMandatory(userOcc, self._stack, ctxt)
+            step.checkMandatory(userOcc, self._stack, ctxt, resolution)
             # loop on keywords provided by the user
             for key, value in userOcc.items():
                 # print key, value
@@ -387,7 +460,9 @@ class SyntaxCheckerVisitor:
                         self._stack.append(key)
                         self.error(KeyError, "reuse is not allowed!")
                     continue
-                kwd = step.getKeyword(key, userOcc, ctxt)
+                if resolution is None:
+                    resolution = step.resolve(userOcc, ctxt)
+                kwd = step.getKeyword(key, userOcc, ctxt, resolution)
                 if kwd is None:
                     debug_message2("keyword:", key, "user dict:", userOcc,
                                    "parent context:", ctxt)
@@ -400,9 +475,12 @@ class SyntaxCheckerVisitor:
                         if (value_is_sequence(value) and len(value) == 1
                                 and not isinstance(value[0], dict)):
                             value = userOcc[key] = value[0]
+                            # the blocks may depend on the changed value
+                            resolution = None
                     else:
                         if value is not None and not value_is_sequence(value):
                             value = userOcc[key] = [value]
+                            resolution = None
                     self._stack.append(key)
                     kwd.accept(self, value)
                     self._stack.pop()
@@ -39,6 +39,8 @@ to import command files that contain it. But it is always optional (see
 `checkMandatory`) because it is removed during import.
 """
 
+import ast
+import builtins
 import inspect
 import types
 from collections import OrderedDict
@@ -95,8 +97,27 @@ class CataDefinition(OrderedDict):
     """Dictionary to store the definition of syntax objects.
     Iteration over the elements is ordered by type: SimpleKeyword, FactorKeyword
     and Bloc.
+
+    The definitions are not changed once created: the tables computed from
+    the content (entities by type, items by type, blocs) are stored at the
+    first call.
     """
 
+    def _table(self, name, builder):
+        """Return a table computed from the definition, stored at the first
+        call.
+
+        Arguments:
+            name (str): Name of the table.
+            builder (callable): Function that computes the table.
+        """
+        tables = self.__dict__.setdefault('_tables', {})
+        try:
+            return tables[name]
+        except KeyError:
+            table = tables[name] = builder()
+            return table
+
     @property
     def entities(self):
         """Return the all entities.
@@ -105,9 +126,9 @@ class CataDefinition(OrderedDict):
             dict: dict of all entities (keywords and conditional blocks) of the
             object.
         """
-        kws = self._filter_entities((SimpleKeyword, Bloc, FactorKeyword),
-                                    with_block=False)
-        return sorted_dict(kws)
+        return OrderedDict(self._table('entities', lambda: sorted_dict(
+            self._filter_entities((SimpleKeyword, Bloc, FactorKeyword),
+                                  with_block=False))))
 
     @property
     def keywords(self):
@@ -122,8 +143,8 @@ class CataDefinition(OrderedDict):
 
         .. _PEP-0468: https://www.python.org/dev/peps/pep-0468/
         """
-        kws = self._filter_entities((SimpleKeyword, FactorKeyword))
-        return sorted_dict(kws)
+        return OrderedDict(self._table('keywords', lambda: sorted_dict(
+            self._filter_entities((SimpleKeyword, FactorKeyword)))))
 
     @property
     def factor_keywords(self):
@@ -132,8 +153,8 @@ class CataDefinition(OrderedDict):
         Returns:
             dict: dict of all factor keywords of the object.
         """
-        kws = self._filter_entities((FactorKeyword, ))
-        return sorted_dict(kws)
+        return OrderedDict(self._table('factor_keywords', lambda: sorted_dict(
+            self._filter_entities((FactorKeyword, )))))
 
     @property
     def simple_keywords(self):
@@ -142,8 +163,16 @@ class CataDefinition(OrderedDict):
         Returns:
             dict: dict of all simple keywords of the object.
         """
-        kws = self._filter_entities((SimpleKeyword, ))
-        return sorted_dict(kws)
+        return OrderedDict(self._table('simple_keywords', lambda: sorted_dict(
+            self._filter_entities((SimpleKeyword, )))))
+
+    @property
+    def blocs(self):
+        """list[Bloc]: Conditional blocks directly contained in the object,
+        in the order of definition."""
+        return self._table('blocs', lambda: [
+            value for _, value in self.iterItemsByType()
+            if type(value) is Bloc])
 
     def _filter_entities(self, typeslist, with_block=True):
         """Filter entities by type recursively.
@@ -162,11 +191,14 @@ class CataDefinition(OrderedDict):
     def iterItemsByType(self):
         """Iterator over dictionary's pairs with respecting order:
         SimpleKeyword, FactorKeyword and Bloc objects"""
+        return iter(self._table('items_by_type', self._items_by_type))
+
+    def _items_by_type(self):
+        """Return the pairs in the order of `iterItemsByType()`."""
         keysR = [k for k, v in list(self.items()) if type(v) is SimpleKeyword]
         keysI = [k for k, v in list(self.items()) if type(v) is FactorKeyword]
         keysS = [k for k, v in list(self.items()) if type(v) is Bloc]
-        for key in keysR + keysI + keysS:
-            yield (key, self[key])
+        return [(key, self[key]) for key in keysR + keysI + keysS]
 
 
 class UIDMixing:
@@ -413,17 +445,20 @@ class PartOfSyntax(UIDMixing):
                 if kwd.isEnabled(ctxt):
                     kwd.addDefaultKeywords(userSyntax, ctxt)
 
-    def checkMandatory(self, userSyntax, stack, _parent_ctxt=None):
-        """Check that the mandatory keywords are provided by the user.
+    def resolve(self, userSyntax, _parent_ctxt=None):
+        """Compute the resolution context of an occurrence: the enabled
+        blocks, the available keywords and the active rules.
 
-        Warning: this does not check recursively, only the current level.
+        The same object can be passed to `getKeyword()`, `getRules()` and
+        `checkMandatory()` for the same occurrence.
 
         Arguments:
             userSyntax (dict): dict of the keywords as filled by the user.
-            stack (list): used to give contextual informations in error
-                messages.
             _parent_ctxt (dict): contains the keywords as known in the parent.
                 This context is used to evaluate block conditions.
+
+        Returns:
+            Resolution: Resolution context of the occurrence.
         """
         ctxt = _parent_ctxt.copy() if _parent_ctxt else {}
         userSyntax = mixedcopy(userSyntax)
@@ -432,22 +467,30 @@ class PartOfSyntax(UIDMixing):
         # and update parent context with local keywords
         ctxt.update(userSyntax)
 
-        for key, kwd in self.definition.iterItemsByType():
-            if isinstance(kwd, (SimpleKeyword, FactorKeyword)):
-                if key == "reuse": # reuse is deprecated
-                    continue
-                # pragma pylint: disable=no-member
-                if kwd.isMandatory() and kwd.undefined(userSyntax.get(key)):
-                    debug_message2("mandatory keyword =", key, ":", kwd)
-                    debug_message2("given syntax =", userSyntax)
-                    stack.append(key)
-                    raise KeyError("Keyword {0} is mandatory".format(key))
-            elif isinstance(kwd, Bloc):
-                if kwd.isEnabled(ctxt):
-                    kwd.checkMandatory(userSyntax, stack, ctxt)
-            # else: sdprod, fr...
+        blocs = [kwd.resolve(userSyntax, ctxt)
+                 for kwd in self.definition.blocs if kwd.isEnabled(ctxt)]
+        return Resolution(self, userSyntax, blocs)
+
+    def checkMandatory(self, userSyntax, stack, _parent_ctxt=None,
+                       _resolution=None):
+        """Check that the mandatory keywords are provided by the user.
+
+        Warning: this does not check recursively, only the current level.
+
+        Arguments:
+            userSyntax (dict): dict of the keywords as filled by the user.
+            stack (list): used to give contextual informations in error
+                messages.
+            _parent_ctxt (dict): contains the keywords as known in the parent.
+                This context is used to evaluate block conditions.
+            _resolution (Resolution): resolution context of the occurrence,
+                as returned by `resolve()`.
+        """
+        resolution = _resolution or self.resolve(userSyntax, _parent_ctxt)
+        resolution.checkMandatory(stack)
 
-    def getKeyword(self, userKeyword, userSyntax, _parent_ctxt=None):
+    def getKeyword(self, userKeyword, userSyntax, _parent_ctxt=None,
+                   _resolution=None):
         """Return the keyword in the current composite object.
 
         Arguments:
@@ -455,56 +498,30 @@ class PartOfSyntax(UIDMixing):
             userSyntax (dict): dict of the keywords as filled by the user.
             _parent_ctxt (dict): contains the keywords as known in the parent.
                 This context is used to evaluate block conditions.
+            _resolution (Resolution): resolution context of the occurrence,
+                as returned by `resolve()`.
         """
         # search in keywords list
         found = self.definition.get(userKeyword)
         if found:
             return found
 
-        ctxt = _parent_ctxt.copy() if _parent_ctxt else {}
-        userSyntax = mixedcopy(userSyntax)
-        # add default keywords into userSyntax
-        self.addDefaultKeywords(userSyntax, ctxt)
-        # and update parent context with local keywords
-        ctxt.update(userSyntax)
-
         # search in BLOC objects
-        for key, kwd in self.definition.iterItemsByType():
-            if not isinstance(kwd, Bloc):
-                continue
-            # debug_message2("block", key, repr(kwd.getCondition()), "with", ctxt,
-            #                "enabled ?", kwd.isEnabled(ctxt))
-            if not kwd.isEnabled(ctxt):
-                continue
-            found = kwd.getKeyword(userKeyword, userSyntax, ctxt)
-            if found:
-                break
-        return found
+        resolution = _resolution or self.resolve(userSyntax, _parent_ctxt)
+        return resolution.keywords.get(userKeyword)
 
-    def getRules(self, userSyntax, _parent_ctxt=None):
+    def getRules(self, userSyntax, _parent_ctxt=None, _resolution=None):
         """Return the rules to be applied to the given keywords.
 
         Arguments:
             userSyntax (dict): dict of the keywords as filled by the user.
             _parent_ctxt (dict): contains the keywords as known in the parent.
                 This context is used to evaluate block conditions.
+            _resolution (Resolution): resolution context of the occurrence,
+                as returned by `resolve()`.
         """
-        ctxt = _parent_ctxt.copy() if _parent_ctxt else {}
-        userSyntax = mixedcopy(userSyntax)
-        # add default keywords into userSyntax
-        self.addDefaultKeywords(userSyntax, ctxt)
-        # and update parent context with local keywords
-        ctxt.update(userSyntax)
-
-        rules = list(self.rules)
-        # search in BLOC objects
-        for key, kwd in self.definition.iterItemsByType():
-            if not isinstance(kwd, Bloc):
-                continue
-            if not kwd.isEnabled(ctxt):
-                continue
-            rules.extend(kwd.getRules(userSyntax))
-        return rules
+        resolution = _resolution or self.resolve(userSyntax, _parent_ctxt)
+        return list(resolution.rules)
 
     @classmethod
     def undefined(cls, value):
@@ -520,6 +537,66 @@ class PartOfSyntax(UIDMixing):
         return self.definition.get('max', 1) != 1
 
 
+class Resolution:
+
+    """
+    Resolution context of an occurrence of a composite object (command,
+    factor keyword or enabled block).
+
+    Attributes:
+        step (PartOfSyntax): The composite object.
+        syntax (dict): Keywords of the occurrence with the default values.
+        blocs (list[Resolution]): Resolution contexts of the enabled blocks.
+    """
+
+    __slots__ = ('step', 'syntax', 'blocs', '_keywords', '_rules')
+
+    def __init__(self, step, syntax, blocs):
+        self.step = step
+        self.syntax = syntax
+        self.blocs = blocs
+        self._keywords = self._rules = None
+
+    @property
+    def keywords(self):
+        """dict: Definitions of the keywords by name, those of the object
+        first, then those of the enabled blocks."""
+        if self._keywords is None:
+            keywords = dict((key, kwd) for key, kwd
+                            in self.step.definition.items() if kwd)
+            for bloc in self.blocs:
+                for key, kwd in bloc.keywords.items():
+                    keywords.setdefault(key, kwd)
+            self._keywords = keywords
+        return self._keywords
+
+    @property
+    def rules(self):
+        """list: Rules of the object and of the enabled blocks."""
+        if self._rules is None:
+            rules = list(self.step.rules)
+            for bloc in self.blocs:
+                rules.extend(bloc.rules)
+            self._rules = rules
+        return self._rules
+
+    def checkMandatory(self, stack):
+        """Check that the mandatory keywords are provided by the user (see
+        `PartOfSyntax.checkMandatory()`)."""
+        syntax = self.syntax
+        for key, kwd in self.step.definition.iterItemsByType():
+            if key == "reuse" or isinstance(kwd, Bloc): # reuse is deprecated
+                continue
+            # pragma pylint: disable=no-member
+            if kwd.isMandatory() and kwd.undefined(syntax.get(key)):
+                debug_message2("mandatory keyword =", key, ":", kwd)
+                debug_message2("given syntax =", syntax)
+                stack.append(key)
+                raise KeyError("Keyword {0} is mandatory".format(key))
+        for bloc in self.blocs:
+            bloc.checkMandatory(stack)
+
+
 class SimpleKeyword(PartOfSyntax):
 
     """
@@ -600,6 +677,160 @@ class FactorKeyword(PartOfSyntax):
         return _F()
 
 
+class Condition:
+
+    """
+    Compiled condition of a BLOC.
+
+    The condition string is compiled once. The result of the evaluation is
+    stored for the values of the keywords it reads, if they can be known
+    statically (names of variables and arguments of the helper functions
+    defined by `block_utils`).
+
+    Conditions are shared by all the blocs using the same string (see
+    `Condition.get`).
+    """
+    #: Number of results stored per condition.
+    memo_size = 256
+    #: Longest sequence used in the key of a result.
+    max_length = 32
+
+    _registry = {}
+    _namespace = None
+
+    __slots__ = ('code', 'names', 'memo')
+
+    def __init__(self, condition):
+        try:
+            self.code = compile(condition.strip(), "<condition>", "eval")
+        except SyntaxError:
+            self.code = None
+        self.names = _condition_names(condition) if self.code else None
+        self.memo = {}
+
+    @classmethod
+    def get(cls, condition):
+        """Return the compiled object for a condition string."""
+        compiled = cls._registry.get(condition)
+        if compiled is None:
+            compiled = cls._registry[condition] = cls(condition)
+        return compiled
+
+    @classmethod
+    def namespace(cls):
+        """Return the names available in conditions (datastructures and
+        builtins). Must not be modified."""
+        if cls._namespace is None:
+            from . import DataStructure as DS
+            namespace = dict(DS.__dict__)
+            namespace['__builtins__'] = builtins
+            cls._namespace = namespace
+        return cls._namespace
+
+    def evaluate(self, context):
+        """Evaluate the condition with the values of the keywords.
+
+        Arguments:
+            context (dict): Values of the keywords.
+
+        Returns:
+            bool: Result of the condition, *False* if it can not be
+            evaluated.
+        """
+        if self.code is None:
+            return False
+        key = self._key(context) if self.names is not None else None
+        if key is not None:
+            try:
+                return self.memo[key]
+            except KeyError:
+                pass
+        eval_context = {}
+        eval_context.update(block_utils(eval_context))
+        # evaluate Python variables if present
+        for name, value in list(context.items()):
+            eval_context[name] = getattr(value, "evaluation", value)
+        try:
+            enabled = eval(self.code, self.namespace(), eval_context)
+        except AssertionError:
+            raise
+        except Exception:
+            # TODO: re-enable CataError, it seems me a catalog error!
+            enabled = False
+        if key is not None:
+            if len(self.memo) >= self.memo_size:
+                self.memo.clear()
+            self.memo[key] = enabled
+        return enabled
+
+    def _key(self, context):
+        """Return the key of the result for this context, *None* if the
+        values can not be used as a key."""
+        key = []
+        try:
+            for name in self.names:
+                if name not in context:
+                    key.append(None)
+                    continue
+                value = context[name]
+                key.append(_frozen(getattr(value, "evaluation", value),
+                                   self.max_length))
+        except TypeError:
+            return None
+        return tuple(key)
+
+
+_HELPERS = ('exists', 'value', 'is_in', 'equal_to', 'is_type')
+
+
+def _condition_names(condition):
+    """Return the names of the keywords read by a condition, *None* if they
+    can not be known statically."""
+    tree = ast.parse(condition.strip(), mode='eval')
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            names.add(node.id)
+        elif isinstance(node, ast.Call) and \
+                isinstance(node.func, ast.Name) and node.func.id in _HELPERS:
+            if not node.args:
+                return None
+            args = node.args[0]
+            args = args.elts if isinstance(args, (ast.List, ast.Tuple)) \
+                else [args]
+            for arg in args:
+                name = _string_constant(arg)
+                if name is None:
+                    return None
+                names.add(name)
+    return tuple(sorted(names.difference(_HELPERS)))
+
+
+def _string_constant(node):
+    """Return the value of a string literal node, *None* otherwise."""
+    if type(node).__name__ not in ('Constant', 'Str'):
+        return None
+    value = getattr(node, 'value', getattr(node, 's', None))
+    return value if isinstance(value, str) else None
+
+
+def _frozen(value, max_length):
+    """Return a hashable equivalent of a keyword value (including its
+    type since conditions may check it).
+
+    Raises:
+        TypeError: If the value is not a plain value.
+    """
+    if value is None or type(value) in (str, int, float, bool):
+        return type(value), value
+    if type(value) in (list, tuple) and len(value) <= max_length:
+        return type(value), tuple(_frozen(i, max_length) for i in value)
+    if isinstance(value, dict) and len(value) <= max_length:
+        return dict, tuple(sorted((key, _frozen(val, max_length))
+                                  for key, val in value.items()))
+    raise TypeError(type(value))
+
+
 class Bloc(PartOfSyntax):
 
     """
@@ -626,23 +857,7 @@ class Bloc(PartOfSyntax):
 
     def isEnabled(self, context):
         """Tell if the block is enabled by the given context"""
-        from . import DataStructure as DS
-        eval_context = {}
-        eval_context.update(DS.__dict__)
-        eval_context.update(block_utils(eval_context))
-        # evaluate Python variables if present
-        for key, value in list(context.items()):
-            eval_context[key] = getattr(value, "evaluation", value)
-        try:
-            enabled = eval(self.getCondition(), {}, eval_context)
-        except AssertionError:
-            raise
-        except Exception as exc:
-            # TODO: re-enable CataError, it seems me a catalog error!
-            # raise CataError("Error evaluating {0!r}: {1}".format(
-            #                 self.getCondition(), str(exc)))
-            enabled = False
-        return enabled
+        return Condition.get(self.getCondition()).evaluate(context)
 
 
 class Command(PartOfSyntax):
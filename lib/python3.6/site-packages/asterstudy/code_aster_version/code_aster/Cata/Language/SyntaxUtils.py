@@ -38,8 +38,11 @@ from .DataStructure import AsType
 
 def mixedcopy(obj):
     """"Make a mixed copy (copy of all dicts, lists and tuples, no copy
-    for all others)."""
-    if isinstance(obj, list):
+    for all others). Immutable sequences of numbers (marked as *numeric*)
+    are not copied."""
+    if isinstance(obj, tuple) and getattr(obj, 'numeric', False):
+        new = obj
+    elif isinstance(obj, list):
         new = [mixedcopy(i) for i in obj]
     elif isinstance(obj, tuple):
         new = tuple(mixedcopy(list(obj)))
@@ -119,7 +122,7 @@ def force_list(values):
 
 def value_is_sequence(value):
     """Tell if *value* is a valid object if max > 1."""
-    return type(value) in (list, tuple, array, numpy.ndarray)
+    return isinstance(value, (list, tuple, array, numpy.ndarray))
 
 # same function exist in asterstudy.datamodel.aster_parser
 def old_complex(value):
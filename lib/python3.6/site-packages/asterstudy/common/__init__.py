@@ -18,14 +18,15 @@
 """Common purpose utilities and services."""
 
 
-from .base_utils import (Singleton, add_extension, copy_file, current_time,
+from .base_utils import (FileFollower, Singleton, add_extension,
+                         appended_lines, copy_file, current_time,
                          get_absolute_dirname, get_absolute_path,
                          get_base_name, get_extension, is_localhost,
                          is_subpath, is_valid_file_path, localhost_server,
                          make_dirs, move_file, no_new_attributes, ping,
                          read_file, remove_path, rotate_path, same_path,
-                         split_text, tail_file, to_unicode, valid_file_name,
-                         write_file)
+                         split_text, tail_file, tail_offset, to_unicode,
+                         valid_file_name, write_file)
 from .configuration import CFG, Configuration, ConfigurationError
 from .excepthook import enable_except_hook
 from .exceptions import (AsterStudyError, AsterStudyInterrupt, CatalogError,
@@ -28,6 +28,7 @@ Some basic utilities.
 # suppression of above two lines.
 # pragma pylint: disable=wrong-import-position,wrong-import-order
 
+import io
 import os
 import os.path as osp
 import re
@@ -331,6 +332,8 @@ def copy_file(source, dest):
 def tail_file(filename, nbline):
     """Read the last *nbline* lines of a file.
 
+    Only the end of the file is read.
+
     Arguments:
         filename (str): Path of the file.
         nbline (int): Number of lines to return (at most).
@@ -340,14 +343,135 @@ def tail_file(filename, nbline):
     """
     if not osp.isfile(filename):
         return ""
-    with open(filename) as fobj:
-        lines = fobj.readlines()[-nbline:]
+    with open(filename, 'rb') as fobj:
+        fobj.seek(tail_offset(fobj, nbline))
+        text = to_unicode(fobj.read())
+    lines = io.StringIO(text, newline=None).readlines()[-nbline:]
     # remove trailing empty lines
     while lines and not lines[-1].strip():
         lines.pop()
     return ''.join(lines).strip()
 
 
+def tail_offset(fobj, nbline, blocksize=65536):
+    """Return the offset of the first of the last *nbline* lines of a file.
+
+    The file is read by blocks from its end.
+
+    Arguments:
+        fobj (file): File object opened in binary mode.
+        nbline (int): Number of lines.
+        blocksize (int): Size of the blocks.
+
+    Returns:
+        int: Offset of the beginning of a line, 0 if the file contains less
+        than *nbline* lines.
+    """
+    pos = fobj.seek(0, os.SEEK_END)
+    data = b""
+    # a terminating newline does not start a new line
+    while pos > 0 and data.count(b"\n") <= nbline:
+        size = min(blocksize, pos)
+        pos -= size
+        fobj.seek(pos)
+        data = fobj.read(size) + data
+    end = len(data) - 1 if data.endswith(b"\n") else len(data)
+    for _ in range(nbline):
+        end = data.rfind(b"\n", 0, end)
+        if end < 0:
+            return 0
+    return pos + end + 1
+
+
+class FileFollower:
+    """Follow a file that is being written.
+
+    Each reading only returns the lines appended since the previous one:
+    the offset of the next line to be read is kept between the readings.
+    If the file is truncated, it is read again from its beginning.
+
+    Arguments:
+        filename (str): Path of the file.
+        nbline (int): If not *None*, the first reading starts from the last
+            *nbline* lines instead of the beginning of the file.
+    """
+
+    def __init__(self, filename, nbline=None):
+        self._filename = filename
+        self._nbline = nbline
+        self._offset = None
+
+    @property
+    def filename(self):
+        """str: Path of the followed file."""
+        return self._filename
+
+    @property
+    def offset(self):
+        """int: Offset of the next line to be read (*None* before the first
+        reading)."""
+        return self._offset
+
+    def read(self, final=False):
+        """Read the lines appended to the file.
+
+        Arguments:
+            final (bool): If *True*, the last line is returned even if it is
+                not terminated.
+
+        Returns:
+            str: Text appended since the previous reading, "" if the file
+            does not exist.
+        """
+        try:
+            with open(self._filename, 'rb') as fobj:
+                size = os.fstat(fobj.fileno()).st_size
+                if self._offset is None:
+                    self._offset = 0
+                    if self._nbline is not None:
+                        self._offset = tail_offset(fobj, self._nbline)
+                elif size < self._offset:
+                    self._offset = 0
+                fobj.seek(self._offset)
+                data = fobj.read(size - self._offset)
+        except OSError:
+            return ""
+        if not final:
+            data = data[:data.rfind(b"\n") + 1]
+        self._offset += len(data)
+        return to_unicode(data)
+
+
+def appended_lines(previous, current):
+    """Return the lines of *current* that follow the lines of *previous*.
+
+    *previous* and *current* are the last lines of a file that is being
+    written, read at two different times: the longest end of *previous*
+    that starts *current* is searched (in linear time).
+
+    Arguments:
+        previous (list[str]): Lines read at the previous time.
+        current (list[str]): Lines read now.
+
+    Returns:
+        list[str]: Lines that have been appended.
+    """
+    if not previous:
+        return current
+    # prefix function of the sequence: current + [separator] + previous
+    head = current[:len(previous)]
+    seq = head + [None] + previous
+    prefix = [0] * len(seq)
+    for i in range(1, len(seq)):
+        length = prefix[i - 1]
+        while length and seq[i] != seq[length]:
+            length = prefix[length - 1]
+        if seq[i] == seq[length]:
+            length += 1
+        prefix[i] = length
+    return current[prefix[-1]:]
+
+
 def current_time():
     """Return the current time."""
     return time.strftime("%c")
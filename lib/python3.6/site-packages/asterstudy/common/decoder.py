@@ -42,8 +42,65 @@ REGFLOAT = re.compile(r"(?P<value>[\-\+]?[0-9]+[0-9\.]+(?:[eE][\-\+]?[0-9]+)?)"
                       r" *X?", re.M)
 
 
+class GrowableArray:
+    """Array of values that grows by appending values.
+
+    The values are stored in a preallocated buffer that is enlarged by
+    doubling its size when it is full.
+
+    Arguments:
+        dtype (type): Type of the values.
+        capacity (int): Initial size of the buffer.
+    """
+
+    def __init__(self, dtype, capacity=1024):
+        self._buffer = numpy.empty(capacity, dtype=dtype)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, value):
+        """Append a value."""
+        if self._size == self._buffer.size:
+            self._resize(self._size + 1)
+        self._buffer[self._size] = value
+        self._size += 1
+
+    def extend(self, values):
+        """Append several values."""
+        values = numpy.asarray(values, dtype=self._buffer.dtype)
+        size = self._size + values.size
+        if size > self._buffer.size:
+            self._resize(size)
+        self._buffer[self._size:size] = values
+        self._size = size
+
+    def _resize(self, size):
+        """Enlarge the buffer to store at least *size* values."""
+        capacity = max(size, 2 * self._buffer.size)
+        buffer = numpy.empty(capacity, dtype=self._buffer.dtype)
+        buffer[:self._size] = self._buffer[:self._size]
+        self._buffer = buffer
+
+    @property
+    def values(self):
+        """numpy.ndarray: View on the values stored."""
+        return self._buffer[:self._size]
+
+
 class AbstractDecoder:
-    """Abstract decoder."""
+    """Abstract decoder.
+
+    A decoder can be used to decode a whole text with :meth:`decode` or to
+    decode a text that is being written: the new chunks of text are passed
+    to :meth:`feed` and :meth:`snapshot` returns the data extracted until
+    now. The last line of a chunk is decoded with the next chunk if it is
+    not terminated.
+    """
+
+    def __init__(self):
+        self._partial = ""
 
     @classmethod
     def decode(cls, text):
@@ -52,6 +109,39 @@ class AbstractDecoder:
         Arguments:
             text (str): Text of the messages files.
 
+        Return:
+            dict(Data): Ordered dict holding the data extracted from the text.
+        """
+        decoder = cls()
+        decoder.feed(text, final=True)
+        return decoder.snapshot()
+
+    def feed(self, text, final=False):
+        """Decode the next chunk of a text.
+
+        Arguments:
+            text (str): Text appended to the messages file.
+            final (bool): Tell if this is the end of the text.
+        """
+        text = self._partial + text
+        self._partial = ""
+        if not final:
+            end = text.rfind("\n") + 1
+            text, self._partial = text[:end], text[end:]
+        if text:
+            self._feed_lines(text)
+
+    def _feed_lines(self, text):
+        """Decode complete lines.
+
+        Arguments:
+            text (str): Lines of text.
+        """
+        raise NotImplementedError
+
+    def snapshot(self):
+        """Return the data extracted from the text already decoded.
+
         Return:
             dict(Data): Ordered dict holding the data extracted from the text.
         """
@@ -69,25 +159,30 @@ class TimeDecoder(AbstractDecoder):
         Info("time", float, REGFLOAT, translate("Dashboard", "Time")),
     )
 
-    @classmethod
-    def decode(cls, text):
-        """Decode the given text.
-
-        Arguments:
-            text (str): Text of the messages files.
-
-        Return:
-            dict(Data): Ordered dict holding the data extracted from the text.
-        """
+    def __init__(self):
+        super().__init__()
+        self._values = OrderedDict([(info.key, GrowableArray(info.type))
+                                    for info in self.infos])
+        self._found = False
+
+    def _feed_lines(self, text):
+        """Decode complete lines."""
+        for mat in self._expr.finditer(text):
+            self._found = True
+            for info in self.infos:
+                value = mat.group(info.key)
+                if value:
+                    self._values[info.key].append(info.type(value))
+
+    def snapshot(self):
+        """Return the data extracted from the text already decoded."""
         data = OrderedDict()
-        found = list(cls._expr.finditer(text))
-        if not found:
+        if not self._found:
             return data
 
-        cmpl = cls.infos[0].key
-        for info in cls.infos:
-            valy = numpy.array([info.type(mat.group(info.key))
-                                for mat in found if mat.group(info.key)])
+        cmpl = self.infos[0].key
+        for info in self.infos:
+            valy = self._values[info.key].values
             valx = numpy.arange(valy.size)
             if valx.size > 1:
                 title = info.title
@@ -124,11 +219,16 @@ class DynaVibraTimeDecoder(TimeDecoder):
 
 
 class ConvergenceDecoder(AbstractDecoder):
-    """Decoder that extract the values for the convergence table."""
+    """Decoder that extract the values for the convergence table.
+
+    The mapping between the columns of the table and the values is kept
+    between the chunks of text.
+    """
     if os.name == "nt":
         _filt = re.compile(r"^( *\|.*\|(?:.*\|)+)\r$", re.M)
     else:
         _filt = re.compile(r"^( *\|.*\|(?:.*\|)+)$", re.M)
+    _separ = re.compile(r" *\| *")
 
     infos = {
         "ITERATION": Info("iteration", int, REGINT,
@@ -141,41 +241,41 @@ class ConvergenceDecoder(AbstractDecoder):
                       translate("Dashboard", "Value of a degree of freedom")),
     }
 
-    @classmethod
-    def decode(cls, text):
-        """Decode the given text.
-
-        Arguments:
-            text (str): Text of the messages files.
-
-        Return:
-            dict(Data): Ordered dict holding the data extracted from the text.
-        """
-        lines = cls._filt.findall(text)
-
-        separ = re.compile(r" *\| *")
-        values = OrderedDict()
-        idx = dict()
-        for line in lines:
-            for i, col in enumerate(separ.split(line)):
-                if col in cls.infos:
+    def __init__(self):
+        super().__init__()
+        self._idx = dict()
+        self._values = OrderedDict()
+
+    def _feed_lines(self, text):
+        """Decode complete lines."""
+        idx = self._idx
+        values = self._values
+        for line in self._filt.findall(text):
+            for i, col in enumerate(self._separ.split(line)):
+                if col in self.infos:
                     idx[i] = (i, col)
                     continue
                 if idx.get(i) is None:
                     continue
                 # assign the value to the right column
-                info = cls.infos[idx[i][1]]
+                info = self.infos[idx[i][1]]
                 mat = info.regexp.search(col)
                 if not mat:
                     continue
                 value = info.type(mat.group('value'))
-                values.setdefault(idx[i], []).append(value)
+                if idx[i] not in values:
+                    values[idx[i]] = GrowableArray(info.type)
+                values[idx[i]].append(value)
 
+    def snapshot(self):
+        """Return the data extracted from the text already decoded."""
         isuiv = 0
         data = OrderedDict()
-        for index in idx.values():
-            info = cls.infos[index[1]]
-            valy = numpy.array(values.get(index, []))
+        for index in self._idx.values():
+            info = self.infos[index[1]]
+            valy = numpy.array([])
+            if index in self._values:
+                valy = self._values[index].values
             valx = numpy.arange(valy.size)
             if valx.size > 1:
                 suffix = ""
@@ -191,28 +291,47 @@ class ConvergenceDecoder(AbstractDecoder):
 
 
 class Decoder(AbstractDecoder):
-    """The meta-decoder that cumulates several decoders."""
+    """The meta-decoder that cumulates several decoders.
+
+    A decoder that fails is ignored.
+    """
 
     SubDecoders = (NLTimeDecoder, DynaVibraTimeDecoder, ConvergenceDecoder)
 
-    @classmethod
-    def decode(cls, text):
-        """Decode the given text.
+    def __init__(self):
+        super().__init__()
+        self._decoders = []
+        for class_ in self.SubDecoders:
+            try:
+                self._decoders.append(class_())
+            except Exception: # pylint: disable=broad-except
+                continue
 
-        Arguments:
-            text (str): Text of the messages files.
+    def feed(self, text, final=False):
+        """Decode the next chunk of a text.
 
-        Return:
-            dict(Data): Ordered dict holding the data extracted from the text.
+        Arguments:
+            text (str): Text appended to the messages file.
+            final (bool): Tell if this is the end of the text.
         """
-        data = OrderedDict()
         if text:
-            text = remove_mpi_prefix(to_unicode(text))
-            for class_ in cls.SubDecoders:
-                try:
-                    data_i = class_.decode(text)
-                except Exception: # pylint: disable=broad-except
-                    continue
-                data.update(data_i)
-
+            super().feed(to_unicode(text), final)
+
+    def _feed_lines(self, text):
+        """Decode complete lines."""
+        text = remove_mpi_prefix(text)
+        for decoder in self._decoders[:]:
+            try:
+                decoder.feed(text, final=True)
+            except Exception: # pylint: disable=broad-except
+                self._decoders.remove(decoder)
+
+    def snapshot(self):
+        """Return the data extracted from the text already decoded."""
+        data = OrderedDict()
+        for decoder in self._decoders:
+            try:
+                data.update(decoder.snapshot())
+            except Exception: # pylint: disable=broad-except
+                continue
         return data
@@ -85,3 +85,20 @@ def remove_mpi_prefix(text):
 
     lines = [_clean(line) for line in text.splitlines()]
     return os.linesep.join(lines)
+
+
+def remove_mpi_output(text):
+    """Remove the lines printed by the processors other than the first one
+    in the log of code_aster execution.
+
+    Arguments:
+        text(str): Log (output) of code_aster execution.
+
+    Returns:
+        str: Lines printed by the first processor (the ends of lines are
+        kept).
+    """
+    exprs = MPIPrefix(proc0=False).regexp_c
+    lines = [line for line in text.splitlines(True)
+             if not any(expr.search(line) for expr in exprs)]
+    return "".join(lines)
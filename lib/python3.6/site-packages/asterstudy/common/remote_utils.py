@@ -27,9 +27,15 @@ Some utilities for remote files.
 # suppression of above two lines.
 # pragma pylint: disable=wrong-import-position,wrong-import-order
 
+import atexit
 import os
 import os.path as osp
+import shutil
+import signal
 import subprocess as SP
+import tempfile
+import threading
+import time
 import urllib.parse
 
 from PyQt5 import Qt as Q
@@ -278,6 +284,198 @@ def make_remote_path(user, host, path):
     host = host + PATH_SEP if host or user else ""
     return user + host + path
 
+class SSHTransport:
+    """Transport of the remote commands with OpenSSH.
+
+    The commands executed on a server share one connection (multiplexing
+    with a control socket), it is kept open during *idle* seconds after the
+    last command.
+    """
+
+    @staticmethod
+    def multiplexing():
+        """Tell if the connections can be shared."""
+        return os.name != "nt"
+
+    @staticmethod
+    def _options(control, idle):
+        """Return the options to use a shared connection."""
+        if not control:
+            return []
+        return ["-o", "ControlMaster=auto", "-o", "ControlPath=" + control,
+                "-o", "ControlPersist={0}".format(int(idle))]
+
+    def command(self, user, host, control, idle):
+        """Return the command line to execute a command on a server.
+
+        Arguments:
+            user (str): User name on the remote host.
+            host (str): Host name to be addressed by SSH.
+            control (str): Path of the control socket (*None* to not share
+                the connection).
+            idle (float): Delay before closing the shared connection.
+
+        Returns:
+            list[str]: Command line, the command to execute on the server
+            must be appended.
+        """
+        return (["ssh", "-n",
+                 "-o", "StrictHostKeyChecking=no", "-o", "BatchMode=yes"]
+                + self._options(control, idle)
+                + [(user + "@" if user else "") + host])
+
+    def close(self, user, host, control):
+        """Close the shared connection to a server."""
+        if not osp.exists(control):
+            return
+        SP.call(["ssh", "-O", "exit", "-o", "ControlPath=" + control,
+                 (user + "@" if user else "") + host],
+                stdout=SP.DEVNULL, stderr=SP.DEVNULL)
+
+
+class RemoteChannels:
+    """Pool of the connections to the remote servers.
+
+    One connection is kept for each server (and user) and is closed after
+    *idle* seconds without command. A connection is never closed while
+    commands are running on it. At most *maxcalls* commands are executed
+    at the same time on a server.
+
+    Arguments:
+        transport (object): Object that builds the command lines (see
+            *SSHTransport*).
+        idle (float): Delay before closing an unused connection (seconds).
+        maxcalls (int): Maximum number of simultaneous commands per server.
+        timeout (float): Default timeout of the commands (seconds).
+    """
+
+    def __init__(self, transport=None, idle=300., maxcalls=8, timeout=None):
+        self._transport = transport or SSHTransport()
+        self._idle = idle
+        self._maxcalls = maxcalls
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._dir = None
+        # (user, host): [control path, semaphore, time of the last usage,
+        #                number of running commands]
+        self._channels = {}
+
+    def channels(self):
+        """Return the servers (user, host) with an open connection."""
+        with self._lock:
+            return sorted(self._channels.keys())
+
+    def _channel(self, user, host):
+        """Return the connection to a server, create it if needed.
+
+        The connection is marked as busy, `_release()` must be called when
+        the command is finished.
+        """
+        self.evict()
+        with self._lock:
+            channel = self._channels.get((user, host))
+            if channel is None:
+                control = None
+                if self._transport.multiplexing():
+                    if not self._dir:
+                        self._dir = tempfile.mkdtemp(prefix="asterstudy-")
+                    control = osp.join(self._dir, "ssh-{0}".format(
+                        len(self._channels)))
+                    while osp.exists(control):
+                        control += "_"
+                channel = [control, threading.BoundedSemaphore(
+                    self._maxcalls), time.time(), 0]
+                self._channels[(user, host)] = channel
+            channel[2] = time.time()
+            channel[3] += 1
+            return channel
+
+    def _release(self, channel):
+        """Mark the end of a command on a connection."""
+        with self._lock:
+            channel[2] = time.time()
+            channel[3] -= 1
+
+    def run(self, user, host, command, timeout=None):
+        """Execute a command on a server.
+
+        Arguments:
+            user (str): User name on the remote host.
+            host (str): Host name to be addressed by SSH.
+            command (str|list[str]): Command line to remotely execute.
+            timeout (float): Timeout of the command, the default timeout
+                of the pool is used if *None*.
+
+        Returns:
+            tuple: Exit code, output and error of the command (as bytes).
+        """
+        timeout = timeout or self._timeout
+        if not isinstance(command, (list, tuple)):
+            command = [command]
+        channel = self._channel(user, host)
+        try:
+            with channel[1]:
+                cmd = self._transport.command(user, host, channel[0],
+                                              self._idle)
+                proc = SP.Popen(cmd + list(command),
+                                stdout=SP.PIPE, stderr=SP.PIPE,
+                                start_new_session=os.name != "nt")
+                try:
+                    out, err = proc.communicate(timeout=timeout)
+                    returncode = proc.returncode
+                except SP.TimeoutExpired:
+                    if os.name != "nt":
+                        os.killpg(proc.pid, signal.SIGKILL)
+                    else:
+                        proc.kill()
+                    proc.communicate()
+                    out = b""
+                    err = "Command not finished after {0} seconds.".format(
+                        timeout).encode()
+                    returncode = 6
+        finally:
+            self._release(channel)
+        return returncode, out, err
+
+    def evict(self, idle=None):
+        """Close the connections unused for more than *idle* seconds.
+
+        The connections with running commands are kept.
+
+        Arguments:
+            idle (float): Delay, the one of the pool is used if *None*.
+        """
+        idle = self._idle if idle is None else idle
+        now = time.time()
+        with self._lock:
+            expired = [key for key, channel in self._channels.items()
+                       if channel[3] == 0 and now - channel[2] >= idle]
+            channels = [(key, self._channels.pop(key)) for key in expired]
+        self._close(channels)
+
+    def _close(self, channels):
+        """Close connections."""
+        for (user, host), channel in channels:
+            if channel[0]:
+                self._transport.close(user, host, channel[0])
+
+    def close_all(self):
+        """Close all the connections, even the busy ones (at exit)."""
+        with self._lock:
+            channels = list(self._channels.items())
+            self._channels.clear()
+        self._close(channels)
+        with self._lock:
+            if self._dir:
+                shutil.rmtree(self._dir, ignore_errors=True)
+                self._dir = None
+
+
+# pool of connections used by `remote_exec()`
+CHANNELS = RemoteChannels()
+atexit.register(CHANNELS.close_all)
+
+
 def remote_exec(user, host, command, ignore_errors=False, timeout=None,
                 message=None):
     """Execute *command* on a remote server and return the output.
@@ -308,22 +506,17 @@ def remote_exec(user, host, command, ignore_errors=False, timeout=None,
     if not is_local:
         if not message:
             info_message("Command executed on {0}: {1}".format(host, command))
-        use_shell = False
-        cmd = [str("ssh"), "-n",
-               "-o", "StrictHostKeyChecking=no", "-o", "BatchMode=yes",
-               str(user + "@" if user else "") + host] + cmd
-        if not message:
-            info_message("Full command {0}".format(cmd))
+        # the connection to the server is shared by the commands
+        returncode, out, err = CHANNELS.run(user, host, command, timeout)
     else:
-        use_shell = True
-    ssh = SP.Popen(cmd, shell=use_shell, stdout=SP.PIPE, stderr=SP.PIPE)
-    try:
-        out, err = ssh.communicate(timeout=timeout)
-        returncode = ssh.returncode
-    except SP.TimeoutExpired:
-        out = ""
-        err = "Command not finished after {0} seconds.".format(timeout)
-        returncode = 6
+        ssh = SP.Popen(cmd, shell=True, stdout=SP.PIPE, stderr=SP.PIPE)
+        try:
+            out, err = ssh.communicate(timeout=timeout)
+            returncode = ssh.returncode
+        except SP.TimeoutExpired:
+            out = ""
+            err = "Command not finished after {0} seconds.".format(timeout)
+            returncode = 6
     if not is_local:
         info_message("exit code: %d" % returncode)
     if ignore_errors:
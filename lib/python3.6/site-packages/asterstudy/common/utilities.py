@@ -24,7 +24,10 @@ Auxiliary utilities for AsterStudy application.
 """
 
 
+import ast
 import getpass
+import io
+import keyword
 import math
 import os
 import os.path as osp
@@ -32,11 +35,12 @@ import re
 import sys
 import tempfile
 import time
+import tokenize
 import traceback
 import zipfile
 from collections import OrderedDict
 from contextlib import contextmanager
-from functools import partial, wraps
+from functools import lru_cache, partial, wraps
 from itertools import product
 
 from PyQt5 import Qt as Q
@@ -412,16 +416,124 @@ def format_code(text, style='facebook', **kwargs):
     return FormatCode(text, style_config=style)[0]
 
 
+_EXPR_OPERATORS = ('+', '-', '*', '/', '//', '%', '**', '~',
+                   '(', ')', '[', ']', ',', '.', '=')
+_EXPR_KEYWORDS = ('True', 'False', 'None')
+_EXPR_WIDTH = 79
+
+
+def _normalize_expr(text):
+    """
+    Format a simple Python expression as *yapf* does with the 'facebook'
+    style.
+
+    Only expressions that are written with names, numbers, strings,
+    arithmetic operators, calls, subscripts and keyword arguments, and that
+    hold on one line are supported.
+
+    Arguments:
+        text (str): Python expression.
+
+    Returns:
+        str: Formatted expression or *None* if the expression is not
+        supported.
+    """
+    if text[:1].isspace():
+        return None
+    try:
+        compile(text, '<expr>', 'eval', ast.PyCF_ONLY_AST)
+        tokens = list(tokenize.generate_tokens(io.StringIO(text).readline))
+    except (SyntaxError, tokenize.TokenError):
+        return None
+    # opened brackets: bracket, number of commas, is it a call
+    stack = []
+    out = []
+    prev = prev_kind = prev_type = None
+    tight = True
+    for tok in tokens:
+        kind, string = tok[0], tok[1]
+        if kind in (tokenize.NL, tokenize.NEWLINE, tokenize.ENDMARKER):
+            continue
+        if kind == tokenize.NAME:
+            if keyword.iskeyword(string) and string not in _EXPR_KEYWORDS:
+                return None
+        elif kind == tokenize.OP:
+            if string not in _EXPR_OPERATORS:
+                return None
+        elif kind not in (tokenize.NUMBER, tokenize.STRING):
+            return None
+
+        operand = kind != tokenize.OP or string in (')', ']')
+        unary = string in ('+', '-', '~') and prev_type != 'operand'
+        if string in ('*', '**') and prev_type != 'operand':
+            # star arguments are left to yapf
+            return None
+        if prev_type == 'unary' and not (
+                kind == tokenize.NUMBER or string in ('(', '+', '-', '~') or
+                kind == tokenize.NAME and string not in _EXPR_KEYWORDS):
+            return None
+        if prev in _EXPR_KEYWORDS and string in ('(', '[', '.'):
+            return None
+        space = not tight
+        if string in ('(', '['):
+            call = prev_type == 'operand'
+            space = space and not call
+            stack.append([string, 0, call])
+        elif string in (')', ']'):
+            bracket, commas, _ = stack.pop()
+            # a trailing comma makes yapf split the items on several lines
+            if prev == ',' and (commas > 1 or bracket == '['):
+                return None
+            space = prev == ','
+        elif string == ',':
+            if stack:
+                stack[-1][1] += 1
+            space = False
+        elif string == '.':
+            if prev_type != 'operand' or prev_kind == tokenize.NUMBER:
+                return None
+            space = False
+        elif string == '**':
+            space = False
+        elif string == '=':
+            # only keyword arguments
+            if not stack or not stack[-1][2] or prev_kind != tokenize.NAME:
+                return None
+            space = False
+        out.append(' ' if space and out else '')
+        out.append(string)
+        tight = string in ('(', '[', '.', '=', '**') or unary
+        if operand:
+            prev_type = 'operand'
+        else:
+            prev_type = 'unary' if unary else 'operator'
+        prev = string
+        prev_kind = kind
+    if not out:
+        return None
+    expr = ''.join(out)
+    if len(expr) > _EXPR_WIDTH:
+        return None
+    return expr
+
+
+@lru_cache(maxsize=1024)
 def format_expr(text):
     """
     Format the given Python expression.
 
+    Simple expressions are formatted by a tokenizer, other ones are
+    formatted with *yapf* (see `format_code()`).
+
     Arguments:
         text (str): Source code block.
 
     Returns:
         str: Formatted code block.
     """
+    expr = _normalize_expr(text)
+    if expr is not None:
+        return expr
     try:
         return format_code(text)[:-1]
     except SyntaxError:
@@ -1122,7 +1234,9 @@ def recursive_items(dictionary, rootkey=None):
     Recursively loop on items of *dictionary* and its nested *dict* items.
 
     Each item is returned with its *key* in the dictionary and the occurrence
-    number (or *None* if it's not in a list).
+    number (or *None* if it's not in a list). The sequences of numbers marked
+    as *numeric* (see :class:`datamodel.command.numeric.NumericValues`) are
+    returned as a single item.
     Example:
     - "('k1', None), 3" for {'k1: 3.},
     - "('k1', None, 'k2', 0), 'x'" and "('k1', None, 'k2', 1), 'y'"
@@ -1135,7 +1249,8 @@ def recursive_items(dictionary, rootkey=None):
         generator object suitable for iterating.
     """
     for key, value in dictionary.items():
-        if not isinstance(value, (list, tuple)):
+        if not isinstance(value, (list, tuple)) or \
+                getattr(value, 'numeric', False):
             value = [value]
             enum = [None]
         else:
@@ -27,9 +27,8 @@ their connections.
 
 import re
 
-import numpy as NP
-
 from ..common import no_new_attributes
+from .dependency_index import create_dependency_index
 from .general import UIDMixing
 
 
@@ -141,6 +140,7 @@ class Node(UIDMixing):
     def name(self, name):
         """Declares setter for so named property."""
         if self._name != name:
+            self.touch()
             self._name = name
             self._after_rename()
 
@@ -156,6 +156,14 @@ class Node(UIDMixing):
         """
         self._model = None
 
+    def touch(self):
+        """Declare to the model that the node is being modified.
+
+        See :meth:`.AbstractDataModel.touch`.
+        """
+        if self._model is not None:
+            self._model.touch(self)
+
     def is_valid(self):
         """Checks whether Node instance is valid or not."""
         return self._model is not None
@@ -434,6 +442,14 @@ class Node(UIDMixing):
     def after_remove(self, *args): # pragma pylint: disable=no-self-use
         """Hook that is called after the node removing is finished."""
 
+    def after_restore(self):
+        """Hook that is called after the node state has been restored by
+        the undo/redo journal (reset cached values)."""
+
+    def after_touch(self):
+        """Hook that is called when the node is declared as modified
+        (reset cached values)."""
+
     def add_child(self, child):
         """
         Add a child to the node.
@@ -506,6 +522,7 @@ class Node(UIDMixing):
         if parent is not None and parent in self._parents:
             if index is None:
                 index = len(self._parents)-1
+            self.touch()
             self._parents.remove(parent)
             self._parents.insert(index, parent)
 
@@ -525,6 +542,7 @@ class Node(UIDMixing):
             # TODO: not a good value, order of other objects will change
             return None
 
+        self.touch()
         self._children.sort(key=_key)
 
 
@@ -532,21 +550,31 @@ class AbstractDataModel:
     """
     Abstract data model implementation.
 
+    Arguments:
+        deps_index (Optional[str or type]): Dependency index engine
+            (see :func:`.create_dependency_index`).
+
     Attributes:
-        _deps: adjacency matrix: if there is a connection from node i to node j
-            then G[i, j] = 1, and 0 elsewhere.
+        _deps (DependencyIndex): Index that stores the dependencies between
+            nodes (transitive closure of the parent/child relations).
+        _touched (set[int]): Identifiers of the nodes modified since the
+            last checkpoint of the undo/redo journal, *None* if no journal
+            is attached.
+        _revision (int): Counter of the modifications of the nodes.
     """
 
     _nodes = _next_id = _name = _deps = shallow_copy = None
+    _touched = None
+    _revision = 0
     __setattr__ = no_new_attributes(object.__setattr__)
 
-    def __init__(self):
+    def __init__(self, deps_index=None):
         """Create model."""
         self._nodes = {}
         self._next_id = 1
         self._name = ''
         self.shallow_copy = None
-        self._deps = NP.zeros((0, 0), NP.int_)
+        self._deps = create_dependency_index(deps_index)
 
     def __contains__(self, node):
         """
@@ -592,6 +620,7 @@ class AbstractDataModel:
 
         self._init_deps(node)
         add_parent(node, parent)
+        self.touch(node)
 
         self._nodes[node_id] = node
         self._next_id = self._next_id + 1
@@ -620,6 +649,7 @@ class AbstractDataModel:
         # Remove node from the list of children from its parents.
         node_id = node.uid
         assert node_id in self._nodes
+        self.touch(node)
 
         # temporary fix to handle child stages
         if hasattr(node, "child_stages"):
@@ -731,6 +761,44 @@ class AbstractDataModel:
             return children
         return parent.child_nodes
 
+    def touch(self, node, notify=True):
+        """
+        Declare that a node is being modified.
+
+        Increments the revision of the model and records the nodes to be
+        saved by the undo/redo journal (see :class:`.NodeJournal`).
+
+        Arguments:
+            node (Node): Modified node.
+            notify (bool): If *False*, the :meth:`Node.after_touch` hook is
+                not called (used when only the children of the node change).
+        """
+        self._revision += 1
+        if self._touched is not None:
+            self._touched.add(node.uid)
+        if notify:
+            node.after_touch()
+
+    @property
+    def revision(self):
+        """int: Attribute that holds a counter incremented each time a node
+        is modified. Used to invalidate cached informations."""
+        return self._revision
+
+    def rebuild_deps(self):
+        """Rebuild the dependency index from the parent/child relations."""
+        self._deps.rebuild(list(self._nodes.values()))
+
+    def refresh_deps(self, restored, removed):
+        """Update the dependency index after nodes have been restored in
+        place (see :meth:`.DependencyIndex.refresh`).
+
+        Arguments:
+            restored (list[Node]): Restored nodes, including the new ones.
+            removed (list[int]): Identifiers of the removed nodes.
+        """
+        self._deps.refresh(self._nodes.values(), restored, removed)
+
     def has_path(self, node_id1, node_id2):
         """
         Check if there is a dependency path between nodes.
@@ -743,37 +811,29 @@ class AbstractDataModel:
             bool: *True* if there is a path from `node1` to `node2` (if `node1`
             is an ancestor of `node2`); *False* otherwise.
         """
-        return self._deps[node_id1 - 1, node_id2 - 1] == 1
+        return self._deps.has_path(node_id1, node_id2)
 
     def _init_deps(self, node):
-        """Resize the adjacency matrix."""
-        node_id = node.uid
-        prev = self._deps
-        dim = prev.shape[0]
-        self._deps = NP.zeros((node_id, node_id), NP.int_)
-        self._deps[:dim, :dim] = prev
-        self._deps[node_id - 1, node_id - 1] = 1
+        """Register a new node in the dependency index."""
+        self._deps.register(node)
 
     def _remove_deps(self, node):
-        """Remove a node from adjacency matrix."""
-        node_id = node.uid
-
-        self._deps[node_id - 1, :] = 0
-        self._deps[:, node_id - 1] = 0
+        """Remove a node from the dependency index."""
+        self._deps.unregister(node)
 
     def deps_update_parent(self, node, parent):
         """
-        Add a parent to a node in adjacency matrix.
+        Add a parent to a node in the dependency index.
 
         The implementation preserves transitive closure.
         """
-        self._deps[parent.uid - 1, node.uid - 1] = 1
-        for ancestor in parent.parent_nodes:
-            self.deps_update_parent(node, ancestor)
+        self.touch(node)
+        self.touch(parent, notify=False)
+        self._deps.update_parent(node, parent)
 
     def deps_remove_parent(self, node, parent):
         """
-        Remove a parent from a node in adjacency matrix.
+        Remove a parent from a node in the dependency index.
 
         Warning:
             The implementation assumes that relation has been
@@ -781,26 +841,23 @@ class AbstractDataModel:
             The developer is responsible for ensuring that when
                 calling this method.
         """
-        # If not a direct parent
-        if parent not in node.parent_nodes:
-            self._deps[parent.uid - 1, node.uid - 1] = 0
-        for ancestor in parent.parent_nodes:
-            self.deps_remove_parent(node, ancestor)
+        self.touch(node)
+        self.touch(parent, notify=False)
+        self._deps.remove_parent(node, parent)
 
     def deps_update_child(self, node, child):
         """
-        Add a child to a node in adjacency matrix.
+        Add a child to a node in the dependency index.
 
         The implementation preserves transitive closure.
         """
-        uid = node.uid
-        self._deps[uid - 1, child.uid - 1] = 1
-        for grandchild in child.child_nodes:
-            self.deps_update_child(node, grandchild)
+        self.touch(node, notify=False)
+        self.touch(child)
+        self._deps.update_child(node, child)
 
     def deps_remove_child(self, node, child):
         """
-        Remove a child of a node in adjacency matrix.
+        Remove a child of a node in the dependency index.
 
         Warning:
             The implementation assumes that relation has been
@@ -808,11 +865,9 @@ class AbstractDataModel:
             The developer is responsible for ensuring that when
                 calling this method.
         """
-        # If not a direct descendant
-        if child.uid not in node.children:
-            self._deps[node.uid - 1, child.uid - 1] = 0
-        for grandchild in child.child_nodes:
-            self.deps_remove_child(node, grandchild)
+        self.touch(node, notify=False)
+        self.touch(child)
+        self._deps.remove_child(node, child)
 
     @staticmethod
     def save(model, file_name, serializer=None):
@@ -278,7 +278,7 @@ def _replace_variable(buff):
     num = [i[0] for i in buff[:3]]
     val = [i[1] for i in buff[:3]]
     if num[:2] == [token.NAME, token.OP] and val[1] == "=":
-        commands = [name for name in CATA]
+        commands = CATA.command_names
         if num[2] == token.NAME and val[2] in ("CO",):
             # insert an error: raise NotImplementedError
             buff = [
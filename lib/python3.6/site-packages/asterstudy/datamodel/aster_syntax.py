@@ -25,6 +25,7 @@ Implementation of the interface to the code_aster commands catalog.
 
 
 import importlib
+import importlib.util
 import os.path as osp
 import sys
 
@@ -85,12 +86,17 @@ def _import_aster(path, package):
     return module
 
 
-def import_aster(path):
+def import_aster(path, commands=True):
     """Import the code_aster catalog from path.
 
     Example: ``path = /path/to/catalogue/vers``
 
     *path* contains the *code_aster* package.
+
+    Arguments:
+        path (str): Path of the catalog.
+        commands (bool): If *False*, the packages of the commands are not
+            imported (see `import_commands()`).
     """
     # to force reload
     # pylint: disable=consider-iterating-dictionary
@@ -98,8 +104,41 @@ def import_aster(path):
         if pkg.startswith('code_aster.') or pkg == 'code_aster':
             del sys.modules[pkg]
     mods = {}
-    for pkg in ("", "aster_version", "Commons", "Commands", "DataStructure",
+    for pkg in ("", "aster_version", "DataStructure",
                 "Syntax", "SyntaxChecker", "SyntaxObjects", "SyntaxUtils"):
         sep = "." if pkg else ""
         mods[pkg] = _import_aster(path, "Cata" + sep + pkg)
+    if commands:
+        mods.update(import_commands(path))
     return mods
+
+
+def import_commands(path):
+    """Import the packages of the commands of a code_aster catalog
+    already imported by `import_aster()`."""
+    return {pkg: _import_aster(path, "Cata." + pkg)
+            for pkg in ("Commons", "Commands")}
+
+
+def import_command(path, modname):
+    """Import only one module of the commands of a code_aster catalog
+    already imported by `import_aster()`.
+
+    The *Commands* package is registered without being executed because it
+    imports all the commands.
+
+    Arguments:
+        path (str): Path of the catalog.
+        modname (str): Basename of the module in the *Commands* package.
+
+    Returns:
+        module: Module of the command.
+    """
+    pkgname = "code_aster.Cata.Commands"
+    if pkgname not in sys.modules:
+        pkgdir = osp.join(path, "code_aster", "Cata", "Commands")
+        spec = importlib.util.spec_from_file_location(
+            pkgname, osp.join(pkgdir, "__init__.py"),
+            submodule_search_locations=[pkgdir])
+        sys.modules[pkgname] = importlib.util.module_from_spec(spec)
+    return _import_aster(path, "Cata.Commands." + modname)
@@ -19,7 +19,7 @@ DESCRIPTOR = _descriptor.FileDescriptor(
   name='asterstudy.proto',
   package='asterstudy',
   syntax='proto3',
-  serialized_pb=_b('\n\x10\x61sterstudy.proto\x12\nasterstudy\"M\n\tBFileInfo\x12\x0e\n\x06handle\x18\x01 \x01(\r\x12\x10\n\x08\x66ilename\x18\x02 \x01(\t\x12\x0c\n\x04\x61ttr\x18\x03 \x01(\r\x12\x10\n\x08\x65mbedded\x18\x04 \x01(\x08\"\xb4\x03\n\x04\x42Job\x12\r\n\x05jobid\x18\x01 \x01(\t\x12\x13\n\x0b\x64ump_string\x18\x15 \x01(\t\x12\x0c\n\x04name\x18\x04 \x01(\t\x12\x0e\n\x06server\x18\x05 \x01(\t\x12$\n\x04mode\x18\x02 \x01(\x0e\x32\x16.asterstudy.BJob.BMode\x12\x12\n\nstart_time\x18\x0c \x01(\t\x12\x10\n\x08\x65nd_time\x18\r \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\x12\x0e\n\x06memory\x18\x06 \x01(\r\x12\x0c\n\x04time\x18\x07 \x01(\t\x12\x0f\n\x07version\x18\x08 \x01(\t\x12\x0e\n\x06mpicpu\x18\t \x01(\r\x12\r\n\x05nodes\x18\n \x01(\r\x12\x0f\n\x07threads\x18\x0b \x01(\r\x12\x0e\n\x06\x66older\x18\x0e \x01(\t\x12\x10\n\x08\x63ompress\x18\x11 \x01(\x08\x12\x11\n\tpartition\x18\x0f \x01(\t\x12\r\n\x05queue\x18\x10 \x01(\t\x12\x0c\n\x04\x61rgs\x18\x12 \x01(\t\x12\r\n\x05wckey\x18\x13 \x01(\t\x12\r\n\x05\x65xtra\x18\x14 \x01(\t\":\n\x05\x42Mode\x12\x08\n\x04Null\x10\x00\x12\t\n\x05\x42\x61tch\x10\x01\x12\x0f\n\x0bInteractive\x10\x02\x12\x0b\n\x07\x43onsole\x10\x06\"\xd6\x02\n\x07\x42Result\x12)\n\x05state\x18\x01 \x01(\x0e\x32\x1a.asterstudy.BResult.BState\x12\x10\n\x08resstate\x18\x03 \x01(\r\x12\x1d\n\x03job\x18\x02 \x01(\x0b\x32\x10.asterstudy.BJob\x12\x12\n\nhas_remote\x18\x04 \x01(\x08\"\xda\x01\n\x06\x42State\x12\x08\n\x04Null\x10\x00\x12\x0b\n\x07Waiting\x10\x01\x12\x0b\n\x07Running\x10\x02\x12\x0b\n\x07Pausing\x10\x04\x12\x0b\n\x07Success\x10\x10\x12\t\n\x05\x45rror\x10 \x12\x0f\n\x0bInterrupted\x10@\x12\x11\n\x0cIntermediate\x10\x80\x01\x12\t\n\x04Warn\x10\x80\x02\x12\t\n\x04Nook\x10\x80\x04\x12\r\n\x08\x43puLimit\x10\x80\x08\x12\x12\n\rNoConvergence\x10\x80\x10\x12\x0b\n\x06Memory\x10\x80 \x12\x0c\n\x08\x46inished\x10p\x12\x0f\n\x0bNotFinished\x10\x07\"4\n\x07\x42\x43mdAdd\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\r\n\x05title\x18\x02 \x01(\t\x12\x0c\n\x04type\x18\x03 \x01(\t\"\x94\x02\n\x06\x42Stage\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0c\n\x04text\x18\x02 \x01(\t\x12%\n\x08\x63md_defs\x18\x08 \x03(\x0b\x32\x13.asterstudy.BCmdAdd\x12\x10\n\x08\x63md_dels\x18\t \x03(\t\x12&\n\x04mode\x18\x03 \x01(\x0e\x32\x18.asterstudy.BStage.BMode\x12$\n\x05\x66iles\x18\x04 \x03(\x0b\x32\x15.asterstudy.BFileInfo\x12#\n\x06result\x18\x05 \x01(\x0b\x32\x13.asterstudy.BResult\x12\x13\n\x0b\x62\x61se_folder\x18\x07 \x01(\t\x12\x0b\n\x03uid\x18\x06 \x01(\r\" \n\x05\x42Mode\x12\r\n\tGraphical\x10\x00\x12\x08\n\x04Text\x10\x01\"\xa4\x01\n\x05\x42\x43\x61se\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0e\n\x06stages\x18\x02 \x03(\r\x12\x13\n\x0b\x62\x61se_folder\x18\x03 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x04 \x01(\t\x12\x11\n\tis_backup\x18\x05 \x01(\x08\x12\x0e\n\x06in_dir\x18\x06 \x01(\t\x12\x0f\n\x07out_dir\x18\x07 \x01(\t\x12\x0f\n\x07ot_vars\x18\x08 \x01(\t\x12\x0e\n\x06ot_cmd\x18\t \x01(\r\"\xd0\x01\n\x08\x42History\x12 \n\x05\x63\x61ses\x18\x01 \x03(\x0b\x32\x11.asterstudy.BCase\x12\"\n\x06stages\x18\x02 \x03(\x0b\x32\x12.asterstudy.BStage\x12\r\n\x05\x61ster\x18\x03 \x01(\t\x12\x14\n\x0cversionMajor\x18\x05 \x01(\r\x12\x14\n\x0cversionMinor\x18\x06 \x01(\r\x12\x14\n\x0cversionPatch\x18\x07 \x01(\r\x12\x1a\n\x12remote_folder_base\x18\t \x01(\t\x12\x11\n\tjobs_list\x18\x08 \x01(\t\"_\n\tBDocument\x12%\n\x07history\x18\x01 \x01(\x0b\x32\x14.asterstudy.BHistory\x12\r\n\x05major\x18\x02 \x01(\r\x12\r\n\x05minor\x18\x03 \x01(\r\x12\r\n\x05patch\x18\x04 \x01(\rb\x06proto3')
+  serialized_pb=_b('\n\x10\x61sterstudy.proto\x12\nasterstudy\"M\n\tBFileInfo\x12\x0e\n\x06handle\x18\x01 \x01(\r\x12\x10\n\x08\x66ilename\x18\x02 \x01(\t\x12\x0c\n\x04\x61ttr\x18\x03 \x01(\r\x12\x10\n\x08\x65mbedded\x18\x04 \x01(\x08\"\xb4\x03\n\x04\x42Job\x12\r\n\x05jobid\x18\x01 \x01(\t\x12\x13\n\x0b\x64ump_string\x18\x15 \x01(\t\x12\x0c\n\x04name\x18\x04 \x01(\t\x12\x0e\n\x06server\x18\x05 \x01(\t\x12$\n\x04mode\x18\x02 \x01(\x0e\x32\x16.asterstudy.BJob.BMode\x12\x12\n\nstart_time\x18\x0c \x01(\t\x12\x10\n\x08\x65nd_time\x18\r \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\x12\x0e\n\x06memory\x18\x06 \x01(\r\x12\x0c\n\x04time\x18\x07 \x01(\t\x12\x0f\n\x07version\x18\x08 \x01(\t\x12\x0e\n\x06mpicpu\x18\t \x01(\r\x12\r\n\x05nodes\x18\n \x01(\r\x12\x0f\n\x07threads\x18\x0b \x01(\r\x12\x0e\n\x06\x66older\x18\x0e \x01(\t\x12\x10\n\x08\x63ompress\x18\x11 \x01(\x08\x12\x11\n\tpartition\x18\x0f \x01(\t\x12\r\n\x05queue\x18\x10 \x01(\t\x12\x0c\n\x04\x61rgs\x18\x12 \x01(\t\x12\r\n\x05wckey\x18\x13 \x01(\t\x12\r\n\x05\x65xtra\x18\x14 \x01(\t\":\n\x05\x42Mode\x12\x08\n\x04Null\x10\x00\x12\t\n\x05\x42\x61tch\x10\x01\x12\x0f\n\x0bInteractive\x10\x02\x12\x0b\n\x07\x43onsole\x10\x06\"\xd6\x02\n\x07\x42Result\x12)\n\x05state\x18\x01 \x01(\x0e\x32\x1a.asterstudy.BResult.BState\x12\x10\n\x08resstate\x18\x03 \x01(\r\x12\x1d\n\x03job\x18\x02 \x01(\x0b\x32\x10.asterstudy.BJob\x12\x12\n\nhas_remote\x18\x04 \x01(\x08\"\xda\x01\n\x06\x42State\x12\x08\n\x04Null\x10\x00\x12\x0b\n\x07Waiting\x10\x01\x12\x0b\n\x07Running\x10\x02\x12\x0b\n\x07Pausing\x10\x04\x12\x0b\n\x07Success\x10\x10\x12\t\n\x05\x45rror\x10 \x12\x0f\n\x0bInterrupted\x10@\x12\x11\n\x0cIntermediate\x10\x80\x01\x12\t\n\x04Warn\x10\x80\x02\x12\t\n\x04Nook\x10\x80\x04\x12\r\n\x08\x43puLimit\x10\x80\x08\x12\x12\n\rNoConvergence\x10\x80\x10\x12\x0b\n\x06Memory\x10\x80 \x12\x0c\n\x08\x46inished\x10p\x12\x0f\n\x0bNotFinished\x10\x07\"4\n\x07\x42\x43mdAdd\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\r\n\x05title\x18\x02 \x01(\t\x12\x0c\n\x04type\x18\x03 \x01(\t\"&\n\x08\x42\x43omplex\x12\x0c\n\x04real\x18\x01 \x01(\x01\x12\x0c\n\x04imag\x18\x02 \x01(\x01\"/\n\nBValueList\x12!\n\x05items\x18\x01 \x03(\x0b\x32\x12.asterstudy.BValue\"6\n\x06\x42\x41rray\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\x0c\x12\r\n\x05\x64type\x18\x02 \x01(\t\x12\x0f\n\x07is_list\x18\x03 \x01(\x08\"\xaf\x02\n\x06\x42Value\x12\x0e\n\x04ival\x18\x01 \x01(\x12H\x00\x12\x0e\n\x04rval\x18\x02 \x01(\x01H\x00\x12\x0e\n\x04sval\x18\x03 \x01(\tH\x00\x12\x0e\n\x04\x62val\x18\x04 \x01(\x08H\x00\x12$\n\x04\x63val\x18\x05 \x01(\x0b\x32\x14.asterstudy.BComplexH\x00\x12&\n\x04lval\x18\x06 \x01(\x0b\x32\x16.asterstudy.BValueListH\x00\x12&\n\x04tval\x18\x07 \x01(\x0b\x32\x16.asterstudy.BValueListH\x00\x12%\n\x04\x64val\x18\x08 \x01(\x0b\x32\x15.asterstudy.BKeywordsH\x00\x12\r\n\x03ref\x18\t \x01(\rH\x00\x12\x0c\n\x02\x63o\x18\n \x01(\tH\x00\x12\"\n\x04\x61val\x18\x0b \x01(\x0b\x32\x12.asterstudy.BArrayH\x00\x42\x07\n\x05value\";\n\x08\x42Keyword\x12\x0c\n\x04name\x18\x01 \x01(\t\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.asterstudy.BValue\"3\n\tBKeywords\x12&\n\x08keywords\x18\x01 \x03(\x0b\x32\x14.asterstudy.BKeyword\"\x7f\n\x08\x42\x43ommand\x12\x0b\n\x03uid\x18\x01 \x01(\r\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\r\n\x05title\x18\x03 \x01(\t\x12&\n\x07storage\x18\x04 \x01(\x0b\x32\x15.asterstudy.BKeywords\x12\x0f\n\x07parents\x18\x05 \x03(\r\x12\x10\n\x08inactive\x18\x06 \x01(\x08\"\xbc\x02\n\x06\x42Stage\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0c\n\x04text\x18\x02 \x01(\t\x12%\n\x08\x63md_defs\x18\x08 \x03(\x0b\x32\x13.asterstudy.BCmdAdd\x12\x10\n\x08\x63md_dels\x18\t \x03(\t\x12&\n\x04mode\x18\x03 \x01(\x0e\x32\x18.asterstudy.BStage.BMode\x12$\n\x05\x66iles\x18\x04 \x03(\x0b\x32\x15.asterstudy.BFileInfo\x12#\n\x06result\x18\x05 \x01(\x0b\x32\x13.asterstudy.BResult\x12\x13\n\x0b\x62\x61se_folder\x18\x07 \x01(\t\x12\x0b\n\x03uid\x18\x06 \x01(\r\x12&\n\x08\x63ommands\x18\n \x03(\x0b\x32\x14.asterstudy.BCommand\" \n\x05\x42Mode\x12\r\n\tGraphical\x10\x00\x12\x08\n\x04Text\x10\x01\"\xa4\x01\n\x05\x42\x43\x61se\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0e\n\x06stages\x18\x02 \x03(\r\x12\x13\n\x0b\x62\x61se_folder\x18\x03 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x04 \x01(\t\x12\x11\n\tis_backup\x18\x05 \x01(\x08\x12\x0e\n\x06in_dir\x18\x06 \x01(\t\x12\x0f\n\x07out_dir\x18\x07 \x01(\t\x12\x0f\n\x07ot_vars\x18\x08 \x01(\t\x12\x0e\n\x06ot_cmd\x18\t \x01(\r\"\xd0\x01\n\x08\x42History\x12 \n\x05\x63\x61ses\x18\x01 \x03(\x0b\x32\x11.asterstudy.BCase\x12\"\n\x06stages\x18\x02 \x03(\x0b\x32\x12.asterstudy.BStage\x12\r\n\x05\x61ster\x18\x03 \x01(\t\x12\x14\n\x0cversionMajor\x18\x05 \x01(\r\x12\x14\n\x0cversionMinor\x18\x06 \x01(\r\x12\x14\n\x0cversionPatch\x18\x07 \x01(\r\x12\x1a\n\x12remote_folder_base\x18\t \x01(\t\x12\x11\n\tjobs_list\x18\x08 \x01(\t\"_\n\tBDocument\x12%\n\x07history\x18\x01 \x01(\x0b\x32\x14.asterstudy.BHistory\x12\r\n\x05major\x18\x02 \x01(\r\x12\r\n\x05minor\x18\x03 \x01(\r\x12\r\n\x05patch\x18\x04 \x01(\rb\x06proto3')
 )
 _sym_db.RegisterFileDescriptor(DESCRIPTOR)
 
@@ -146,8 +146,8 @@ _BSTAGE_BMODE = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   options=None,
-  serialized_start=1194,
-  serialized_end=1226,
+  serialized_start=1928,
+  serialized_end=1960,
 )
 _sym_db.RegisterEnumDescriptor(_BSTAGE_BMODE)
 
@@ -474,6 +474,359 @@ _BCMDADD = _descriptor.Descriptor(
 )
 
 
+_BCOMPLEX = _descriptor.Descriptor(
+  name='BComplex',
+  full_name='asterstudy.BComplex',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='real', full_name='asterstudy.BComplex.real', index=0,
+      number=1, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='imag', full_name='asterstudy.BComplex.imag', index=1,
+      number=2, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=949,
+  serialized_end=987,
+)
+
+
+_BVALUELIST = _descriptor.Descriptor(
+  name='BValueList',
+  full_name='asterstudy.BValueList',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='items', full_name='asterstudy.BValueList.items', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=989,
+  serialized_end=1036,
+)
+
+
+_BARRAY = _descriptor.Descriptor(
+  name='BArray',
+  full_name='asterstudy.BArray',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='data', full_name='asterstudy.BArray.data', index=0,
+      number=1, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b(""),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='dtype', full_name='asterstudy.BArray.dtype', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='is_list', full_name='asterstudy.BArray.is_list', index=2,
+      number=3, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1038,
+  serialized_end=1092,
+)
+
+
+_BVALUE = _descriptor.Descriptor(
+  name='BValue',
+  full_name='asterstudy.BValue',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='ival', full_name='asterstudy.BValue.ival', index=0,
+      number=1, type=18, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='rval', full_name='asterstudy.BValue.rval', index=1,
+      number=2, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='sval', full_name='asterstudy.BValue.sval', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='bval', full_name='asterstudy.BValue.bval', index=3,
+      number=4, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='cval', full_name='asterstudy.BValue.cval', index=4,
+      number=5, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='lval', full_name='asterstudy.BValue.lval', index=5,
+      number=6, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='tval', full_name='asterstudy.BValue.tval', index=6,
+      number=7, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='dval', full_name='asterstudy.BValue.dval', index=7,
+      number=8, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='ref', full_name='asterstudy.BValue.ref', index=8,
+      number=9, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='co', full_name='asterstudy.BValue.co', index=9,
+      number=10, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='aval', full_name='asterstudy.BValue.aval', index=10,
+      number=11, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+    _descriptor.OneofDescriptor(
+      name='value', full_name='asterstudy.BValue.value',
+      index=0, containing_type=None, fields=[]),
+  ],
+  serialized_start=1095,
+  serialized_end=1398,
+)
+
+
+_BKEYWORD = _descriptor.Descriptor(
+  name='BKeyword',
+  full_name='asterstudy.BKeyword',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='name', full_name='asterstudy.BKeyword.name', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='value', full_name='asterstudy.BKeyword.value', index=1,
+      number=2, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1400,
+  serialized_end=1459,
+)
+
+
+_BKEYWORDS = _descriptor.Descriptor(
+  name='BKeywords',
+  full_name='asterstudy.BKeywords',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='keywords', full_name='asterstudy.BKeywords.keywords', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1461,
+  serialized_end=1512,
+)
+
+
+_BCOMMAND = _descriptor.Descriptor(
+  name='BCommand',
+  full_name='asterstudy.BCommand',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='uid', full_name='asterstudy.BCommand.uid', index=0,
+      number=1, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='name', full_name='asterstudy.BCommand.name', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='title', full_name='asterstudy.BCommand.title', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='storage', full_name='asterstudy.BCommand.storage', index=3,
+      number=4, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='parents', full_name='asterstudy.BCommand.parents', index=4,
+      number=5, type=13, cpp_type=3, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='inactive', full_name='asterstudy.BCommand.inactive', index=5,
+      number=6, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1514,
+  serialized_end=1641,
+)
+
+
 _BSTAGE = _descriptor.Descriptor(
   name='BStage',
   full_name='asterstudy.BStage',
@@ -544,6 +897,13 @@ _BSTAGE = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
+    _descriptor.FieldDescriptor(
+      name='commands', full_name='asterstudy.BStage.commands', index=9,
+      number=10, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
   ],
   extensions=[
   ],
@@ -557,8 +917,8 @@ _BSTAGE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=950,
-  serialized_end=1226,
+  serialized_start=1644,
+  serialized_end=1960,
 )
 
 
@@ -644,8 +1004,8 @@ _BCASE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1229,
-  serialized_end=1393,
+  serialized_start=1963,
+  serialized_end=2127,
 )
 
 
@@ -724,8 +1084,8 @@ _BHISTORY = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1396,
-  serialized_end=1604,
+  serialized_start=2130,
+  serialized_end=2338,
 )
 
 
@@ -776,8 +1136,8 @@ _BDOCUMENT = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1606,
-  serialized_end=1701,
+  serialized_start=2340,
+  serialized_end=2435,
 )
 
 _BJOB.fields_by_name['mode'].enum_type = _BJOB_BMODE
@@ -785,10 +1145,53 @@ _BJOB_BMODE.containing_type = _BJOB
 _BRESULT.fields_by_name['state'].enum_type = _BRESULT_BSTATE
 _BRESULT.fields_by_name['job'].message_type = _BJOB
 _BRESULT_BSTATE.containing_type = _BRESULT
+_BVALUELIST.fields_by_name['items'].message_type = _BVALUE
+_BVALUE.fields_by_name['cval'].message_type = _BCOMPLEX
+_BVALUE.fields_by_name['lval'].message_type = _BVALUELIST
+_BVALUE.fields_by_name['tval'].message_type = _BVALUELIST
+_BVALUE.fields_by_name['dval'].message_type = _BKEYWORDS
+_BVALUE.fields_by_name['aval'].message_type = _BARRAY
+_BVALUE.oneofs_by_name['value'].fields.append(
+  _BVALUE.fields_by_name['ival'])
+_BVALUE.fields_by_name['ival'].containing_oneof = _BVALUE.oneofs_by_name['value']
+_BVALUE.oneofs_by_name['value'].fields.append(
+  _BVALUE.fields_by_name['rval'])
+_BVALUE.fields_by_name['rval'].containing_oneof = _BVALUE.oneofs_by_name['value']
+_BVALUE.oneofs_by_name['value'].fields.append(
+  _BVALUE.fields_by_name['sval'])
+_BVALUE.fields_by_name['sval'].containing_oneof = _BVALUE.oneofs_by_name['value']
+_BVALUE.oneofs_by_name['value'].fields.append(
+  _BVALUE.fields_by_name['bval'])
+_BVALUE.fields_by_name['bval'].containing_oneof = _BVALUE.oneofs_by_name['value']
+_BVALUE.oneofs_by_name['value'].fields.append(
+  _BVALUE.fields_by_name['cval'])
+_BVALUE.fields_by_name['cval'].containing_oneof = _BVALUE.oneofs_by_name['value']
+_BVALUE.oneofs_by_name['value'].fields.append(
+  _BVALUE.fields_by_name['lval'])
+_BVALUE.fields_by_name['lval'].containing_oneof = _BVALUE.oneofs_by_name['value']
+_BVALUE.oneofs_by_name['value'].fields.append(
+  _BVALUE.fields_by_name['tval'])
+_BVALUE.fields_by_name['tval'].containing_oneof = _BVALUE.oneofs_by_name['value']
+_BVALUE.oneofs_by_name['value'].fields.append(
+  _BVALUE.fields_by_name['dval'])
+_BVALUE.fields_by_name['dval'].containing_oneof = _BVALUE.oneofs_by_name['value']
+_BVALUE.oneofs_by_name['value'].fields.append(
+  _BVALUE.fields_by_name['ref'])
+_BVALUE.fields_by_name['ref'].containing_oneof = _BVALUE.oneofs_by_name['value']
+_BVALUE.oneofs_by_name['value'].fields.append(
+  _BVALUE.fields_by_name['co'])
+_BVALUE.fields_by_name['co'].containing_oneof = _BVALUE.oneofs_by_name['value']
+_BVALUE.oneofs_by_name['value'].fields.append(
+  _BVALUE.fields_by_name['aval'])
+_BVALUE.fields_by_name['aval'].containing_oneof = _BVALUE.oneofs_by_name['value']
+_BKEYWORD.fields_by_name['value'].message_type = _BVALUE
+_BKEYWORDS.fields_by_name['keywords'].message_type = _BKEYWORD
+_BCOMMAND.fields_by_name['storage'].message_type = _BKEYWORDS
 _BSTAGE.fields_by_name['cmd_defs'].message_type = _BCMDADD
 _BSTAGE.fields_by_name['mode'].enum_type = _BSTAGE_BMODE
 _BSTAGE.fields_by_name['files'].message_type = _BFILEINFO
 _BSTAGE.fields_by_name['result'].message_type = _BRESULT
+_BSTAGE.fields_by_name['commands'].message_type = _BCOMMAND
 _BSTAGE_BMODE.containing_type = _BSTAGE
 _BHISTORY.fields_by_name['cases'].message_type = _BCASE
 _BHISTORY.fields_by_name['stages'].message_type = _BSTAGE
@@ -797,6 +1200,13 @@ DESCRIPTOR.message_types_by_name['BFileInfo'] = _BFILEINFO
 DESCRIPTOR.message_types_by_name['BJob'] = _BJOB
 DESCRIPTOR.message_types_by_name['BResult'] = _BRESULT
 DESCRIPTOR.message_types_by_name['BCmdAdd'] = _BCMDADD
+DESCRIPTOR.message_types_by_name['BComplex'] = _BCOMPLEX
+DESCRIPTOR.message_types_by_name['BValueList'] = _BVALUELIST
+DESCRIPTOR.message_types_by_name['BArray'] = _BARRAY
+DESCRIPTOR.message_types_by_name['BValue'] = _BVALUE
+DESCRIPTOR.message_types_by_name['BKeyword'] = _BKEYWORD
+DESCRIPTOR.message_types_by_name['BKeywords'] = _BKEYWORDS
+DESCRIPTOR.message_types_by_name['BCommand'] = _BCOMMAND
 DESCRIPTOR.message_types_by_name['BStage'] = _BSTAGE
 DESCRIPTOR.message_types_by_name['BCase'] = _BCASE
 DESCRIPTOR.message_types_by_name['BHistory'] = _BHISTORY
@@ -830,6 +1240,55 @@ BCmdAdd = _reflection.GeneratedProtocolMessageType('BCmdAdd', (_message.Message,
   ))
 _sym_db.RegisterMessage(BCmdAdd)
 
+BComplex = _reflection.GeneratedProtocolMessageType('BComplex', (_message.Message,), dict(
+  DESCRIPTOR = _BCOMPLEX,
+  __module__ = 'asterstudy_pb2'
+  # @@protoc_insertion_point(class_scope:asterstudy.BComplex)
+  ))
+_sym_db.RegisterMessage(BComplex)
+
+BValueList = _reflection.GeneratedProtocolMessageType('BValueList', (_message.Message,), dict(
+  DESCRIPTOR = _BVALUELIST,
+  __module__ = 'asterstudy_pb2'
+  # @@protoc_insertion_point(class_scope:asterstudy.BValueList)
+  ))
+_sym_db.RegisterMessage(BValueList)
+
+BArray = _reflection.GeneratedProtocolMessageType('BArray', (_message.Message,), dict(
+  DESCRIPTOR = _BARRAY,
+  __module__ = 'asterstudy_pb2'
+  # @@protoc_insertion_point(class_scope:asterstudy.BArray)
+  ))
+_sym_db.RegisterMessage(BArray)
+
+BValue = _reflection.GeneratedProtocolMessageType('BValue', (_message.Message,), dict(
+  DESCRIPTOR = _BVALUE,
+  __module__ = 'asterstudy_pb2'
+  # @@protoc_insertion_point(class_scope:asterstudy.BValue)
+  ))
+_sym_db.RegisterMessage(BValue)
+
+BKeyword = _reflection.GeneratedProtocolMessageType('BKeyword', (_message.Message,), dict(
+  DESCRIPTOR = _BKEYWORD,
+  __module__ = 'asterstudy_pb2'
+  # @@protoc_insertion_point(class_scope:asterstudy.BKeyword)
+  ))
+_sym_db.RegisterMessage(BKeyword)
+
+BKeywords = _reflection.GeneratedProtocolMessageType('BKeywords', (_message.Message,), dict(
+  DESCRIPTOR = _BKEYWORDS,
+  __module__ = 'asterstudy_pb2'
+  # @@protoc_insertion_point(class_scope:asterstudy.BKeywords)
+  ))
+_sym_db.RegisterMessage(BKeywords)
+
+BCommand = _reflection.GeneratedProtocolMessageType('BCommand', (_message.Message,), dict(
+  DESCRIPTOR = _BCOMMAND,
+  __module__ = 'asterstudy_pb2'
+  # @@protoc_insertion_point(class_scope:asterstudy.BCommand)
+  ))
+_sym_db.RegisterMessage(BCommand)
+
 BStage = _reflection.GeneratedProtocolMessageType('BStage', (_message.Message,), dict(
   DESCRIPTOR = _BSTAGE,
   __module__ = 'asterstudy_pb2'
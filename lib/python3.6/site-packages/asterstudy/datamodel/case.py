@@ -567,16 +567,20 @@ class Case(Node, RCaseMixing):
         except (TypeError, AttributeError):
             prefix = "unnamed"
 
+        visible = command.stage.visible_names if check_previous else None
+
+        def _used(name):
+            if name in self._generated_names:
+                return True
+            return visible is not None and \
+                (name == command.name or visible.is_visible(name, command))
+
         attempts = [""] + list(range(1000))
-        prenames = []
-        if check_previous:
-            prenames = command.previous_names()
-            prenames.add(command.name)
         while attempts:
             suffix = str(attempts.pop(0))
             size = 8 - len(suffix)
             name = "{0}{1}".format(prefix[:size], suffix)
-            if name not in self._generated_names and name not in prenames:
+            if not _used(name):
                 self._generated_names.add(name)
                 return name
 
@@ -0,0 +1,379 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2016 EDF R&D
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License Version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, you may download a copy of license
+# from https://www.gnu.org/licenses/gpl-3.0.
+
+"""
+Catalog snapshot
+----------------
+
+Snapshot of a loaded code_aster catalog.
+
+Importing all the modules of the commands catalog is slow, even more on a
+network file system. Once the catalog has been loaded, the commands
+definitions and the tables built by :class:`.Catalogs` are stored in a
+pickled file that is read in a single operation at the next loading of the
+same version.
+
+The snapshot is identified by a key computed from the modification times
+and sizes of the catalog sources, the categories definition and the Python
+version: it is rebuilt as soon as the catalog changes. The content is
+checked with a checksum before being unpickled.
+
+The functions defined in the commands modules (*sd_prod* functions) are
+stored by value, with the global names they use, in order to not import
+their modules while reading the snapshot. They are stored as persistent
+identifiers (``persistent_id`` / ``persistent_load``), the only hooks of
+the pickler available for functions with all the supported Python versions.
+
+A smaller index of the commands (module of each command, categories and
+translations) is also stored for the lazy loading of the catalog (see
+:class:`.LazyCommands`).
+
+The snapshots are stored in the user's configuration directory. They can be
+disabled by setting the ``ASTERSTUDY_NO_CATALOG_SNAPSHOT`` environment
+variable.
+
+"""
+
+
+import hashlib
+import importlib
+import io
+import marshal
+import os
+import os.path as osp
+import pickle
+import sys
+import types
+from importlib.util import MAGIC_NUMBER
+from itertools import count
+from weakref import WeakValueDictionary
+
+from ..common import CFG, debug_message, make_dirs
+
+#: Version of the snapshot format.
+FORMAT = 2
+
+#: Kinds of snapshots: whole catalog or index of the commands modules.
+SNAPSHOT, INDEX = "pickle", "index"
+
+#: Prefix of the modules of which functions are stored by value.
+BY_VALUE = ("code_aster.Cata.Commands", "code_aster.Cata.Commons")
+
+_HASH = hashlib.sha1
+_HASH_SIZE = _HASH().digest_size
+_RESTORED = "_restored"
+_COUNTER = count()
+
+
+class _Registry:
+    """Registry of the functions restored from a snapshot.
+
+    The functions are found by attribute access, as the pickle module does
+    to pickle a function by reference. Only weak references are kept: a
+    function is released with the catalog that uses it.
+    """
+
+    def __init__(self):
+        self._functions = WeakValueDictionary()
+
+    def __getattr__(self, name):
+        try:
+            return self._functions[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def add(self, name, func):
+        """Register a function."""
+        self._functions[name] = func
+
+
+_restored = _Registry()
+
+
+def snapshot_enabled():
+    """Tell if the catalog snapshots are enabled."""
+    return not int(os.getenv("ASTERSTUDY_NO_CATALOG_SNAPSHOT", "0") or "0")
+
+
+def snapshot_path(version_path, kind=SNAPSHOT):
+    """Return the path of the snapshot of a catalog.
+
+    Arguments:
+        version_path (str): Path of the catalog (containing the *code_aster*
+            package).
+        kind (str): Kind of snapshot (*SNAPSHOT* or *INDEX*).
+
+    Returns:
+        str: Path of the snapshot file.
+    """
+    name = osp.basename(osp.normpath(version_path))
+    digest = _HASH(osp.realpath(version_path).encode()).hexdigest()[:12]
+    return osp.join(osp.dirname(CFG.userrc), "asterstudy_catalogs",
+                    "{0}-{1}.{2}".format(name, digest, kind))
+
+
+def snapshot_key(version_path, extra=None):
+    """Compute the key that identifies the current state of a catalog.
+
+    Arguments:
+        version_path (str): Path of the catalog.
+        extra (object): Other data (with a stable representation) on which
+            the snapshot depends.
+
+    Returns:
+        bytes: Key of the catalog.
+    """
+    key = _HASH()
+    key.update(repr((FORMAT, MAGIC_NUMBER, sys.version, extra)).encode())
+    root = osp.join(version_path, "code_aster", "Cata")
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if not filename.endswith(".py"):
+                continue
+            path = osp.join(dirpath, filename)
+            stat = os.stat(path)
+            key.update(repr((path, stat.st_mtime_ns,
+                             stat.st_size)).encode())
+    return key.digest()
+
+
+def load_snapshot(version_path, key, kind=SNAPSHOT):
+    """Read the snapshot of a catalog.
+
+    The catalog packages (except the commands) must have been imported
+    before.
+
+    Arguments:
+        version_path (str): Path of the catalog.
+        key (bytes): Key of the catalog, as returned by `snapshot_key()`.
+        kind (str): Kind of snapshot (*SNAPSHOT* or *INDEX*).
+
+    Returns:
+        dict: Content of the snapshot, *None* if the snapshot does not exist
+        or is not up to date.
+    """
+    path = snapshot_path(version_path, kind)
+    try:
+        with open(path, "rb") as snapshot:
+            data = snapshot.read()
+    except OSError:
+        return None
+    size = len(key)
+    if data[:size] != key:
+        debug_message("catalog snapshot out of date:", path)
+        return None
+    checksum = data[size:size + _HASH_SIZE]
+    payload = data[size + _HASH_SIZE:]
+    if _HASH(payload).digest() != checksum:
+        debug_message("catalog snapshot corrupted:", path)
+        return None
+    try:
+        content = _SnapshotUnpickler(io.BytesIO(payload)).load()
+    except Exception as exc: # pragma pylint: disable=broad-except
+        debug_message("can not read the catalog snapshot:", exc)
+        return None
+    debug_message("catalog read from snapshot:", path)
+    return content
+
+
+def save_snapshot(version_path, key, content, kind=SNAPSHOT):
+    """Write the snapshot of a catalog.
+
+    Errors are ignored: the catalog will just be imported again at the next
+    loading.
+
+    Arguments:
+        version_path (str): Path of the catalog.
+        key (bytes): Key of the catalog, as returned by `snapshot_key()`.
+        content (dict): Objects to be stored.
+        kind (str): Kind of snapshot (*SNAPSHOT* or *INDEX*).
+
+    Returns:
+        bool: *True* if the snapshot has been written.
+    """
+    path = snapshot_path(version_path, kind)
+    try:
+        stream = io.BytesIO()
+        _SnapshotPickler(stream).dump(content)
+        payload = stream.getvalue()
+        make_dirs(osp.dirname(path))
+        tmpfile = "{0}.{1}".format(path, os.getpid())
+        with open(tmpfile, "wb") as snapshot:
+            snapshot.write(key)
+            snapshot.write(_HASH(payload).digest())
+            snapshot.write(payload)
+        os.replace(tmpfile, path)
+    except Exception as exc: # pragma pylint: disable=broad-except
+        debug_message("can not write the catalog snapshot:", exc)
+        return False
+    debug_message("catalog snapshot written:", path)
+    return True
+
+
+def _make_function(code, name, namespace, defaults, kwdefaults):
+    """Rebuild a function stored by value.
+
+    The function is registered in this module to be pickled by reference
+    (for example by the undo/redo stack) while it is used.
+    """
+    func = types.FunctionType(marshal.loads(code), namespace, name, defaults)
+    func.__kwdefaults__ = kwdefaults
+    func.__module__ = __name__
+    key = "{0}_{1}".format(next(_COUNTER), name)
+    func.__qualname__ = "{0}.{1}".format(_RESTORED, key)
+    _restored.add(key, func)
+    return func
+
+
+def _by_value(func):
+    """Tell if a function must be stored by value."""
+    return func.__module__.startswith(BY_VALUE) or (
+        func.__module__ == __name__ and
+        func.__qualname__.startswith(_RESTORED + "."))
+
+
+def _get_attribute(modname, name):
+    """Return an object stored by reference."""
+    return getattr(importlib.import_module(modname), name)
+
+
+def _function_names(code):
+    """Return the global names used by a code object."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names.update(_function_names(const))
+    return names
+
+
+class _SnapshotPickler(pickle.Pickler):
+    """Pickler that stores the functions of the commands modules by value.
+
+    The functions of a module share a namespace that only contains the
+    global names used by these functions (the namespace of a function
+    restored from a snapshot is itself such a namespace). Modules are
+    stored by name, as the instances defined in the other modules of the
+    catalog (for example the translation object).
+    """
+
+    def __init__(self, stream):
+        super().__init__(stream, protocol=pickle.HIGHEST_PROTOCOL)
+        self._namespaces = {}
+        self._references = {}
+        self._pids = {}
+
+    def _add_references(self, namespace):
+        """Register the instances of a namespace that are defined by a
+        module of the catalog not stored by value."""
+        modules = [(name, module) for name, module in sys.modules.items()
+                   if name.startswith("code_aster.Cata")
+                   and not name.startswith(BY_VALUE)]
+        for name, value in namespace.items():
+            if isinstance(value, (type, types.FunctionType, types.ModuleType,
+                                  str, bytes, int, float, tuple, list, dict)):
+                continue
+            for modname, module in modules:
+                if getattr(module, name, None) is value:
+                    self._references[id(value)] = (modname, name)
+                    break
+
+    def _namespace(self, func):
+        """Return the namespace of the functions of a module."""
+        globs = func.__globals__
+        namespace = self._namespaces.get(id(globs))
+        if namespace is None:
+            module = sys.modules.get(func.__module__)
+            if module is None or vars(module) is not globs:
+                # already restored from a snapshot
+                namespace = dict(globs)
+            else:
+                names = set()
+                for obj in globs.values():
+                    if isinstance(obj, types.FunctionType) \
+                            and obj.__globals__ is globs:
+                        names.update(_function_names(obj.__code__))
+                namespace = {name: globs[name]
+                             for name in names if name in globs}
+                namespace["__name__"] = module.__name__
+            self._add_references(namespace)
+            self._namespaces[id(globs)] = namespace
+        return namespace
+
+    def persistent_id(self, obj): # pragma pylint: disable=method-hidden
+        """Store the functions of the commands modules by value, the
+        modules and the registered instances by name."""
+        pid = self._pids.get(id(obj))
+        if pid is not None:
+            # same object to use the memo of the pickler
+            return pid
+        if isinstance(obj, types.ModuleType):
+            pid = ("module", obj.__name__)
+        elif id(obj) in self._references:
+            pid = ("attribute", ) + self._references[id(obj)]
+        elif type(obj) is types.FunctionType and _by_value(obj):
+            if obj.__closure__:
+                raise pickle.PicklingError("closures are not supported: {0}"
+                                           .format(obj.__qualname__))
+            pid = ("function", marshal.dumps(obj.__code__), obj.__name__,
+                   self._namespace(obj), obj.__defaults__,
+                   obj.__kwdefaults__)
+        else:
+            return None
+        self._pids[id(obj)] = pid
+        return pid
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    """Unpickler that restores the objects stored by
+    :class:`_SnapshotPickler`."""
+
+    def __init__(self, stream):
+        super().__init__(stream)
+        # identifiers are kept with the objects to keep their id valid
+        self._objects = {}
+
+    def persistent_load(self, pid): # pragma pylint: disable=method-hidden
+        """Restore an object stored by a persistent identifier."""
+        key = _pid_key(pid)
+        try:
+            return self._objects[key][1]
+        except KeyError:
+            pass
+        kind = pid[0]
+        if kind == "module":
+            obj = importlib.import_module(pid[1])
+        elif kind == "attribute":
+            obj = _get_attribute(*pid[1:])
+        elif kind == "function":
+            obj = _make_function(*pid[1:])
+        else:
+            raise pickle.UnpicklingError("unsupported persistent id: {0!r}"
+                                         .format(kind))
+        self._objects[key] = (pid, obj)
+        return obj
+
+
+def _pid_key(pid):
+    """Return a hashable key for a persistent identifier.
+
+    The namespace and the default values of a function are identified by
+    their id: they are shared by the functions of a module through the memo
+    of the pickler.
+    """
+    return tuple(item if isinstance(item, (str, bytes)) else id(item)
+                 for item in pid)
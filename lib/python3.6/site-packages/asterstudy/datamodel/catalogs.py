@@ -31,17 +31,94 @@ Implementation of the catalogs container.
 import os
 import os.path as osp
 import re
+import sys
 import traceback
 from collections import OrderedDict
+from collections.abc import MutableMapping
+from functools import partial
 from itertools import chain
 
 from ..common import (CFG, AsterStudySession, CatalogError, debug_message,
                       info_message)
-from .aster_syntax import IDS, get_cata_typeid, import_aster
+from .aster_syntax import (IDS, get_cata_typeid, import_aster, import_command,
+                           import_commands)
+from .catalog_snapshot import (INDEX, load_snapshot, save_snapshot,
+                               snapshot_enabled, snapshot_key)
 from .dict_categories import CATEGORIES_DEFINITION, DEPRECATED
 from .global_dict import GLOBAL_DICT
 
 
+def lazy_enabled(default=False):
+    """Tell if the commands of the catalog are imported on demand.
+
+    The lazy mode is requested by the entry points that only use a few
+    commands (see :meth:`Catalogs.set_lazy`). The user may force it on or
+    off with the ``ASTERSTUDY_LAZY_CATALOG`` environment variable. It needs
+    the index stored with the catalog snapshots, the catalog is fully
+    imported once to build it.
+
+    Arguments:
+        default (bool): Mode used if the environment variable is not set.
+    """
+    value = os.getenv("ASTERSTUDY_LAZY_CATALOG", "")
+    if not value:
+        return default
+    return bool(int(value))
+
+
+class LazyCommands(MutableMapping):
+    """Commands definitions that are imported on first access.
+
+    Arguments:
+        modules (dict): Name of the module (in the *Commands* package) that
+            defines each command.
+        importer (callable): Function that imports a module by name.
+    """
+
+    def __init__(self, modules, importer):
+        self._modules = dict(modules)
+        self._importer = importer
+        self._loaded = {}
+
+    def __getitem__(self, name):
+        try:
+            return self._loaded[name]
+        except KeyError:
+            pass
+        modname = self._modules[name]
+        debug_message("importing command {0!r} from {1!r}"
+                      .format(name, modname))
+        command = getattr(self._importer(modname), name)
+        self._loaded[name] = command
+        return command
+
+    def __setitem__(self, name, command):
+        self._modules.setdefault(name, None)
+        self._loaded[name] = command
+
+    def __delitem__(self, name):
+        del self._modules[name]
+        self._loaded.pop(name, None)
+
+    def __contains__(self, name):
+        return name in self._modules
+
+    def __iter__(self):
+        return iter(self._modules)
+
+    def __len__(self):
+        return len(self._modules)
+
+    def clear(self):
+        """Remove all commands."""
+        self._modules.clear()
+        self._loaded.clear()
+
+    def loaded(self):
+        """Return the names of the commands already imported."""
+        return list(self._loaded)
+
+
 class Catalogs:
     """Class for the catalogs access"""
 
@@ -54,15 +131,43 @@ class Catalogs:
         self._command_to_category = {}
         self._command_to_subcategory = {}
         self._dockeys = {}
-        self.read_catalogs()
+        self._modules = {}
+        self._translations = {}
+        self._names = None
+        self._type2command = None
+        # the default catalog is read on first access
+        self._pending = True
+        self._lazy = False
+
+    def _check_read(self):
+        """Read the default catalog if no catalog has been read yet."""
+        if self._pending:
+            self.read_catalogs()
+
+    def set_lazy(self, lazy=True):
+        """Import the commands on demand when the catalog is read.
+
+        The entry points that only use a few commands call it before
+        accessing the catalog. It has no effect if the catalog has already
+        been read.
+
+        Arguments:
+            lazy (bool): *True* to import the commands on demand.
+        """
+        if self._pending:
+            self._lazy = lazy
 
     def reset(self):
         """Reset catalogs when version is changing."""
         self._pkgs.clear()
-        self._catalogs.clear()
+        self._catalogs = {}
         self._categories.clear()
         self._command_to_category.clear()
         self._command_to_subcategory.clear()
+        self._modules = {}
+        self._translations = {}
+        self._names = None
+        self._type2command = None
         self._version = None
 
     def package(self, pkg_name):
@@ -72,6 +177,7 @@ class Catalogs:
         Returnds:
             package: Package being requested.
         """
+        self._check_read()
         return self._pkgs[pkg_name]
 
     @staticmethod
@@ -115,6 +221,7 @@ class Catalogs:
             debug_message("Catalog for {0!r}: already loaded".format(version))
             return
 
+        self._pending = False
         self.reset()
         if not version:
             version = CFG.default_version
@@ -124,9 +231,27 @@ class Catalogs:
 
         # Enable marker
         AsterStudySession.set_cata()
+        cata_key = None
         try:
-            self._pkgs = import_aster(version_path)
+            self._pkgs = import_aster(version_path, commands=False)
+            if snapshot_enabled():
+                cata_key = snapshot_key(version_path,
+                                        self._snapshot_extra(version))
+                if lazy_enabled(self._lazy):
+                    index = load_snapshot(version_path, cata_key, INDEX)
+                    if self._restore_index(index, version_path):
+                        self._version = version
+                        return
+                content = load_snapshot(version_path, cata_key)
+                if self._restore_snapshot(content):
+                    self._version = version
+                    if lazy_enabled(self._lazy):
+                        save_snapshot(version_path, cata_key,
+                                      self._index_content(), INDEX)
+                    return
+            self._pkgs.update(import_commands(version_path))
             commands = self._pkgs["Commands"].__dict__
+            self._modules = _commands_modules(commands)
         except ImportError as exc:
             info_message("Can not import version {0!r}\nReason: {1}"
                          .format(version_path, exc))
@@ -141,10 +266,102 @@ class Catalogs:
         self._fill_categories()
         self._version = version
         self._read_dockeys()
+        if commands and cata_key is not None:
+            save_snapshot(version_path, cata_key, self._snapshot_content())
+            save_snapshot(version_path, cata_key, self._index_content(),
+                          INDEX)
+
+    @staticmethod
+    def _snapshot_extra(version):
+        """Return the data, other than the catalog sources, on which the
+        snapshot depends."""
+        stat = os.stat(__file__)
+        dockeys = [CFG.rcfile("clefs_docu_{0}".format(name))
+                   for name in (version, "stable")]
+        dockeys = [(path, os.stat(path).st_mtime_ns)
+                   for path in dockeys if path]
+        return (stat.st_mtime_ns, stat.st_size, dockeys,
+                list(CATEGORIES_DEFINITION.items()), DEPRECATED)
+
+    def _snapshot_content(self):
+        """Return the objects to be stored in the snapshot."""
+        # pragma pylint: disable=protected-access
+        return {
+            'catalogs': self._catalogs,
+            'categories': self._categories,
+            'command_to_category': self._command_to_category,
+            'command_to_subcategory': self._command_to_subcategory,
+            'dockeys': self._dockeys,
+            'type2command': self.type2command,
+            'modules': self._modules,
+            'last_id': self._uid_class()._new_id,
+        }
+
+    def _index_content(self):
+        """Return the objects to be stored in the index of the commands."""
+        translations = {}
+        for name in self._modules:
+            translations[name] = \
+                self._catalogs[name].definition.get("translation", {})
+        return {
+            'modules': self._modules,
+            'categories': self._categories,
+            'command_to_category': self._command_to_category,
+            'command_to_subcategory': self._command_to_subcategory,
+            'dockeys': self._dockeys,
+            'translations': translations,
+        }
+
+    def _restore_snapshot(self, content):
+        """Restore the catalog from a snapshot.
+
+        Returns:
+            bool: *True* if the snapshot has been restored.
+        """
+        if not content:
+            return False
+        self._catalogs.update(content['catalogs'])
+        self._categories.update(content['categories'])
+        self._command_to_category.update(content['command_to_category'])
+        self._command_to_subcategory.update(
+            content['command_to_subcategory'])
+        self._dockeys = content['dockeys']
+        self._type2command = content['type2command']
+        self._modules = content['modules']
+        # objects created later must have new ids
+        # pragma pylint: disable=protected-access
+        uid = self._uid_class()
+        uid._new_id = max(uid._new_id, content['last_id'])
+        return True
+
+    def _restore_index(self, content, version_path):
+        """Prepare the lazy import of the commands from their index.
+
+        Returns:
+            bool: *True* if the index has been restored.
+        """
+        if not content:
+            return False
+        self._catalogs = LazyCommands(content['modules'],
+                                      partial(import_command, version_path))
+        self._add_conversion_commands()
+        self._modules = content['modules']
+        self._categories.update(content['categories'])
+        self._command_to_category.update(content['command_to_category'])
+        self._command_to_subcategory.update(
+            content['command_to_subcategory'])
+        self._dockeys = content['dockeys']
+        self._translations = content['translations']
+        return True
+
+    def _uid_class(self):
+        """Return the class that provides the ids of the syntax objects."""
+        return sys.modules[self.command.__module__].UIDMixing
 
     @property
     def version(self):
         """str: Attribute that holds current catalog's version."""
+        self._check_read()
         return self._version
 
     @property
@@ -306,6 +523,7 @@ class Catalogs:
         Returns:
             list[str]: Names of all categories.
         """
+        self._check_read()
         categ = list(self._categories.keys())
         if usage:
             categ.remove("Hidden")
@@ -325,6 +543,7 @@ class Catalogs:
         Returns:
             list[str]: Names of all commands in given category.
         """
+        self._check_read()
         return self._categories.get(category, [])
 
     def get_command_category(self, command):
@@ -336,6 +555,7 @@ class Catalogs:
         Returns:
             str: Name of the category.
         """
+        self._check_read()
         return self._command_to_category.get(command)
 
     def get_command_subcategory(self, command):
@@ -348,6 +568,7 @@ class Catalogs:
             str: Name of the sub-category (*None* if sub-category
             is not specified).
         """
+        self._check_read()
         return self._command_to_subcategory.get(command)
 
     def get_category_index(self, command):
@@ -371,16 +592,29 @@ class Catalogs:
         Returns:
             PartOfSyntax: Command's catalog class.
         """
+        self._check_read()
         return self._catalogs.get(str(command))
 
+    @property
+    def command_names(self):
+        """frozenset[str]: Attribute that holds the names of the commands
+        of the current catalog."""
+        self._check_read()
+        # commands may be added after the reading of the catalog
+        if self._names is None or len(self._names) != len(self._catalogs):
+            self._names = frozenset(self._catalogs)
+        return self._names
+
     def iteritems(self):
         """Return an iterator over the pairs (*command name*, *catalog*).
         """
+        self._check_read()
         for key, value in self._catalogs.items():
             yield key, value
 
     def __iter__(self):
         """Iterator over command names."""
+        self._check_read()
         for key in self._catalogs:
             yield key
 
@@ -392,12 +626,16 @@ class Catalogs:
         """
         key = item if item is not None else \
             keyword if keyword is not None else command
-        cata = self.get_catalog(command)
-        if cata is not None:
-            dtr = cata.definition.get("translation", {})
-            trans = dtr.get(key)
-            if trans is not None:
-                return trans
+        self._check_read()
+        # in lazy mode, translations are read from the index
+        dtr = self._translations.get(command)
+        if dtr is None:
+            cata = self.get_catalog(command)
+            dtr = {} if cata is None else \
+                cata.definition.get("translation", {})
+        trans = dtr.get(key)
+        if trans is not None:
+            return trans
         return GLOBAL_DICT.get(key, key)
 
     def _read_dockeys(self):
@@ -436,6 +674,8 @@ class Catalogs:
         Returns:
             dict: Dict of {"type name": *Command*}.
         """
+        if self._type2command is not None:
+            return self._type2command
         typ2cmd = dict()
         for _, command in self.iteritems():
             for typ in self.possible_types(command):
@@ -445,6 +685,7 @@ class Catalogs:
                 if typname in typ2cmd:
                     continue
                 typ2cmd[typname] = command
+        self._type2command = typ2cmd
         return typ2cmd
 
     def get_command_url(self, command, base_url, language=None):
@@ -484,6 +725,28 @@ class Catalogs:
         return self.get_catalog(command).udocstring
 
 
+def _commands_modules(commands):
+    """Return the name of the module that defines each command.
+
+    Arguments:
+        commands (dict): Content of the *Commands* package.
+
+    Returns:
+        dict: Basename of the module (in the *Commands* package) by command
+        name.
+    """
+    prefix = "code_aster.Cata.Commands."
+    modules = {}
+    for modname, module in list(sys.modules.items()):
+        if not modname.startswith(prefix):
+            continue
+        for name, obj in vars(module).items():
+            if get_cata_typeid(obj) == IDS.command and \
+                    commands.get(name) is obj:
+                modules.setdefault(name, modname[len(prefix):])
+    return modules
+
+
 def _hidden_prod(**kwargs):
     decl = kwargs.get("DECL")
     if decl:
@@ -75,6 +75,18 @@ class Toggler:
         self._before = ctxt.copy()
 
 
+class CommandsContext(dict):
+    """Context of a commands file that provides the commands of the catalog
+    on first access (only the used commands are imported in lazy mode, see
+    :class:`.LazyCommands`)."""
+
+    def __missing__(self, name):
+        command = CATA.get_catalog(name)
+        if command is None:
+            raise KeyError(name)
+        return command
+
+
 class CommandBuilder:
     """Builder of objects of AsterStudy data model.
 
@@ -220,7 +232,7 @@ class CommandBuilder:
             dict: Context to execute the commands file.
         """
         vartype = CATA.package("DataStructure").PythonVariable
-        context = {}
+        context = CommandsContext()
 
         # Update context with commands from preceding stages
         for stage in self._stg.preceding_stages:
@@ -243,8 +255,7 @@ class CommandBuilder:
                     pass
                 context[command.name] = result
 
-        # add code_aster command dictionary
-        context.update(CATA.iteritems())
+        # code_aster commands are provided by the context
 
         self._toggle = Toggler()
         context['_DISABLE_COMMANDS'] = self._toggle.disable
@@ -30,5 +30,6 @@ from .constancy import ModifiesCommandInstance, ModifiesStageInstance
 from .formula import Formula
 from .helper import deleted_by, paths_using_group
 from .hidden import Hidden
-from .mixing import CO, KeysMixing, Unit
+from .mixing import CO, ConditionContext, KeysMixing, Unit
+from .numeric import NumericValues
 from .variable import Variable
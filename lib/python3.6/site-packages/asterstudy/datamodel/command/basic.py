@@ -43,6 +43,8 @@ from .helper import (clean_undefined, deleted_by, init_deleter, register_cos,
                      unregister_cos, unregister_deleter, unregister_parent,
                      unregister_unit, update_dependence_up)
 from .mixing import CO, KeysMixing, ResultMixing
+from .numeric import compact_values
+from .syntax_cache import SYNTAX_CACHE
 from .text import TextMixing
 
 
@@ -103,6 +105,7 @@ class Command(TextMixing, CataMixing, ResultMixing):
 
     @active.setter
     def active(self, value):
+        self.touch()
         self._active = value
 
         comment = self.comment
@@ -269,6 +272,7 @@ class Command(TextMixing, CataMixing, ResultMixing):
         self._storage.clear()
         self._engine.clear_cache()
 
+        compact_values(storage)
         clean_undefined(storage)
         update_dependence_up(storage)
 
@@ -347,8 +351,7 @@ class Command(TextMixing, CataMixing, ResultMixing):
         Returns:
             list[Command]: List of deleters.
         """
-        preceding_commands = self.stage.preceding_commands(self, only_preceding)
-        return [cmd for cmd in preceding_commands if cmd.is_deleter]
+        return self.stage.visible_names.deleters(self, only_preceding)
 
     @staticmethod
     def filterby(stage, astype, command=None):
@@ -389,6 +392,7 @@ class Command(TextMixing, CataMixing, ResultMixing):
     @title.setter
     def title(self, value):
         """Attribute that holds unique *title*"""
+        self.touch()
         self._title = value
 
     def need_reuse(self):
@@ -460,6 +464,7 @@ class Command(TextMixing, CataMixing, ResultMixing):
         Arguments:
             value (bool): *True* to reuse the name of an input object if found.
         """
+        self.touch()
         self._reuse_input_name = value
 
     def keywords_equal_to(self, value):
@@ -605,6 +610,22 @@ class Command(TextMixing, CataMixing, ResultMixing):
 
         self._cache_type = None
 
+    def after_restore(self):
+        """Reset cached values after the command has been restored by the
+        undo/redo journal (only the restored nodes are notified, the
+        dependent commands are reset as for a modification)."""
+        self.reset_validity()
+        self.reset_cache_type()
+        if self._engine is not None:
+            self._engine.clear_cache()
+        self.after_touch()
+
+    def after_touch(self):
+        """Reset the index of the visible names of the stage."""
+        stage = self.stage
+        if stage is not None:
+            stage.reset_visible_names()
+
     def check(self, mode=Validity.Complete, safe=True):
         """Checks given validity aspect and returns corresponding status
 
@@ -675,9 +696,7 @@ class Command(TextMixing, CataMixing, ResultMixing):
 
     def previous_names(self):
         """Returns command names to be considered for naming conflicts"""
-        preceding_commands = self.stage.preceding_commands(self)
-        names = set(cmd.name for cmd in preceding_commands if cmd != self)
-        return names
+        return self.stage.visible_names.names(self)
 
     def _check_naming_conflicts(self):
         """Check the validity of the command result name relatively to all
@@ -686,10 +705,7 @@ class Command(TextMixing, CataMixing, ResultMixing):
         if self.name == "_" or self.can_reuse():
             return True
 
-        if self.name in self.previous_names():
-            return False
-
-        return True
+        return not self.stage.visible_names.is_visible(self.name, self)
 
     def _check_dependencies(self):
         """Checks dependencies."""
@@ -717,20 +733,33 @@ class Command(TextMixing, CataMixing, ResultMixing):
         return result
 
     def _check_syntax(self, check_all, safe):
-        """Checks syntax of the command."""
-        result = Validity.Nothing
+        """Checks syntax of the command.
+
+        The results are shared with the identical commands through
+        the syntax cache (see `datamodel.command.syntax_cache`).
+        """
+        storage = self.storage_nocopy
+        key = SYNTAX_CACHE.key(self._cata, self._syntax_checker, storage)
+        result = SYNTAX_CACHE.get(key)
+        if result == Validity.Nothing:
+            return result
 
         checker = self._syntax_checker()
         if not safe:
-            self._cata.accept(checker, self.storage_nocopy)
+            # also for a known error, to raise it
+            self._cata.accept(checker, storage)
+            SYNTAX_CACHE.set(key, self._cata, Validity.Nothing)
             if check_all:
                 self._check_validity = False
-            return result
+            return Validity.Nothing
 
-        try:
-            self._cata.accept(checker, self.storage_nocopy)
-        except Exception: # pragma pylint: disable=broad-except
-            result |= Validity.Syntaxic
+        if result is None:
+            result = Validity.Nothing
+            try:
+                self._cata.accept(checker, storage)
+            except Exception: # pragma pylint: disable=broad-except
+                result |= Validity.Syntaxic
+            SYNTAX_CACHE.set(key, self._cata, result)
 
         return result
 
@@ -35,6 +35,29 @@ that is referenced by the current case as well as a runcase.
 
 from functools import wraps
 
+
+def touch(this, children=False):
+    """
+    Declare the node that owns `this` as modified to its model (see
+    :meth:`.AbstractDataModel.touch`).
+
+    Arguments:
+        this (any): Node or object aggregated by a node (through its
+            `calling` or `_engine` attribute).
+        children (bool): If *True*, the child nodes are declared too.
+    """
+    from ..abstract_data_model import Node
+    node = this
+    while node is not None and not isinstance(node, Node):
+        node = getattr(node, 'calling', None) or getattr(node, '_engine', None)
+    if node is None:
+        return
+    node.touch()
+    if children:
+        for child in node.child_nodes:
+            child.touch()
+
+
 class CopyUnderProgress:
     """
     Context manager under which the auto copy operation
@@ -93,6 +116,8 @@ class ModifiesStageInstance:
         def wrapper(this, *args, **kwargs):
             """Wrapper"""
 
+            touch(this, children=True)
+
             # If an auto copy is already under progress
             #     just invoke the method.
             if type(self).COPY_UNDER_PROGRESS:
@@ -143,6 +168,8 @@ class ModifiesCommandInstance:
 
             from .basic import Command
 
+            touch(this)
+
             # If a auto copy is already under progress
             #     proceed normally.
             if ModifiesStageInstance.COPY_UNDER_PROGRESS:
@@ -33,6 +33,7 @@ from ..visit_study import (FilterVisitor, UnitVisitor,
                            get_related, LEVEL_2_COMMANDS)
 from ..general import ConversionLevel, FileAttr
 from ..catalogs import CATA
+from .numeric import NumericValues
 
 def register_cos(stage, command, pool_co=None, conversion=False):
     """Properly register all CO command args via producing corresponding
@@ -90,7 +91,8 @@ def unregister_parent(command, value):
 
     if isinstance(value, Command):
         remove_parent(command, value)
-    elif isinstance(value, (list, tuple)):
+    elif isinstance(value, (list, tuple)) and \
+            not isinstance(value, NumericValues):
         for item in value:
             unregister_parent(command, item)
     elif isinstance(value, dict):
@@ -218,7 +220,8 @@ def register_parent(command, value):
         if value.name == '_' and value.gettype(ConversionLevel.NoFail):
             value.name = "_%d" % value.uid
         add_parent(command, value)
-    elif isinstance(value, (list, tuple)):
+    elif isinstance(value, (list, tuple)) and \
+            not isinstance(value, NumericValues):
         for item in value:
             register_parent(command, item)
     elif isinstance(value, dict):
@@ -228,7 +231,8 @@ def register_parent(command, value):
 
 def clean_undefined(value):
     "Removes all 'keys' of None 'values'"
-    if isinstance(value, (list, tuple)):
+    if isinstance(value, (list, tuple)) and \
+            not isinstance(value, NumericValues):
         for item in value:
             clean_undefined(item)
     elif isinstance(value, dict):
@@ -24,8 +24,8 @@ Implementation of Mixing classes used for Command definition.
 """
 
 
-import copy
 import inspect
+from collections.abc import Mapping
 
 from ...common import CachedValues, no_new_attributes
 from ..general import CataMixing
@@ -34,6 +34,7 @@ from ..catalogs import CATA
 from .helper import unregister_parent, register_parent, register_cos
 from .helper import unregister_unit, register_unit
 from .constancy import ModifiesCommandInstance as ModifiesInstance
+from .numeric import compact_values
 
 
 def _type_check(astype, value):
@@ -62,6 +63,7 @@ def _type_check(astype, value):
 def _update_value(command, astype, name2value, name, value):
     """Assign the value of a keyword into the storage dict of a command."""
     _type_check(astype, value)
+    value = compact_values(value)
 
     if name in name2value:
         unregister_parent(command, name2value[name])
@@ -91,8 +93,124 @@ class CompositeMixing:
     def __init__(self, keywords):
         self._keywords = keywords
 
+
+class ConditionContext(Mapping):
+    """Read-only view of the keywords used to evaluate the conditions of
+    the blocks.
+
+    The view is made of layers: the default values of the keywords
+    (computed at the first access), the keywords given by the user (never
+    copied) and the context of the parent. The values of the user variables
+    are replaced by their evaluation when they are read.
+
+    Arguments:
+        storage (dict): Keywords given by the user.
+        step (PartOfSyntax): Catalog object that defines the keywords
+            (*None* for no default values).
+        parent (Mapping): Context of the parent, its keywords are visible
+            through the view (optional).
+        scope (Mapping): Context only used to evaluate the conditions of the
+            blocks of `step` (defaults to `parent`). For example, the values
+            of a factor keyword do not contain the keywords of the command
+            but its blocks depend on them.
+    """
+
+    __slots__ = ('storage', '_step', '_parent', '_scope', '_defaults')
+
+    def __init__(self, storage, step=None, parent=None, scope=None):
+        self.storage = storage
+        self._step = step
+        self._parent = parent
+        self._scope = scope if scope is not None else parent
+        self._defaults = None if step is not None else {}
+
+    def _layers(self):
+        """Return the layers, the first ones preempt on the next ones."""
+        if self._defaults is None:
+            # the blocks are evaluated with the defaults already known,
+            # as by the catalog
+            self._defaults = {}
+            context = self
+            if self._scope is not self._parent:
+                context = ConditionContext(self.storage, parent=self._scope)
+                context._defaults = self._defaults # pragma pylint: disable=protected-access
+            _add_defaults(self._step.definition, self.storage, self._defaults,
+                          context)
+        if self._parent is None:
+            return self._defaults, self.storage
+        return self._defaults, self.storage, self._parent
+
+    def __getitem__(self, key):
+        for layer in self._layers():
+            if key in layer:
+                value = layer[key]
+                return getattr(value, 'evaluation', value)
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return any(key in layer for layer in self._layers())
+
+    def __iter__(self):
+        seen = set()
+        for layer in self._layers():
+            for key in layer:
+                if key not in seen:
+                    seen.add(key)
+                    yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+def _add_defaults(definition, storage, defaults, context):
+    """Store the default values of the keywords not given by the user.
+
+    This is the same as *addDefaultKeywords* of the catalog objects but
+    the keywords given by the user are not changed.
+
+    Arguments:
+        definition (CataDefinition): Definition of the keywords.
+        storage (dict): Keywords given by the user.
+        defaults (dict): Dict that receives the default values.
+        context (Mapping): Context used to evaluate the blocks conditions.
+    """
+    is_sequence = CATA.package("SyntaxUtils").value_is_sequence
+    for key, kwd in definition.iterItemsByType():
+        typeid = get_cata_typeid(kwd)
+        if typeid == IDS.simp:
+            value = storage.get(key, kwd.defaultValue())
+            if value is None:
+                continue
+            if kwd.is_list() and not is_sequence(value):
+                defaults[key] = [value]
+            elif key not in storage:
+                defaults[key] = value
+        elif typeid == IDS.fact:
+            value = storage.get(key, kwd.defaultValue())
+            if value is None:
+                if key not in storage:
+                    defaults[key] = None
+                continue
+            if type(value) in (list, tuple):
+                defaults[key] = type(value)(
+                    ConditionContext(occ, kwd, scope=context)
+                    for occ in value)
+            else:
+                value = ConditionContext(value, kwd, scope=context)
+                defaults[key] = [value] if kwd.is_list() else value
+        elif typeid == IDS.bloc:
+            if kwd.isEnabled(context):
+                _add_defaults(kwd.definition, storage, defaults, context)
+
+
 _CONTEXT_CACHE = CachedValues()
 
+
+def _clear_context(engine):
+    """Forget the conditions contexts of a command."""
+    _CONTEXT_CACHE.discard(engine)
+
+
 class KeysMixing(CataMixing, CompositeMixing, StorageMixing):
     """Mixing class that provides access to its elements as Python *dict*"""
 
@@ -146,13 +264,12 @@ class KeysMixing(CataMixing, CompositeMixing, StorageMixing):
         in current context described by given storage.
 
         item (Item): Bloc element to test.
+        storage (dict): Values of the keywords, not changed.
         """
-        _storage = copy.deepcopy(storage)
-        # use evaluation of expressions for user variables
-        for key, value in _storage.items():
-            if hasattr(value, 'evaluation'):
-                _storage[key] = value.evaluation
-        return item.isEnabled(_storage)
+        if not isinstance(storage, ConditionContext):
+            # use evaluation of expressions for user variables
+            storage = ConditionContext(storage)
+        return item.isEnabled(storage)
 
     @staticmethod
     def _getitem(keywords, name, storage, engine, cond_context):
@@ -200,29 +317,43 @@ class KeysMixing(CataMixing, CompositeMixing, StorageMixing):
 
     def __getitem__(self, name):
         """Returns composite structure item for the given *key*"""
-        cond_context = _CONTEXT_CACHE.get(self)
-        if cond_context is None:
-            # this makes a deepcopy of the Command._storage
-            cond_context = self._engine.storage
-            # add default keywords according to other provided keywords
-            self._engine.cata.addDefaultKeywords(cond_context)
-            # this storage dict will allow to evaluate block conditions in
-            # the underlying factor keyword
-            # keep "local" (factor) values first
-            if isinstance(self, (Factor, Sequence, Item)):
-                _storage = cond_context[self.name] # pragma pylint: disable=no-member
-                if not isinstance(_storage, dict):
-                    idx = 0
-                    if isinstance(self, Item):
-                        idx = self.idx # pragma pylint: disable=no-member
-                    _storage = _storage[idx]
-            else:
-                _storage = self._storage
-            # _debug_getitem(name, self._engine.title, _storage, stop=True)
-            cond_context.update(_storage)
-            _CONTEXT_CACHE.set(self, cond_context)
         return KeysMixing._getitem(self._keywords, name, self._storage,
-                                   self._engine, cond_context)
+                                   self._engine, self.condition_context())
+
+    def condition_context(self):
+        """Returns the context used to evaluate the blocks conditions.
+
+        It gives the keywords of the command with their default values
+        and, for a factor keyword, its "local" values first. The contexts
+        are kept per command until its keywords are changed.
+
+        Returns:
+            ConditionContext: Read-only view of the keywords.
+        """
+        contexts = _CONTEXT_CACHE.get(self._engine)
+        if contexts is None:
+            contexts = {}
+            _CONTEXT_CACHE.set(self._engine, contexts)
+        storage = self._engine.storage_nocopy
+        # keywords of the command with their default values
+        command = contexts.get(None)
+        if command is None or command.storage is not storage:
+            contexts.clear()
+            command = contexts[None] = ConditionContext(storage,
+                                                        self._engine.cata)
+        if not isinstance(self, (Factor, Sequence, Item)):
+            # the values given by the user preempt at the command level
+            key, _storage, step = (), storage, None
+        else:
+            key = (self.name, getattr(self, 'idx', None)) # pragma pylint: disable=no-member
+            _storage, step = self._storage, self._cata
+            if not isinstance(_storage, dict):
+                _storage = _storage[0] if _storage else {}
+        context = contexts.get(key)
+        if context is None or context.storage is not _storage:
+            context = contexts[key] = ConditionContext(_storage, step,
+                                                       command)
+        return context
 
     @staticmethod
     def _gettype(keywords, name):
@@ -285,13 +416,15 @@ class KeysMixing(CataMixing, CompositeMixing, StorageMixing):
         """Remove an item"""
         if name not in self.keys():
             raise KeyError("There is no value for the given name: '%s'" % name)
+        self._engine.touch()
+        self.clear_cache()
         unregister_parent(self._engine, self._storage[name])
         self._engine.reset_validity()
         del self._storage[name]
 
     def clear_cache(self):
-        """Reset cond_context cache."""
-        _CONTEXT_CACHE.discard(self)
+        """Reset the conditions contexts of the command."""
+        _clear_context(self._engine)
 
 
 class NameMixing:
@@ -424,6 +557,7 @@ class Simple(NameMixing, CataMixing, StorageMixing):
     @ModifiesInstance(True)
     def value(self, value):
         """Updates the value"""
+        _clear_context(self._engine)
         if value is None:
             if self._name in self._storage:
                 del self._storage[self._name]
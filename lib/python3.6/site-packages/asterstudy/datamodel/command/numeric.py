@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2016 EDF R&D
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License Version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, you may download a copy of license
+# from https://www.gnu.org/licenses/gpl-3.0.
+
+"""
+Numeric values
+--------------
+
+Storage of the large sequences of numbers given to the keywords (for example
+the values of *DEFI_FONCTION* or *DEFI_LIST_REEL*).
+
+The sequences of at least ``ARRAY_THRESHOLD`` numbers of the same type
+(integers or floats) are stored as :class:`NumericValues` objects. These
+objects are immutable: they are shared, instead of being copied, between the
+copies of the storage of a command (run cases, undo/redo...). They provide
+a read-only :mod:`numpy` array of the values and they are pickled and saved
+as packed binary data.
+
+"""
+
+
+import hashlib
+
+import numpy
+
+#: Minimum length of the sequences stored as :class:`NumericValues`.
+ARRAY_THRESHOLD = 100
+
+_DTYPES = {int: numpy.dtype('<i8'), float: numpy.dtype('<f8')}
+_INT_LIMIT = 2 ** 63
+
+
+class NumericValues(tuple):
+    """Immutable sequence of numbers of the same type.
+
+    The values are stored as a tuple of Python numbers, so that the callers
+    that iterate on the values get the same objects as before. A sequence
+    that replaces a list compares equal to the list and is represented
+    as a list.
+
+    Attributes:
+        is_list (bool): *True* if the values were given as a list.
+        numeric (bool): Tells that the sequence does not contain any
+            reference to an object (see :func:`common.recursive_items`).
+    """
+
+    numeric = True
+
+    def __new__(cls, values, is_list=False):
+        obj = super().__new__(cls, values)
+        obj.is_list = is_list
+        obj._array = None # pragma pylint: disable=protected-access
+        obj._digest = None # pragma pylint: disable=protected-access
+        return obj
+
+    @classmethod
+    def from_array(cls, array, is_list=False):
+        """Create an object from an array.
+
+        Arguments:
+            array (numpy.ndarray): Array of integers or floats.
+            is_list (bool): *True* if the values were given as a list.
+
+        Returns:
+            NumericValues: New object.
+        """
+        obj = cls(array.tolist(), is_list)
+        array = numpy.array(array, dtype=_DTYPES[type(obj[0])])
+        array.flags.writeable = False
+        obj._array = array # pragma pylint: disable=protected-access
+        return obj
+
+    @property
+    def array(self):
+        """numpy.ndarray: Read-only array of the values."""
+        if self._array is None:
+            array = numpy.fromiter(self, _DTYPES[type(self[0])], len(self))
+            array.flags.writeable = False
+            self._array = array
+        return self._array
+
+    @property
+    def digest(self):
+        """bytes: Digest of the values, their type and *is_list*."""
+        if self._digest is None:
+            array = self.array
+            digest = hashlib.sha1(array.dtype.str.encode())
+            digest.update(b'l' if self.is_list else b't')
+            digest.update(array.tobytes())
+            self._digest = digest.digest()
+        return self._digest
+
+    def __array__(self, dtype=None):
+        return self.array if dtype is None else self.array.astype(dtype)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memodict):
+        # pragma pylint: disable=unused-argument
+        return self
+
+    def __reduce__(self):
+        array = self.array
+        return _restore, (array.tobytes(), array.dtype.str, self.is_list)
+
+    def __eq__(self, other):
+        if isinstance(other, list):
+            other = tuple(other)
+        return tuple.__eq__(self, other)
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = tuple.__hash__
+
+    def __add__(self, other):
+        return self.as_builtin() + other
+
+    def __radd__(self, other):
+        return other + self.as_builtin()
+
+    def __repr__(self):
+        text = tuple.__repr__(self)
+        if self.is_list:
+            text = "[" + text[1:-1] + "]"
+        return text
+
+    def as_builtin(self):
+        """Return the values as a list or a tuple, as they were given."""
+        return list(self) if self.is_list else tuple(self)
+
+
+def _restore(data, dtype, is_list):
+    """Restore a pickled :class:`NumericValues` object."""
+    return NumericValues.from_array(numpy.frombuffer(data, dtype=dtype),
+                                    is_list)
+
+
+def is_numeric_sequence(value):
+    """Tell if a value must be stored as a :class:`NumericValues` object.
+
+    Arguments:
+        value (misc): Value of a keyword.
+
+    Returns:
+        bool: *True* for a list or a tuple of at least ``ARRAY_THRESHOLD``
+        integers or floats of the same type.
+    """
+    # pragma pylint: disable=unidiomatic-typecheck
+    if type(value) not in (list, tuple) or len(value) < ARRAY_THRESHOLD:
+        return False
+    types = set(map(type, value))
+    if len(types) != 1 or not types.issubset(_DTYPES):
+        return False
+    if int in types:
+        return -_INT_LIMIT <= min(value) and max(value) < _INT_LIMIT
+    return True
+
+
+def compact_values(value):
+    """Replace the large sequences of numbers by :class:`NumericValues`
+    objects.
+
+    The dicts (and the dicts in the lists) are changed in place.
+
+    Arguments:
+        value (misc): Value of a keyword or storage dict.
+
+    Returns:
+        misc: The value itself or a :class:`NumericValues` object.
+    """
+    if isinstance(value, dict):
+        for key, item in value.items():
+            value[key] = compact_values(item)
+    elif isinstance(value, (list, tuple)) and not isinstance(value,
+                                                             NumericValues):
+        if is_numeric_sequence(value):
+            return NumericValues(value, isinstance(value, list))
+        for item in value:
+            if isinstance(item, dict):
+                compact_values(item)
+    return value
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2016 EDF R&D
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License Version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, you may download a copy of license
+# from https://www.gnu.org/licenses/gpl-3.0.
+
+"""
+Syntax cache
+------------
+
+Cache of the results of the syntax checking of the commands.
+
+The result of the syntax checker only depends on the catalog of the command,
+on its keywords and on the types of the results it uses (and the values of
+the variables). These informations are summarized by a key, so that the
+identical commands (in the different cases, in the copies of a stage, after
+an undo...) are checked only once.
+
+The cache is shared by all the commands and keeps the most recently used
+results. Its size is given by the ``ASTERSTUDY_SYNTAX_CACHE_SIZE``
+environment variable (10000 by default, 0 disables the cache).
+
+"""
+
+
+import os
+from collections import OrderedDict
+
+from ...common import debug_message
+from .numeric import NumericValues
+
+_SCALARS = (type(None), bool, int, float, complex, str)
+
+
+class _Unsupported(Exception):
+    """Raised for the values that can not be part of a key."""
+
+
+def _freeze(value):
+    """Return a hashable summary of a value."""
+    # pragma pylint: disable=unidiomatic-typecheck
+    if type(value) in _SCALARS:
+        return type(value), value
+    if isinstance(value, NumericValues):
+        return NumericValues, value.digest
+    if type(value) in (list, tuple):
+        return type(value), tuple(_freeze(i) for i in value)
+    if isinstance(value, dict):
+        return dict, frozenset((key, _freeze(item))
+                               for key, item in value.items())
+    # commands and CO: the checker only uses their type (see `_gettype()`
+    # in the SyntaxChecker) and the evaluation of the variables
+    if hasattr(value, "gettype"):
+        evaluation = None
+        if hasattr(value, "evaluation"):
+            evaluation = _freeze(value.evaluation)
+        return "result", value.gettype(), evaluation
+    raise _Unsupported
+
+
+class SyntaxCache:
+    """Cache of the results of the syntax checker.
+
+    Arguments:
+        maxsize (int): Maximum number of results kept.
+
+    Attributes:
+        hits (int): Number of results found in the cache.
+        misses (int): Number of results not found in the cache.
+    """
+
+    def __init__(self, maxsize=None):
+        if maxsize is None:
+            try:
+                maxsize = int(os.getenv("ASTERSTUDY_SYNTAX_CACHE_SIZE",
+                                        10000))
+            except ValueError:
+                maxsize = 10000
+        self.maxsize = maxsize
+        self.hits = self.misses = 0
+        self._results = OrderedDict()
+
+    def __len__(self):
+        return len(self._results)
+
+    def key(self, cata, checker, storage):
+        """Return the key of a command.
+
+        Arguments:
+            cata (PartOfSyntax): Catalog of the command.
+            checker (class): Class of the syntax checker.
+            storage (dict): Keywords of the command.
+
+        Returns:
+            tuple: Key of the command, *None* if it can not be cached.
+        """
+        if self.maxsize <= 0:
+            return None
+        try:
+            return id(cata), checker, _freeze(storage)
+        except _Unsupported:
+            return None
+        except Exception as exc: # pragma pylint: disable=broad-except
+            debug_message("can not compute the syntax cache key:", exc)
+            return None
+
+    def get(self, key):
+        """Return the result of a command.
+
+        Arguments:
+            key (tuple): Key of the command (see `key()`).
+
+        Returns:
+            int: *Validity* of the command, *None* if it is unknown.
+        """
+        entry = self._results.get(key) if key is not None else None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._results.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key, cata, result):
+        """Store the result of a command.
+
+        Arguments:
+            key (tuple): Key of the command (see `key()`).
+            cata (PartOfSyntax): Catalog of the command, kept with the result
+                since its identifier is part of the key.
+            result (int): *Validity* of the command.
+        """
+        if key is None:
+            return
+        self._results[key] = (cata, result)
+        self._results.move_to_end(key)
+        while len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+
+    def clear(self):
+        """Remove all the results and reset the counters."""
+        self._results.clear()
+        self.hits = self.misses = 0
+
+    @property
+    def hit_rate(self):
+        """float: Ratio of the results found in the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.
+
+    def stats(self):
+        """Return the counters of the cache.
+
+        Returns:
+            dict: Number of hits, misses, stored results, maximum size and
+            hit rate.
+        """
+        return dict(hits=self.hits, misses=self.misses, size=len(self),
+                    maxsize=self.maxsize, hit_rate=self.hit_rate)
+
+
+#: Cache shared by all the commands.
+SYNTAX_CACHE = SyntaxCache()
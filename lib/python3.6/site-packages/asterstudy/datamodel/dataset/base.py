@@ -78,6 +78,12 @@ class DataSet(Node, metaclass=ABCMeta):
         """Stage: Attribute that holds a parent *Stage* of dataset."""
         return self.parent_nodes[0] if self.has_parents() else None
 
+    def after_touch(self):
+        """Reset the index of the visible names of the stage."""
+        stage = self.stage
+        if stage is not None:
+            stage.reset_visible_names()
+
     @property
     def mode(self):
         """int: Attribute that holds a type of dataset.
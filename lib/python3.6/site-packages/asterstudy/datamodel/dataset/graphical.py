@@ -127,12 +127,14 @@ class GraphicalDataSet(DataSet):
 
     def _set_position(self, command):
         """Insert a command at the right position."""
+        self.touch()
         self._before_insert(command)
         self._insert_id(command)
         self._after_insert(command)
 
     def _discard_position(self, command):
         """Remove an element from the list if it is a member."""
+        self.touch()
         try:
             self._ids.remove(command.uid)
         except ValueError:
@@ -231,41 +233,44 @@ class GraphicalDataSet(DataSet):
         cmdid = command.uid
         to_check = []
 
-        def depends_on_following(next_ids):
-            """Tell if the Command depends on a command that follows."""
-            deps = False
-            for idj in next_ids:
-                # if command is a child of cmd_idj:
-                if self._model.has_path(idj, cmdid):
-                    deps = True
-                    break
-            return deps
-
         self._discard_position(command)
         idx = 0
 
         ids = self._ids
+        # position of the last command the command depends on: the command
+        # depends on a command that follows the i-th one if i < last_parent
+        is_parent = [self._model.has_path(uid, cmdid) for uid in ids]
+        last_parent = max((i for i, deps in enumerate(is_parent) if deps),
+                          default=-1)
+
+        def depends_on_following(i):
+            """Tell if the Command depends on a command that follows."""
+            return i < last_parent
+
+        categ = command.categ
+
         for i, uid in enumerate(ids):
             # if command is a child of cmd_i
-            if self._model.has_path(uid, cmdid):
+            if is_parent[i]:
                 pass
             # elif cmd_i is a child of command
             elif self._model.has_path(cmdid, uid):
-                if not depends_on_following(ids[i + 1:]):
+                if not depends_on_following(i):
                     break
                 to_check.append(self.get_cmd(uid))
             # no direct dependencies
             else:
                 # if command depends on a command that follows,
                 # do not use other criteria
-                if depends_on_following(ids[i + 1:]):
+                if depends_on_following(i):
                     idx += 1
                     continue
                 cmd_i = self.get_cmd(uid)
-                if command.categ < cmd_i.categ:
+                categ_i = cmd_i.categ
+                if categ < categ_i:
                     # debug_message("criteria: category", level=2)
                     break
-                elif command.categ == cmd_i.categ:
+                elif categ == categ_i:
                     if command.uid < uid:
                         # debug_message("criteria: creation order", level=2)
                         break
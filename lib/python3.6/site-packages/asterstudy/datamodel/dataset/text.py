@@ -153,6 +153,7 @@ class TextDataSet(PatchedDataSet):
 
     @text.setter
     def text(self, text):
+        self.touch()
         self._text = to_unicode(text)
 
     def __len__(self):
@@ -0,0 +1,427 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2016 EDF R&D
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License Version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, you may download a copy of license
+# from https://www.gnu.org/licenses/gpl-3.0.
+
+"""
+Dependency index
+----------------
+
+Engines that store the reachability relation between the nodes of an
+:class:`.AbstractDataModel`.
+
+The data model notifies its engine each time a node is registered or
+removed and each time a parent/child relation is added or removed.
+The engine answers to :meth:`DependencyIndex.has_path` requests.
+
+Two engines are provided:
+
+- :class:`MatrixDependencyIndex`: the historical dense adjacency matrix.
+  Adding a node reallocates the whole matrix (quadratic memory).
+
+- :class:`BitsetDependencyIndex`: each node owns a bitset of its ancestors
+  stored as a Python integer. Inserting a node costs a dictionary insertion
+  and, when it gets a parent, a bitwise *or* of the bitsets (linear in the
+  identifier of the node, by machine words). The memory is still quadratic
+  but 128 times smaller than the dense matrix.
+
+"""
+
+
+import numpy as NP
+
+from ..common import no_new_attributes
+
+
+class DependencyIndex:
+    """Interface of a dependency index engine.
+
+    Node identifiers start at 1 and are never reused by the data model.
+    """
+
+    __setattr__ = no_new_attributes(object.__setattr__)
+
+    def register(self, node):
+        """Register a new node (without any relation)."""
+        raise NotImplementedError("must be implemented in a subclass")
+
+    def unregister(self, node):
+        """Remove a node: it is no more an ancestor or a descendant."""
+        raise NotImplementedError("must be implemented in a subclass")
+
+    def has_path(self, node_id1, node_id2):
+        """Tell if *node_id1* is an ancestor of *node_id2*.
+
+        Arguments:
+            node_id1 (int): Identifier of the first node.
+            node_id2 (int): Identifier of the second node.
+
+        Returns:
+            bool: *True* if there is a path from `node1` to `node2`.
+        """
+        raise NotImplementedError("must be implemented in a subclass")
+
+    def update_parent(self, node, parent):
+        """Called after `parent` has been added to the parents of `node`."""
+        raise NotImplementedError("must be implemented in a subclass")
+
+    def remove_parent(self, node, parent):
+        """Called after `parent` has been removed from the parents of `node`.
+        """
+        raise NotImplementedError("must be implemented in a subclass")
+
+    def update_child(self, node, child):
+        """Called after `child` has been added to the children of `node`."""
+        raise NotImplementedError("must be implemented in a subclass")
+
+    def remove_child(self, node, child):
+        """Called after `child` has been removed from the children of `node`.
+        """
+        raise NotImplementedError("must be implemented in a subclass")
+
+    def rebuild(self, nodes):
+        """Reset the index from the parent/child relations of `nodes`.
+
+        Used after the nodes have been restored in place (for example by
+        the undo/redo journal).
+
+        Arguments:
+            nodes (list[Node]): All the nodes registered in the model.
+        """
+        self.__init__()
+        nodes = sorted(nodes, key=lambda node: node.uid)
+        for node in nodes:
+            self.register(node)
+        for node in nodes:
+            for parent in node.parent_nodes:
+                self.update_parent(node, parent)
+
+    def refresh(self, nodes, restored, removed):
+        """Update the index after some nodes have been restored in place
+        (for example by the undo/redo journal).
+
+        The default implementation rebuilds the whole index.
+
+        Arguments:
+            nodes (iterable[Node]): All the nodes registered in the model.
+            restored (list[Node]): Nodes whose state has been restored,
+                including the new ones.
+            removed (list[int]): Identifiers of the removed nodes.
+        """
+        # pragma pylint: disable=unused-argument
+        self.rebuild(nodes)
+
+    def to_array(self):
+        """Return the dependencies as a dense adjacency matrix.
+
+        Only intended for debugging and testing purposes.
+
+        Returns:
+            numpy.ndarray: Matrix where ``G[i - 1, j - 1]`` is 1 if node *i*
+            is an ancestor of node *j* (or if *i* equals *j*).
+        """
+        raise NotImplementedError("must be implemented in a subclass")
+
+
+class MatrixDependencyIndex(DependencyIndex):
+    """Dense adjacency matrix: if there is a connection from node i to node
+    j then ``G[i - 1, j - 1] = 1``, and 0 elsewhere.
+
+    The matrix is reallocated each time a node is registered.
+    """
+
+    _deps = None
+    __setattr__ = no_new_attributes(object.__setattr__)
+
+    def __init__(self):
+        self._deps = NP.zeros((0, 0), NP.int_)
+
+    def register(self, node):
+        """Resize the adjacency matrix."""
+        node_id = node.uid
+        prev = self._deps
+        dim = prev.shape[0]
+        self._deps = NP.zeros((node_id, node_id), NP.int_)
+        self._deps[:dim, :dim] = prev
+        self._deps[node_id - 1, node_id - 1] = 1
+
+    def unregister(self, node):
+        """Remove a node from adjacency matrix."""
+        node_id = node.uid
+
+        self._deps[node_id - 1, :] = 0
+        self._deps[:, node_id - 1] = 0
+
+    def has_path(self, node_id1, node_id2):
+        """See :meth:`DependencyIndex.has_path`."""
+        return self._deps[node_id1 - 1, node_id2 - 1] == 1
+
+    def update_parent(self, node, parent):
+        """
+        Add a parent to a node in adjacency matrix.
+
+        The implementation preserves transitive closure.
+        """
+        self._deps[parent.uid - 1, node.uid - 1] = 1
+        for ancestor in parent.parent_nodes:
+            self.update_parent(node, ancestor)
+
+    def remove_parent(self, node, parent):
+        """
+        Remove a parent from a node in adjacency matrix.
+
+        Warning:
+            The implementation assumes that relation has been
+                removed from 'datamodel' before this function is called.
+            The developer is responsible for ensuring that when
+                calling this method.
+        """
+        # If not a direct parent
+        if parent not in node.parent_nodes:
+            self._deps[parent.uid - 1, node.uid - 1] = 0
+        for ancestor in parent.parent_nodes:
+            self.remove_parent(node, ancestor)
+
+    def update_child(self, node, child):
+        """
+        Add a child to a node in adjacency matrix.
+
+        The implementation preserves transitive closure.
+        """
+        uid = node.uid
+        self._deps[uid - 1, child.uid - 1] = 1
+        for grandchild in child.child_nodes:
+            self.update_child(node, grandchild)
+
+    def remove_child(self, node, child):
+        """
+        Remove a child of a node in adjacency matrix.
+
+        Warning:
+            The implementation assumes that relation has been
+                removed from 'datamodel' before this function is called.
+            The developer is responsible for ensuring that when
+                calling this method.
+        """
+        # If not a direct descendant
+        if child.uid not in node.children:
+            self._deps[node.uid - 1, child.uid - 1] = 0
+        for grandchild in child.child_nodes:
+            self.remove_child(node, grandchild)
+
+    def to_array(self):
+        """See :meth:`DependencyIndex.to_array`."""
+        return self._deps.copy()
+
+
+class BitsetDependencyIndex(DependencyIndex):
+    """Transitive closure stored as per-node ancestors bitsets.
+
+    The bit *i* of ``_ancestors[j]`` is set if node *i* is an ancestor of
+    node *j*; the bit *j* is always set. The bitset of node *j* therefore
+    uses *j* bits (rounded to 30-bit digits), the whole index uses
+    about *N^2 / 16* bytes for *N* nodes: the same order as the dense
+    matrix but 128 times smaller, and without reallocation when a node is
+    added. The ancestors of a command are dense in practice (the case, the
+    stages, their datasets and the commands it depends on), so integer
+    bitsets are more compact than sets of identifiers.
+
+    The closure is kept exact: adding a relation propagates the ancestors
+    of the parent to the descendants of the child (stopping as soon as a
+    descendant already knows them) and removing a relation recomputes the
+    ancestors of the descendants in topological order.
+    """
+
+    _ancestors = None
+    __setattr__ = no_new_attributes(object.__setattr__)
+
+    def __init__(self):
+        self._ancestors = {}
+
+    def register(self, node):
+        """See :meth:`DependencyIndex.register`."""
+        self._ancestors[node.uid] = 1 << node.uid
+
+    def unregister(self, node):
+        """See :meth:`DependencyIndex.unregister`.
+
+        The bit of the node is not cleared in the bitsets of its former
+        descendants since identifiers are never reused: `has_path` checks
+        that both nodes are still registered.
+        """
+        self._ancestors.pop(node.uid, None)
+
+    def has_path(self, node_id1, node_id2):
+        """See :meth:`DependencyIndex.has_path`."""
+        if node_id1 not in self._ancestors:
+            return False
+        return self._ancestors.get(node_id2, 0) >> node_id1 & 1 == 1
+
+    def update_parent(self, node, parent):
+        """See :meth:`DependencyIndex.update_parent`."""
+        self._propagate(node, self._ancestors.get(parent.uid, 0))
+
+    def update_child(self, node, child):
+        """See :meth:`DependencyIndex.update_child`."""
+        self._propagate(child, self._ancestors.get(node.uid, 0))
+
+    def remove_parent(self, node, parent):
+        """See :meth:`DependencyIndex.remove_parent`."""
+        self._recompute(node)
+
+    def remove_child(self, node, child):
+        """See :meth:`DependencyIndex.remove_child`."""
+        self._recompute(child)
+
+    def rebuild(self, nodes):
+        """See :meth:`DependencyIndex.rebuild`.
+
+        The bitsets are computed once per node, parents first.
+        """
+        known = set(node.uid for node in nodes)
+        ancestors = self._ancestors = {}
+        for node in nodes:
+            stack = [(node, False)]
+            while stack:
+                item, done = stack.pop()
+                if item.uid in ancestors:
+                    continue
+                parents = [parent for parent in item.parent_nodes
+                           if parent.uid in known]
+                if done:
+                    bits = 1 << item.uid
+                    for parent in parents:
+                        bits |= ancestors[parent.uid]
+                    ancestors[item.uid] = bits
+                    continue
+                stack.append((item, True))
+                stack.extend((parent, False) for parent in parents
+                             if parent.uid not in ancestors)
+
+    def refresh(self, nodes, restored, removed):
+        """See :meth:`DependencyIndex.refresh`.
+
+        Only the restored nodes and their descendants are recomputed: the
+        ancestors of another node can not have changed since the relations
+        are stored by both ends.
+        """
+        ancestors = self._ancestors
+        for uid in removed:
+            ancestors.pop(uid, None)
+        for node in restored:
+            ancestors.setdefault(node.uid, 1 << node.uid)
+        for item in _topological_descendants(*restored):
+            ancestors[item.uid] = self._closure_of(item)
+
+    def _propagate(self, node, bits):
+        """Add `bits` to the ancestors of `node` and of its descendants."""
+        ancestors = self._ancestors
+        stack = [node]
+        while stack:
+            item = stack.pop()
+            current = ancestors.get(item.uid)
+            if current is None:
+                continue
+            new = current | bits
+            # descendants already contain the ancestors of this node
+            if new == current:
+                continue
+            ancestors[item.uid] = new
+            stack.extend(_children(item))
+
+    def _recompute(self, node):
+        """Recompute the ancestors of `node` and of its descendants."""
+        ancestors = self._ancestors
+        if node.uid not in ancestors:
+            return
+        if self._closure_of(node) == ancestors[node.uid]:
+            return
+        for item in _topological_descendants(node):
+            if item.uid in ancestors:
+                ancestors[item.uid] = self._closure_of(item)
+
+    def _closure_of(self, node):
+        """Return the ancestors bitset of `node` built from its parents."""
+        ancestors = self._ancestors
+        bits = 1 << node.uid
+        for parent in node.parent_nodes:
+            bits |= ancestors.get(parent.uid, 0)
+        return bits
+
+    def to_array(self):
+        """See :meth:`DependencyIndex.to_array`."""
+        dim = max(self._ancestors, default=0)
+        deps = NP.zeros((dim, dim), NP.int_)
+        for uid2, bits in self._ancestors.items():
+            for uid1 in self._ancestors:
+                if bits >> uid1 & 1:
+                    deps[uid1 - 1, uid2 - 1] = 1
+        return deps
+
+
+def _children(node):
+    """Return the child nodes still registered in the model."""
+    model = node.model
+    if model is None:
+        return []
+    nodes = (model.get_node(uid) for uid in node.children)
+    return [child for child in nodes if child is not None]
+
+
+def _topological_descendants(*nodes):
+    """Return `nodes` and their descendants sorted in topological order."""
+    order = []
+    visited = set()
+    stack = [(node, False) for node in nodes]
+    while stack:
+        item, done = stack.pop()
+        if done:
+            order.append(item)
+            continue
+        if item.uid in visited:
+            continue
+        visited.add(item.uid)
+        stack.append((item, True))
+        stack.extend((child, False) for child in _children(item)
+                     if child.uid not in visited)
+    order.reverse()
+    return order
+
+
+INDEXES = {
+    'matrix': MatrixDependencyIndex,
+    'bitset': BitsetDependencyIndex,
+}
+
+#: Name of the engine used by default.
+DEFAULT_INDEX = 'bitset'
+
+
+def create_dependency_index(kind=None):
+    """Create a dependency index engine.
+
+    Arguments:
+        kind (Optional[str or type]): Name of the engine (see `INDEXES`)
+            or engine class. Defaults to `DEFAULT_INDEX`.
+
+    Returns:
+        DependencyIndex: New empty engine.
+    """
+    kind = kind or DEFAULT_INDEX
+    if isinstance(kind, str):
+        if kind not in INDEXES:
+            raise ValueError("unknown dependency index: {0!r}".format(kind))
+        kind = INDEXES[kind]
+    return kind()
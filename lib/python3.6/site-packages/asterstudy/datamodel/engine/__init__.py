@@ -38,6 +38,7 @@ class Engine:
     AsRun = 0x02
     Salome = 0x04
     Direct = 0x08
+    Local = 0x10
 
     # If revert to AsRun by default, see changeset 2e851e61bfe3 to restore
     # a relevant message about the job output
@@ -51,6 +52,7 @@ class Engine:
             Engine.AsRun: "AsRun",
             Engine.Salome: "Salome",
             Engine.Direct: "Direct",
+            Engine.Local: "Local",
         }[engine]
 
 def _select_engine(engine):
@@ -71,6 +73,10 @@ def _select_engine(engine):
         from .direct_runner import Direct, DirectInfos
         return Direct, DirectInfos
 
+    if engine & Engine.Local:
+        from .local_runner import Local, LocalInfos
+        return Local, LocalInfos
+
     raise TypeError(translate('Runner',
                               "Unknown engine type: {0}").format(engine))
 
@@ -105,6 +111,6 @@ def version_ismpi(version):
 def init_default_engine(engine):
     """Init default engine."""
     assert engine in (Engine.Simulator, Engine.AsRun, Engine.Salome,
-                      Engine.Direct)
+                      Engine.Direct, Engine.Local)
     Engine.Default = Engine.Simulator \
         if os.getenv('ASTERSTUDY_SIMULATOR') else engine
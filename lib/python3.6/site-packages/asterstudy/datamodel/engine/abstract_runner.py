@@ -24,12 +24,18 @@ Implementation of the common classes for code_aster runners.
 """
 
 
-from ...common import (RunnerError, build_url, debug_message, debug_message2,
-                       mount_enclosing_fs, translate)
+import threading
+import time
+
+from ...common import (FileFollower, RunnerError, appended_lines, build_url,
+                       debug_message, debug_message2, mount_enclosing_fs,
+                       translate)
+from ...common.execution import remove_mpi_output
 from ..case import Case
 from ..result import StateOptions as SO
-from ..result import Job
+from ..result import Job, MessageStream
 from ..stage import Stage
+from .server_cache import SERVERS_CACHE
 
 
 class Runner:
@@ -51,6 +57,8 @@ class Runner:
         _interm (list[Result]): Stack of intermediate results to calculate.
         _logger (function): Callback for logging of server commands.
         _console (function): Callback for the console (jobs output).
+        _followers (dict): Followers of the output of the running stages,
+            indexed by stage uid.
     """
 
     def __init__(self, case, **kwargs):
@@ -61,6 +69,7 @@ class Runner:
         self._interm = []
         self._logger = kwargs.get('logger', debug_message)
         self._console = kwargs.get('console', debug_message)
+        self._followers = {}
 
         for result in self._case.results():
             if result.state & SO.NotFinished:
@@ -111,6 +120,27 @@ class Runner:
     def cleanup(self):
         """Cleanup function, called when a RunCase is removed."""
 
+    def output_follower(self, remove=False):
+        """Return the follower of the output of the current stage.
+
+        Arguments:
+            remove (bool): If *True*, the follower is forgotten (at the end
+                of the stage).
+
+        Returns:
+            OutputFollower: Follower of the output.
+        """
+        uid = self.current_stage.uid
+        if remove:
+            return self._followers.pop(uid, None) or OutputFollower()
+        return self._followers.setdefault(uid, OutputFollower())
+
+    def close_followers(self):
+        """Stop following the outputs of all the stages."""
+        for follower in self._followers.values():
+            follower.close()
+        self._followers.clear()
+
     def check_parameters(self, params):
         """Check parameters before starting.
         Save parameters into the `_params` attribute.
@@ -174,6 +204,22 @@ class Runner:
         """Refresh state of all *not finished* results."""
         raise NotImplementedError("must be sub-classed")
 
+    def wait(self, timeout):
+        """Wait until the state of the current result may have changed.
+
+        The default implementation just sleeps: the state has to be polled.
+        The runners that are notified of the end of their executions return
+        as soon as it happens.
+
+        Arguments:
+            timeout (float): Maximum waiting time in seconds.
+
+        Returns:
+            bool: *True* if the state has changed, *False* if it is unknown.
+        """
+        time.sleep(max(timeout, 0.))
+        return False
+
     def stop_current(self):
         """Implementation of the core of 'stop' action.
 
@@ -235,18 +281,115 @@ class Runner:
         return ':'.join(names)
 
 
+class OutputFollower:
+    """Extract the messages from the output of a running stage.
+
+    Only the new part of the output is analyzed at each refresh, the state
+    of the analysis being kept between the refreshes
+    (see :class:`~asterstudy.datamodel.result.message.MessageStream`).
+    """
+
+    def __init__(self):
+        self._stream = MessageStream()
+        self._lines = []
+        self._file = None
+        self._remote = None
+
+    def from_tail(self, text):
+        """Return the new messages from the last lines of the output.
+
+        The lines already analyzed are recognized in the last lines read at
+        the previous refresh.
+
+        Arguments:
+            text (str): Last lines of the output.
+
+        Returns:
+            list[Message]: Messages found in the new lines.
+        """
+        # the last line may be incomplete
+        lines = text.splitlines()[:-1]
+        new = appended_lines(self._lines, lines)
+        self._lines = lines
+        return self._stream.feed("".join([line + "\n" for line in new]))
+
+    def from_file(self, filename, nbline=None):
+        """Return the new messages from a local output file.
+
+        Only the bytes appended since the previous refresh are read.
+
+        Arguments:
+            filename (str): Path of the output file.
+            nbline (int): Start from the last *nbline* lines at the first
+                reading.
+
+        Returns:
+            (str, list[Message]): Text appended (output of the other MPI
+            processors excluded) and messages found in this text.
+        """
+        if self._file is None or self._file.filename != filename:
+            self._file = FileFollower(filename, nbline)
+        text = remove_mpi_output(self._file.read())
+        return text, self._stream.feed(text)
+
+    def from_remote(self, streams, user, host, path, nbline=None):
+        """Return the new messages from a remote output file.
+
+        Only the bytes appended since the previous refresh are transferred.
+
+        Arguments:
+            streams (RemoteLogStreams): Object that reads the remote logs.
+            user (str): User name on the remote host.
+            host (str): Host name to be addressed by SSH.
+            path (str): Path of the output file on the remote host.
+            nbline (int): Start from the last *nbline* lines at the first
+                reading.
+
+        Returns:
+            (str, list[Message]): Text appended (output of the other MPI
+            processors excluded) and messages found in this text.
+        """
+        self._remote = (streams, (user, host, path))
+        text = streams.read(user, host, path, nbline)
+        return text, self._stream.feed(text)
+
+    def close(self):
+        """Stop following the output."""
+        if self._remote:
+            streams, key = self._remote
+            streams.forget(*key)
+            self._remote = None
+
+
 class ServerInfos:
-    """Abstract class that provides informations of the servers."""
+    """Abstract class that provides informations of the servers.
+
+    The informations of the servers are stored in a persistent cache (see
+    :mod:`datamodel.engine.server_cache`): they are read from the cache
+    before being refreshed from the servers.
+
+    Attributes:
+        server_cache (ServerCache): Cache of the servers informations.
+    """
 
     def __init__(self, **kwargs):  # pragma pylint: disable=unused-argument
         self._servers = []
         self._refreshed = set()
+        self._configs = {}
+        self._inflight = {}
+        self._threads = []
+        self._lock = threading.Lock()
+        self.server_cache = SERVERS_CACHE
 
     @property
     def available_servers(self):
         """Return the list of available servers."""
         return self._servers
 
+    def server_config(self, server):
+        """Returns a dict with server configuration."""
+        return self._configs.setdefault(server, {})
+
     def server_username(self, server):
         """Return the username to be used on a server.
 
@@ -301,11 +444,158 @@ class ServerInfos:
         """
         raise NotImplementedError("must be sub-classed")
 
+    def _cache_key(self, server):
+        """Return the key of a server in the cache."""
+        return "{0}:{1}".format(type(self).__name__, server)
+
     def refresh_once(self, server, force=False):
-        """Refresh the informations of a server, only once per session."""
-        if force or server not in self._refreshed:
-            if self.refresh_one(server):
+        """Refresh the informations of a server, only once per session.
+
+        Unless *force* is *True*, the informations stored in the cache are
+        used. If they are out of date, they are refreshed in background.
+
+        Arguments:
+            server (str): Server name.
+            force (bool): Refresh the informations from the server.
+        """
+        if not force and server in self._refreshed:
+            return
+        if not force:
+            config, expired = self.server_cache.get(self._cache_key(server))
+            if config is not None:
+                self.server_config(server).update(config)
                 self._refreshed.add(server)
+                if expired:
+                    self.refresh_all([server], wait=False)
+                return
+        if self._refresh(server):
+            self._refreshed.add(server)
+
+    def refresh_all(self, servers=None, timeout=30., max_workers=8,
+                    stale_only=False, wait=True, callback=None):
+        """Refresh the informations of several servers concurrently.
+
+        A server that does not answer before *timeout* does not delay the
+        others. Its informations will be stored when its refresh ends.
+
+        Arguments:
+            servers (list[str]): Servers names, all the available servers
+                by default.
+            timeout (float): Maximum waiting time in seconds.
+            max_workers (int): Maximum number of simultaneous refreshes.
+            stale_only (bool): Only refresh the servers that are not in the
+                cache or whose informations are out of date.
+            wait (bool): If *False*, the refresh is done in background.
+            callback (callable): Function called with the results at the
+                end of a refresh done in background (from the background
+                thread).
+
+        Returns:
+            dict: *True* for the refreshed servers, *False* for those that
+            failed and *None* for those that did not answer in time. If
+            *wait* is *False*, the background thread is returned.
+        """
+        servers = list(self.available_servers if servers is None
+                       else servers)
+        if stale_only:
+            servers = [server for server in servers
+                       if self.server_cache.get(self._cache_key(server))[1]]
+        if not wait:
+            def _background():
+                results = self.refresh_all(servers, timeout, max_workers)
+                if callback is not None:
+                    callback(results)
+
+            thread = threading.Thread(target=_background, daemon=True)
+            self._start(thread)
+            return thread
+
+        results = dict.fromkeys(servers)
+        semaphore = threading.BoundedSemaphore(max(max_workers, 1))
+
+        def _worker(server):
+            with semaphore:
+                try:
+                    results[server] = self._refresh(server)
+                except Exception as exc: # pragma pylint: disable=broad-except
+                    debug_message("refresh of {0!r} failed: {1}"
+                                  .format(server, exc))
+                    results[server] = False
+                if results[server]:
+                    self._refreshed.add(server)
+
+        threads = [threading.Thread(target=_worker, args=(server, ),
+                                    daemon=True)
+                   for server in servers]
+        for thread in threads:
+            self._start(thread)
+        deadline = time.time() + timeout
+        for thread in threads:
+            thread.join(max(deadline - time.time(), 0.))
+        results = dict(results)
+        late = [server for server, done in results.items() if done is None]
+        if late:
+            debug_message("servers not refreshed in time:", late)
+        return results
+
+    def join(self, timeout=None):
+        """Wait for the end of the refreshes that are still running (those
+        done in background or not ended in time by `refresh_all()`).
+
+        Arguments:
+            timeout (float): Maximum waiting time in seconds, no limit by
+                default.
+
+        Returns:
+            bool: *True* if all the refreshes ended.
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            with self._lock:
+                self._threads = [thread for thread in self._threads
+                                 if thread.is_alive()]
+                threads = list(self._threads)
+            if not threads:
+                return True
+            if deadline is not None and time.time() >= deadline:
+                return False
+            for thread in threads:
+                thread.join(None if deadline is None
+                            else max(deadline - time.time(), 0.))
+
+    def _start(self, thread):
+        """Start a refresh thread, that can be waited for by `join()`."""
+        with self._lock:
+            self._threads.append(thread)
+        thread.start()
+
+    def _refresh(self, server):
+        """Refresh the informations of a server and store them in the cache.
+
+        If the server is already being refreshed by another thread, it waits
+        for the end of this refresh.
+
+        Returns:
+            bool: *True* if it succeeded, *False* otherwise.
+        """
+        with self._lock:
+            event = self._inflight.get(server)
+            running = event is not None
+            if not running:
+                event = self._inflight[server] = threading.Event()
+        if running:
+            event.wait()
+            return server in self._refreshed
+        try:
+            done = bool(self.refresh_one(server))
+        finally:
+            with self._lock:
+                del self._inflight[server]
+            event.set()
+        if done:
+            self.server_cache.set(self._cache_key(server),
+                                  self.server_config(server))
+        return done
 
     def refresh_one(self, server): # pragma: pylint disable=unused-argument
         """Refresh the informations of a server.
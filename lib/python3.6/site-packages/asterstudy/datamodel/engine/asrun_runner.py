@@ -101,6 +101,7 @@ class AsRun(Runner):
         if self.current.state & SO.Finished:
             self.current.job.end_time = current_time()
             self.hdlr.get_results()
+            self.output_follower(remove=True)
             # parse message file if it exists
             stage = self.current_stage
             output = glob(osp.join(stage.folder, "message"))
@@ -117,8 +118,9 @@ class AsRun(Runner):
             self.console("\nLast {0} lines at {1}..."
                          .format(self._nbline, current_time()), reset=True)
             self.console(res.output)
-            # on partial output
-            self.current.add_messages(extract_messages(res.output))
+            # on partial output, only the new lines are analyzed
+            follower = self.output_follower()
+            self.current.add_messages(follower.from_tail(res.output))
 
     def start_current(self):
         """Activate calculation simulation for next result."""
@@ -106,6 +106,10 @@ class Direct(Runner):
             self.current.job.end_time = current_time()
             self._update_result()
 
+    def wait(self, timeout):
+        """The executions are synchronous: nothing to wait for."""
+        return True
+
     def stop_current(self):
         """Stop the current calculation process."""
         return True
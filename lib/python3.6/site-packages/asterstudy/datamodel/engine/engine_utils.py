@@ -23,14 +23,18 @@ This module allows to manipulate asrun objects.
 
 """
 
+import base64
 import os
 import os.path as osp
 import platform
 import re
+import shlex
 import signal
 import subprocess as SP
+import time
 from collections import OrderedDict, defaultdict
 from functools import wraps
+from itertools import count
 from math import log10
 
 from ...common import (CFG, AsterStudyError, Features, RunnerError, copy_file,
@@ -38,7 +42,7 @@ from ...common import (CFG, AsterStudyError, Features, RunnerError, copy_file,
                        make_dirs, no_new_attributes, to_unicode, translate,
                        version)
 from ...common.conversion import FileProvider
-from ...common.execution import MPIPrefix
+from ...common.execution import MPIPrefix, remove_mpi_output
 from ...common.extfiles import external_file_export_to_med, gen_mesh_file_name
 from ...common.remote_utils import make_remote_path, remote_exec, url_gio2asrun
 from ..aster_parser import add_debut_fin, is_cmd_called
@@ -46,6 +50,8 @@ from ..general import FileAttr
 from ..result import Job, StateOptions
 from ..stage import UsageOptions as UO
 
+_COUNTER = count(1)
+
 
 def default_parameters():
     """Returns the default parameters for an execution."""
@@ -245,10 +251,9 @@ def exec_to_asrun(mode):
 
 def counter():
     """Returns a counter of execution to pass a unique id for each run."""
-    if not hasattr(counter, "idx"):
-        counter.idx = 0
-    counter.idx += 1
-    return counter.idx
+    # 'next' on 'itertools.count' is atomic: executions may be prepared
+    # by several threads
+    return next(_COUNTER)
 
 
 def create_profil_for_current(prof, case, stages, jobname, params, infos):
@@ -800,6 +805,112 @@ def remote_tail(user, host, pattern, nbline):
     return to_unicode(text)
 
 
+class RemoteLogStreams:
+    """Follow the logs of the jobs running on remote servers.
+
+    Only the bytes appended to a log since the previous reading are
+    transferred. The logs followed on the same server are read by a single
+    remote command: the new text of the other logs is kept until they are
+    read (if they are read within *max_age* seconds, no new remote command
+    is executed).
+
+    The text of a log is returned by complete lines, without the output of
+    the MPI processors other than the first one.
+
+    Arguments:
+        executor (callable): Function to execute a remote command, with the
+            same arguments as `remote_exec()`.
+        max_age (float): Delay during which the text already read is
+            returned without executing a new remote command (in seconds).
+    """
+    _marker = "@@ASTERSTUDY@@"
+    _script = (
+        "_delta() {{ "
+        "if [ ! -f \"$1\" ]; then echo \"{0} $3 -1 -1\"; return; fi; "
+        "s=$(wc -c < \"$1\"); o=$2; "
+        "if [ $o -lt 0 ]; then "
+        "o=$((s - $(head -c $s \"$1\" | tail -n $((-o)) | wc -c))); fi; "
+        "if [ $o -gt $s ]; then o=0; fi; "
+        "echo \"{0} $3 $o $s\"; "
+        "tail -c +$((o + 1)) \"$1\" | head -c $((s - o)) | base64; "
+        "}}; "
+    ).format(_marker)
+
+    def __init__(self, executor=remote_exec, max_age=1.):
+        self._exec = executor
+        self._max_age = max_age
+        # (user, host, path): [offset, pending text, time of the reading]
+        self._logs = OrderedDict()
+
+    def read(self, user, host, path, nbline=None):
+        """Return the text appended to a remote log since the last reading.
+
+        Arguments:
+            user (str): User name on the remote host.
+            host (str): Host name to be addressed by SSH.
+            path (str): Path of the log on the remote host.
+            nbline (int): If not *None*, the first reading starts from the
+                last *nbline* lines instead of the beginning of the log.
+
+        Returns:
+            str: New lines of the log.
+        """
+        key = (user, host, path)
+        if key not in self._logs:
+            self._logs[key] = [-nbline if nbline else 0, "", None]
+        log = self._logs[key]
+        if log[2] is None or time.time() - log[2] > self._max_age:
+            self._fetch(user, host)
+        text, log[1] = log[1], ""
+        return text
+
+    def offset(self, user, host, path):
+        """Return the offset of the next byte to be read of a log (*None*
+        if it is not followed)."""
+        log = self._logs.get((user, host, path))
+        return log[0] if log and log[0] >= 0 else None
+
+    def forget(self, user, host, path):
+        """Stop following a log."""
+        self._logs.pop((user, host, path), None)
+
+    def _fetch(self, user, host):
+        """Read the new bytes of all the logs followed on a server."""
+        logs = [(key[2], log) for key, log in self._logs.items()
+                if key[:2] == (user, host)]
+        command = self._script + "; ".join([
+            "_delta {0} {1} {2}".format(shlex.quote(path), log[0], i)
+            for i, (path, log) in enumerate(logs)])
+        msg = translate("Runner", "Getting job output on {0}...").format(host)
+        output = self._exec(user, host, command, ignore_errors=True,
+                            message=msg)[1]
+        now = time.time()
+        for _, log in logs:
+            log[2] = now
+        blocks = output.split(self._marker)[1:]
+        for block in blocks:
+            lines = block.split()
+            if len(lines) < 3 or not lines[0].isdigit() \
+                    or int(lines[0]) >= len(logs):
+                continue
+            log = logs[int(lines[0])][1]
+            offset = int(lines[1])
+            if offset < 0:
+                continue
+            try:
+                data = base64.b64decode("".join(lines[3:]))
+            except ValueError:
+                continue
+            # an incomplete line will be read again
+            data = data[:data.rfind(b"\n") + 1]
+            log[0] = offset + len(data)
+            log[1] += remove_mpi_output(to_unicode(data))
+
+
+#: Logs of the remote jobs that are being followed.
+REMOTE_LOGS = RemoteLogStreams()
+
+
 def kill_aster(jobid, user=None, host=None):
     """Kill a code_aster process executed in interactive mode.
 
@@ -24,6 +24,7 @@ Implementation of helper functions for executions.
 """
 
 
+import asyncio
 import time
 from math import exp
 
@@ -45,11 +46,15 @@ class CalcWatcher:
 
         watch.run()
 
-    or start it asynchronously and follow its state::
+    or start it asynchronously and wait for its completion::
 
         watch.start()
-        while not watch.is_finished():
-            pass
+        watch.wait(timeout=3600)
+
+    or, from a coroutine::
+
+        watch.start()
+        await watch.wait_async()
 
     Check the state::
 
@@ -182,10 +187,83 @@ class CalcWatcher:
     def run(self):
         """Execute the calculation and wait until its completion."""
         self.start()
+        self.wait()
+
+    def _check_finished(self):
+        """Refresh the state now and tell if the calculation is finished."""
+        self._t_refr = None
+        return self.is_finished()
+
+    def _delays(self, deadline):
+        """Generate the successive waiting times until *deadline*.
+
+        The delay doubles from 0.1 second up to the maximal delay between
+        refreshings (see `_do_refresh`).
+        """
+        delay = 0.1
+        while True:
+            wait = min(delay, self._refresh_delay())
+            if deadline is not None:
+                wait = min(wait, deadline - time.time())
+                if wait <= 0:
+                    return
+            yield wait
+            delay *= 2
+
+    def wait(self, timeout=None):
+        """Wait for the end of the calculation.
+
+        The runner returns as soon as it knows that the state changed (for
+        example at the end of a local process), otherwise the state is
+        polled with an increasing delay.
+
+        Arguments:
+            timeout (float): Maximum waiting time in seconds, no limit by
+                default (except the timeout of the calculation).
+
+        Returns:
+            bool: *True* if the calculation ended or expired, *False* if
+            *timeout* was reached before.
+        """
+        if self._runner is None:
+            return False
+        deadline = None if timeout is None else time.time() + timeout
+        delays = self._delays(deadline)
+        while not self._check_finished():
+            wait = next(delays, None)
+            if wait is None:
+                return False
+            if self._runner.wait(wait):
+                # the state changed: poll again quickly, same deadline
+                delays = self._delays(deadline)
+        return True
+
+    async def wait_async(self, timeout=None):
+        """Wait for the end of the calculation without blocking the event
+        loop (*asyncio*).
 
-        # waiting for the end of the calculation
-        while not self.is_finished():
-            pass
+        The state is refreshed in the default executor since it may have to
+        request a server.
+
+        Arguments:
+            timeout (float): Maximum waiting time in seconds, no limit by
+                default (except the timeout of the calculation).
+
+        Returns:
+            bool: *True* if the calculation ended or expired, *False* if
+            *timeout* was reached before.
+        """
+        if self._runner is None:
+            return False
+        loop = asyncio.get_event_loop()
+        deadline = None if timeout is None else time.time() + timeout
+        delays = self._delays(deadline)
+        while not await loop.run_in_executor(None, self._check_finished):
+            wait = next(delays, None)
+            if wait is None:
+                return False
+            await asyncio.sleep(wait)
+        return True
 
     def logfiles(self):
         """Returns the list of pathnames of the logfiles.
@@ -247,16 +325,21 @@ class CalcWatcher:
             return True
 
         now = time.time()
-        elapsed = now - self._t_init
-        time_limit = hms2s(self._params['time'])
-        tau = max([5., min([30., time_limit / 20.])])
-        delay = max([1., tau * (1. - exp(-elapsed / tau))])
-        if self._t_refr is not None and now - self._t_refr < delay:
+        if self._t_refr is not None and \
+                now - self._t_refr < self._refresh_delay():
             time.sleep(0.5)
             return False
 
         return True
 
+    def _refresh_delay(self):
+        """Return the minimal delay between refreshings (see
+        `_do_refresh`)."""
+        elapsed = max(time.time() - self._t_init, 0.)
+        time_limit = hms2s(self._params['time'])
+        tau = max([5., min([30., time_limit / 20.])])
+        return max([1., tau * (1. - exp(-elapsed / tau))])
+
     def set_engine(self, engine):
         """Select the engine to be used (mainly for unittest).
 
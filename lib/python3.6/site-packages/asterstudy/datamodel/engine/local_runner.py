@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2016 EDF R&D
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License Version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, you may download a copy of license
+# from https://www.gnu.org/licenses/gpl-3.0.
+
+"""
+Local runner
+------------
+
+This module defines a runner that executes code_aster on the local host
+through the local scheduler: several run cases may be executed at the same
+time, within the limits of the resources of the host.
+
+"""
+
+
+import os.path as osp
+
+from ...common import (RunnerError, current_time, debug_message2, to_unicode,
+                       translate, valid_filename)
+from ..result import Job
+from ..result import StateOptions as SO
+from ..result import extract_messages
+from .abstract_runner import Runner
+from .direct_runner import DirectInfos
+from .engine_utils import code_aster_exit_code, create_profil_for_current
+from .local_scheduler import SCHEDULER
+
+
+class Local(Runner):
+    """Runner that asynchronously executes the stages on the local host.
+
+    The stages of a case are submitted one after the other, each one when
+    the previous one succeeded. The executions of the different cases are
+    scheduled by :obj:`datamodel.engine.local_scheduler.SCHEDULER`.
+
+    Arguments:
+        case, params, logger: see
+            :obj:`datamodel.engine.abstract_runner.Runner`.
+
+    Attributes:
+        _infos (object): LocalInfos instance.
+        _scheduler (LocalScheduler): Scheduler of the jobs.
+        _nbline (int): Number of lines of the output shown while running.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._infos = LocalInfos()
+        self._scheduler = kwargs.get('scheduler', SCHEDULER)
+        self._nbline = 50
+
+    def refresh(self):
+        """Refresh state of currently processed (calculated) result."""
+        if self.is_finished() or not self.is_started():
+            return
+        job = self.current.job
+        local = self._scheduler.job(job.jobid)
+        if local is None:
+            # the job was started by another session
+            self.log(translate('Runner', 'Job {0} is unknown')
+                     .format(job.jobid))
+            self.current.state = SO.Error
+            self._update_result()
+            return
+        debug_message2('Job {0}: status is {1}'
+                       .format(job.jobid, SO.name(local.state)))
+        if not local.state & SO.Finished:
+            self.current.state = local.state
+            if local.state & SO.Running:
+                follower = self.output_follower()
+                text, messages = follower.from_file(local.output,
+                                                    self._nbline)
+                self.current.add_messages(messages)
+                if text:
+                    self.console(text.rstrip(), reset=False)
+            return
+
+        job.start_time = local.start_time or job.start_time
+        job.end_time = local.end_time
+        self._scheduler.forget(job.jobid)
+        self.output_follower(remove=True).close()
+        state = local.state
+        output = self.current_stage.output_file()
+        if output and osp.isfile(output):
+            state = code_aster_exit_code(output)
+            with open(output, 'rb') as fileout:
+                text = to_unicode(fileout.read())
+            self.current.clear_messages()
+            self.current.add_messages(extract_messages(text))
+            state |= SO.Nook if 'NOOK' in text else 0
+        elif local.exitcode != 0:
+            self.log(translate('Runner', 'Execution of "{0}" failed')
+                     .format(self._name(self.current_stage)))
+        self.current.state = state
+        self._update_result()
+        # refresh next if any
+        self.refresh()
+
+    def start_current(self):
+        """Submit the execution of the current result."""
+        stage = self.current_stage
+        stages = self.stages_stack + [stage]
+        stagename = self._name(stage)
+        name = valid_filename(stagename)
+        params = self._params
+        stagedir = stage.folder
+        export = osp.join(stagedir, "export")
+        self.log(translate('Runner', 'Starting "{0}"...').format(stagename))
+
+        try:
+            prof = create_profil_for_current(None, self._case,
+                                             stages, name, params, self._infos)
+        except RunnerError as exc:
+            self.log("ERROR: {0}".format(exc.msg))
+            self.stop()
+            raise
+
+        with open(export, "w") as fexp:
+            fexp.write(prof.get_content())
+
+        job = self.current.job
+        job.jobid = self._scheduler.submit(["as_run", export], stagedir,
+                                           osp.join(stagedir, "output"),
+                                           params)
+        job.start_time = current_time()
+        job.server = params['server']
+        job.name = name
+        job.mode = Job.text_to_mode(params['mode'])
+        job.set_parameters_from(params)
+        job.description = params.get('description', '')
+        self.current.state = SO.Pending
+        self.refresh()
+
+    def wait(self, timeout):
+        """Wait for the end of the process of the current result."""
+        if self.current is None:
+            return True
+        return self._scheduler.wait(self.current.job.jobid, timeout)
+
+    def stop_current(self):
+        """Stop the current calculation process."""
+        if self.current is None or self.current.state & SO.Finished:
+            return False
+        self.current.state = SO.Error
+        jobid = self.current.job.jobid
+        stopped = self._scheduler.cancel(jobid)
+        self._scheduler.forget(jobid)
+        return stopped
+
+    def _update_result(self):
+        """
+        Assign calculation state to the first result and remove
+        it from list. In successfull case begin simulation for next
+        result or interrupt simulation otherwise.
+        """
+        stagename = self._name(self.current_stage)
+        if self.current.state & SO.Error:
+            self.log(translate('Runner',
+                               'Stage "{0}" calculation failed. Interruption')
+                     .format(stagename))
+            self.cancel_next()
+        else:
+            self.log(translate('Runner',
+                               'Stage "{0}" calculation succeeded')
+                     .format(stagename))
+            self._queue.pop(0)
+            self.start_next()
+
+
+class LocalInfos(DirectInfos):
+    """Server informations for the local scheduler."""
+
+    def server_modes(self, server):
+        """Give the modes supported by `server`.
+
+        Returns:
+            list(str): List of modes (as text).
+        """
+        return [Job.BatchText, Job.InteractiveText]
@@ -0,0 +1,369 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2016 EDF R&D
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License Version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, you may download a copy of license
+# from https://www.gnu.org/licenses/gpl-3.0.
+
+"""
+Local scheduler
+---------------
+
+Scheduler of the executions on the local host.
+
+The jobs are started as asynchronous processes as soon as the resources they
+need are available. The resources are budgets of processors, of memory (in
+MB) and of MPI slots. A job uses *mpicpu x threads* processors,
+*mpicpu x memory* of memory and *mpicpu* MPI slots if it is a parallel
+execution.
+
+The jobs are admitted in the order of their submission: a job that does not
+fit in the remaining budgets makes the following ones wait, so that the large
+executions are not delayed indefinitely by the small ones. A job that
+requires more than the whole budgets is started alone.
+
+The budgets default to the number of processors and the physical memory of
+the host. They can be changed by the ``ASTERSTUDY_LOCAL_CPUS``,
+``ASTERSTUDY_LOCAL_MEMORY`` and ``ASTERSTUDY_LOCAL_MPI`` environment
+variables or by `LocalScheduler.configure()`.
+
+"""
+
+
+import os
+import signal
+import subprocess
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from ...common import current_time, debug_message
+from ..result import StateOptions as SO
+
+
+def _physical_memory():
+    """Return the physical memory of the host in MB (*None* if unknown)."""
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * \
+            os.sysconf('SC_PHYS_PAGES') // 1024 ** 2
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def _env_budget(name, default):
+    """Return a budget from the environment."""
+    try:
+        return int(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
+def job_requirements(params):
+    """Return the resources needed by an execution.
+
+    Arguments:
+        params (dict): Parameters of the execution.
+
+    Returns:
+        tuple(int): Number of processors, memory (in MB) and number of MPI
+        slots.
+    """
+    mpicpu = max(int(params.get('mpicpu') or 1), 1)
+    threads = max(int(params.get('threads') or 1), 1)
+    memory = int(float(params.get('memory') or 0))
+    return mpicpu * threads, mpicpu * memory, mpicpu if mpicpu > 1 else 0
+
+
+class LocalJob:
+    """A job managed by the local scheduler.
+
+    Attributes:
+        jobid (str): Identifier of the job.
+        command (list[str]): Command line.
+        cwd (str): Working directory.
+        output (str): File that receives the standard and error outputs.
+        cpus (int): Number of processors used.
+        memory (int): Memory used (in MB).
+        mpi (int): Number of MPI slots used.
+        state (int): *StateOptions.Pending*, *Running*, *Success* or *Error*.
+        exitcode (int): Exit code of the process (*None* while running).
+        start_time (str): Time when the process was started.
+        end_time (str): Time when the process ended.
+    """
+
+    def __init__(self, jobid, command, cwd, output, requirements):
+        self.jobid = jobid
+        self.command = command
+        self.cwd = cwd
+        self.output = output
+        self.cpus, self.memory, self.mpi = requirements
+        self.state = SO.Pending
+        self.exitcode = None
+        self.start_time = self.end_time = ''
+        self._process = None
+
+    def start(self):
+        """Start the process of the job."""
+        with open(self.output, 'wb') as output:
+            self._process = subprocess.Popen(self.command, cwd=self.cwd,
+                                             stdin=subprocess.DEVNULL,
+                                             stdout=output,
+                                             stderr=subprocess.STDOUT,
+                                             start_new_session=True)
+        self.state = SO.Running
+        self.start_time = current_time()
+
+    def poll(self):
+        """Check if the process ended.
+
+        Returns:
+            bool: *True* if the job just ended.
+        """
+        if self._process is None or self.exitcode is not None:
+            return False
+        exitcode = self._process.poll()
+        if exitcode is None:
+            return False
+        self._finish(exitcode)
+        return True
+
+    def wait(self, timeout):
+        """Wait for the end of the process.
+
+        Returns:
+            bool: *True* if the process ended.
+        """
+        if self._process is None:
+            return self.exitcode is not None
+        try:
+            self._process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            return False
+        return True
+
+    def kill(self, timeout=5.):
+        """Kill the process of the job and its children.
+
+        Arguments:
+            timeout (float): Delay given to the processes to end after the
+                termination signal, they are killed after this delay.
+        """
+        if self._process is not None and self.exitcode is None:
+            self._signal(signal.SIGTERM)
+            try:
+                exitcode = self._process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                self._signal(signal.SIGKILL)
+                exitcode = self._process.wait()
+            self._finish(exitcode)
+        else:
+            self.exitcode = -signal.SIGTERM
+            self.state = SO.Error
+            self.end_time = current_time()
+
+    def _signal(self, signum):
+        """Send a signal to the process of the job and its children."""
+        try:
+            os.killpg(self._process.pid, signum)
+        except OSError:
+            pass
+
+    def _finish(self, exitcode):
+        """Register the end of the job."""
+        self.exitcode = exitcode
+        self.state = SO.Success if exitcode == 0 else SO.Error
+        self.end_time = current_time()
+
+
+class LocalScheduler:
+    """Scheduler of the local executions.
+
+    Arguments:
+        cpus (int): Budget of processors.
+        memory (int): Budget of memory in MB (*None* means unlimited).
+        mpislots (int): Budget of MPI slots.
+
+    Attributes:
+        _pending (OrderedDict): Jobs waiting for resources.
+        _running (OrderedDict): Running jobs.
+        _ended (dict): Ended jobs, until they are forgotten.
+    """
+
+    def __init__(self, cpus=None, memory=None, mpislots=None):
+        self._lock = threading.RLock()
+        self._pending = OrderedDict()
+        self._running = OrderedDict()
+        self._ended = {}
+        self.cpus = self.memory = self.mpislots = None
+        ncpus = os.cpu_count() or 1
+        self.configure(
+            cpus=_env_budget("ASTERSTUDY_LOCAL_CPUS", cpus or ncpus),
+            memory=_env_budget("ASTERSTUDY_LOCAL_MEMORY",
+                               memory or _physical_memory()),
+            mpislots=_env_budget("ASTERSTUDY_LOCAL_MPI", mpislots or ncpus))
+
+    def configure(self, cpus=None, memory=None, mpislots=None):
+        """Change the budgets (the running jobs are not affected).
+
+        Arguments:
+            cpus (int): Budget of processors.
+            memory (int): Budget of memory in MB.
+            mpislots (int): Budget of MPI slots.
+        """
+        with self._lock:
+            self.cpus = cpus or self.cpus
+            self.memory = memory or self.memory
+            self.mpislots = mpislots or self.mpislots
+            self._admit()
+
+    def used(self):
+        """Return the resources used by the running jobs.
+
+        Returns:
+            tuple(int): Number of processors, memory and MPI slots used.
+        """
+        with self._lock:
+            jobs = list(self._running.values())
+        return (sum(job.cpus for job in jobs),
+                sum(job.memory for job in jobs),
+                sum(job.mpi for job in jobs))
+
+    def submit(self, command, cwd, output, params):
+        """Submit a job.
+
+        Arguments:
+            command (list[str]): Command line.
+            cwd (str): Working directory.
+            output (str): File that receives the outputs of the process.
+            params (dict): Parameters of the execution, used to compute
+                the resources needed by the job.
+
+        Returns:
+            str: Identifier of the job.
+        """
+        with self._lock:
+            # saved in the study: must not match a job of another session
+            jobid = uuid.uuid4().hex
+            job = LocalJob(jobid, command, cwd, output,
+                           job_requirements(params))
+            self._pending[jobid] = job
+            debug_message("local job {0} submitted: {1}".format(jobid,
+                                                                command))
+            self._admit()
+        return jobid
+
+    def job(self, jobid):
+        """Return a job after having updated the states of the jobs.
+
+        Arguments:
+            jobid (str): Identifier of the job.
+
+        Returns:
+            LocalJob: The job, *None* if it is unknown.
+        """
+        self.poll()
+        with self._lock:
+            return (self._pending.get(jobid) or self._running.get(jobid)
+                    or self._ended.get(jobid))
+
+    def wait(self, jobid, timeout):
+        """Wait for the end of a job.
+
+        Arguments:
+            jobid (str): Identifier of the job.
+            timeout (float): Maximum waiting time in seconds.
+
+        Returns:
+            bool: *True* if the job ended, *False* if it is still running or
+            pending.
+        """
+        with self._lock:
+            job = (self._pending.get(jobid) or self._running.get(jobid)
+                   or self._ended.get(jobid))
+        if job is None or job.state & SO.Finished:
+            return True
+        if job.state & SO.Pending:
+            # it will be started when another job ends
+            time.sleep(max(timeout, 0.))
+            ended = False
+        else:
+            ended = job.wait(timeout)
+        self.poll()
+        return ended
+
+    def forget(self, jobid):
+        """Forget an ended job."""
+        with self._lock:
+            self._ended.pop(jobid, None)
+
+    def cancel(self, jobid):
+        """Cancel a job, pending or running.
+
+        Returns:
+            bool: *True* if the job has been cancelled, *False* if it was
+            already ended or unknown.
+        """
+        with self._lock:
+            job = self._pending.pop(jobid, None) or \
+                self._running.pop(jobid, None)
+            if job is None:
+                return False
+            self._ended[jobid] = job
+        # the end of the process is not waited for with the lock held
+        job.kill()
+        with self._lock:
+            self._admit()
+        return True
+
+    def poll(self):
+        """Update the states of the running jobs and start the pending ones
+        that fit in the budgets."""
+        with self._lock:
+            for jobid, job in list(self._running.items()):
+                if job.poll():
+                    debug_message("local job {0} ended: {1}"
+                                  .format(jobid, job.exitcode))
+                    self._ended[jobid] = self._running.pop(jobid)
+            self._admit()
+
+    def _fits(self, job):
+        """Tell if a job fits in the remaining budgets."""
+        if not self._running:
+            return True
+        cpus, memory, mpi = self.used()
+        return (cpus + job.cpus <= self.cpus
+                and (self.memory is None
+                     or memory + job.memory <= self.memory)
+                and mpi + job.mpi <= self.mpislots)
+
+    def _admit(self):
+        """Start the pending jobs, in order, while they fit."""
+        while self._pending:
+            jobid, job = next(iter(self._pending.items()))
+            if not self._fits(job):
+                break
+            del self._pending[jobid]
+            try:
+                job.start()
+            except OSError as exc:
+                debug_message("local job {0} can not be started: {1}"
+                              .format(jobid, exc))
+                job.kill()
+                self._ended[jobid] = job
+                continue
+            self._running[jobid] = job
+
+
+#: Scheduler shared by all the local runners.
+SCHEDULER = LocalScheduler()
@@ -43,8 +43,8 @@ from ..result import StateOptions as SO
 from ..result import extract_messages
 from .abstract_runner import Runner, ServerInfos
 from .edf_servers import adapt_parameters
-from .engine_utils import (code_aster_exit_code, convert_launcher_state,
-                           convert_state_from_message,
+from .engine_utils import (REMOTE_LOGS, code_aster_exit_code,
+                           convert_launcher_state, convert_state_from_message,
                            create_profil_for_current, kill_aster,
                            parse_server_config, remote_exec, remote_file_copy,
                            remote_tail)
@@ -133,6 +133,7 @@ class Salome(Runner):
         if self.current.state & SO.Finished:
             job.end_time = current_time()
             self.get_job_results(job)
+            self.output_follower(remove=True).close()
             # parse message file if it exists
             output = self.current_stage.output_file()
             if output:
@@ -153,16 +154,29 @@ class Salome(Runner):
             # refresh next if any
             self.refresh()
         else:
-            self.console("\nLast {0} lines at {1}..."
-                         .format(self._nbline, current_time()), reset=False)
             salome_job = self.hdlr.getJobParameters(job.jobid_int)
-            text = remote_tail(self._infos.server_username(job.server),
-                               self._infos.server_hostname(job.server),
-                               osp.join(salome_job.work_directory,
-                                        "logs", "stderr_command_salome.log"),
-                               self._nbline)
-            self.current.add_messages(extract_messages(text))
-            self.console(text)
+            logfile = osp.join(salome_job.work_directory,
+                               "logs", "stderr_command_salome.log")
+            follower = self.output_follower()
+            user = self._infos.server_username(job.server)
+            host = self._infos.server_hostname(job.server)
+            if os.name == 'nt':
+                self.console("\nLast {0} lines at {1}..."
+                             .format(self._nbline, current_time()),
+                             reset=False)
+                text = remote_tail(user, host, logfile, self._nbline)
+                self.current.add_messages(follower.from_tail(text))
+                self.console(text)
+                return
+            # only read the lines appended since the last refresh
+            if is_localhost(host):
+                text, messages = follower.from_file(logfile, self._nbline)
+            else:
+                text, messages = follower.from_remote(REMOTE_LOGS, user, host,
+                                                      logfile, self._nbline)
+            self.current.add_messages(messages)
+            if text:
+                self.console(text.rstrip(), reset=False)
 
     def start_current(self):
         """Activate calculation simulation for next result."""
@@ -248,6 +262,8 @@ class Salome(Runner):
         if not self.current or self.current.state & SO.Finished:
             return False
         self.current.state = SO.Error
+        # the output of the job will not be refreshed anymore
+        self.output_follower(remove=True).close()
         job = self._init_job(self.current.job)
         if not job.assigned:
             return True
@@ -269,6 +285,7 @@ class Salome(Runner):
         # Warning: it should be "when a RunCase is deleted"
         # Currently "removed" means "not follow by the dashboard", no?
         debug_message2("cleanup execution")
+        self.close_followers()
 
     def _update_result(self):
         """
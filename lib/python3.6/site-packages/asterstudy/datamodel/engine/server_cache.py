@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2016 EDF R&D
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License Version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, you may download a copy of license
+# from https://www.gnu.org/licenses/gpl-3.0.
+
+"""
+Server cache
+------------
+
+Persistent cache of the informations of the servers (available versions,
+configuration...).
+
+The informations are read from the cache at startup, so that the servers can
+be used immediately, and are refreshed in background when they are older
+than a time-to-live (one day by default, changed by the
+``ASTERSTUDY_SERVERS_TTL`` environment variable, in seconds).
+
+"""
+
+
+import json
+import os
+import os.path as osp
+import threading
+import time
+
+from ...common import CFG, debug_message, make_dirs
+
+#: Version of the cache format.
+FORMAT = 1
+
+
+def _jsonable(value):
+    """Tell if a value can be stored in the cache."""
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return True
+    if isinstance(value, (list, tuple)):
+        return all(_jsonable(i) for i in value)
+    if isinstance(value, dict):
+        return all(isinstance(key, str) and _jsonable(val)
+                   for key, val in value.items())
+    return False
+
+
+def cacheable(config):
+    """Return the items of a server configuration that can be stored.
+
+    Arguments:
+        config (dict): Configuration of a server.
+
+    Returns:
+        dict: Items that can be stored in the cache.
+    """
+    return {key: value for key, value in config.items() if _jsonable(value)}
+
+
+class ServerCache:
+    """Persistent cache of the informations of the servers.
+
+    Arguments:
+        path (str): Path of the cache file.
+        ttl (float): Time-to-live of the informations, in seconds.
+    """
+
+    def __init__(self, path=None, ttl=None):
+        self.path = path or osp.join(osp.dirname(CFG.userrc),
+                                     "asterstudy_servers.json")
+        if ttl is None:
+            ttl = float(os.getenv("ASTERSTUDY_SERVERS_TTL", 86400))
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._data = None
+
+    def _content(self):
+        """Return the content of the cache, read at the first call."""
+        if self._data is None:
+            self._data = {}
+            try:
+                with open(self.path) as fobj:
+                    content = json.load(fobj)
+                if content.get('format') == FORMAT:
+                    self._data = content.get('servers', {})
+            except (OSError, ValueError, AttributeError):
+                pass
+        return self._data
+
+    def get(self, key):
+        """Return the informations of a server.
+
+        Arguments:
+            key (str): Identifier of the server.
+
+        Returns:
+            (dict, bool): Informations of the server (*None* if it is not in
+            the cache) and *True* if they are older than the time-to-live.
+        """
+        with self._lock:
+            entry = self._content().get(key)
+        if entry is None:
+            return None, True
+        return entry['config'], time.time() - entry['time'] > self.ttl
+
+    def set(self, key, config):
+        """Store the informations of a server.
+
+        The file is read again before being written to keep the informations
+        stored by the other sessions. Errors are ignored: the server will
+        just be refreshed at the next session.
+
+        Arguments:
+            key (str): Identifier of the server.
+            config (dict): Informations of the server.
+        """
+        with self._lock:
+            self._data = None
+            self._content()[key] = dict(time=time.time(),
+                                        config=cacheable(config))
+            self._save()
+
+    def invalidate(self, key=None):
+        """Forget the informations of a server (of all servers by default).
+        """
+        with self._lock:
+            if key is None:
+                self._content().clear()
+            else:
+                self._content().pop(key, None)
+            self._save()
+
+    def _save(self):
+        """Write the cache file (the lock must be held)."""
+        tmpfile = "{0}.{1}.{2}".format(self.path, os.getpid(),
+                                       threading.get_ident())
+        try:
+            make_dirs(osp.dirname(self.path))
+            with open(tmpfile, 'w') as fobj:
+                json.dump(dict(format=FORMAT, servers=self._content()), fobj)
+            os.replace(tmpfile, self.path)
+        except OSError as exc:
+            debug_message("can not write the servers cache:", exc)
+
+
+#: Cache shared by the servers informations objects.
+SERVERS_CACHE = ServerCache()
@@ -105,6 +105,14 @@ class Simulator(Runner):
             self.console("The job is running: {}"
                          .format(time.strftime("%H:%M:%S")))
 
+    def wait(self, timeout):
+        """Wait until the end of the simulated execution."""
+        if self._tinit is None or self._duration is None:
+            return super().wait(timeout)
+        remaining = self._tinit + self._duration - time.time()
+        time.sleep(max(min(remaining, timeout), 0.))
+        return remaining <= timeout
+
     def stop_current(self):
         """Stop the current calculation process."""
         assert self.current.state & SO.Running, self.current.state
@@ -50,7 +50,7 @@ class History(AbstractDataModel, RHistoryMixing):
     __version_number = _autocopy_enabled = _hid = _features = None
     __setattr__ = no_new_attributes(object.__setattr__)
 
-    def __init__(self, version=None):
+    def __init__(self, version=None, deps_index=None):
         """
         Create History.
 
@@ -58,8 +58,10 @@ class History(AbstractDataModel, RHistoryMixing):
             version (Optional[str]): Version of code_aster to use.
                 Defaults to *None*; in this case default version is
                 used.
+            deps_index (Optional[str]): Dependency index engine.
+                Defaults to *None*; in this case default engine is used.
         """
-        super().__init__()
+        super().__init__(deps_index)
         RHistoryMixing.__init__(self)
         self._hid = id(self)
         self.create_case("CurrentCase")
@@ -251,6 +253,30 @@ class History(AbstractDataModel, RHistoryMixing):
                 # no, 'remote_folder' may be change
                 self._remote_folder_base = None # pylint: disable=no-member
 
+    def load_stages(self, limit=None):
+        """
+        Load the stages whose loading has been deferred, in order (see
+        :meth:`.Stage.defer_loading`).
+
+        The model is not thread-safe: the stages must be loaded by the thread
+        that uses the model. The GUI loads them from its event loop, a few at
+        a time.
+
+        Arguments:
+            limit (Optional[int]): Maximum number of stages to load. All the
+                pending stages are loaded by default.
+
+        Returns:
+            int: Number of stages that are still pending.
+        """
+        stages = []
+        for case in self._cases:
+            stages.extend(stage for stage in case
+                          if not stage.is_loaded() and stage not in stages)
+        for stage in stages[:limit]:
+            stage.materialize()
+        return len([stage for stage in stages if not stage.is_loaded()])
+
     def check_dir(self, task):
         """
         Check study directory after a load.
@@ -333,7 +359,8 @@ class History(AbstractDataModel, RHistoryMixing):
         AbstractDataModel.save(model, file_name, serializer)
 
     @staticmethod
-    def load(file_name, serializer=None, strict=STRICT_DEFAULT, **kwargs):
+    def load(file_name, serializer=None, strict=STRICT_DEFAULT, lazy=False,
+             **kwargs):
         """
         Load model from a file.
 
@@ -343,6 +370,8 @@ class History(AbstractDataModel, RHistoryMixing):
             file_name (str): Path to Asterstudy persistence file.
             serializer (Optinal[any]): Serializer object.
                 Defaults to *None*.
+            lazy (Optional[bool]): If *True*, the graphical stages are
+                converted when they are used (see `load_stages()`).
             kwargs (Optional): Keywords arguments passed to the serializer.
 
         Returns:
@@ -350,6 +379,8 @@ class History(AbstractDataModel, RHistoryMixing):
         """
         # pragma pylint: disable=arguments-differ
         serializer = serializer_factory(file_name, serializer, strict)
+        if lazy:
+            kwargs['lazy'] = True
         return AbstractDataModel.load(file_name, serializer, **kwargs)
 
     @property
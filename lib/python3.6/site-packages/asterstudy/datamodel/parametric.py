@@ -57,6 +57,9 @@ def create_exec_function(casedir, input_vars, output_vars, parameters,
                          verbose=1):
     """Create the 'exec' for parametric study as expected by OpenTurns.
 
+    The code defines the function `_exec` that evaluates one point and the
+    function `_exec_sample` that evaluates several points at once.
+
     Arguments:
         casedir (str): Path to the parametric case directory (must contain the
             related export file named 'parametric.export').
@@ -98,6 +101,30 @@ def _exec({input_vars}):
 
     {output_vars} = results{first}
     return {output_vars}
+
+
+def _exec_sample(sample, max_workers=None):
+    from asterstudy.api import ParametricCalculation, StateOptions
+
+    # following parameters are set in the 'parametric.export' file
+    # but can be overridden here:
+    outputs, states = ParametricCalculation.run_many(
+        "{casedir}", [{input_names}], sample, max_workers=max_workers,
+        keep_results={verbosy}, logger=print,
+        version="{para[version]}",
+        memory={para[memory]},
+        time="{para[time]}",
+        mpicpu={para[mpicpu]},
+        nodes={para[nodes]},
+        threads={para[threads]},
+        language="{para[language]}",
+        args="{para[args]}")
+    failed = [list(sample[i]) for i, state in enumerate(states)
+              if not state & StateOptions.Success]
+    if failed or outputs.shape[1] != {len_output_vars}:
+        raise ValueError("Calculation failed with inputs: {{0}}"
+                         .format(failed))
+    return outputs
 """
     values = {
         'casedir': ".",
@@ -27,4 +27,4 @@ Implementation of Result objects within the study stage.
 from .utils import RunOptions, StateOptions, MsgLevel, MsgType
 from .mixing import CaseMixing, HistoryMixing, StageMixing
 from .execution import Job, Result
-from .message import extract_messages, Message
+from .message import extract_messages, Message, MessageStore, MessageStream
@@ -26,6 +26,7 @@ Implementation of objects that give access to execution results.
 
 
 from ...common import no_new_attributes, to_list, translate
+from .message import MessageStore
 from .utils import StateOptions
 
 
@@ -47,7 +48,7 @@ class Result:
         self._state = StateOptions.Waiting
         self._job = Job()
         self._has_remote = False
-        self._messages = []
+        self._messages = MessageStore()
 
     @property
     def stage(self):
@@ -140,7 +141,7 @@ class Result:
 
     @property
     def messages(self):
-        """Get the list of messages of this execution.
+        """MessageStore: Get the messages of this execution.
 
         Messages are returned in the order of creation that is supposed to be
         the raising order.
@@ -152,7 +153,7 @@ class Result:
 
         Useful to extract messages from a new fresh output file.
         """
-        self._messages = []
+        self._messages = MessageStore()
 
     def add_messages(self, msglist):
         """Add messages to the list of messages of this execution.
@@ -160,9 +161,8 @@ class Result:
         Arguments:
             msglist (list[Message]): List of messages to be added.
         """
-        existing = [msg.checksum for msg in self._messages]
         for msg in to_list(msglist):
-            if msg.checksum not in existing:
+            if not self._messages.contains(msg):
                 msg.set_stage(self.stage)
                 self._messages.append(msg)
 
@@ -21,14 +21,18 @@ Execution messages
 
 Implementation of objects that give access to the execution messages.
 
+The messages of an execution are stored by a :class:`MessageStore` that
+keeps their attributes in parallel arrays. The :class:`Message` objects are
+only created on demand.
+
 """
 
 
 import hashlib
 import os
 import re
+from array import array
 from collections import OrderedDict
-from math import log10
 
 from ...common import no_new_attributes, to_list, translate
 from ...common.execution import CMDTAG, remove_mpi_prefix
@@ -210,8 +214,275 @@ class Message:
         return self._unknown
 
 
+class MessageStore:
+    """Compact storage of execution messages.
+
+    The attributes of the messages are stored in parallel arrays, the texts
+    are stored once in a table of unique texts (messages emitted in a loop
+    share the same text). The positions of the messages are indexed by
+    level, by command and by a hash of their attributes (to find the
+    duplicates).
+
+    The store behaves as a read-only sequence of *Message*: the objects are
+    created when they are accessed, modifying them does not change the
+    store.
+    """
+    _level = _source = _case = _stage = _cmd = _line = _occ = _text = None
+    _texts = _text_ids = _extra = _by_level = _by_cmd = _by_hash = None
+    __setattr__ = no_new_attributes(object.__setattr__)
+
+    def __init__(self, msglist=None):
+        self.clear()
+        if msglist:
+            self.extend(msglist)
+
+    def clear(self):
+        """Remove all the messages."""
+        self._level = array('B')
+        self._source = array('B')
+        self._case = array('q')
+        self._stage = array('q')
+        self._cmd = array('q')
+        self._line = array('q')
+        self._occ = array('q')
+        self._text = array('l')
+        self._texts = []
+        self._text_ids = {}
+        self._extra = {}
+        self._by_level = {}
+        self._by_cmd = {}
+        self._by_hash = {}
+
+    def __len__(self):
+        return len(self._level)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("message index out of range")
+        msg = Message.__new__(Message)
+        msg._level = self._level[index]
+        msg._text = self._texts[self._text[index]]
+        msg._source = self._source[index]
+        msg._case_id = self._case[index]
+        msg._stg_num = self._stage[index]
+        msg._cmd_num = self._cmd[index]
+        line = self._line[index]
+        msg._line = line if line >= 0 else None
+        msg._occ = self._occ[index]
+        topo, unknown = self._extra.get(index, ({}, []))
+        msg._topo = {typ: names[:] for typ, names in topo.items()}
+        msg._unknown = unknown[:]
+        return msg
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def _row(self, index):
+        """Return the attributes of a stored message."""
+        line = self._line[index]
+        return (self._level[index], self._source[index], self._case[index],
+                self._stage[index], self._cmd[index],
+                line if line >= 0 else 0, self._occ[index],
+                self._texts[self._text[index]])
+
+    def contains(self, msg):
+        """Tell if a message with the same attributes is already stored.
+
+        Arguments:
+            msg (Message): Message object.
+
+        Returns:
+            bool: *True* if the message is stored.
+        """
+        row = (msg.level, msg.source, msg.case_id, msg.stage_num,
+               msg.command_num, msg.line or 0, msg._occ, msg.text)
+        found = self._by_hash.get(hash(row))
+        if found is None:
+            return False
+        if isinstance(found, int):
+            return self._row(found) == row
+        return any(self._row(i) == row for i in found)
+
+    def _register(self, index):
+        """Index a stored message by the hash of its attributes."""
+        key = hash(self._row(index))
+        found = self._by_hash.get(key)
+        if found is None:
+            self._by_hash[key] = index
+        elif isinstance(found, int):
+            self._by_hash[key] = [found, index]
+        else:
+            found.append(index)
+
+    def _intern(self, text):
+        """Return the position of a text in the table of texts."""
+        text_id = self._text_ids.get(text)
+        if text_id is None:
+            text_id = self._text_ids[text] = len(self._texts)
+            self._texts.append(text)
+        return text_id
+
+    def append(self, msg):
+        """Add a message.
+
+        Arguments:
+            msg (Message): Message object.
+        """
+        index = len(self)
+        text_id = self._intern(msg.text)
+        self._level.append(msg.level)
+        self._source.append(msg.source)
+        self._case.append(msg.case_id)
+        self._stage.append(msg.stage_num)
+        self._cmd.append(msg.command_num)
+        self._line.append(msg.line if msg.line is not None else -1)
+        self._occ.append(msg._occ)
+        self._text.append(text_id)
+        if msg._topo or msg._unknown:
+            self._extra[index] = (msg._topo, msg._unknown)
+        self._by_level.setdefault(msg.level, array('l')).append(index)
+        self._by_cmd.setdefault((msg.stage_num, msg.command_num),
+                                array('l')).append(index)
+        self._register(index)
+
+    def extend(self, msglist):
+        """Add several messages.
+
+        Arguments:
+            msglist (list[Message]): Message objects or another store.
+        """
+        if not isinstance(msglist, MessageStore):
+            for msg in msglist:
+                self.append(msg)
+            return
+        offset = len(self)
+        remap = array('l', [self._intern(text) for text in msglist._texts])
+        self._level.extend(msglist._level)
+        self._source.extend(msglist._source)
+        self._case.extend(msglist._case)
+        self._stage.extend(msglist._stage)
+        self._cmd.extend(msglist._cmd)
+        self._line.extend(msglist._line)
+        self._occ.extend(msglist._occ)
+        self._text.extend(array('l', [remap[i] for i in msglist._text]))
+        for index, extra in msglist._extra.items():
+            self._extra[index + offset] = extra
+        for level, indexes in msglist._by_level.items():
+            self._by_level.setdefault(level, array('l')).extend(
+                [i + offset for i in indexes])
+        for key, indexes in msglist._by_cmd.items():
+            self._by_cmd.setdefault(key, array('l')).extend(
+                [i + offset for i in indexes])
+        for index in range(offset, len(self)):
+            self._register(index)
+
+    def indexes(self, levels=None, command=None, stages=None, source=None,
+                text=None):
+        """Return the positions of the messages matching some criteria.
+
+        The candidates are taken from the index by command or by level, the
+        other criteria are checked on the stored attributes without creating
+        the *Message* objects.
+
+        Arguments:
+            levels (list[int]): Levels of the messages (*MsgLevel*), all
+                levels by default.
+            command (tuple(int)): Stage number and command identifier
+                (as *stage_num*, *command_num*), all commands by default.
+            stages (list[(int, int)]): Case identifier and stage number of
+                the messages emitted by a stage or a command (as returned by
+                :meth:`stages`), the messages of the runner are always
+                selected. All stages by default.
+            source (int): Source of the messages (*MsgType*), all sources
+                by default.
+            text (str): Text that must be contained in the messages, no
+                filtering on the text by default.
+
+        Returns:
+            list[int]: Sorted positions of the messages.
+        """
+        if command is not None:
+            selected = self._by_cmd.get(tuple(command), ())
+            if levels is not None:
+                levels = set(levels)
+                selected = [i for i in selected if self._level[i] in levels]
+        elif levels is None:
+            selected = range(len(self))
+        else:
+            selected = []
+            for level in set(levels):
+                selected.extend(self._by_level.get(level, ()))
+            selected.sort()
+        if source is not None:
+            selected = [i for i in selected if self._source[i] == source]
+        if stages is not None:
+            stages = set(stages)
+            attached = (MsgType.Stage, MsgType.Command)
+            selected = [i for i in selected
+                        if self._source[i] not in attached
+                        or (self._case[i], self._stage[i]) in stages]
+        if text:
+            # each unique text is checked once
+            found = set(idx for idx, txt in enumerate(self._texts)
+                        if text in txt)
+            selected = [i for i in selected if self._text[i] in found]
+        return list(selected)
+
+    def select(self, **criteria):
+        """Return the messages matching some criteria.
+
+        Arguments:
+            criteria: See :meth:`indexes`.
+
+        Returns:
+            list[Message]: Messages found.
+        """
+        return [self[i] for i in self.indexes(**criteria)]
+
+    def count_by_level(self):
+        """Return the number of messages of each level.
+
+        Returns:
+            dict: Number of messages per level (*MsgLevel*).
+        """
+        return {level: len(indexes)
+                for level, indexes in self._by_level.items()}
+
+    def stages(self):
+        """Return the stages that emitted messages.
+
+        Returns:
+            list[(int, int)]: Case identifier and stage number, in the order
+            of the messages.
+        """
+        return list(OrderedDict.fromkeys(zip(self._case, self._stage)))
+
+
 SEPAR = "EXECUTION_CODE_ASTER_EXIT_"
 
+# must be consistent with usage of supervis2_69 message in code_aster
+_XTAG = re.compile(r"(?P<orig>run|stg)(?P<stgnum>[0-9]+)_"
+                   r"(?P<loc>cmd|txt)(?P<id>[0-9]+(:[0-9]+)?)")
+_REINFO = re.compile("^(<I>|<INFO>|{0})".format(SEPAR), re.M)
+_EXPR = re.compile(r"(^[0-9]+:(?:"
+                   r"\.\. __stg[0-9]+_\w+[0-9]+(:[0-9]+)?|"
+                   r" *![-]{3}[-]*?!.*?![-]{3}[-]*?!|"
+                   r" *<(?:INFO|A|F)>.*?$|"
+                   r"Traceback \(most recent call last\)|"
+                   r"\w*Error:.*?$|"
+                   r">> JDC.py : DEBUT RAPPORT|"
+                   r" *" + SEPAR + ".*?$"
+                   r"))",
+                   re.M | re.DOTALL)
+_OUTOFCMD = re.compile("(>> JDC.py : DEBUT RAPPORT|" + SEPAR + ")", re.M)
+_BOX = re.compile(r"^([0-9]+): *![-]{3}", re.M)
+
+
 def extract_messages(text):
     """Extract the messages from a text.
 
@@ -221,10 +492,6 @@ def extract_messages(text):
     Returns:
         list[*Message*]: List of Message objects.
     """
-    # must be consistent with usage of supervis2_69 message in code_aster
-    xtag = re.compile(r"(?P<orig>run|stg)(?P<stgnum>[0-9]+)_"
-                      r"(?P<loc>cmd|txt)(?P<id>[0-9]+(:[0-9]+)?)")
-    reinfo = re.compile("^(<I>|<INFO>|{0})".format(SEPAR), re.M)
     msglist = []
     # for unittest and simulator runner
     if text == 'random':
@@ -232,23 +499,9 @@ def extract_messages(text):
     else:
         dmsg = search_msg(text)
         for key, ltext in dmsg.items():
-            mat = xtag.search(key)
-            source = MsgType.Stage
-            if mat.group("orig") == "run":
-                source = MsgType.Runner
-            elif mat.group("loc") == "cmd":
-                source = MsgType.Command
-
-            uid = mat.group("id")
             for i, linetext in enumerate(ltext):
                 line, text = linetext
-                if text.startswith("<A>") or 'NOOK' in text:
-                    level = MsgLevel.Warn
-                elif reinfo.search(text) is not None:
-                    level = MsgLevel.Info
-                else:
-                    level = MsgLevel.Error
-                msglist.append(Message(level, text, source, uid, line, i))
+                msglist.append(_new_message(key, line, text, i))
     return msglist
 
 
@@ -262,26 +515,6 @@ def search_msg(text, maxlines=100000):
     Returns:
         dict: Ordered Dict of list of messages, indexed by command identifier.
     """
-    def run_id(irun, line=1):
-        "Return an identifier for Runner messages."
-        return "run{0}_txt{1}".format(irun, line)
-
-    # must be consistent with usage of supervis2_69 message in code_aster
-    expr = re.compile(r"(^[0-9]+:(?:"
-                      r"\.\. __stg[0-9]+_\w+[0-9]+(:[0-9]+)?|"
-                      r" *![-]{3}[-]*?!.*?![-]{3}[-]*?!|"
-                      r" *<(?:INFO|A|F)>.*?$|"
-                      r"Traceback \(most recent call last\)|"
-                      r"\w*Error:.*?$|"
-                      r">> JDC.py : DEBUT RAPPORT|"
-                      r" *" + SEPAR + ".*?$"
-                      r"))",
-                      re.M | re.DOTALL)
-    outofcmd = re.compile("(>> JDC.py : DEBUT RAPPORT|" + SEPAR + ")", re.M)
-
-    # attach first messages to the Runner (also if there is no tag)
-    irun = 0
-    current = run_id(irun)
     dmsg = OrderedDict()
     closure = None
 
@@ -292,30 +525,144 @@ def search_msg(text, maxlines=100000):
         closure = (1, "<A> Only the messages found in the last "
                       "{0} lines have been analyzed.".format(maxlines))
 
-    text = remove_mpi_prefix(text)
-    text = _add_line_numbers(text)
-
-    for mat_i in expr.finditer(text):
-        text_i = mat_i.group(0)
-        # print "DEBUG: current", current, "\n", text_i, "\n" + "+" * 80
-        mat = CMDTAG.search(text_i)
-        if mat:
-            current = "{orig}{stgnum}_{loc}{id}".format(**mat.groupdict())
-            continue
-        line, cleaned = _remove_decoration(text_i)
-        mat = outofcmd.search(text_i)
-        if mat:
-            irun += 1
-            current = run_id(irun, line)
-        dmsg.setdefault(current, [])
-        dmsg[current].append((line, cleaned))
+    stream = MessageStream()
+    for key, line, cleaned in stream.search(text, final=True):
+        dmsg.setdefault(key, [])
+        dmsg[key].append((line, cleaned))
 
     if closure:
-        dmsg.setdefault(current, [])
-        dmsg[current].append(closure)
+        dmsg.setdefault(stream.current, [])
+        dmsg[stream.current].append(closure)
     return dmsg
 
 
+class MessageStream:
+    """Incremental extraction of the messages from an output being written.
+
+    The output is passed by chunks to :meth:`feed` that only returns the
+    messages found in the new text. The state of the parser (current
+    command, index of the run, number of lines, incomplete message) is kept
+    between the chunks: the messages are the same as those extracted from
+    the whole output at once, with the same line numbers.
+    """
+    _irun = _current = _nbline = _partial = _held = _occ = None
+    __setattr__ = no_new_attributes(object.__setattr__)
+
+    def __init__(self):
+        self._irun = 0
+        self._current = _run_id(self._irun)
+        self._nbline = 0
+        self._partial = ""
+        self._held = []
+        self._occ = {}
+
+    @property
+    def current(self):
+        """str: Identifier of the command currently executed."""
+        return self._current
+
+    @property
+    def nbline(self):
+        """int: Number of lines already analyzed."""
+        return self._nbline
+
+    def feed(self, text, final=False):
+        """Analyze the next chunk of the output.
+
+        Arguments:
+            text (str): Text appended to the output.
+            final (bool): Tell if this is the end of the output.
+
+        Returns:
+            list[*Message*]: Messages found in the new text.
+        """
+        msglist = []
+        for key, line, cleaned in self.search(text, final):
+            occ = self._occ.get(key, 0)
+            self._occ[key] = occ + 1
+            msglist.append(_new_message(key, line, cleaned, occ))
+        return msglist
+
+    def search(self, text, final=False):
+        """Search the messages in the next chunk of the output.
+
+        The last line is kept for the next chunk if it is not terminated,
+        as the lines of a message that is not complete, unless *final* is
+        *True*.
+
+        Arguments:
+            text (str): Text appended to the output.
+            final (bool): Tell if this is the end of the output.
+
+        Returns:
+            list[(str, int, str)]: Command identifier, line number and text
+            of the messages found.
+        """
+        text = self._partial + text
+        self._partial = ""
+        if not final:
+            end = text.rfind("\n") + 1
+            text, self._partial = text[:end], text[end:]
+        lines = self._held[:]
+        if text:
+            lines.extend(remove_mpi_prefix(text).split(os.linesep))
+        first = self._nbline + 1
+        text = os.linesep.join(["{0}:{1}".format(first + i, line)
+                                for i, line in enumerate(lines)])
+        matches = list(_EXPR.finditer(text))
+        self._held = []
+        if not final:
+            last = matches[-1].end() if matches else 0
+            mat = _BOX.search(text, last)
+            if mat:
+                # keep the lines of an incomplete message
+                held = int(mat.group(1)) - first
+                self._held = lines[held:]
+                lines = lines[:held]
+                matches = [i for i in matches if i.start() < mat.start()]
+        self._nbline += len(lines)
+
+        found = []
+        for mat_i in matches:
+            text_i = mat_i.group(0)
+            mat = CMDTAG.search(text_i)
+            if mat:
+                self._current = "{orig}{stgnum}_{loc}{id}".format(
+                    **mat.groupdict())
+                continue
+            line, cleaned = _remove_decoration(text_i)
+            mat = _OUTOFCMD.search(text_i)
+            if mat:
+                self._irun += 1
+                self._current = _run_id(self._irun, line)
+            found.append((self._current, line, cleaned))
+        return found
+
+
+def _run_id(irun, line=1):
+    """Return an identifier for Runner messages."""
+    return "run{0}_txt{1}".format(irun, line)
+
+
+def _new_message(key, line, text, occurrence):
+    """Create a Message from an item returned by :meth:`MessageStream.search`.
+    """
+    mat = _XTAG.search(key)
+    source = MsgType.Stage
+    if mat.group("orig") == "run":
+        source = MsgType.Runner
+    elif mat.group("loc") == "cmd":
+        source = MsgType.Command
+
+    if text.startswith("<A>") or 'NOOK' in text:
+        level = MsgLevel.Warn
+    elif _REINFO.search(text) is not None:
+        level = MsgLevel.Info
+    else:
+        level = MsgLevel.Error
+    return Message(level, text, source, mat.group("id"), line, occurrence)
+
+
 def _remove_decoration(text):
     """Remove the message decoration.
 
@@ -336,21 +683,6 @@ def _remove_decoration(text):
     return line, text
 
 
-def _add_line_numbers(text):
-    """
-    Insert line numbers at the beginning of the log of code_aster execution.
-
-    Arguments:
-        text(str): Log (output) of code_aster execution.
-    """
-    lines = text.splitlines()
-    # 0 not an admissible value for the log
-    nbl = max(len(lines), 1)
-    fmt = '{{0:0{}d}}:{{1}}'.format(int(log10(nbl)) + 1)
-    lines = [fmt.format(i + 1, line) for i, line in enumerate(lines)]
-    return os.linesep.join(lines)
-
-
 def _remove_line_numbers(text):
     number = re.compile("^([0-9]+):", re.M)
     mat_line = number.search(text)
@@ -40,7 +40,7 @@ from ...common.remote_utils import remove_remote_dir
 from ..abstract_data_model import add_parent, remove_parent
 from ..general import FileAttr
 from .execution import Result
-from .message import extract_messages
+from .message import MessageStore, extract_messages
 from .utils import RunOptions, StateOptions
 
 
@@ -228,9 +228,9 @@ class CaseMixing:
         """Return the messages of all stages of the case.
 
         Returns:
-            list[Message]: List of messages.
+            MessageStore: Messages of the stages.
         """
-        msglist = []
+        msglist = MessageStore()
         for stage in self.stages: # pragma pylint: disable=no-member
             if not stage.state & StateOptions.Finished:
                 break
@@ -22,22 +22,30 @@ Persistence
 
 AsterStudy related serialization functionality
 
+The commands of the graphical stages are stored as text and in a structured
+form (names, titles, keywords values, dependencies) that allows to restore
+them without converting the text again. The large sequences of numbers
+(see :class:`.NumericValues`) are stored as packed binary data.
+
 """
 
 
 import os
 import traceback
+from functools import partial
 
+import numpy
 from google.protobuf import json_format
 
 from ..common import ConversionError, VersionError, debug_message, info_message
 from ..common.version import (VERSION_DB_MAJOR, VERSION_DB_MINOR,
                               VERSION_DB_PATCH)
 from . import asterstudy_pb2
+from .abstract_data_model import add_parent, remove_parent
 from .backup import BackupHistory
-from .command import deleted_by
+from .command import CO, Command, Hidden, NumericValues, deleted_by
 from .dataset import DataSet
-from .general import ConversionLevel
+from .general import ConversionLevel, Validity
 from .result import Job
 
 STRICT_DEFAULT = ConversionLevel.Any
@@ -117,6 +125,7 @@ def history2document(history): # pragma pylint: disable=too-many-locals
 
     suids = set()
     stage2uid = {}
+    cmd2id = {}
     for case in history:
         info_message("saving case {0.uid}-{0.name}...".format(case))
         bcase = bhistory.cases.add()
@@ -140,6 +149,9 @@ def history2document(history): # pragma pylint: disable=too-many-locals
                                       pretty_text=False)
                 bstage.text = text
                 backup.save_stage(stage, text)
+                if stage.saving_mode == DataSet.graphicalMode \
+                        and stage.is_graphical_mode():
+                    _save_commands(stage, bstage, cmd2id)
                 bstage.base_folder = stage.base_folder
                 if stage.saving_mode == DataSet.textMode:
                     for cmd in stage.commands:
@@ -193,7 +205,8 @@ def history2document(history): # pragma pylint: disable=too-many-locals
 
     return bdocument
 
-def document2history(bdocument, strict=STRICT_DEFAULT, aster_version=None): # pragma pylint: disable=too-many-locals
+def document2history(bdocument, strict=STRICT_DEFAULT, aster_version=None,
+                     lazy=False): # pragma pylint: disable=too-many-locals
     """Converts AsterStudy ProtoBuffer message to History instance
 
     Arguments:
@@ -202,6 +215,10 @@ def document2history(bdocument, strict=STRICT_DEFAULT, aster_version=None): # pr
             must be.
         aster_version (Optional[str]): code_aster version used instead of those
             stored in the document.
+        lazy (Optional[bool]): If *True*, the graphical stages are only
+            converted when their commands are accessed (see
+            :meth:`.Stage.defer_loading`). The stages that can not be
+            converted are then kept in text mode instead of raising an error.
     """
     from .history import History
     bhistory = bdocument.history
@@ -219,8 +236,11 @@ def document2history(bdocument, strict=STRICT_DEFAULT, aster_version=None): # pr
         if strict & ConversionLevel.Restore:
             raise VersionError(msgerr)
         debug_message(msgerr)
+    # structured commands are only valid with the same catalog
+    same_cata = bvers == history.version_number
 
     uid2stage = {}
+    id2cmd = {}
     nbcases = len(bhistory.cases)
     for idx, bcase in enumerate(bhistory.cases):
         name = bcase.name
@@ -253,12 +273,16 @@ def document2history(bdocument, strict=STRICT_DEFAULT, aster_version=None): # pr
 
         info_message("loading stages...")
         for stageid in bcase.stages:
+            bstage = bhistory.stages[stageid-1]
+            builder = None
+            if same_cata and bstage.commands:
+                builder = _commands_builder(bstage.commands, id2cmd, strict)
             if stageid in uid2stage:
                 stage = uid2stage[stageid]
                 case.add_stage(stage)
-                _check_stage_mode(stage, is_runcase, strict)
+                _load_stage(stage, bstage, is_runcase, strict, builder,
+                            id2cmd, lazy)
             else:
-                bstage = bhistory.stages[stageid-1]
 
                 debug_message("loading stage {0.uid}-{0.name}..."
                               .format(bstage))
@@ -269,7 +293,8 @@ def document2history(bdocument, strict=STRICT_DEFAULT, aster_version=None): # pr
                 stage.base_folder = bstage.base_folder
 
                 stage.saving_mode = bstage.mode
-                _check_stage_mode(stage, is_runcase, strict)
+                _load_stage(stage, bstage, is_runcase, strict, builder,
+                            id2cmd, lazy)
 
                 if stage.saving_mode == DataSet.textMode:
                     defs = [(i.name, i.title, i.type) for i in bstage.cmd_defs]
@@ -313,7 +338,25 @@ def document2history(bdocument, strict=STRICT_DEFAULT, aster_version=None): # pr
 
     return history
 
-def _check_stage_mode(stage, is_runcase, strict):
+def _load_stage(stage, bstage, is_runcase, strict, builder, id2cmd, lazy):
+    """Convert a stage in the expected mode (see `_check_stage_mode()`),
+    immediately or when its commands are accessed if *lazy* is *True*.
+
+    A deferred conversion can not report its errors to the caller of the
+    loading: a stage that can not be converted is kept in text mode."""
+    def _load(level):
+        """Convert the stage."""
+        _check_stage_mode(stage, is_runcase, level, builder)
+        _register_commands(stage, bstage.commands, id2cmd)
+
+    graphical = stage.saving_mode == DataSet.graphicalMode and \
+        not is_runcase and not strict & ConversionLevel.NoGraphical
+    if lazy and graphical:
+        stage.defer_loading(partial(_load, strict & ~ConversionLevel.Syntaxic))
+    else:
+        _load(strict)
+
+def _check_stage_mode(stage, is_runcase, strict, builder=None):
     """Check the Stage mode:
 
     - If the *ConversionLevel* forces to text, keep the stage as pure text.
@@ -322,7 +365,8 @@ def _check_stage_mode(stage, is_runcase, strict):
       remember that it had been saved as a graphical stage.
 
     - Else if the stage had been saved as a graphical stage and belongs to
-      the *CurrentCase*, it is converted to graphical mode.
+      the *CurrentCase*, its commands are restored by *builder* if provided
+      or if it fails, the text is converted to graphical mode.
     """
     mode = stage.saving_mode
     debug_message("stage saved in mode:", "text" if mode else "graphical")
@@ -335,6 +379,13 @@ def _check_stage_mode(stage, is_runcase, strict):
         debug_message("in a runcase => text")
 
     if mode == DataSet.graphicalMode:
+        if builder is not None:
+            try:
+                stage.use_graphical_mode(strict, builder=builder)
+                return
+            except ConversionError:
+                debug_message("restoration failed, convert the text:",
+                              traceback.format_exc())
         try:
             stage.use_graphical_mode(strict)
         except (TypeError, ConversionError):
@@ -346,6 +397,189 @@ def _check_stage_mode(stage, is_runcase, strict):
     else:
         stage.use_text_mode()
 
+def _save_commands(stage, bstage, cmd2id):
+    """Store the commands of a graphical stage in a structured form.
+
+    Nothing is stored if a value can not be encoded, the stage will be
+    restored from its text.
+
+    Arguments:
+        stage (Stage): Graphical stage.
+        bstage (BStage): ProtoBuffer message of the stage.
+        cmd2id (dict): Identifiers of the commands already stored, updated
+            with those of *stage*.
+    """
+    added = []
+    try:
+        for command in stage.sorted_commands:
+            bcommand = bstage.commands.add()
+            bcommand.uid = len(cmd2id) + 1
+            cmd2id[command] = bcommand.uid
+            added.append(command)
+            bcommand.name = command.name
+            bcommand.title = command.title
+            bcommand.inactive = not command.active
+            _storage2keywords(command.storage_nocopy, bcommand.storage, cmd2id)
+            for parent in command.parent_nodes:
+                if parent in cmd2id:
+                    bcommand.parents.append(cmd2id[parent])
+    except (KeyError, TypeError, ValueError) as exc:
+        debug_message("stage {0.name!r} will be restored from text: {1}"
+                      .format(stage, exc))
+        for command in added:
+            del cmd2id[command]
+        del bstage.commands[:]
+
+def _storage2keywords(storage, bkeywords, cmd2id):
+    """Store the keywords of a dict into a *BKeywords* message."""
+    bkeywords.SetInParent()
+    for key, value in storage.items():
+        bkeyword = bkeywords.keywords.add()
+        bkeyword.name = key
+        _value2bvalue(value, bkeyword.value, cmd2id)
+
+def _value2bvalue(value, bvalue, cmd2id):
+    """Store a keyword value into a *BValue* message (*None* is stored as an
+    empty message).
+
+    Raises:
+        KeyError: If the value references a command that is not stored.
+        TypeError: If the type of the value is not supported.
+    """
+    if value is None:
+        bvalue.SetInParent()
+    elif isinstance(value, bool):
+        bvalue.bval = value
+    elif isinstance(value, int):
+        bvalue.ival = value
+    elif isinstance(value, float):
+        bvalue.rval = value
+    elif isinstance(value, str):
+        bvalue.sval = value
+    elif isinstance(value, complex):
+        bvalue.cval.real = value.real
+        bvalue.cval.imag = value.imag
+    elif isinstance(value, CO):
+        bvalue.co = value.name
+    elif isinstance(value, Command):
+        bvalue.ref = cmd2id[value]
+    elif isinstance(value, dict):
+        _storage2keywords(value, bvalue.dval, cmd2id)
+    elif isinstance(value, NumericValues):
+        bvalue.aval.data = value.array.tobytes()
+        bvalue.aval.dtype = value.array.dtype.str
+        bvalue.aval.is_list = value.is_list
+    elif isinstance(value, (list, tuple)):
+        blist = bvalue.lval if isinstance(value, list) else bvalue.tval
+        blist.SetInParent()
+        for item in value:
+            _value2bvalue(item, blist.items.add(), cmd2id)
+    else:
+        raise TypeError("unsupported type: {0}".format(type(value)))
+
+def _keywords2storage(bkeywords, id2cmd):
+    """Return the dict of keywords stored in a *BKeywords* message."""
+    return {bkeyword.name: _bvalue2value(bkeyword.value, id2cmd)
+            for bkeyword in bkeywords.keywords}
+
+def _bvalue2value(bvalue, id2cmd):
+    """Return the keyword value stored in a *BValue* message."""
+    kind = bvalue.WhichOneof('value')
+    if kind == 'ref':
+        command = id2cmd[bvalue.ref]
+        # the command may have been removed by undo before a deferred loading
+        if not command.is_valid():
+            raise KeyError(bvalue.ref)
+        return command
+    if kind == 'co':
+        return CO(bvalue.co)
+    if kind == 'cval':
+        return complex(bvalue.cval.real, bvalue.cval.imag)
+    if kind == 'dval':
+        return _keywords2storage(bvalue.dval, id2cmd)
+    if kind == 'lval':
+        return [_bvalue2value(i, id2cmd) for i in bvalue.lval.items]
+    if kind == 'tval':
+        return tuple(_bvalue2value(i, id2cmd) for i in bvalue.tval.items)
+    if kind == 'aval':
+        array = numpy.frombuffer(bvalue.aval.data, dtype=bvalue.aval.dtype)
+        return NumericValues.from_array(array, bvalue.aval.is_list)
+    if kind is None:
+        return None
+    return getattr(bvalue, kind)
+
+def _commands_builder(bcommands, id2cmd, strict):
+    """Return a function that restores the commands of a stage stored in a
+    structured form (see :meth:`.Stage.use_graphical_mode`).
+
+    Arguments:
+        bcommands (list[BCommand]): ProtoBuffer messages of the commands.
+        id2cmd (dict): Commands already restored by identifier, updated with
+            those of the stage.
+        strict (ConversionLevel): Tells how strict the conversion must be.
+    """
+    def _restore(stage):
+        """Restore the commands into *stage*."""
+        added = []
+        try:
+            for bcommand in bcommands:
+                storage = _keywords2storage(bcommand.storage, id2cmd)
+                if bcommand.title == Hidden.specific_name:
+                    # already created by the macro-command
+                    command = [i for i in storage['PARENT'].hidden
+                               if i.storage_nocopy['PATH'] == storage['PATH']]
+                    command = command[0]
+                else:
+                    command = stage.add_command(bcommand.title, bcommand.name)
+                    command.init(storage, conversion=True)
+                    if bcommand.inactive:
+                        command.active = False
+                id2cmd[bcommand.uid] = command
+                added.append(bcommand.uid)
+            _restore_dependencies(bcommands, id2cmd)
+            stage.reorder()
+            if strict & ConversionLevel.Syntaxic:
+                for command in stage:
+                    if command.check(Validity.Syntaxic, safe=False):
+                        raise ValueError("invalid command: {0}"
+                                         .format(command.title))
+        except Exception as exc: # pragma pylint: disable=broad-except
+            for uid in added:
+                del id2cmd[uid]
+            raise ConversionError(exc, traceback.format_exc(), 0, "")
+    return _restore
+
+def _restore_dependencies(bcommands, id2cmd):
+    """Restore the dependencies of the commands of a stage.
+
+    The dependencies between the commands of the stage are exactly those that
+    were saved: the creation of the commands in their sorted order may have
+    added others (for example to a preceding comment).
+    """
+    local = {id2cmd[i.uid]: i.uid for i in bcommands}
+    for bcommand in bcommands:
+        command = id2cmd[bcommand.uid]
+        for uid in bcommand.parents:
+            add_parent(command, id2cmd.get(uid))
+        parents = set(bcommand.parents)
+        for parent in command.parent_nodes[:]:
+            if parent in local and local[parent] not in parents:
+                remove_parent(command, parent)
+
+def _register_commands(stage, bcommands, id2cmd):
+    """Register the identifiers of the commands of a stage that has been
+    converted from its text (the next stages may reference them)."""
+    if not bcommands or not stage.is_graphical_mode():
+        return
+    commands = stage.sorted_commands
+    if len(commands) != len(bcommands):
+        return
+    for command, bcommand in zip(commands, bcommands):
+        if (command.name, command.title) != (bcommand.name, bcommand.title):
+            return
+    for command, bcommand in zip(commands, bcommands):
+        id2cmd.setdefault(bcommand.uid, command)
+
 def document2json(bdocument):
     "Converts AsterStudy ProtoBuffer message to JSON text representation"
     js_text = json_format.MessageToJson(bdocument)
@@ -372,7 +606,8 @@ def json2history(js_text, strict=STRICT_DEFAULT, **kwargs):
         js_text (str): Content of JSON document.
         strict (Optional[ConversionLevel]): Tells how strict the conversion
             must be.
-        kwargs (Optional): Keywords arguments passed to create the History.
+        kwargs (Optional): Keywords arguments passed to
+            `document2history()`.
     """
     bdocument = json2document(js_text)
     history = document2history(bdocument, strict, **kwargs)
@@ -28,9 +28,12 @@ Implementation of a stage within the study case.
 # suppression of above two lines.
 # pragma pylint: disable=wrong-import-position,wrong-import-order
 
+import traceback
 from functools import wraps
+from weakref import WeakKeyDictionary, WeakSet
 
-from ..common import (ConversionError, format_code, no_new_attributes, to_unicode)
+from ..common import (ConversionError, debug_message, format_code,
+                      no_new_attributes, to_unicode)
 from ..common.conversion import ConversionReport
 from .abstract_data_model import Node, add_parent, remove_parent
 from .aster_parser import add_debut_fin
@@ -43,6 +46,12 @@ from .general import CopyContext as Ctx
 from .general import ConversionLevel, Validity
 from .result import StageMixing as RStageMixing
 from .study2comm import study2comm
+from .visible_names import VisibleNames
+
+# deferred loaders of the stages (see `Stage.defer_loading()`), kept outside
+# of the stages because they are not pickled by the undo/redo journal
+_LOADERS = WeakKeyDictionary()
+_LOADING = WeakSet()
 
 
 def only_on(mode):
@@ -86,6 +95,8 @@ class Stage(Node, FDMixing, RStageMixing):
     - one child of type Result.
     """
     _number = _dataset = _conv_report = _savingmode = _usage = _dbase = None
+    _visible_names = None
+    _pending = False
     __setattr__ = no_new_attributes(object.__setattr__)
 
     def __init__(self, name, number=0):
@@ -112,7 +123,9 @@ class Stage(Node, FDMixing, RStageMixing):
     def __getstate__(self):
         """Reset attached exception before pickling."""
         self._conv_report = None
-        return self.__dict__
+        state = self.__dict__.copy()
+        state['_visible_names'] = None
+        return state
 
     @property
     def number(self):
@@ -122,6 +135,7 @@ class Stage(Node, FDMixing, RStageMixing):
 
     @number.setter
     def number(self, number):
+        self.touch()
         self._number = number
 
     @property
@@ -156,6 +170,8 @@ class Stage(Node, FDMixing, RStageMixing):
     @property
     def dataset(self):
         """DataSet: Attribute that holds the Stage's DataSet."""
+        if self._pending:
+            self.materialize()
         if self._dataset is not None:
             return self._dataset
 
@@ -185,8 +201,67 @@ class Stage(Node, FDMixing, RStageMixing):
     def mode(self):
         """int: Attribute that holds a type of Stage
         (see *DataSet.mode()*)."""
+        if self._pending and self not in _LOADING:
+            return DataSet.graphicalMode
         return self.dataset.mode if self.dataset is not None else None
 
+    def defer_loading(self, loader):
+        """Keep the stage as a placeholder until its commands are accessed.
+
+        The stage stays in text mode but it is seen as a graphical stage.
+        *loader* is called to switch to graphical mode the first time that
+        the dataset is accessed (or by `materialize()`).
+
+        Arguments:
+            loader (callable): Function that converts the stage, called
+                without argument.
+        """
+        _LOADERS[self] = loader
+        self._pending = True
+
+    def is_loaded(self):
+        """Tell if the stage has been loaded (see `defer_loading()`).
+
+        Returns:
+            bool: *False* if the conversion of the stage is still pending.
+        """
+        return not self._pending
+
+    def materialize(self):
+        """Load the stage if its loading has been deferred.
+
+        The preceding stages are loaded first because the commands may
+        depend on their results. As any change of the model, the loading
+        must be done by the thread that uses the model.
+        """
+        if not self._pending or self in _LOADING:
+            return
+        stages = []
+        stage = self
+        while stage is not None and stage._pending: # pragma pylint: disable=protected-access
+            stages.append(stage)
+            stage = stage.parent_stage
+        for stage in reversed(stages):
+            _LOADING.add(stage)
+            try:
+                stage._load() # pragma pylint: disable=protected-access
+            finally:
+                stage._pending = False # pragma pylint: disable=protected-access
+                _LOADING.discard(stage)
+
+    def _load(self):
+        """Call the deferred loader or convert the text if there is none
+        (for example after unpickling)."""
+        debug_message("loading stage {0.uid}-{0.name}...".format(self))
+        loader = _LOADERS.get(self)
+        if loader is not None:
+            loader()
+            return
+        try:
+            self.use_graphical_mode()
+        except (TypeError, ConversionError):
+            debug_message("conversion failed:", traceback.format_exc())
+
     @property
     def saving_mode(self):
         """int: Attribute that holds the type of the Stage at saving time.
@@ -200,6 +275,7 @@ class Stage(Node, FDMixing, RStageMixing):
     @saving_mode.setter
     def saving_mode(self, value):
         """Setter for *saving_mode*."""
+        self.touch()
         self._savingmode = value
 
     @Node.name.setter # pragma pylint: disable=no-member
@@ -218,6 +294,7 @@ class Stage(Node, FDMixing, RStageMixing):
 
     @usage.setter
     def usage(self, value):
+        self.touch()
         self._usage = value
 
     @property
@@ -230,6 +307,7 @@ class Stage(Node, FDMixing, RStageMixing):
     def database(self, path):
         if self._number != 1:
             raise ValueError("'database' is only available for the first stage")
+        self.touch()
         self._dbase = path
 
     def accept(self, visitor):
@@ -241,7 +319,8 @@ class Stage(Node, FDMixing, RStageMixing):
         """
         visitor.visit_stage(self)
 
-    def use_graphical_mode(self, strict=ConversionLevel.NoFail, provider=None):
+    def use_graphical_mode(self, strict=ConversionLevel.NoFail, provider=None,
+                           builder=None):
         """
         Convert the child *DataSet* in a graphical one.
 
@@ -255,6 +334,10 @@ class Stage(Node, FDMixing, RStageMixing):
                 Default is not to fail.
             provider (*FileProvider*): Instance of *FileProvider* that can
                 provide additional COMM files on demand.
+            builder (Optional[callable]): Function called with the stage to
+                fill the new graphical *DataSet* instead of converting the
+                text (used to restore the commands from a structured storage).
+                It must raise *ConversionError* in case of failure.
 
         Raises:
             TypeError: If parent Stage is a text one;
@@ -268,10 +351,10 @@ class Stage(Node, FDMixing, RStageMixing):
         if self.is_graphical_mode():
             return
 
-        self._2graphical(strict, provider)
+        self._2graphical(strict, provider, builder)
 
     @ModifiesInstance(True)
-    def _2graphical(self, strict, provider):
+    def _2graphical(self, strict, provider, builder=None):
         """
         conversion to graphical, once all checks done
         """
@@ -280,8 +363,11 @@ class Stage(Node, FDMixing, RStageMixing):
         self._dataset = self._model.add(dataset, self)
         self._conv_report = ConversionReport()
         try:
-            comm2study(previous.text, self, strict=strict, provider=provider,
-                       report=self._conv_report)
+            if builder is None:
+                comm2study(previous.text, self, strict=strict,
+                           provider=provider, report=self._conv_report)
+            else:
+                builder(self)
             self.track_unused()
         except ConversionError:
             self._dataset = previous
@@ -404,6 +490,7 @@ class Stage(Node, FDMixing, RStageMixing):
         # Old graphical dataset removed from model
         self._model.unregister(previous)
         remove_parent(previous, self)
+        self._model._remove_deps(previous) # pragma pylint: disable=protected-access
         previous.detach_model()
 
         dataset.text = text
@@ -415,7 +502,7 @@ class Stage(Node, FDMixing, RStageMixing):
         Returns:
             bool: *True* if Stage is graphical one; *False* otherwise.
         """
-        return self.dataset is not None and self.dataset.is_graphical_mode()
+        return self.mode == DataSet.graphicalMode
 
     def is_text_mode(self):
         """
@@ -424,7 +511,7 @@ class Stage(Node, FDMixing, RStageMixing):
         Returns:
             bool: *True* if Stage is text one; *False* otherwise.
         """
-        return self.dataset is not None and self.dataset.is_text_mode()
+        return self.mode == DataSet.textMode
 
     @ModifiesInstance(True)
     def rename(self, name):
@@ -473,6 +560,7 @@ class Stage(Node, FDMixing, RStageMixing):
         Returns:
             Stage: New empty Stage.
         """
+        self.materialize()
         return Stage(self.name, self.number)
 
 
@@ -892,28 +980,47 @@ class Stage(Node, FDMixing, RStageMixing):
         Returns:
             list[Command]: List of commands.
         """
-        commands = []
-        if self.parent_stage:
-            commands = self.parent_stage.preceding_commands(command)
+        return self.visible_names.commands(command, only_preceding)
+
+    @property
+    def visible_names(self):
+        """VisibleNames: Attribute that holds the index of the commands
+        visible from the commands of the stage.
 
-        if only_preceding:
-            return commands
+        The index is rebuilt when the stage or a preceding one has been
+        modified (see :meth:`reset_visible_names`).
+        """
+        index = self._visible_names
+        if index is None:
+            parent = self.parent_stage
+            parent = parent.visible_names if parent else None
+            index = VisibleNames(self, parent)
+            self._visible_names = index
+        return index
 
-        def _predicate(cmd):
-            return (cmd.active and
-                    (command is None or not cmd.depends_on(command)))
+    def reset_visible_names(self, force=False):
+        """Reset the index of the visible names of the stage and of the
+        following ones.
 
-        local = [cmd for cmd in self.sorted_commands if _predicate(cmd)]
+        Arguments:
+            force (bool): If *False*, nothing is done if the index of the
+                stage is not built (the following ones can not be built).
+        """
+        if self._visible_names is None and not force:
+            return
+        for case in self.cases:
+            for stage in case[self:]:
+                stage._visible_names = None # pragma pylint: disable=protected-access
+        self._visible_names = None
 
-        for cmd in local:
-            commands.append(cmd)
-            deleted = deleted_by(cmd)
-            if deleted:
-                for current in list(commands): # iterate on a copy
-                    if current in deleted:
-                        commands.remove(current)
+    def after_touch(self):
+        """Reset the index of the visible names (the position of the stage
+        may have changed)."""
+        self.reset_visible_names(force=True)
 
-        return commands
+    def after_restore(self):
+        """Reset the index of the visible names."""
+        self.reset_visible_names(force=True)
 
     def get_cmd_by_index(self, index):
         """Get Command by index.
@@ -1038,7 +1145,10 @@ class Stage(Node, FDMixing, RStageMixing):
     def preceding_stages(self):
         """list[Stage]: Attribute that gives access to the preceding
         Stages."""
-        return self.dataset.preceding_stages
+        # the commands are not needed, do not load the stage
+        parent_case = self.parent_case
+        assert parent_case
+        return parent_case[:self]
 
     # shortcuts to TextDataSet methods
     @only_on("text")
@@ -1161,6 +1271,7 @@ class Stage(Node, FDMixing, RStageMixing):
     def before_remove(self):
         """Prepare for stage removing."""
         RStageMixing.before_remove(self)
+        self._pending = False
         self.dataset = None
         return Node.before_remove(self)
 
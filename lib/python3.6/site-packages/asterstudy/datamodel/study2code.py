@@ -33,7 +33,7 @@ from io import StringIO
 
 from ..common import format_code
 from .aster_parser import clean_expression
-from .command import CO, Command
+from .command import CO, Command, NumericValues
 from .visit_study import obj_end, obj_start
 
 
@@ -166,6 +166,8 @@ class ExportToCodeVisitor:
             self._write("%s['%s':command]" % (self.stage_name, value.name,))
         elif isinstance(value, CO):
             self._write(u"%s" % repr(value.name))
+        elif isinstance(value, NumericValues):
+            self._write(repr(value))
         elif isinstance(value, (list, tuple)):
             self._write(obj_start(value))
 
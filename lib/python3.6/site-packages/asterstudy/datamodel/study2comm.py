@@ -30,7 +30,7 @@ from functools import wraps
 
 from ..common import Features, no_new_attributes, translate
 from ..common.conversion import COMMENT
-from .command import CO, Command
+from .command import CO, Command, NumericValues
 from .visit_study import obj_end, obj_start
 
 
@@ -254,6 +254,9 @@ class ExportToCommVisitor:
             self._print_left_brace()
             self._write(repr(self.decorate_name(value.name)))
             self._print_right_brace()
+        elif isinstance(value, NumericValues) and self._limit <= 0:
+            # same text as below, built in a single operation
+            self._write(repr(value))
         elif isinstance(value, (list, tuple)):
             self._write(obj_start(value))
 
@@ -1,33 +1,29 @@
-# -*- coding: utf-8 -*-
-
-# Copyright 2016 EDF R&D
-#
-# This program is free software; you can redistribute it and/or modify
-# it under the terms of the GNU General Public License Version 3 as
-# published by the Free Software Foundation.
-#
-# This program is distributed in the hope that it will be useful, but
-# WITHOUT ANY WARRANTY; without even the implied warranty of
-# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
-# General Public License for more details.
-#
-# You should have received a copy of the GNU General Public License
-# along with this program; if not, you may download a copy of license
-# from https://www.gnu.org/licenses/gpl-3.0.
-
 """
 Undo/redo
 ---------
 
 Implementation of the undo-redo mechanism.
 
+By default, a complete copy of the data model is stored for each state.
+With the *journal* mode, only the changes made between two states are
+stored (see :class:`NodeJournal`): the pickled states of the modified
+nodes before and after the change. Undo and redo replay these changes on
+the data model in place.
+
+The memory used by the history may be limited (*memory_limit*): the
+oldest states are forgotten first.
+
 """
 
 
+import io
 import pickle
+
 from ..common import debug_message
+from .abstract_data_model import AbstractDataModel, Node
+from .catalogs import CATA
 
-__all__ = ["UndoRedo", "TransactionUndoRedo"]
+__all__ = ["UndoRedo", "TransactionUndoRedo", "NodeJournal"]
 
 
 def deepcopy(src):
@@ -40,15 +36,346 @@ def deepcopy(src):
     Returns:
         any: A copy of source object.
     """
-    return pickle.loads(pickle.dumps(src))
+    return snapshot(src)[0]
+
+
+def snapshot(src):
+    """
+    Make deep copy of source object and return its size.
+
+    Arguments:
+        any: Source object.
+
+    Returns:
+        tuple(any, int): A copy of source object and the size of its
+        pickled representation (in bytes).
+    """
+    data = pickle.dumps(src)
+    return pickle.loads(data), len(data)
+
+
+def _get_state(obj):
+    """Return a copy of the attributes of an object as pickled."""
+    getstate = getattr(type(obj), '__getstate__', None)
+    if getstate is None or getstate is getattr(object, '__getstate__', None):
+        return dict(obj.__dict__)
+    return dict(getstate(obj))
+
+
+def _set_state(obj, state, keep=()):
+    """Restore the attributes of an object in place.
+
+    Arguments:
+        obj (any): Object to restore.
+        state (dict): Attributes as returned by `_get_state()`.
+        keep (list[str]): Attributes that are not part of `state` and must
+            be kept.
+    """
+    kept = dict((key, obj.__dict__[key]) for key in keep
+                if key in obj.__dict__)
+    obj.__dict__.clear()
+    setstate = getattr(type(obj), '__setstate__', None)
+    if setstate is not None:
+        setstate(obj, state)
+    else:
+        obj.__dict__.update(state)
+    obj.__dict__.update(kept)
+
+
+class _Pickler(pickle.Pickler):
+    """Pickler that stores the registered nodes, the model and the catalog
+    definitions by reference."""
+
+    def __init__(self, file, model):
+        super().__init__(file)
+        self._model = model
+        self._cata = CATA.command
+
+    def persistent_id(self, obj): # pragma pylint: disable=method-hidden
+        """Return a reference for shared objects."""
+        if isinstance(obj, Node):
+            # pragma pylint: disable=protected-access
+            if obj._model is self._model and \
+                    self._model._nodes.get(obj.uid) is obj:
+                return ('node', obj.uid)
+            return None
+        if obj is self._model:
+            return ('model',)
+        if isinstance(obj, self._cata) and CATA.get_catalog(obj.name) is obj:
+            return ('cata', obj.name)
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+    """Unpickler that resolves the references created by `_Pickler`."""
+
+    def __init__(self, file, model, nodes):
+        super().__init__(file)
+        self._model = model
+        self._nodes = nodes
+
+    def persistent_load(self, pid):
+        """Return the object referenced by `pid`."""
+        if pid[0] == 'node':
+            return self._nodes[pid[1]]
+        if pid[0] == 'model':
+            return self._model
+        if pid[0] == 'cata':
+            return CATA.get_catalog(pid[1])
+        raise pickle.UnpicklingError("unsupported reference: {0}".format(pid))
+
+
+class JournalEntry:
+    """Changes recorded by a :class:`NodeJournal`.
+
+    Attributes:
+        nodes (dict): Changes of the nodes: *uid* -> (*before*, *after*)
+            where *before* and *after* are (*class*, *bytes*) or *None* if
+            the node does not exist.
+        state (tuple[bytes]): States of the model itself (*before*,
+            *after*) or *None* if unchanged.
+        size (int): Number of bytes used by the entry.
+    """
+
+    def __init__(self, nodes, state):
+        self.nodes = nodes
+        self.state = state
+        size = 0
+        for change in nodes.values():
+            size += sum(len(record[1]) for record in change if record)
+        if state:
+            size += len(state[0]) + len(state[1])
+        self.size = size
+
+    def __bool__(self):
+        """Tell if the entry contains changes."""
+        return bool(self.nodes or self.state)
+
+
+class NodeJournal:
+    """
+    Journal of the changes of a data model.
+
+    The journal keeps a checkpoint of the data model: the pickled state
+    of each node and the state of the model itself. The nodes and the
+    catalog definitions referenced by a node are stored by reference.
+
+    The model declares the nodes being modified (see
+    :meth:`.AbstractDataModel.touch`). `record()` only pickles these
+    nodes, their parents and the top-level nodes, and returns the
+    differences with the checkpoint. These changes are replayed backward
+    or forward by `apply()` to restore the model in place.
+
+    An object that is not an :class:`.AbstractDataModel` is stored as a
+    single state.
+    """
+
+    _keep = ('_nodes', '_deps', '_touched')
+
+    def __init__(self, model):
+        """
+        Create the journal and take a checkpoint of the model.
+
+        Arguments:
+            model (any): Data model to manage.
+        """
+        self._model = model
+        self._nodes = {}
+        self._state = None
+        self._tracked = isinstance(model, AbstractDataModel)
+        # pragma pylint: disable=protected-access
+        if self._tracked:
+            model._touched = set()
+            self._nodes = dict((uid, self._dump_node(node))
+                               for uid, node in model._nodes.items())
+        self._state = self._dump_state()
+
+    @property
+    def size(self):
+        """int: Number of bytes used by the checkpoint."""
+        return len(self._state) + sum(len(record[1])
+                                      for record in self._nodes.values())
+
+    def _dumps(self, obj):
+        """Pickle an object, nodes are stored by reference."""
+        if not self._tracked:
+            return pickle.dumps(obj)
+        buffer = io.BytesIO()
+        _Pickler(buffer, self._model).dump(obj)
+        return buffer.getvalue()
+
+    def _loads(self, data, model=None, nodes=None):
+        """Unpickle an object, references are resolved in `model`."""
+        model = model or self._model
+        if not self._tracked:
+            return pickle.loads(data)
+        # pragma pylint: disable=protected-access
+        nodes = model._nodes if nodes is None else nodes
+        return _Unpickler(io.BytesIO(data), model, nodes).load()
+
+    def _dump_node(self, node):
+        """Return the record of a node."""
+        return type(node), self._dumps(_get_state(node))
+
+    def _dump_state(self):
+        """Return the state of the model itself."""
+        state = _get_state(self._model)
+        for key in self._keep if self._tracked else ():
+            state.pop(key, None)
+        return self._dumps(state)
+
+    def _dirty(self):
+        """Return the uids of the nodes to be checked."""
+        model = self._model
+        # pragma pylint: disable=protected-access
+        uids = set(model._touched)
+        for uid in model._touched:
+            node = model._nodes.get(uid)
+            if node is not None:
+                uids.update(parent.uid for parent in node.parent_nodes)
+        uids.update(node.uid for node in model.child_nodes())
+        return uids
+
+    def record(self):
+        """
+        Move the checkpoint to the current state of the model.
+
+        Returns:
+            JournalEntry: Changes since the previous checkpoint.
+        """
+        changes = {}
+        if self._tracked:
+            # pragma pylint: disable=protected-access
+            nodes = self._model._nodes
+            for uid in sorted(self._dirty()):
+                before = self._nodes.get(uid)
+                node = nodes.get(uid)
+                after = self._dump_node(node) if node is not None else None
+                if before == after:
+                    continue
+                changes[uid] = (before, after)
+                if after is None:
+                    del self._nodes[uid]
+                else:
+                    self._nodes[uid] = after
+            self._model._touched = set()
+        state = self._dump_state()
+        states = (self._state, state) if state != self._state else None
+        self._state = state
+        entry = JournalEntry(changes, states)
+        debug_message("JOURNAL record", len(changes), "node(s),",
+                      entry.size, "bytes")
+        return entry
+
+    def apply(self, entry, forward=True):
+        """
+        Replay changes on the model.
+
+        The model must be at the state that precedes the changes (or that
+        follows them if `forward` is *False*).
+
+        Arguments:
+            entry (JournalEntry): Changes to apply.
+            forward (bool): Apply the changes (redo) if *True*, revert
+                them (undo) otherwise.
+        """
+        pick = 1 if forward else 0
+        model = self._model
+        if not self._tracked:
+            if entry.state:
+                _set_state(model, self._loads(entry.state[pick]))
+                self._state = entry.state[pick]
+            return
+        # pragma pylint: disable=protected-access
+        nodes = model._nodes
+        created = False
+        restored = []
+        removed = []
+        for uid, change in entry.nodes.items():
+            record = change[pick]
+            if record is None:
+                node = nodes.pop(uid, None)
+                if node is not None:
+                    node.detach_model()
+                self._nodes.pop(uid, None)
+                removed.append(uid)
+            elif uid not in nodes:
+                nodes[uid] = record[0].__new__(record[0])
+                created = True
+        if entry.state:
+            _set_state(model, self._loads(entry.state[pick]), self._keep)
+            self._state = entry.state[pick]
+        for uid, change in entry.nodes.items():
+            record = change[pick]
+            if record is not None:
+                _set_state(nodes[uid], self._loads(record[1]))
+                self._nodes[uid] = record
+                restored.append(nodes[uid])
+        if created:
+            model._nodes = dict(sorted(nodes.items()))
+        self._restored(restored, removed)
+
+    def _restored(self, nodes, removed):
+        """Update the model after some nodes have been restored.
+
+        Arguments:
+            nodes (list[Node]): Restored nodes.
+            removed (list[int]): Identifiers of the removed nodes.
+        """
+        model = self._model
+        model.refresh_deps(nodes, removed)
+        for node in nodes:
+            node.after_restore()
+        model._touched = set() # pragma pylint: disable=protected-access
+
+    def discard(self):
+        """Revert the changes made in the model since the checkpoint."""
+        entry = self.record()
+        if entry:
+            debug_message("JOURNAL discard uncommitted changes")
+            self.apply(entry, forward=False)
+
+    def materialize(self):
+        """
+        Create a new instance of the model at the checkpoint.
+
+        Returns:
+            any: Copy of the model.
+        """
+        cls = type(self._model)
+        model = cls.__new__(cls)
+        if not self._tracked:
+            _set_state(model, self._loads(self._state))
+            return model
+        # pragma pylint: disable=protected-access
+        nodes = {}
+        for uid, record in sorted(self._nodes.items()):
+            nodes[uid] = record[0].__new__(record[0])
+        _set_state(model, self._loads(self._state, model, nodes))
+        for uid, record in self._nodes.items():
+            _set_state(nodes[uid], self._loads(record[1], model, nodes))
+        model._nodes = nodes
+        model._deps = type(self._model._deps)()
+        model._touched = None
+        model.rebuild_deps()
+        return model
 
 
 class UndoRedoItem:
-    """An item in the undo/redo history."""
+    """An item in the undo/redo history.
+
+    Attributes:
+        state (any): Copy of the model (snapshot mode).
+        changes (JournalEntry): Changes from the previous state (journal
+            mode).
+        size (int): Number of bytes used by the item.
+    """
 
     def __init__(self):
         """Constructor."""
         self.state = {}
+        self.changes = None
+        self.size = 0
         self.ident = -1
         self.message = ''
 
@@ -72,9 +399,13 @@ class UndoRedo:
 
     Method `revert()` reverts data model to last committed state, thus
     reverting all changes made in the data model.
+
+    In *journal* mode, the items only store the changes from the previous
+    state and the model is restored in place.
     """
 
-    def __init__(self, model, undo_limit=-1, disable_cbck=None):
+    def __init__(self, model, undo_limit=-1, disable_cbck=None,
+                 journal=False, memory_limit=-1):
         """
         Create UndoRedo object.
 
@@ -84,19 +415,26 @@ class UndoRedo:
                 to -1 (no limit).
             disable_cbck (func): Callback that tells if the feature is
                 disabled.
+            journal (Optional[bool]): Store the changes between states
+                instead of copies of the model. Defaults to *False*.
+            memory_limit (Optional[int]): Maximum number of bytes used
+                by the history. Defaults to -1 (no limit).
 
         See also:
-            `undo_limit` attribute
+            `undo_limit`, `memory_limit` attributes
         """
         self._model = model
         self._undo_limit = undo_limit
+        self._memory_limit = memory_limit
         self._items = []
         self._id = 0
         self._next_id = 0
         self._index = 0
+        self._journal = NodeJournal(model) if journal else None
         item = UndoRedoItem()
         item.ident = self._id
-        item.state = deepcopy(self._model)
+        if self._journal is None:
+            item.state, item.size = snapshot(self._model)
         debug_message("UNDO init with", self._index, id(item.state))
         self._items.append(item)
         self._disable_cbck = disable_cbck
@@ -119,10 +457,17 @@ class UndoRedo:
         """
         if self.disabled:
             return self.model
+        if self._journal is not None:
+            return self._journal.materialize()
         debug_message("UNDO last is", self._index,
                       id(self._items[self._index].state))
         return self._items[self._index].state
 
+    @property
+    def journal(self):
+        """bool: Tell if the changes are stored instead of copies."""
+        return self._journal is not None
+
     @property
     def undo_limit(self):
         """
@@ -150,8 +495,53 @@ class UndoRedo:
             lower = max(0, upper - new_len)
             self._items = self._items[lower:upper]
             self._index = self._index - lower
+            self._rebase()
             debug_message("UNDO undo_limit reached")
 
+    @property
+    def memory_limit(self):
+        """
+        int: Attribute that holds the maximum number of bytes used by the
+        history.
+
+        The oldest states are forgotten when the limit is reached. The
+        current state is always kept. Negative value means no limit.
+
+        By default, memory limit is set to -1 (i.e. no limit).
+        """
+        return self._memory_limit
+
+    @memory_limit.setter
+    def memory_limit(self, limit):
+        """Set memory limit."""
+        self._memory_limit = max(-1, limit)
+        self._check_memory()
+
+    @property
+    def memory_usage(self):
+        """int: Attribute that holds the number of bytes used by the
+        history."""
+        return sum(item.size for item in self._items)
+
+    def _check_memory(self):
+        """Forget the oldest states while the memory limit is exceeded."""
+        if self._memory_limit < 0:
+            return
+        usage = self.memory_usage
+        while usage > self._memory_limit and self._index > 0:
+            self._items.pop(0)
+            self._index -= 1
+            self._rebase()
+            usage = self.memory_usage
+            debug_message("UNDO memory_limit reached")
+
+    def _rebase(self):
+        """Drop the changes of the first item that is now the oldest
+        state (journal mode)."""
+        if self._journal is not None:
+            self._items[0].changes = None
+            self._items[0].size = 0
+
     @property
     def nb_undo(self):
         """
@@ -231,13 +621,19 @@ class UndoRedo:
         item = UndoRedoItem()
         item.ident = self._id
         item.message = message
-        item.state = deepcopy(self._model)
+        if self._journal is None:
+            item.state, item.size = snapshot(self._model)
+        else:
+            item.changes = self._journal.record()
+            item.size = item.changes.size
         self._items = self._items[:self._index + 1]
         if self._undo_limit >= 0 and len(self._items) - 1 == self._undo_limit:
             self._items.pop(0)
         else:
             self._index = self._index + 1
         self._items.append(item)
+        self._rebase()
+        self._check_memory()
         debug_message("UNDO commit", self._index, id(item.state))
         debug_message(caller=True, limit=5)
         return self._id
@@ -295,7 +691,10 @@ class UndoRedo:
         """
         if self.disabled:
             return self._always_change()
-        self._model = deepcopy(self._items[self._index].state)
+        if self._journal is not None:
+            self._journal.discard()
+        else:
+            self._model = deepcopy(self._items[self._index].state)
 
         return self._id
 
@@ -315,9 +714,29 @@ class UndoRedo:
         if self._index != prev_index:
             debug_message("UNDO move at", self._index,
                           id(self._items[self._index].state))
-            self._model = deepcopy(self._items[self._index].state)
+            if self._journal is not None:
+                self._replay(prev_index, self._index)
+            else:
+                self._model = deepcopy(self._items[self._index].state)
             self._id = self._items[self._index].ident
 
+    def _replay(self, start, end):
+        """
+        Replay the changes to move from a state to another one
+        (journal mode).
+
+        Arguments:
+            start (int): Index of the current state.
+            end (int): Index of the target state.
+        """
+        self._journal.discard()
+        if end < start:
+            for index in range(start, end, -1):
+                self._journal.apply(self._items[index].changes, False)
+        else:
+            for index in range(start + 1, end + 1):
+                self._journal.apply(self._items[index].changes, True)
+
     def _always_change(self):
         """Ensure the current state is changing"""
         self._id += 1
@@ -348,9 +767,12 @@ class TransactionUndoRedo:
     it is necessary to ensure that no any change to the data model is
     made without opening a transaction. In other words, if there is no
     open transaction, any change should raise an exception.
+
+    In *journal* mode, the items only store the changes made by each
+    transaction and the model is restored in place.
     """
 
-    def __init__(self, model, undo_limit=-1):
+    def __init__(self, model, undo_limit=-1, journal=False, memory_limit=-1):
         """
         Create TransactionUndoRedo object.
 
@@ -358,12 +780,19 @@ class TransactionUndoRedo:
             model (AbstractDataModel): Data model to manage.
             undo_limit (Optional[int]): Length of undo history. Defaults
                 to -1 (no limit).
+            journal (Optional[bool]): Store the changes made by the
+                transactions instead of copies of the model. Defaults to
+                *False*.
+            memory_limit (Optional[int]): Maximum number of bytes used
+                by the history. Defaults to -1 (no limit).
 
         See also:
-            `undo_limit` attribute.
+            `undo_limit`, `memory_limit` attributes.
         """
         self._model = model
         self._undo_limit = undo_limit
+        self._memory_limit = memory_limit
+        self._journal = NodeJournal(model) if journal else None
         self._backup = None
         self._undo = []
         self._redo = []
@@ -401,6 +830,46 @@ class TransactionUndoRedo:
             lower = max(0, len(self._undo) - self._undo_limit)
             self._undo = self._undo[lower:]
 
+    @property
+    def journal(self):
+        """bool: Tell if the changes are stored instead of copies."""
+        return self._journal is not None
+
+    @property
+    def memory_limit(self):
+        """
+        int: Attribute that holds the maximum number of bytes used by the
+        history.
+
+        The oldest undo actions are forgotten first, then the most
+        recently undone actions. Negative value means no limit.
+
+        By default, memory limit is set to -1 (i.e. no limit).
+        """
+        return self._memory_limit
+
+    @memory_limit.setter
+    def memory_limit(self, limit):
+        """Set memory limit."""
+        self._memory_limit = max(-1, limit)
+        self._check_memory()
+
+    @property
+    def memory_usage(self):
+        """int: Attribute that holds the number of bytes used by the
+        history."""
+        return sum(item.size for item in self._undo + self._redo)
+
+    def _check_memory(self):
+        """Forget the oldest actions while the memory limit is exceeded."""
+        if self._memory_limit < 0:
+            return
+        usage = self.memory_usage
+        while usage > self._memory_limit and (self._undo or self._redo):
+            item = self._undo.pop(0) if self._undo else self._redo.pop(0)
+            usage -= item.size
+            debug_message("UNDO memory_limit reached")
+
     @property
     def nb_undo(self):
         """
@@ -477,7 +946,11 @@ class TransactionUndoRedo:
         self._backup = UndoRedoItem()
         self._backup.ident = self._id
         self._backup.message = message
-        self._backup.state = deepcopy(self._model)
+        if self._journal is not None:
+            # changes made outside a transaction are not undoable
+            self._journal.record()
+        else:
+            self._backup.state, self._backup.size = snapshot(self._model)
 
     @property
     def opened(self):
@@ -507,12 +980,16 @@ class TransactionUndoRedo:
         """
         if not self.opened:
             raise RuntimeError("There is no open transaction.")
+        if self._journal is not None:
+            self._backup.changes = self._journal.record()
+            self._backup.size = self._backup.changes.size
         self._redo = []
         self._undo.append(self._backup)
         if self._undo_limit >= 0:
             lower = max(0, len(self._undo) - self._undo_limit)
             self._undo = self._undo[lower:]
         self._backup = None
+        self._check_memory()
         self._next_id = self._next_id + 1
         self._id = self._next_id
         return self._id
@@ -532,7 +1009,10 @@ class TransactionUndoRedo:
         """
         if not self.opened:
             raise RuntimeError("There is no open transaction.")
-        self._model = deepcopy(self._backup.state)
+        if self._journal is not None:
+            self._journal.discard()
+        else:
+            self._model = deepcopy(self._backup.state)
         self._backup = None
         return self._id
 
@@ -555,11 +1035,13 @@ class TransactionUndoRedo:
         """
         if self.opened:
             raise RuntimeError("There is already open transaction.")
+        if self._journal is not None:
+            return self._journal_undo(nb_undo)
         if self._undo:
             redo_item = UndoRedoItem()
             redo_item.ident = self._id
             redo_item.message = self._undo[-1].message
-            redo_item.state = deepcopy(self._model)
+            redo_item.state, redo_item.size = snapshot(self._model)
             self._redo.append(redo_item)
             undo_item = self._undo.pop()
             nb_undo = nb_undo - 1
@@ -591,13 +1073,15 @@ class TransactionUndoRedo:
         """
         if self.opened:
             raise RuntimeError("There is already open transaction.")
+        if self._journal is not None:
+            return self._journal_redo(nb_redo)
         if self._redo:
             redo_item = self._redo.pop()
             if self._undo_limit < 0 or len(self._undo) < self._undo_limit:
                 undo_item = UndoRedoItem()
                 undo_item.ident = self._id
                 undo_item.message = redo_item.message
-                undo_item.state = deepcopy(self._model)
+                undo_item.state, undo_item.size = snapshot(self._model)
                 self._undo.append(undo_item)
             nb_redo = nb_redo - 1
             while nb_redo and self._redo:
@@ -608,3 +1092,31 @@ class TransactionUndoRedo:
             self._model = deepcopy(redo_item.state)
             self._id = redo_item.ident
         return self._id
+
+    def _journal_undo(self, nb_undo):
+        """Undo last action(s) by reverting their changes (journal mode)."""
+        self._journal.discard()
+        while nb_undo and self._undo:
+            item = self._undo.pop()
+            self._journal.apply(item.changes, forward=False)
+            ident, item.ident = item.ident, self._id
+            self._id = ident
+            self._redo.append(item)
+            nb_undo = nb_undo - 1
+        return self._id
+
+    def _journal_redo(self, nb_redo):
+        """Redo last undone action(s) by replaying their changes
+        (journal mode)."""
+        self._journal.discard()
+        while nb_redo and self._redo:
+            item = self._redo.pop()
+            self._journal.apply(item.changes, forward=True)
+            ident, item.ident = item.ident, self._id
+            self._id = ident
+            self._undo.append(item)
+            nb_redo = nb_redo - 1
+        if self._undo_limit >= 0:
+            lower = max(0, len(self._undo) - self._undo_limit)
+            self._undo = self._undo[lower:]
+        return self._id
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2016 EDF R&D
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License Version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, you may download a copy of license
+# from https://www.gnu.org/licenses/gpl-3.0.
+
+"""
+Visible names
+-------------
+
+Index of the commands results that are visible from the commands of a
+stage.
+
+A command sees all the active commands of the preceding stages that have
+not been deleted (by a ``DETRUIRE`` command) and the active commands of its
+own stage that do not depend on it, minus those deleted by a deleter that
+does not depend on it.
+
+The index of a stage is built from the index of its parent stage and is
+reset when a command of the stage is modified (see
+:meth:`.Stage.reset_visible_names`): lookups by name then only check the few
+commands having this name. The results at the end of a stage are cached for
+the following stages.
+
+"""
+
+
+from collections import defaultdict
+
+from ..common import no_new_attributes
+from .command import deleted_by
+
+
+class VisibleNames:
+    """Index of the commands visible from the commands of a stage.
+
+    Arguments:
+        stage (Stage): Stage to index.
+        parent (Optional[VisibleNames]): Index of the parent stage.
+
+    Attributes:
+        _parent (VisibleNames): Index of the parent stage.
+        _local (list[Command]): Active commands of the stage.
+        _position (dict[int, int]): Position of the commands of the stage.
+        _by_name (dict[str, list[Command]]): Commands of the stage by result
+            name.
+        _deleters (dict[int, list[Command]]): Local deleters by uid of
+            the deleted commands.
+        _visible (list[Command]): Cache of the commands visible at the end
+            of the stage.
+        _visible_by_name (dict[str, list[Command]]): Cache of the commands
+            visible at the end of the stage by result name.
+    """
+
+    _parent = _local = _position = _by_name = _deleters = None
+    _visible = _visible_by_name = None
+    __setattr__ = no_new_attributes(object.__setattr__)
+
+    def __init__(self, stage, parent=None):
+        self._parent = parent
+        self._local = [cmd for cmd in stage.sorted_commands if cmd.active]
+        self._position = {}
+        self._by_name = defaultdict(list)
+        self._deleters = defaultdict(list)
+        for pos, cmd in enumerate(self._local):
+            self._position[cmd.uid] = pos
+            self._by_name[cmd.name].append(cmd)
+        for deleter in self._local:
+            for deleted in deleted_by(deleter):
+                uid = getattr(deleted, 'uid', None)
+                if uid is not None:
+                    self._deleters[uid].append(deleter)
+
+    @property
+    def parent(self):
+        """VisibleNames: Attribute that holds the index of the parent
+        stage."""
+        return self._parent
+
+    def _inherited(self):
+        """Return the commands visible at the end of the parent stage."""
+        return self._parent.visible() if self._parent else []
+
+    def _inherited_by_name(self, name):
+        """Return the commands named *name* visible at the end of the parent
+        stage."""
+        return self._parent.visible_by_name(name) if self._parent else []
+
+    def _is_visible(self, cmd, command, local=True):
+        """Tell if a command is visible from *command*.
+
+        Arguments:
+            cmd (Command): Indexed command.
+            command (Command): Command from which *cmd* is seen (*None*
+                means after the last command of the stage).
+            local (bool): *False* if *cmd* belongs to a preceding stage.
+        """
+        if command is not None and local and cmd.depends_on(command):
+            return False
+        # commands of the preceding stages are before the local deleters
+        pos = self._position[cmd.uid] if local else -1
+        for deleter in self._deleters.get(cmd.uid, ()):
+            if self._position[deleter.uid] > pos and \
+                    (command is None or not deleter.depends_on(command)):
+                return False
+        return True
+
+    def visible(self):
+        """Return the commands visible at the end of the stage.
+
+        Returns:
+            list[Command]: List of commands (must not be changed).
+        """
+        if self._visible is None:
+            self._visible = self.commands()
+        return self._visible
+
+    def visible_by_name(self, name):
+        """Return the commands named *name* visible at the end of the stage.
+
+        Returns:
+            list[Command]: List of commands (must not be changed).
+        """
+        if self._visible_by_name is None:
+            self._visible_by_name = defaultdict(list)
+            for cmd in self.visible():
+                self._visible_by_name[cmd.name].append(cmd)
+        return self._visible_by_name.get(name, [])
+
+    def commands(self, command=None, only_preceding=False):
+        """Return the commands visible from *command*.
+
+        See :meth:`.Stage.preceding_commands`.
+
+        Arguments:
+            command (Optional[Command]): Command from which the commands are
+                seen. If *None*, returns all visible commands.
+            only_preceding (bool): If *True* only returns the commands from
+                the preceding stages.
+
+        Returns:
+            list[Command]: List of commands.
+        """
+        if only_preceding:
+            return list(self._inherited())
+        if command is None and self._visible is not None:
+            return list(self._visible)
+        commands = [cmd for cmd in self._inherited()
+                    if self._is_visible(cmd, command, local=False)]
+        commands.extend(cmd for cmd in self._local
+                        if self._is_visible(cmd, command))
+        return commands
+
+    def deleters(self, command=None, only_preceding=False):
+        """Return the deleters visible from *command*.
+
+        Same as the deleters returned by :meth:`commands` with the same
+        arguments.
+        """
+        inherited = [cmd for cmd in self._inherited() if cmd.is_deleter]
+        if only_preceding:
+            return inherited
+        deleters = [cmd for cmd in inherited
+                    if self._is_visible(cmd, command, local=False)]
+        deleters.extend(cmd for cmd in self._local
+                        if cmd.is_deleter and self._is_visible(cmd, command))
+        return deleters
+
+    def is_visible(self, name, command=None):
+        """Tell if a result named *name* is visible from *command*.
+
+        Arguments:
+            name (str): Name of the result.
+            command (Optional[Command]): Command from which the results are
+                seen, it is excluded from the search.
+
+        Returns:
+            bool: *True* if another command with this name is visible.
+        """
+        for cmd in self._by_name.get(name, ()):
+            if cmd is not command and self._is_visible(cmd, command):
+                return True
+        for cmd in self._inherited_by_name(name):
+            if cmd is not command and \
+                    self._is_visible(cmd, command, local=False):
+                return True
+        return False
+
+    def names(self, command=None):
+        """Return the names of the results visible from *command*.
+
+        Arguments:
+            command (Optional[Command]): Command from which the results are
+                seen, it is excluded from the search.
+
+        Returns:
+            set[str]: Names of the results.
+        """
+        return set(cmd.name for cmd in self.commands(command)
+                   if cmd is not command)
@@ -300,9 +300,9 @@ def _check_cata(cata, checker):
 def obj_start(obj):
     """Helper function to represent an object."""
     txt = ""
-    if isinstance(obj, list):
+    if isinstance(obj, list) or getattr(obj, 'is_list', False):
         txt += "["
-    if isinstance(obj, tuple):
+    elif isinstance(obj, tuple):
         txt += "("
     return txt
 
@@ -310,9 +310,9 @@ def obj_start(obj):
 def obj_end(obj):
     """Helper function to represent an object."""
     txt = ""
-    if isinstance(obj, list):
+    if isinstance(obj, list) or getattr(obj, 'is_list', False):
         txt += "]"
-    if isinstance(obj, tuple):
+    elif isinstance(obj, tuple):
         if len(obj) == 1:
             txt += ", "
         txt += ")"
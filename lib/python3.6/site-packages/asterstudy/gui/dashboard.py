@@ -38,7 +38,8 @@ from ..common.decoder import Decoder
 from ..datamodel.case import Case
 from ..datamodel.engine import (Engine, code_aster_exit_code,
                                 default_parameters, runner_factory)
-from ..datamodel.result import Message, MsgLevel, MsgType, RunOptions
+from ..datamodel.result import (Message, MessageStore, MsgLevel, MsgType,
+                                RunOptions)
 from ..datamodel.result import StateOptions as SO
 from ..datamodel.stage import Stage
 from . import Context, Entity, NodeType, check_selection, get_node_type
@@ -2106,7 +2107,7 @@ class DashboardInfo(Q.QWidget):
         dshbrd = self.dashboard()
         study = dshbrd.astergui().study()
 
-        messages = []
+        messages = MessageStore()
         selected = dshbrd.selection()
         if len(selected) == 1:
             is_current_selected = (
@@ -3341,6 +3342,7 @@ class DashboardText(Q.QSplitter):
         text.addWidget(self._edit)
 
         self._graph = None
+        self._decoder = Decoder()
         self._last_plot = None
         self._last_size = 100
         if with_graph:
@@ -3424,7 +3426,7 @@ class DashboardText(Q.QSplitter):
         if not self._graph:
             return
 
-        datas = Decoder.decode(self.text())
+        datas = self._decoder.snapshot()
         menu = self._view_graph.menu()
         for act in menu.actions():
             if act.data() is not None:
@@ -3487,6 +3489,8 @@ class DashboardText(Q.QSplitter):
         """
         self._edit.setText(text)
         self._edit.moveCursor(cursor)
+        self._decoder = Decoder()
+        self._decodeText(text)
         self.updateGraph()
 
     def appendText(self, text):
@@ -3498,8 +3502,16 @@ class DashboardText(Q.QSplitter):
         """
         self._edit.append(text)
         self._edit.moveCursor(Q.QTextCursor.End)
+        self._decodeText(text)
         self.updateGraph()
 
+    def _decodeText(self, text):
+        """Decode the text added into editor (only the new text is decoded
+        at each refresh)."""
+        if self._graph:
+            # each text is added as a new paragraph
+            self._decoder.feed(text + "\n")
+
     def _find(self, text):
         wid = self._edit
         if wid is not None:
@@ -3722,6 +3734,7 @@ class DashboardMessages(Q.QWidget):
             Constructor
             """
             super(DashboardMessages.TreeWidget, self).__init__(parent)
+            self._store = MessageStore()
             self.setAllColumnsShowFocus(True)
             self.setColumnCount(5)
             self.setIndentation(5)
@@ -3754,13 +3767,22 @@ class DashboardMessages(Q.QWidget):
             Set the messages from run case to display.
 
             Arguments:
-                [(Stage, Message)]: list of pairs with stage and message
+                messages (MessageStore): messages of the run case
             """
-            self.clear()
-            for msg in messages:
-                self._createMessageItem(msg)
+            if not isinstance(messages, MessageStore):
+                messages = MessageStore(messages)
+            self._store = messages
             self._updateFiltering()
 
+        def messageStore(self):
+            """
+            Gets the messages displayed (filtered or not).
+
+            Returns:
+                MessageStore: messages of the run case
+            """
+            return self._store
+
         # pragma pylint: disable=unused-argument
         def drawBranches(self, painter, rect, index):
             """
@@ -3798,12 +3820,42 @@ class DashboardMessages(Q.QWidget):
 
         def _updateFiltering(self):
             """
-            Updates the visibility of message tree widget items.
+            Creates the tree widget items of the messages that respect
+            the filtering criteria.
+
+            The messages are selected by the index of the store, the items
+            are only created for the selected messages.
             """
-            for i in range(0, self.topLevelItemCount()):
-                item = self.topLevelItem(i)
-                item.setHidden(not self.filterMessage(item.message(),
-                                                      item.stage()))
+            self.clear()
+            for index in self._store.indexes(levels=self.levels(),
+                                             stages=self._selectedStages(),
+                                             source=self.source(),
+                                             text=self.filter()):
+                self._createMessageItem(self._store[index])
+
+        def _selectedStages(self):
+            """
+            Gets the stages of the messages to be displayed.
+
+            Returns:
+                list[(int, int)]: Case identifier and stage number of the
+                stages that match the current stage (see *filterMessage*),
+                *None* if all the stages are displayed.
+            """
+            if self.stage() is None:
+                return None
+            selected = []
+            _case = {}
+            for case_id, stage_num in self._store.stages():
+                if case_id not in _case:
+                    _case[case_id] = self.dashboard().get_object(case_id)
+                case = _case[case_id]
+                stage = None
+                if case is not None:
+                    stage = case.get_stage_by_num(stage_num)
+                if stage is None or stage.uid == self.stage():
+                    selected.append((case_id, stage_num))
+            return selected
 
         def _linkClicked(self):
             msg = None
@@ -4011,7 +4063,7 @@ class DashboardMessages(Q.QWidget):
         Set the messages from run case to display.
 
         Arguments:
-            [Message]: list of messages
+            messages (MessageStore): messages of the run case
         """
         self._messages.setMessages(messages)
 
@@ -4019,18 +4071,13 @@ class DashboardMessages(Q.QWidget):
         _case = {}
         ids = []
         stages = []
-        lvlcount = {}
-        for msg in messages:
-            level = msg.level
-            if level not in lvlcount:
-                lvlcount[level] = 0
-            lvlcount[level] = lvlcount[level] + 1
-            if msg.stage_num not in ids:
-                case = _case.setdefault(msg.case_id,
-                                        dshbrd.get_object(msg.case_id))
+        lvlcount = messages.count_by_level()
+        for case_id, stage_num in messages.stages():
+            if stage_num not in ids:
+                case = _case.setdefault(case_id, dshbrd.get_object(case_id))
                 if case is not None:
-                    ids.append(msg.stage_num)
-                    stages.append(case.get_stage_by_num(msg.stage_num))
+                    ids.append(stage_num)
+                    stages.append(case.get_stage_by_num(stage_num))
 
         for lb in self._levels:
             num = lvlcount[lb.level()] if lb.level() in lvlcount else 0
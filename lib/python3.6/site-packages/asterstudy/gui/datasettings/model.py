@@ -775,7 +775,9 @@ class Model:
             self._categories = []
             stages = self.case.stages
         for stage in stages:
-            if stage.is_graphical_mode():
+            # the commands of a stage that is not loaded yet are added when
+            # it has been loaded (see `Study._load_pending_stages()`)
+            if stage.is_graphical_mode() and stage.is_loaded():
                 # not be necessary if command.check was called before update
                 # now reorder is called by Command.init()
                 # stage.reorder()
@@ -52,6 +52,7 @@ class RunPanel(Q.QWidget):
     Panel with run parameters.
     """
     parametersChanged = Q.pyqtSignal()
+    serversRefreshed = Q.pyqtSignal()
 
     class TimeEdit(Q.QWidget):
         """
@@ -451,6 +452,12 @@ class RunPanel(Q.QWidget):
         self._serverActivated()
         self._versionActivated()
 
+        # revalidate the informations of the servers in background, the
+        # signal is emitted from the refresh thread and queued
+        self.serversRefreshed.connect(self._serversRefreshed)
+        self._infos.refresh_all(stale_only=True, wait=False,
+                                callback=self._emitServersRefreshed)
+
         self.setWindowTitle(translate("RunPanel", "Run parameters"))
         self._updateState()
 
@@ -1077,6 +1084,33 @@ class RunPanel(Q.QWidget):
         else:
             self._last_server = serv
 
+    def _emitServersRefreshed(self, _):
+        """
+        Called by the background refresh of the servers.
+        """
+        try:
+            self.serversRefreshed.emit()
+        except RuntimeError:
+            # the panel has been deleted meanwhile
+            pass
+
+    def _serversRefreshed(self):
+        """
+        Invoked when the informations of the servers have been refreshed in
+        background: updates the servers and versions lists.
+        """
+        server = self.server()
+        version = self.codeAsterVersion()
+        self._server.clear()
+        self._server.addItems(self._infos.available_servers)
+        idx = self._server.findText(server)
+        if idx >= 0:
+            self._server.setCurrentIndex(idx)
+        self._updateServerInfo(False)
+        if version is not None:
+            self.setCodeAsterVersion(version)
+        self._last_server = self.server()
+
     def _updateServerInfo(self, force=False):
         """
         Updates the code aster versions list dependant from current server.
@@ -421,6 +421,27 @@ class Study:
         self._data_files_model = create_data_files_model(case_proxy)
 
         self._state = self._undo_redo.current_state
+        if history.load_stages(limit=0):
+            Q.QTimer.singleShot(0, self._load_pending_stages)
+
+    def _load_pending_stages(self):
+        """Convert the stages whose loading has been deferred, one at a time
+        from the event loop, and report those kept in text mode."""
+        if self.astergui().study() is not self:
+            return
+        if self.history.load_stages(limit=1):
+            Q.QTimer.singleShot(0, self._load_pending_stages)
+            return
+        self.astergui().update()
+        failed = [stage.name for stage in self.history.current_case
+                  if stage.saving_mode == DataSet.graphicalMode
+                  and stage.is_text_mode()]
+        if failed:
+            msg = translate("AsterStudy",
+                            "These stages that were in graphical mode are "
+                            "syntactically invalid, they have been restored "
+                            "in text mode:\n{0}").format(", ".join(failed))
+            MessageBox.warning(self.astergui().mainWindow(), "AsterStudy", msg)
 
     def _load_wrapper(self, file_name, perm_file):
         """
@@ -479,7 +500,9 @@ class Study:
             self._last_chance = False
         History.reset_catalog()
         try:
-            history = History.load(file_name, **args)
+            # the graphical stages are converted later, from the event loop
+            # (see `_load_pending_stages()`), except for the retries
+            history = History.load(file_name, lazy=not args, **args)
         except (CatalogError, KeyError) as exc:
             if isinstance(exc, CatalogError) or "aster_version" in exc.args[0]:
                 defvers = CFG.default_version
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2016 EDF R&D
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License Version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, you may download a copy of license
+# from https://www.gnu.org/licenses/gpl-3.0.
+
+"""Benchmark of the loading of the commands catalog at startup.
+
+Each measure is done in a new process, with an empty configuration directory:
+the catalog is imported without snapshot, then the snapshot is built by the
+first loading and read by the next ones.
+
+Usage::
+
+    python bench_catalog_startup.py [--repeat 3]
+"""
+
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+CHILD = """
+import time
+import asterstudy.common
+start = time.time()
+from asterstudy.datamodel.catalogs import CATA
+print(time.time() - start, len(list(CATA)))
+"""
+
+
+def load(home, snapshot=True):
+    """Return the elapsed time to load the catalog in a new process."""
+    env = dict(os.environ, HOME=home)
+    env.pop("ASTERSTUDY_NO_CATALOG_SNAPSHOT", None)
+    if not snapshot:
+        env["ASTERSTUDY_NO_CATALOG_SNAPSHOT"] = "1"
+    output = subprocess.check_output([sys.executable, "-c", CHILD], env=env)
+    return float(output.split()[-2])
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="number of loadings (default: %(default)s)")
+    args = parser.parse_args()
+
+    home = tempfile.mkdtemp()
+    try:
+        imports = [load(home, snapshot=False) for _ in range(args.repeat)]
+        build = load(home)
+        snapshots = [load(home) for _ in range(args.repeat)]
+    finally:
+        shutil.rmtree(home)
+    print("{0:>12} {1:>12} {2:>12}".format("import", "build", "snapshot"))
+    print("{0:>12.2f} {1:>12.2f} {2:>12.2f}"
+          .format(min(imports), build, min(snapshots)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2016 EDF R&D
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License Version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, you may download a copy of license
+# from https://www.gnu.org/licenses/gpl-3.0.
+
+"""Benchmark of the decoding of the output shown in the dashboard.
+
+The output of a job is simulated by repeating a log of the tests data and
+appending it by chunks, as done by the refreshes of the dashboard. The
+whole text is decoded at each refresh or only the new chunk is passed to a
+streaming decoder.
+
+Usage::
+
+    python bench_decoder.py [--log hsnv125c.output] [--repeat 5]
+                            [--refresh 50]
+"""
+
+
+import argparse
+import os.path as osp
+import time
+
+from asterstudy.common import to_unicode
+from asterstudy.common.decoder import Decoder
+
+DATA = osp.join(osp.dirname(osp.dirname(osp.abspath(__file__))),
+                "data", "export")
+
+
+def chunks(text, nbchunks):
+    """Split a text into *nbchunks* chunks of lines."""
+    lines = text.splitlines()
+    size = len(lines) // nbchunks + 1
+    return ["\n".join(lines[i:i + size]) for i in range(0, len(lines), size)]
+
+
+def decode_all(parts):
+    """Decode the whole text at each refresh."""
+    start = time.time()
+    text = ""
+    for part in parts:
+        text = text + "\n" + part if text else part
+        datas = Decoder.decode(text)
+    return time.time() - start, datas
+
+
+def decode_stream(parts):
+    """Only decode the new text at each refresh."""
+    start = time.time()
+    decoder = Decoder()
+    for part in parts:
+        decoder.feed(part + "\n")
+        datas = decoder.snapshot()
+    return time.time() - start, datas
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--log', default="hsnv125c.output",
+                        help="log file in the tests data "
+                        "(default: %(default)s)")
+    parser.add_argument('--repeat', type=int, default=5,
+                        help="number of copies of the log "
+                        "(default: %(default)s)")
+    parser.add_argument('--refresh', type=int, default=50,
+                        help="number of refreshes (default: %(default)s)")
+    args = parser.parse_args()
+
+    with open(osp.join(DATA, args.log), "rb") as fobj:
+        text = to_unicode(fobj.read())
+    text = "\n".join([text] * args.repeat)
+    parts = chunks(text, args.refresh)
+
+    full, datas = decode_all(parts)
+    stream, datas_s = decode_stream(parts)
+    assert list(datas) == list(datas_s)
+    assert all(datas[key].y.size == datas_s[key].y.size for key in datas)
+    print("{0:>10} {1:>10} {2:>10} {3:>10}"
+          .format("lines", "refreshes", "full", "stream"))
+    print("{0:>10} {1:>10} {2:>10.2f} {3:>10.2f}"
+          .format(len(text.splitlines()), len(parts), full, stream))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2016 EDF R&D
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License Version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, you may download a copy of license
+# from https://www.gnu.org/licenses/gpl-3.0.
+
+"""Benchmark of the dependency index engines.
+
+Build a history of commands spread in several stages, each command
+depending on the first command of its stage and on a command of the previous
+stage.
+
+Usage::
+
+    python bench_dependency_index.py [--commands 20000] [--per-stage 200]
+        [--matrix-max 2000]
+
+The dense matrix engine is skipped above `--matrix-max` commands since it
+needs ``8 * N**2`` bytes. The bitset engine also needs a quadratic storage,
+about ``N**2 / 16`` bytes: the size of the index is printed for both.
+"""
+
+
+import argparse
+import sys
+import time
+
+from asterstudy.datamodel.abstract_data_model import add_parent
+from asterstudy.datamodel.history import History
+
+
+def build_history(kind, nbcmd, per_stage):
+    """Build a history with `nbcmd` commands and return it."""
+    history = History(deps_index=kind)
+    case = history.current_case
+    previous = []
+    count = 0
+    while count < nbcmd:
+        stage = case.create_stage("stage_{0}".format(len(case.stages)))
+        current = []
+        for i in range(min(per_stage, nbcmd - count)):
+            command = stage('DEFI_CONSTANTE', 'c{0}'.format(count))
+            if current:
+                add_parent(command, current[0])
+            if previous:
+                add_parent(command, previous[i % len(previous)])
+            current.append(command)
+            count += 1
+        previous = current
+    return history, previous
+
+
+def index_size(history):
+    """Return the number of bytes used by the dependency index."""
+    # pragma pylint: disable=protected-access
+    deps = history._deps
+    if hasattr(deps, '_ancestors'):
+        return sys.getsizeof(deps._ancestors) + \
+            sum(sys.getsizeof(bits) for bits in deps._ancestors.values())
+    return deps._deps.nbytes
+
+
+def run(kind, nbcmd, per_stage):
+    """Return elapsed times to build the history and to query it and the
+    size of the index."""
+    start = time.time()
+    history, last = build_history(kind, nbcmd, per_stage)
+    build = time.time() - start
+
+    first = history.current_case[0][0]
+    start = time.time()
+    for command in last:
+        assert command.depends_on(first)
+    query = time.time() - start
+    return build, query, index_size(history)
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--commands', type=int, default=20000,
+                        help="number of commands (default: %(default)s)")
+    parser.add_argument('--per-stage', type=int, default=200,
+                        help="commands per stage (default: %(default)s)")
+    parser.add_argument('--matrix-max', type=int, default=2000,
+                        help="largest history built with the 'matrix' "
+                             "engine (default: %(default)s)")
+    args = parser.parse_args()
+
+    sizes = sorted(set([min(args.commands, i) for i in (1000, 2000, 5000)] +
+                       [args.commands]))
+    print("{0:>8} {1:>8} {2:>10} {3:>10} {4:>10}"
+          .format("engine", "commands", "build (s)", "query (s)", "size (MB)"))
+    for nbcmd in sizes:
+        for kind in ('matrix', 'bitset'):
+            if kind == 'matrix' and nbcmd > args.matrix_max:
+                print("{0:>8} {1:>8} {2:>10}".format(kind, nbcmd, "skipped"))
+                continue
+            build, query, size = run(kind, nbcmd, args.per_stage)
+            print("{0:>8} {1:>8} {2:>10.2f} {3:>10.4f} {4:>10.1f}"
+                  .format(kind, nbcmd, build, query, size / 2.**20))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2016 EDF R&D
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License Version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, you may download a copy of license
+# from https://www.gnu.org/licenses/gpl-3.0.
+
+"""Benchmark of the loading of a study with graphical stages.
+
+Build a study with several graphical stages, each stage using the results of
+the previous one, save it and reload it from the structured storage of the
+commands and from the text of the stages. The last column gives the time
+until the first stage can be used when the loading of the stages is deferred.
+
+Usage::
+
+    python bench_structured_load.py [--stages 100]
+"""
+
+
+import argparse
+import json
+import time
+
+from asterstudy.datamodel.comm2study import comm2study
+from asterstudy.datamodel.general import ConversionLevel
+from asterstudy.datamodel.history import History
+from asterstudy.datamodel.serializer import history2json, json2history
+
+FIRST = """
+mesh = LIRE_MAILLAGE(UNITE=20, FORMAT='MED')
+model = AFFE_MODELE(MAILLAGE=mesh,
+                    AFFE=_F(TOUT='OUI', PHENOMENE='MECANIQUE',
+                            MODELISATION='3D'))
+"""
+
+STAGE = """
+mat{0} = DEFI_MATERIAU(ELAS=_F(E=2.e11, NU=0.3))
+chmat{0} = AFFE_MATERIAU(MAILLAGE=mesh, AFFE=_F(TOUT='OUI', MATER=mat{0}))
+load{0} = AFFE_CHAR_MECA(MODELE=model,
+                         DDL_IMPO=_F(GROUP_MA='BASE', DX=0., DY=0., DZ=0.),
+                         PRES_REP=_F(GROUP_MA='TOP', PRES={0}.))
+resu{0} = MECA_STATIQUE(MODELE=model, CHAM_MATER=chmat{0},
+                        EXCIT=_F(CHARGE=load{0}))
+resu{0} = CALC_CHAMP(reuse=resu{0}, RESULTAT=resu{0},
+                     CONTRAINTE=('SIGM_ELNO', ), CRITERES=('SIEQ_ELNO', ))
+DETRUIRE(CONCEPT=_F(NOM=(mat{0}, )))
+"""
+
+
+def build_study(nbstages):
+    """Build a study with `nbstages` stages and return its JSON text."""
+    history = History()
+    case = history.current_case
+    comm2study(FIRST, case.create_stage("stage_0"))
+    for i in range(1, nbstages):
+        comm2study(STAGE.format(i), case.create_stage("stage_{0}".format(i)))
+    return history2json(history)
+
+
+def text_only(js_text):
+    """Remove the structured storage of the commands."""
+    document = json.loads(js_text)
+    for stage in document["history"]["stages"]:
+        stage.pop("commands", None)
+    return json.dumps(document)
+
+
+def load(js_text, lazy=False):
+    """Return the elapsed time to load a study (and its first stage)."""
+    start = time.time()
+    history = json2history(js_text, strict=ConversionLevel.NoFail, lazy=lazy)
+    len(history.current_case[0])
+    return time.time() - start
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--stages', type=int, default=100,
+                        help="number of stages (default: %(default)s)")
+    args = parser.parse_args()
+
+    sizes = sorted(set([min(args.stages, i) for i in (10, 50)] +
+                       [args.stages]))
+    print("{0:>8} {1:>12} {2:>10} {3:>10}".format("stages", "structured",
+                                                  "text", "lazy"))
+    for nbstages in sizes:
+        js_text = build_study(nbstages)
+        structured = load(js_text)
+        text = load(text_only(js_text))
+        lazy = load(js_text, lazy=True)
+        print("{0:>8} {1:>12.2f} {2:>10.2f} {3:>10.2f}"
+              .format(nbstages, structured, text, lazy))
+
+
+if __name__ == "__main__":
+    main()
@@ -18,12 +18,14 @@
 """Automatic tests for API calculation objects."""
 
 
+import asyncio
 import os
 import os.path as osp
 import time
 import unittest
+from unittest.mock import patch
 
-from asterstudy.api import Calculation, FileAttr
+from asterstudy.api import Calculation, Engine, FileAttr
 from asterstudy.common import debug_mode
 from asterstudy.datamodel.engine.salome_runner import has_salome
 from asterstudy.datamodel.result import StateOptions as SO
@@ -142,6 +144,66 @@ def test_refresh(tmpdir):
     assert_that(watch._do_refresh(), equal_to(True))
 
 
+
+def _simulated_calculation(tmpdir):
+    calc = Calculation(tmpdir)
+    calc.add_stage_from_string("DEBUT()\nFIN()")
+    calc.set("time", 10)
+    calc._watcher.set_engine(Engine.Simulator)
+    return calc
+
+
+@tempdir
+def test_wait(tmpdir):
+    calc = _simulated_calculation(tmpdir)
+    assert_that(calc.wait(timeout=0.1), equal_to(False))
+
+    target = "asterstudy.datamodel.engine.simulator.Simulator"
+    with patch(target + "._simulation_time", return_value=1.5), \
+         patch(target + "._simulation_state", return_value=SO.Success):
+        calc.start()
+        tini, cpu = time.time(), time.process_time()
+        assert_that(calc.wait(timeout=0.2), equal_to(False))
+        assert_that(calc.wait(), equal_to(True))
+        elapsed = time.time() - tini
+        # not waiting until the next refresh
+        assert_that(elapsed, close_to(1.5, 0.5))
+        # and not spinning
+        assert_that(time.process_time() - cpu, less_than(elapsed / 2))
+    assert_that(calc.state, equal_to(SO.Success))
+
+    # the runner may wake up often, the deadline does not move
+    calc = _simulated_calculation(osp.join(tmpdir, "woken"))
+    woken = lambda _: time.sleep(0.02) or True
+    with patch(target + "._simulation_time", return_value=10.), \
+         patch(target + "._simulation_state", return_value=SO.Success), \
+         patch(target + ".wait", side_effect=woken):
+        calc.start()
+        tini = time.time()
+        assert_that(calc.wait(timeout=0.3), equal_to(False))
+        assert_that(time.time() - tini, less_than(2.))
+
+
+@tempdir
+def test_wait_async(tmpdir):
+    target = "asterstudy.datamodel.engine.simulator.Simulator"
+    with patch(target + "._simulation_time", return_value=0.5), \
+         patch(target + "._simulation_state", return_value=SO.Success):
+        calcs = [_simulated_calculation(osp.join(tmpdir, str(i)))
+                 for i in range(10)]
+        for calc in calcs:
+            calc.start()
+
+        async def _wait_all():
+            return await asyncio.gather(*[calc.wait_async(timeout=10)
+                                          for calc in calcs])
+
+        tini = time.time()
+        assert_that(asyncio.run(_wait_all()), only_contains(True))
+        assert_that(time.time() - tini, less_than(3.))
+    assert_that([calc.state for calc in calcs], only_contains(SO.Success))
+
+
 if __name__ == "__main__":
     import sys
     from testutils import get_test_suite
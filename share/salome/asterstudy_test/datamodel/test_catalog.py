@@ -19,10 +19,14 @@
 
 
 from collections import defaultdict
+import gc
 import os
 import os.path as osp
-import unittest
+import pickle
 import re
+import shutil
+import tempfile
+import unittest
 from hamcrest import *
 
 from asterstudy.common import CFG
@@ -284,6 +288,291 @@ def test_type2command():
     assert_that(typ2cmd, has_item("fonction_c"))
 
 
+def test_bloc_condition():
+    """Test for evaluation of blocs conditions"""
+    sample = CATA.get_catalog("DEFI_FONCTION").entities['b_vale_para']
+    bloc_class = type(sample)
+    assert_that(sample.isEnabled({'VALE_PARA': (0., 1.)}), equal_to(True))
+    assert_that(sample.isEnabled({'VALE_PARA': None}), equal_to(False))
+    assert_that(sample.isEnabled({}), equal_to(False))
+
+    bloc = bloc_class({'condition': """TYPE != 'A'"""})
+    # missing keyword: the condition can not be evaluated
+    assert_that(bloc.isEnabled({}), equal_to(False))
+    assert_that(bloc.isEnabled({'TYPE': None}), equal_to(True))
+    assert_that(bloc.isEnabled({'TYPE': 'A'}), equal_to(False))
+    assert_that(bloc.isEnabled({'TYPE': 'B'}), equal_to(True))
+
+    # the type of the values is taken into account
+    bloc = bloc_class({'condition': """is_type("X") == int"""})
+    assert_that(bloc.isEnabled({'X': 1}), equal_to(True))
+    assert_that(bloc.isEnabled({'X': 1.}), equal_to(False))
+
+    # keywords names are computed: results are not stored
+    bloc = bloc_class({'condition': """exists("A" + "B")"""})
+    assert_that(bloc.isEnabled({'AB': 1}), equal_to(True))
+    assert_that(bloc.isEnabled({'AB': None}), equal_to(False))
+
+    # mutable values
+    bloc = bloc_class({'condition': """is_in("L", ('b', 'c'))"""})
+    values = ['a']
+    assert_that(bloc.isEnabled({'L': values}), equal_to(False))
+    values.append('b')
+    assert_that(bloc.isEnabled({'L': values}), equal_to(True))
+
+    bloc = bloc_class({'condition': """invalid syntax"""})
+    assert_that(bloc.isEnabled({}), equal_to(False))
+
+
+def test_numeric_sequence_check():
+    """Test for the check of large numeric sequences at once"""
+    import sys
+    import warnings
+    import numpy
+    from unittest.mock import patch
+    CATA.package("SyntaxChecker")
+    checker = sys.modules["code_aster.Cata.Language.SyntaxChecker"]
+    SIMP = CATA.package("Syntax").SIMP
+
+    def _check(keyword, value):
+        try:
+            with warnings.catch_warnings():
+                # comparison of numpy floats with the integer types
+                warnings.simplefilter("ignore", DeprecationWarning)
+                keyword.accept(checker.SyntaxCheckerVisitor(), value)
+        except checker.CheckerError as exc:
+            return exc.original, exc.msg
+        return None
+
+    reals = SIMP(statut='o', typ='R', max='**', val_min=0., val_max=1.e6)
+    ints = SIMP(statut='o', typ='I', max=2000, into=tuple(range(10)))
+    nbval = 1000
+    values = [
+        (reals, [float(i) for i in range(nbval)]),
+        (reals, numpy.arange(nbval, dtype=float)),
+        (reals, list(range(nbval)) + [0.5]),
+        (reals, [float(i) for i in range(nbval)] + [-1.]),
+        (reals, [1.] * nbval + [2.e6]),
+        (reals, numpy.array([1.] * nbval + [numpy.nan])),
+        (reals, [1.] * nbval + [1j]),
+        (ints, [i % 10 for i in range(nbval)]),
+        (ints, [i % 10 for i in range(nbval)] + [12]),
+        (ints, [float(i % 10) for i in range(nbval)]),
+        (ints, [1] * nbval + [1.5]),
+        (ints, numpy.zeros(nbval)),
+        (ints, numpy.zeros(nbval, dtype=int)),
+        (ints, [1] * 3000),
+    ]
+    expected = []
+    with patch.object(checker, "FAST_CHECK_SIZE", 10 ** 9):
+        for keyword, value in values:
+            expected.append(_check(keyword, value))
+    assert_that(expected[0], none())
+    assert_that(expected[3][1], contains_string("-1.0 is not"))
+    assert_that(expected[8][1], contains_string("Unexpected value: 12"))
+    for (keyword, value), result in zip(values, expected):
+        assert_that(_check(keyword, value), equal_to(result))
+
+    # valid sequences are not checked value by value
+    with patch.object(checker, "isValidType",
+                      side_effect=AssertionError("not called")):
+        for index in (0, 1, 7, 12):
+            assert_that(_check(*values[index]), none())
+    array = checker._numeric_values([1, 2.], [float, int])
+    assert_that(array.dtype, equal_to(numpy.float64))
+    assert_that(checker._numeric_values([1, True], [float, int]), none())
+    assert_that(checker._numeric_values([1, 2], [str]), none())
+
+
+def test_keywords_resolution():
+    """Test for the resolution context of an occurrence"""
+    command = CATA.get_catalog("LIRE_MAILLAGE")
+    definition = command.definition
+    assert_that(definition.keywords, equal_to(definition.keywords))
+    assert_that(definition.keywords is definition.keywords, equal_to(False))
+    assert_that([i.getCondition() for i in definition.blocs],
+                has_length(len([i for i in definition.values()
+                                if get_cata_typeid(i) == IDS.bloc])))
+
+    syntax = {'FORMAT': 'MED', 'UNITE': 20}
+    resolution = command.resolve(syntax)
+    assert_that(resolution.syntax, has_entry('INFO_MED', 1))
+    assert_that(syntax, is_not(has_key('INFO_MED')))
+    assert_that(resolution.keywords, has_key('NOM_MED'))
+    assert_that(resolution.keywords, is_not(has_key('CREA_GROUP_COUL')))
+    for key in ('NOM_MED', 'CREA_GROUP_COUL', 'UNITE', 'UNKNOWN'):
+        assert_that(command.getKeyword(key, syntax, None, resolution),
+                    equal_to(command.getKeyword(key, syntax)))
+    assert_that(command.getRules(syntax, None, resolution),
+                equal_to(command.getRules(syntax)))
+
+    syntax['FORMAT'] = 'IDEAS'
+    assert_that(command.getKeyword('CREA_GROUP_COUL', syntax), not_none())
+    assert_that(command.getKeyword('NOM_MED', syntax), none())
+
+    # mandatory keyword in an enabled block
+    command = CATA.get_catalog("DEFI_FONCTION")
+    syntax = {'NOM_PARA': 'X', 'ABSCISSE': (0., 1.)}
+    stack = []
+    assert_that(calling(command.checkMandatory).with_args(syntax, stack),
+                raises(KeyError))
+    assert_that(stack, equal_to(['ORDONNEE']))
+    syntax['ORDONNEE'] = (1., 2.)
+    command.checkMandatory(syntax, stack)
+
+
+def test_catalog_snapshot():
+    """Test for the snapshot of the catalog"""
+    from asterstudy.datamodel import catalog_snapshot as snap
+    tmpdir = tempfile.mkdtemp()
+    version_path = osp.join(tmpdir, "vers")
+    os.makedirs(osp.join(version_path, "code_aster", "Cata"))
+    source = osp.join(version_path, "code_aster", "Cata", "__init__.py")
+    with open(source, "w") as fobj:
+        fobj.write("")
+
+    key = snap.snapshot_key(version_path)
+    assert_that(snap.snapshot_key(version_path), equal_to(key))
+    assert_that(snap.snapshot_key(version_path, "other"),
+                is_not(equal_to(key)))
+    with open(source, "w") as fobj:
+        fobj.write("# changed\n")
+    assert_that(snap.snapshot_key(version_path), is_not(equal_to(key)))
+    key = snap.snapshot_key(version_path)
+
+    copier = CATA.get_catalog("COPIER")
+    orig_path = snap.snapshot_path
+    snap.snapshot_path = lambda _, kind=snap.SNAPSHOT: \
+        osp.join(tmpdir, "snapshot")
+    try:
+        assert_that(snap.load_snapshot(version_path, key), none())
+        content = {'catalogs': {'COPIER': copier}, 'value': 1}
+        assert_that(snap.save_snapshot(version_path, key, content),
+                    equal_to(True))
+        assert_that(snap.load_snapshot(version_path, key[::-1]), none())
+        known = set(snap._restored._functions.keys())
+        restored = snap.load_snapshot(version_path, key)
+        assert_that(restored['value'], equal_to(1))
+        command = restored['catalogs']['COPIER']
+        assert_that(command, is_not(same_instance(copier)))
+        assert_that(command.name, equal_to("COPIER"))
+        assert_that(list(command.keywords), equal_to(list(copier.keywords)))
+        # sd_prod function stored by value
+        sd_prod = command.definition['sd_prod']
+        assert_that(sd_prod, is_not(same_instance(
+            copier.definition['sd_prod'])))
+        DS = CATA.package('DataStructure')
+        assert_that(sd_prod(CONCEPT=DS.maillage_sdaster()),
+                    equal_to(DS.maillage_sdaster))
+        # restored functions can be pickled by reference while they are used
+        assert_that(pickle.loads(pickle.dumps(sd_prod)),
+                    same_instance(sd_prod))
+        name = sd_prod.__qualname__.split('.')[1]
+        assert_that(getattr(snap._restored, name), same_instance(sd_prod))
+        content = {'first': copier.definition['sd_prod'],
+                   'second': copier.definition['sd_prod']}
+        assert_that(snap.save_snapshot(version_path, key, content),
+                    equal_to(True))
+        twice = snap.load_snapshot(version_path, key)
+        assert_that(twice['first'], same_instance(twice['second']))
+        assert_that(set(snap._restored._functions.keys()) - known,
+                    has_length(2))
+        # released with the objects that use them
+        del restored, command, sd_prod, twice
+        gc.collect()
+        assert_that(set(snap._restored._functions.keys()) - known, empty())
+        # no hook only available from Python 3.8
+        assert_that(hasattr(snap._SnapshotPickler, 'reducer_override'),
+                    equal_to(False))
+
+        # corrupted file
+        with open(osp.join(tmpdir, "snapshot"), "r+b") as fobj:
+            fobj.seek(-1, os.SEEK_END)
+            fobj.write(b"\0")
+        assert_that(snap.load_snapshot(version_path, key), none())
+    finally:
+        snap.snapshot_path = orig_path
+        shutil.rmtree(tmpdir)
+
+    # the catalog snapshot is up to date
+    version_path = CATA.version_path(CATA.version)
+    key = snap.snapshot_key(version_path, CATA._snapshot_extra(CATA.version))
+    if snap.snapshot_enabled():
+        content = snap.load_snapshot(version_path, key)
+        assert_that(content['catalogs'], has_length(len(list(CATA))))
+        assert_that(content['type2command'], has_length(
+            len(CATA.type2command)))
+
+
+def test_lazy_commands():
+    """Test for the import of the commands on demand"""
+    from asterstudy.datamodel.catalogs import LazyCommands
+    from asterstudy.datamodel.comm2study import CommandsContext
+    imported = []
+
+    def importer(modname):
+        imported.append(modname)
+        return type(modname, (), {'CMD_A': 'a', 'CMD_B': 'b'})
+
+    commands = LazyCommands({'CMD_A': 'mod_a', 'CMD_B': 'mod_b'}, importer)
+    assert_that(commands, has_length(2))
+    assert_that(sorted(commands), equal_to(['CMD_A', 'CMD_B']))
+    assert_that('CMD_A' in commands, equal_to(True))
+    assert_that(imported, empty())
+
+    assert_that(commands['CMD_B'], equal_to('b'))
+    assert_that(commands['CMD_B'], equal_to('b'))
+    assert_that(imported, equal_to(['mod_b']))
+    assert_that(commands.loaded(), equal_to(['CMD_B']))
+
+    commands['CMD_C'] = 'c'
+    assert_that(commands['CMD_C'], equal_to('c'))
+    assert_that(commands, has_length(3))
+    del commands['CMD_A']
+    assert_that('CMD_A' in commands, equal_to(False))
+    assert_that(imported, equal_to(['mod_b']))
+
+    context = CommandsContext()
+    assert_that(context['COPIER'], same_instance(CATA.get_catalog('COPIER')))
+    assert_that(calling(context.__getitem__).with_args('NOT_A_COMMAND'),
+                raises(KeyError))
+
+
+def test_lazy_mode():
+    """Test for the selection of the lazy mode"""
+    import importlib
+    from unittest.mock import patch
+    import asterstudy.api
+    from asterstudy.datamodel.catalogs import Catalogs, lazy_enabled
+    key = 'ASTERSTUDY_LAZY_CATALOG'
+
+    with patch.dict(os.environ):
+        os.environ.pop(key, None)
+        # the environment of the process is not changed by the API
+        importlib.reload(asterstudy.api)
+        assert_that(os.environ, is_not(has_key(key)))
+        assert_that(lazy_enabled(), equal_to(False))
+        assert_that(lazy_enabled(True), equal_to(True))
+        # the environment variable is a user override
+        os.environ[key] = '0'
+        assert_that(lazy_enabled(True), equal_to(False))
+        os.environ[key] = '1'
+        assert_that(lazy_enabled(), equal_to(True))
+
+    cata = Catalogs()
+    cata.set_lazy()
+    assert_that(cata._lazy, equal_to(True))
+    # the default catalog is read on first access
+    with patch.object(Catalogs, 'read_catalogs', autospec=True) as read:
+        cata.get_catalog('COPIER')
+        read.assert_called_once_with(cata)
+    # no effect once the catalog is read
+    assert_that(CATA.version, not_none())
+    lazy = CATA._lazy
+    CATA.set_lazy(not lazy)
+    assert_that(CATA._lazy, equal_to(lazy))
+
+
 if __name__ == "__main__":
     import sys
     from testutils import get_test_suite
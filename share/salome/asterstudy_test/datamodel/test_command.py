@@ -499,6 +499,39 @@ def test_get_types():
     assert_that(res, contains(CATA.baseds))
 
 
+def test_condition_context():
+    """Test for the context used to evaluate the blocks conditions"""
+    from asterstudy.datamodel.command import ConditionContext, KeysMixing
+    history = History()
+    stage = history.current_case.create_stage(':memory:')
+    mesh = stage('LIRE_MAILLAGE', 'mesh')
+
+    # FORMAT='MED' by default, not added to the keywords
+    assert_that(mesh['NOM_MED'], not_none())
+    assert_that(mesh.storage_nocopy, is_not(has_key('FORMAT')))
+    assert_that(calling(mesh.__getitem__).with_args('CREA_GROUP_COUL'),
+                raises(KeyError))
+
+    mesh['FORMAT'] = 'IDEAS'
+    assert_that(mesh['CREA_GROUP_COUL'], not_none())
+    assert_that(calling(mesh.__getitem__).with_args('NOM_MED'),
+                raises(KeyError))
+
+    # local values first, then the keywords of the command
+    context = mesh['VERI_MAIL'].condition_context()
+    assert_that(context, instance_of(ConditionContext))
+    assert_that(context['VERIF'], equal_to('OUI'))
+    assert_that(context['FORMAT'], equal_to('IDEAS'))
+    assert_that(mesh.storage_nocopy['VERI_MAIL'], is_not(has_key('VERIF')))
+
+    # user variables are evaluated, the storage is not changed
+    fmt = stage.add_variable('fmt', "'IDEAS'")
+    storage = {'FORMAT': fmt}
+    bloc = CATA.get_catalog('LIRE_MAILLAGE').definition['b_format_ideas']
+    assert_that(KeysMixing.is_item_enabled(bloc, storage), equal_to(True))
+    assert_that(storage['FORMAT'], same_instance(fmt))
+
+
 if __name__ == "__main__":
     import sys
     from testutils import get_test_suite
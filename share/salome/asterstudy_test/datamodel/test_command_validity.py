@@ -369,6 +369,74 @@ DETRUIRE(CONCEPT=_F(NOM=(mesh, )))
                                'LIRE_MAILLAGE', 'DETRUIRE'))
 
 
+def _preceding_commands(stage, command):
+    """Reference implementation of `Stage.preceding_commands`."""
+    from asterstudy.datamodel.command import deleted_by
+    commands = []
+    if stage.parent_stage:
+        commands = _preceding_commands(stage.parent_stage, command)
+    for cmd in stage.sorted_commands:
+        if not cmd.active or (command is not None and cmd.depends_on(command)):
+            continue
+        commands.append(cmd)
+        deleted = deleted_by(cmd)
+        commands = [i for i in commands if i not in deleted]
+    return commands
+
+
+def test_visible_names():
+    """Test for the index of visible names"""
+    history = History()
+    case = history.current_case
+    stage1 = case.create_stage('s1')
+    comm2study("""
+mesh = LIRE_MAILLAGE(UNITE=20)
+mesh2 = LIRE_MAILLAGE(UNITE=21)
+""", stage1)
+    stage2 = case.create_stage('s2')
+    comm2study("""
+DETRUIRE(CONCEPT=_F(NOM=mesh))
+mesh = LIRE_MAILLAGE(UNITE=22)
+model = AFFE_MODELE(MAILLAGE=mesh,
+                    AFFE=_F(TOUT='OUI', PHENOMENE='MECANIQUE',
+                            MODELISATION='3D'))
+""", stage2)
+
+    def _check():
+        for stage in case.stages:
+            for cmd in [None] + stage.sorted_commands:
+                assert_that(stage.preceding_commands(cmd),
+                            equal_to(_preceding_commands(stage, cmd)))
+            for cmd in stage.sorted_commands:
+                expected = set(i.name for i in _preceding_commands(stage, cmd)
+                               if i is not cmd)
+                assert_that(cmd.previous_names(), equal_to(expected))
+
+    _check()
+    mesh1, mesh2 = stage1.sorted_commands
+    detr, mesh3, model = stage2.sorted_commands
+    assert_that(stage2.preceding_commands(None, only_preceding=True),
+                contains(mesh1, mesh2))
+    assert_that(stage2.preceding_commands(None),
+                contains(mesh2, detr, mesh3, model))
+    assert_that(mesh3.check(), equal_to(Validity.Nothing))
+
+    # the index is rebuilt after a modification
+    mesh3.name = 'mesh2'
+    _check()
+    assert_that(mesh3.check() & Validity.Naming)
+    mesh3.name = 'mesh'
+    mesh2.active = False
+    _check()
+    assert_that(stage2.visible_names.is_visible('mesh2'), equal_to(False))
+    detr.delete()
+    _check()
+    assert_that(stage2.visible_names.is_visible('mesh', mesh3),
+                equal_to(True))
+    assert_that(case.generate_name(mesh3, check_previous=True),
+                is_not(is_in(['mesh', 'model'])))
+
+
 def test_28054():
 #tab = POST_ELEM(TRAV_EXT=_F())
     text = \
@@ -392,6 +460,62 @@ res = MACR_ELEM_STAT(RIGI_MECA=_F())
     assert_that(cmd.check(safe=False), equal_to(Validity.Nothing))
 
 
+def test_syntax_cache():
+    from asterstudy.datamodel.command.syntax_cache import SYNTAX_CACHE
+    text = \
+"""
+mesh = LIRE_MAILLAGE(UNITE=20)
+
+model = AFFE_MODELE(AFFE=_F(MODELISATION='3D', PHENOMENE='MECANIQUE',
+                            TOUT='OUI'),
+                    MAILLAGE=mesh)
+"""
+    SYNTAX_CACHE.clear()
+    stages = []
+    for _ in range(2):
+        history = History()
+        stage = history.current_case.create_stage(':memory:')
+        comm2study(text, stage)
+        stages.append(stage)
+
+    model1 = stages[0]['model']
+    assert_that(model1.check(), equal_to(Validity.Nothing))
+    misses = SYNTAX_CACHE.misses
+    assert_that(SYNTAX_CACHE.hits, equal_to(0))
+
+    # identical commands in another study
+    model2 = stages[1]['model']
+    assert_that(model2.check(), equal_to(Validity.Nothing))
+    assert_that(SYNTAX_CACHE.hits, equal_to(2))
+    assert_that(SYNTAX_CACHE.misses, equal_to(misses))
+
+    # invalid keywords, then restored
+    storage = model2.storage
+    storage['AFFE']['MODELISATION'] = 'XXX'
+    model2.init(storage)
+    assert_that(model2.check(), equal_to(Validity.Syntaxic))
+    assert_that(SYNTAX_CACHE.misses, equal_to(misses + 1))
+    storage['AFFE']['MODELISATION'] = '3D'
+    model2.init(storage)
+    assert_that(model2.check(), equal_to(Validity.Nothing))
+    storage['AFFE']['MODELISATION'] = 'XXX'
+    model2.init(storage)
+    assert_that(model2.check(), equal_to(Validity.Syntaxic))
+    assert_that(SYNTAX_CACHE.misses, equal_to(misses + 1))
+    # a known error is raised again
+    model2.reset_validity()
+    assert_that(calling(model2.check).with_args(safe=False),
+                raises(Exception))
+
+    # the type of the results is part of the key
+    model1.reset_validity()
+    model1._cache_type = None
+    stages[0]['mesh']._cache_type = str
+    assert_that(model1.check(), equal_to(Validity.Syntaxic))
+    assert_that(SYNTAX_CACHE.stats()['size'], equal_to(len(SYNTAX_CACHE)))
+    assert_that(SYNTAX_CACHE.hit_rate, greater_than(0.))
+
+
 if __name__ == "__main__":
     import sys
     from testutils import get_test_suite
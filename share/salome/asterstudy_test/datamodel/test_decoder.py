@@ -25,7 +25,8 @@ import unittest
 from asterstudy.common import to_unicode
 from asterstudy.common.execution import remove_mpi_prefix
 from asterstudy.common.decoder import (ConvergenceDecoder, Decoder,
-                                       DynaVibraTimeDecoder, NLTimeDecoder)
+                                       DynaVibraTimeDecoder, GrowableArray,
+                                       NLTimeDecoder)
 from hamcrest import *
 
 
@@ -107,6 +108,54 @@ def test_decoder():
     assert_that(datas["iteration"].y, has_length(1904))
 
 
+def test_decoder_stream():
+    output = osp.join(os.getenv('ASTERSTUDYDIR'),
+                      'data', 'export', 'hsnv125c.output')
+    with open(output) as fmess:
+        text = fmess.read()
+    expected = Decoder.decode(text)
+
+    decoder = Decoder()
+    assert_that(decoder.snapshot(), empty())
+    size = len(text) // 7
+    decoder.feed(text[:size])
+    assert_that(decoder.snapshot()["iteration"].y,
+                has_length(less_than(1904)))
+    for i in range(size, len(text), size):
+        decoder.feed(text[i:i + size])
+    decoder.feed("", final=True)
+    datas = decoder.snapshot()
+    assert_that(list(datas.keys()), equal_to(list(expected.keys())))
+    for key, data in expected.items():
+        assert_that(datas[key].title, equal_to(data.title))
+        assert_that(datas[key].y.tolist(), equal_to(data.y.tolist()))
+        assert_that(datas[key].x.tolist(), equal_to(data.x.tolist()))
+
+    # the mapping of the columns is kept between the chunks
+    decoder = ConvergenceDecoder()
+    decoder.feed("| ITERATION | RESI_GLOB_MAXI |\n| 1 | 1.0E+00 |\n")
+    decoder.feed("| 2 | 2.0E-01 |\n| 3 ")
+    assert_that(decoder.snapshot()["resi_glob_maxi"].y.tolist(),
+                equal_to([1.0, 0.2]))
+    decoder.feed("| 3.0E-02 |\n")
+    assert_that(decoder.snapshot()["iteration"].y.tolist(),
+                equal_to([1, 2, 3]))
+
+
+def test_growable_array():
+    array = GrowableArray(float, capacity=2)
+    assert_that(array, has_length(0))
+    for i in range(5):
+        array.append(i)
+    array.extend([5., 6.])
+    assert_that(array, has_length(7))
+    assert_that(array.values.tolist(), equal_to(list(range(7))))
+    view = array.values
+    array.extend(range(100))
+    assert_that(view, has_length(7))
+    assert_that(array.values, has_length(107))
+
+
 def test_reg():
     text = \
 """
@@ -30,20 +30,28 @@ Example::
 
 import os
 import os.path as osp
+import signal
+import threading
 import time
 import unittest
+from unittest.mock import PropertyMock, patch
 
-from asterstudy.common.remote_utils import remote_exec
+from asterstudy.common.remote_utils import RemoteChannels, remote_exec
 from asterstudy.datamodel import History
 from asterstudy.datamodel.engine import (Engine, runner_factory,
                                          serverinfos_factory)
+from asterstudy.datamodel.engine.abstract_runner import ServerInfos
 from asterstudy.datamodel.engine.engine_utils import (
-    _convert_launcher_state, code_aster_exit_code, convert_state_from_message,
-    database_path, default_parameters, from_asrun_params, has_asrun,
-    parse_server_config, remote_file_copy)
-from asterstudy.datamodel.engine.salome_runner import (SalomeInfos,
+    RemoteLogStreams, _convert_launcher_state, code_aster_exit_code,
+    convert_state_from_message, database_path, default_parameters,
+    from_asrun_params, has_asrun, parse_server_config, remote_file_copy)
+from asterstudy.datamodel.engine.local_scheduler import (LocalJob,
+                                                         LocalScheduler,
+                                                         job_requirements)
+from asterstudy.datamodel.engine.salome_runner import (Salome, SalomeInfos,
                                                        create_command_job,
                                                        has_salome)
+from asterstudy.datamodel.engine.server_cache import ServerCache
 from asterstudy.datamodel.result import Job
 from asterstudy.datamodel.result import StateOptions as SO
 from engine_testcases import _setup_run_case
@@ -152,6 +160,335 @@ def test_1(tmpdir):
     assert_that(osp.isfile(dest), equal_to(True))
 
 
+def test_remote_channels():
+    closed = []
+
+    class LocalTransport:
+        """Stand-in for SSH that executes the commands locally."""
+
+        @staticmethod
+        def multiplexing():
+            return True
+
+        @staticmethod
+        def command(user, host, control, idle):
+            return ["sh", "-c"]
+
+        @staticmethod
+        def close(user, host, control):
+            closed.append((user, host, control))
+
+    pool = RemoteChannels(LocalTransport(), idle=60, maxcalls=1)
+    assert_that(pool.run("user", "host1", "echo hello"),
+                equal_to((0, b"hello\n", b"")))
+    code, _, err = pool.run("user", "host1", "echo error >&2 ; exit 3")
+    assert_that(code, equal_to(3))
+    assert_that(err, equal_to(b"error\n"))
+    pool.run("user", "host2", "true")
+    assert_that(pool.channels(),
+                contains(("user", "host1"), ("user", "host2")))
+
+    # timeout
+    tini = time.time()
+    code, _, err = pool.run("user", "host1", "sleep 10", timeout=0.5)
+    assert_that(code, equal_to(6))
+    assert_that(err.decode(), contains_string("not finished"))
+    assert_that(time.time() - tini, less_than(5.))
+
+    # concurrency limit: one command at a time on a server
+    from threading import Thread
+    tini = time.time()
+    threads = [Thread(target=pool.run, args=("user", "host1", "sleep 0.3"))
+               for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert_that(time.time() - tini, greater_than_or_equal_to(0.6))
+
+    # a connection is not closed while a command is running
+    started = time.time()
+    thread = Thread(target=pool.run, args=("user", "host2", "sleep 0.5"))
+    thread.start()
+    while not pool._channels[("user", "host2")][3] and \
+            time.time() - started < 10.:
+        time.sleep(0.01)
+    pool.evict(idle=0)
+    assert_that(pool.channels(), contains(("user", "host2")))
+    thread.join()
+    assert_that([i[:2] for i in closed], contains(("user", "host1")))
+
+    # eviction of the idle connections
+    pool.evict(idle=0)
+    assert_that(pool.channels(), empty())
+    assert_that([i[:2] for i in closed],
+                contains_inanyorder(("user", "host1"), ("user", "host2")))
+    pool.run("user", "host1", "true")
+    pool.close_all()
+    assert_that(closed, has_length(3))
+
+
+@tempdir
+def test_remote_logs(tmpdir):
+    calls = []
+
+    def local_exec(user, host, command, **kwargs):
+        """Stand-in for remote_exec that runs the command locally."""
+        calls.append(host)
+        return remote_exec("", "", command, **kwargs)
+
+    log1 = osp.join(tmpdir, "log1")
+    log2 = osp.join(tmpdir, "log 2")
+    with open(log1, "w") as fobj:
+        fobj.write("line 1\nline 2\n[1] output of proc #1\nline")
+    with open(log2, "w") as fobj:
+        fobj.write("a\nb\nc\n")
+
+    streams = RemoteLogStreams(local_exec, max_age=0.5)
+    assert_that(streams.read("user", "host", log1),
+                equal_to("line 1\nline 2\n"))
+    assert_that(calls, has_length(1))
+    assert_that(streams.read("user", "host", log2, nbline=2),
+                equal_to("b\nc\n"))
+    assert_that(calls, has_length(2))
+    assert_that(streams.offset("user", "host", log2), equal_to(6))
+
+    time.sleep(0.6)
+    with open(log1, "a") as fobj:
+        fobj.write(" 3\n")
+    with open(log2, "a") as fobj:
+        fobj.write("d\n")
+    # both logs are read by one command
+    assert_that(streams.read("user", "host", log1), equal_to("line 3\n"))
+    assert_that(streams.read("user", "host", log2), equal_to("d\n"))
+    assert_that(calls, has_length(3))
+    assert_that(streams.read("user", "host", log2), empty())
+    assert_that(calls, has_length(3))
+
+    # truncated and missing logs
+    time.sleep(0.6)
+    with open(log1, "w") as fobj:
+        fobj.write("new\n")
+    assert_that(streams.read("user", "host", log1), equal_to("new\n"))
+    missing = osp.join(tmpdir, "missing")
+    assert_that(streams.read("user", "host", missing), empty())
+    assert_that(streams.offset("user", "host", missing), equal_to(0))
+    streams.forget("user", "host", missing)
+    assert_that(streams.offset("user", "host", missing), none())
+
+
+@tempdir
+def test_salome_stop_forgets_logs(tmpdir):
+    streams = RemoteLogStreams(lambda *args, **kwargs: (0, ""))
+    with patch.object(SalomeInfos, "available_servers",
+                      new_callable=PropertyMock, return_value=[]):
+        runner = Salome(case=_setup_run_case(tmpdir, 0), unittest=True)
+    logfile = osp.join(tmpdir, "stderr_command_salome.log")
+    runner.output_follower().from_remote(streams, "user", "host", logfile)
+    assert_that(streams.offset("user", "host", logfile), equal_to(0))
+
+    # the stopped job is not polled anymore
+    assert_that(runner.stop_current(), equal_to(True))
+    assert_that(runner.current.state, equal_to(SO.Error))
+    assert_that(streams.offset("user", "host", logfile), none())
+
+    runner.output_follower().from_remote(streams, "user", "host", logfile)
+    runner.cleanup()
+    assert_that(streams.offset("user", "host", logfile), none())
+
+
+@tempdir
+def test_local_scheduler(tmpdir):
+    assert_that(job_requirements({'mpicpu': 4, 'threads': 2,
+                                  'memory': 1000}),
+                equal_to((8, 4000, 4)))
+    assert_that(job_requirements({'mpicpu': 1, 'threads': 0,
+                                  'memory': '512'}),
+                equal_to((1, 512, 0)))
+
+    sched = LocalScheduler(cpus=2, memory=4096, mpislots=2)
+    seq = {'mpicpu': 1, 'threads': 1, 'memory': 1024}
+    outputs = iter(range(100))
+    submit = lambda cmd, params: sched.submit(
+        ["sh", "-c", cmd], tmpdir,
+        osp.join(tmpdir, "out{0}".format(next(outputs))), params)
+    job1 = submit("echo job1; sleep 10; echo 1", seq)
+    job2 = submit("echo job2; sleep 10; echo 2", seq)
+    assert_that(sched.used(), equal_to((2, 2048, 0)))
+    # no processor left
+    job3 = submit("exit 3", seq)
+    assert_that(sched.job(job3).state, equal_to(SO.Pending))
+    # first in, first out: the parallel job waits for job3
+    job4 = submit("echo 4", {'mpicpu': 2, 'threads': 1, 'memory': 1024})
+    job5 = submit("echo 5", seq)
+    assert_that(sched.job(job5).state, equal_to(SO.Pending))
+
+    assert_that(sched.cancel(job1), equal_to(True))
+    assert_that(sched.cancel(job1), equal_to(False))
+    assert_that(sched.job(job1).state, equal_to(SO.Error))
+    tini = time.time()
+    while sched.job(job3).state & SO.Running:
+        time.sleep(0.05)
+    assert_that(sched.job(job3).exitcode, equal_to(3))
+    assert_that(sched.job(job3).state, equal_to(SO.Error))
+    # job4 needs 2 processors, job2 is still running
+    assert_that(sched.job(job4).state, equal_to(SO.Pending))
+    assert_that(sched.job(job5).state, equal_to(SO.Pending))
+
+    sched.cancel(job2)
+    # job4 may already be ended
+    assert_that(sched.job(job4).state & (SO.Running | SO.Finished))
+    while sched.job(job5).state & SO.NotFinished:
+        time.sleep(0.05)
+    assert_that(time.time() - tini, less_than(5.))
+    assert_that(sched.job(job4).state, equal_to(SO.Success))
+    assert_that(sched.job(job5).state, equal_to(SO.Success))
+    with open(sched.job(job4).output) as output:
+        assert_that(output.read(), equal_to("4\n"))
+    with open(sched.job(job2).output) as output:
+        assert_that(output.read(), equal_to("job2\n"))
+
+    # a job larger than the budgets is started alone
+    job6 = submit("sleep 0.2", {'mpicpu': 4, 'memory': 8192})
+    assert_that(sched.job(job6).state, equal_to(SO.Running))
+    job7 = submit("echo 7", seq)
+    assert_that(sched.job(job7).state, equal_to(SO.Pending))
+    assert_that(sched.wait(job7, 0.01), equal_to(False))
+    assert_that(sched.wait(job6, 5.), equal_to(True))
+    # job7 has been started, it may already be ended
+    assert_that(sched.job(job7).state & (SO.Running | SO.Finished))
+    assert_that(sched.wait(job7, 5.), equal_to(True))
+    assert_that(sched.job(job7).state, equal_to(SO.Success))
+    sched.forget(job7)
+    assert_that(sched.job(job7), none())
+    assert_that(sched.used(), equal_to((0, 0, 0)))
+
+    # the identifiers saved in a study do not match the jobs of another
+    # session
+    other = LocalScheduler(cpus=1, memory=1024, mpislots=1)
+    job8 = other.submit(["true"], tmpdir, osp.join(tmpdir, "out8"), seq)
+    assert_that(job8, is_not(is_in([job1, job2, job3, job4, job5, job6])))
+    assert_that(sched.job(job8), none())
+    assert_that(other.wait(job8, 5.), equal_to(True))
+
+    runner = runner_factory(engine=Engine.Local,
+                            case=History().current_case)
+    assert_that(type(runner).__name__, equal_to("Local"))
+
+    # a stopped job is in error
+    runner = runner_factory(engine=Engine.Local, scheduler=sched,
+                            case=_setup_run_case(tmpdir, 0))
+    runner.current.job.jobid = submit("sleep 10", seq)
+    runner.current.state = SO.Running
+    assert_that(runner.stop_current(), equal_to(True))
+    assert_that(runner.current.state, equal_to(SO.Error))
+    assert_that(runner.stop_current(), equal_to(False))
+
+    # a process that ignores the termination signal is killed
+    output = osp.join(tmpdir, "ignored")
+    job = LocalJob("8", ["sh", "-c", "trap '' TERM; echo ready; sleep 10"],
+                   tmpdir, output, (1, 0, 0))
+    job.start()
+    while True:
+        with open(output) as fobj:
+            if fobj.read():
+                break
+        time.sleep(0.05)
+    tini = time.time()
+    job.kill(timeout=0.2)
+    assert_that(time.time() - tini, less_than(5.))
+    assert_that(job.exitcode, equal_to(-signal.SIGKILL))
+    assert_that(job.state, equal_to(SO.Error))
+
+
+class _StandInInfos(ServerInfos):
+    """Servers informations that do not need any server.
+
+    *waits* gives a function called by the refresh of each server, it
+    raises *OSError* for an unreachable server."""
+
+    def __init__(self, servers, waits, cache):
+        super().__init__()
+        self._servers = servers
+        self.waits = waits
+        self.server_cache = cache
+        self.calls = []
+
+    def refresh_one(self, server):
+        self.calls.append(server)
+        self.waits.get(server, lambda: None)()
+        self.server_config(server).update(
+            versions_ids={'stable': '15.{0}'.format(len(self.calls))},
+            rc_definition=object())
+        return True
+
+
+def _unreachable():
+    raise OSError("unreachable")
+
+
+@tempdir
+def test_server_infos(tmpdir):
+    cache = ServerCache(osp.join(tmpdir, "servers.json"), ttl=3600)
+    # srv1 and srv2 must be refreshed concurrently to pass the barrier
+    barrier = threading.Barrier(2, timeout=10.)
+    slow = threading.Event()
+    infos = _StandInInfos(["srv1", "srv2", "slow", "down"],
+                          {'srv1': barrier.wait, 'srv2': barrier.wait,
+                           'slow': slow.wait, 'down': _unreachable},
+                          cache)
+    # the slow server does not delay the others
+    results = infos.refresh_all(timeout=1.)
+    assert_that(results, equal_to({'srv1': True, 'srv2': True,
+                                   'slow': None, 'down': False}))
+    assert_that(infos.server_config('srv1')['versions_ids'],
+                has_key('stable'))
+    config, expired = cache.get("_StandInInfos:srv1")
+    assert_that(expired, equal_to(False))
+    assert_that(config, is_not(has_key('rc_definition')))
+    assert_that(cache.get("_StandInInfos:down")[0], none())
+    assert_that(cache.get("_StandInInfos:slow")[0], none())
+    assert_that(infos.join(timeout=0.), equal_to(False))
+
+    # a new session uses the persistent cache without refreshing
+    cache = ServerCache(osp.join(tmpdir, "servers.json"), ttl=3600)
+    other = _StandInInfos(["srv1"], {}, cache)
+    other.refresh_once("srv1")
+    assert_that(other.calls, empty())
+    assert_that(other.server_config("srv1")['versions_ids'],
+                equal_to(infos.server_config("srv1")['versions_ids']))
+    other.refresh_once("srv1", force=True)
+    assert_that(other.calls, equal_to(["srv1"]))
+
+    # out of date informations are used while being refreshed in background
+    cache = ServerCache(osp.join(tmpdir, "servers.json"), ttl=0.)
+    started = threading.Event()
+    other = _StandInInfos(["srv2"], {'srv2': started.wait}, cache)
+    old = cache.get("_StandInInfos:srv2")[0]
+    other.refresh_once("srv2")
+    assert_that(other.server_config("srv2"), equal_to(old))
+    started.set()
+    assert_that(other.join(timeout=10.), equal_to(True))
+    assert_that(other.calls, equal_to(["srv2"]))
+    assert_that(cache.get("_StandInInfos:srv2")[0]['versions_ids'],
+                equal_to({'stable': '15.1'}))
+
+    # the results of a background refresh are passed to the callback
+    refreshed = []
+    other.refresh_all(wait=False, callback=refreshed.append)
+    assert_that(other.join(timeout=10.), equal_to(True))
+    assert_that(refreshed, equal_to([{'srv2': True}]))
+
+    # the slow server is stored once refreshed
+    slow.set()
+    assert_that(infos.join(timeout=10.), equal_to(True))
+    cache = ServerCache(osp.join(tmpdir, "servers.json"), ttl=3600)
+    assert_that(cache.get("_StandInInfos:slow")[0], not_none())
+    assert_that(cache.get("_StandInInfos:srv2")[0], not_none())
+    assert_that(infos.refresh_all(["srv1", "slow"], stale_only=True),
+                equal_to({}))
+
+
 if __name__ == "__main__":
     import sys
     from testutils import get_test_suite
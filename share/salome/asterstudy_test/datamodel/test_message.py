@@ -19,12 +19,14 @@
 import os
 import os.path as osp
 import unittest
+from unittest import mock
 
 from asterstudy.common import to_unicode
 from asterstudy.datamodel import History
-from asterstudy.datamodel.result import (Message, MsgLevel, MsgType,
-                                         extract_messages)
-from asterstudy.datamodel.result.message import search_msg
+from asterstudy.datamodel.result import (Message, MessageStore, MsgLevel,
+                                         MsgType, extract_messages)
+from asterstudy.datamodel.engine.abstract_runner import OutputFollower
+from asterstudy.datamodel.result.message import MessageStream, search_msg
 from hamcrest import *
 
 
@@ -409,6 +411,180 @@ def test_old_identifiers():
     assert_that(cmd_id, has_length(5))
 
 
+def _msg_key(msg):
+    return (msg.level, msg.text, msg.source, msg.command_num, msg.stage_num,
+            msg.line, msg.checksum)
+
+
+def test_message_stream():
+    output = osp.join(os.getenv('ASTERSTUDYDIR'),
+                      'data', 'export', 'ssnv128a_graph.output')
+    with open(output, "rb") as fobj:
+        text = to_unicode(fobj.read())
+    expected = sorted([_msg_key(msg) for msg in extract_messages(text)])
+
+    for size in (1, 50, 777, len(text)):
+        stream = MessageStream()
+        msglist = []
+        for i in range(0, len(text), size):
+            msglist.extend(stream.feed(text[i:i + size]))
+        msglist.extend(stream.feed("", final=True))
+        assert_that(sorted([_msg_key(msg) for msg in msglist]),
+                    equal_to(expected))
+    assert_that(stream.nbline, equal_to(len(text.splitlines())))
+
+    # an incomplete message is kept for the next chunk
+    stream = MessageStream()
+    assert_that(stream.feed("line\n   !-------!\n   ! <A> <ID_1> alarm"),
+                empty())
+    assert_that(stream.feed(" !\n   !-------!\nnext"), has_length(1))
+    assert_that(stream.nbline, equal_to(4))
+
+
+def test_output_follower():
+    lines = ["line {0}".format(i) for i in range(20)]
+    lines[8] = "   <A> an alarm"
+    lines[15] = "   <A> another alarm"
+    follower = OutputFollower()
+    msglist = follower.from_tail("\n".join(lines[:10]))
+    assert_that(msglist, has_length(1))
+    assert_that(msglist[0].line, equal_to(9))
+    # the same alarm is not extracted twice
+    msglist = follower.from_tail("\n".join(lines[5:18]))
+    assert_that(msglist, has_length(1))
+    assert_that(msglist[0].line, equal_to(16))
+    assert_that(msglist[0].text, contains_string("another"))
+    assert_that(follower.from_tail("\n".join(lines[7:18])), empty())
+
+
+def test_message_store():
+    msglist = []
+    for i in range(1000):
+        level = MsgLevel.Warn if i % 10 else MsgLevel.Error
+        msglist.append(Message(level, "Text {0}".format(i % 3),
+                               MsgType.Command, "{0}:1".format(i % 4),
+                               100 + i, i))
+    msglist[5].add_topo('grel', ['GRMA1', 'GRMA2'])
+    msglist[5].add_unknown('DX')
+    store = MessageStore(msglist)
+    assert_that(store, has_length(1000))
+    assert_that(store._texts, has_length(3))
+    assert_that(store.count_by_level(),
+                equal_to({MsgLevel.Warn: 900, MsgLevel.Error: 100}))
+    assert_that(store.stages(), equal_to([(-1, 1)]))
+
+    # views have the same attributes than the original objects
+    for i in (0, 5, 999, -1):
+        msg, orig = store[i], msglist[i]
+        assert_that(msg.checksum, equal_to(orig.checksum))
+        assert_that(msg.get_topo('grel'), equal_to(orig.get_topo('grel')))
+        assert_that(msg.get_unknown(), equal_to(orig.get_unknown()))
+    assert_that(store[5].get_topo('grel'), has_length(2))
+    store[5].add_topo('grel', 'GRMA3')
+    assert_that(store[5].get_topo('grel'), has_length(2))
+    assert_that(store[2:4], has_length(2))
+    assert_that(calling(store.__getitem__).with_args(1000),
+                raises(IndexError))
+    assert_that([msg.line for msg in store][:3], equal_to([100, 101, 102]))
+
+    # indexes
+    errors = store.select(levels=[MsgLevel.Error])
+    assert_that(errors, has_length(100))
+    assert_that(errors[1].line, equal_to(110))
+    assert_that(store.indexes(command=(1, 2)), has_length(250))
+    assert_that(store.indexes(levels=[MsgLevel.Error], command=(1, 0)),
+                has_length(50))
+    assert_that(store.indexes(), has_length(1000))
+    assert_that(store.contains(msglist[7]), equal_to(True))
+    assert_that(store.contains(Message(MsgLevel.Warn, "Text 2",
+                                       MsgType.Command, "3:1", 107, 7)),
+                equal_to(False))
+
+    # concatenation
+    other = MessageStore([Message(MsgLevel.Info, "Text 2", MsgType.Runner,
+                                  "0:2", 1, 0),
+                          Message(MsgLevel.Info, "New text", MsgType.Runner,
+                                  "0:2", 2, 0)])
+    store.extend(other)
+    assert_that(store, has_length(1002))
+    assert_that(store._texts, has_length(4))
+    assert_that(store[1001].text, equal_to("New text"))
+    assert_that(store[1000].text, equal_to("Text 2"))
+    assert_that(store.select(levels=[MsgLevel.Info]), has_length(2))
+    assert_that(store.stages(), equal_to([(-1, 1), (-1, 2)]))
+    store.clear()
+    assert_that(store, empty())
+
+
+def test_message_store_filters():
+    msglist = []
+    for i in range(300):
+        level = MsgLevel.Warn if i % 10 else MsgLevel.Error
+        source = MsgType.Runner if i % 7 == 0 else MsgType.Command
+        msglist.append(Message(level, "Text {0}".format(i % 3), source,
+                               "{0}:{1}".format(i % 4, 1 + i % 2),
+                               100 + i, i))
+    store = MessageStore(msglist)
+    assert_that(store.stages(), equal_to([(-1, 1), (-1, 2)]))
+
+    def _linear(levels, stages, source, text):
+        return [i for i, msg in enumerate(msglist)
+                if msg.level in levels
+                and (msg.source not in (MsgType.Stage, MsgType.Command)
+                     or (msg.case_id, msg.stage_num) in stages)
+                and (source is None or msg.source == source)
+                and text in msg.text]
+
+    # filtering is done on the stored attributes, without Message objects
+    with mock.patch.object(MessageStore, '__getitem__',
+                           side_effect=AssertionError):
+        for levels in ([], [MsgLevel.Error], [MsgLevel.Error, MsgLevel.Warn]):
+            for stages in ([], [(-1, 1)], [(-1, 1), (-1, 2)]):
+                for source in (None, MsgType.Command, MsgType.Runner):
+                    for text in ("", "Text 2", "xt"):
+                        assert_that(
+                            store.indexes(levels=levels, stages=stages,
+                                          source=source, text=text),
+                            equal_to(_linear(levels, stages, source, text)))
+
+    # candidates are taken from the level index
+    levels = {MsgLevel.Error: store._by_level[MsgLevel.Error]}
+    with mock.patch.object(store, '_by_level', levels):
+        assert_that(store.indexes(levels=[MsgLevel.Error, MsgLevel.Warn]),
+                    has_length(30))
+    assert_that(store.indexes(levels=[MsgLevel.Error, MsgLevel.Warn]),
+                has_length(300))
+    assert_that(store.select(levels=[MsgLevel.Error], source=MsgType.Runner,
+                             text="Text 0"),
+                has_length(2))
+
+
+def test_message_store_duplicates():
+    history = History()
+    stage = history.current_case.create_stage(':memory:')
+    result = stage.result
+    # many messages of the same command
+    msglist = [Message(MsgLevel.Warn, "Text {0}".format(i % 7),
+                       MsgType.Command, "1:5", i, 0) for i in range(20000)]
+    result.add_messages(msglist)
+    assert_that(result.messages, has_length(20000))
+    result.add_messages(msglist[::2])
+    result.add_messages([Message(MsgLevel.Warn, "Text 0", MsgType.Command,
+                                 "1:5", 7, 0)])
+    assert_that(result.messages, has_length(20001))
+    store = result.messages
+    assert_that(store.contains(msglist[-1]), equal_to(True))
+    assert_that(store.indexes(command=(5, 1)), has_length(20001))
+
+    # same key after a concatenation
+    other = MessageStore()
+    other.extend(store)
+    assert_that(other.contains(msglist[123]), equal_to(True))
+    assert_that(other.contains(Message(MsgLevel.Error, "Text 0",
+                                       MsgType.Command, "1:5", 7, 0)),
+                equal_to(False))
+
+
 if __name__ == "__main__":
     import sys
     from testutils import get_test_suite
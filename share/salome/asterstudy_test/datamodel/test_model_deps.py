@@ -37,7 +37,7 @@ def test():
     mat = stage('DEFI_MATERIAU')
     matfield = stage('AFFE_MATERIAU')
 
-    deps = history._deps[3:, 3:]
+    deps = history._deps.to_array()[3:, 3:]
     assert_that(min(deps[0]), equal_to(1))
     assert_that(max(deps[0]), equal_to(1))
     for i in range(1, 5):
@@ -47,7 +47,7 @@ def test():
     add_parent(model, mesh)
     add_parent(matfield, mat)
     add_parent(matfield, model)
-    deps = history._deps[3:, 3:]
+    deps = history._deps.to_array()[3:, 3:]
     assert_that((deps == ((1, 1, 1, 1, 1),
                           (0, 1, 1, 0, 1),
                           (0, 0, 1, 0, 1),
@@ -56,6 +56,7 @@ def test():
     assert_that(matfield.depends_on(mesh), equal_to(True))
 
     remove_parent(matfield, model)
+    deps = history._deps.to_array()[3:, 3:]
     assert_that((deps == ((1, 1, 1, 1, 1),
                           (0, 1, 1, 0, 0),
                           (0, 0, 1, 0, 0),
@@ -66,6 +67,48 @@ def test():
     return history
 
 
+def test_engines():
+    """Check that both engines give the same dependencies"""
+    import random
+    from asterstudy.datamodel.abstract_data_model import AbstractDataModel, Node
+
+    for kind in ('matrix', 'bitset'):
+        model = AbstractDataModel(kind)
+        nodes = [model.add(Node('n{}'.format(i))) for i in range(12)]
+        # chain: n0 -> n1 -> ... -> n11
+        for parent, node in zip(nodes[:-1], nodes[1:]):
+            add_parent(node, parent)
+        assert_that(model.has_path(nodes[0].uid, nodes[-1].uid), equal_to(True))
+        assert_that(model.has_path(nodes[-1].uid, nodes[0].uid), equal_to(False))
+        assert_that(nodes[-1].depends_on(nodes[0]), equal_to(True))
+
+        remove_parent(nodes[6], nodes[5])
+        assert_that(model.has_path(nodes[0].uid, nodes[5].uid), equal_to(True))
+        assert_that(model.has_path(nodes[0].uid, nodes[6].uid), equal_to(False))
+        assert_that(model.has_path(nodes[5].uid, nodes[11].uid), equal_to(False))
+        assert_that(model.has_path(nodes[6].uid, nodes[11].uid), equal_to(True))
+
+        nodes[3].delete()
+        assert_that(model.has_path(nodes[3].uid, nodes[4].uid), equal_to(False))
+        assert_that(model.has_path(nodes[3].uid, nodes[3].uid), equal_to(False))
+        assert_that(model.has_path(nodes[4].uid, nodes[4].uid), equal_to(True))
+
+    # random leaf insertions: same matrix for both engines
+    rand = random.Random(1)
+    models = [AbstractDataModel('matrix'), AbstractDataModel('bitset')]
+    all_nodes = [[], []]
+    for _ in range(60):
+        idx = [rand.randrange(len(all_nodes[0])) for _ in range(2)] \
+            if all_nodes[0] else []
+        for model, nodes in zip(models, all_nodes):
+            node = model.add(Node())
+            for i in idx:
+                add_parent(node, nodes[i])
+            nodes.append(node)
+    assert_that((models[0]._deps.to_array()
+                 == models[1]._deps.to_array()).all(), equal_to(True))
+
+
 if __name__ == "__main__":
     import sys
     from testutils import get_test_suite
@@ -20,18 +20,23 @@
 
 import os
 import os.path as osp
+import pickle
 import random
 import shutil
 import unittest
+from unittest.mock import patch
 
-from asterstudy.api import ParametricCalculation
+import numpy
+from asterstudy.api import FileAttr, ParametricCalculation, result_cache
+from asterstudy.api.result_cache import ResultCache
 from asterstudy.common import debug_message, debug_mode
 from asterstudy.datamodel.comm2study import comm2study
 from asterstudy.datamodel.engine import Engine, runner_factory
 from asterstudy.datamodel.engine.engine_utils import ExportCase
 from asterstudy.datamodel.engine.salome_runner import has_salome
 from asterstudy.datamodel.history import History
-from asterstudy.datamodel.parametric import (export_to_openturns,
+from asterstudy.datamodel.parametric import (INPUTS, OUTPUTS,
+                                             export_to_openturns,
                                              output_commands)
 from asterstudy.datamodel.result import StateOptions as SO
 from asterstudy.datamodel.study2comm import study2comm
@@ -99,6 +104,7 @@ def _setup_and_check_ot(case, tmpdir, mem_limit=None, run=True):
     debug_message("Input files and directories:\n{0}".format(otdata.files))
     debug_message("Job parameters:\n{0}".format(otdata.parameters))
     assert_that(otdata.code.strip(), contains_string("def _exec("))
+    assert_that(otdata.code.strip(), contains_string("def _exec_sample("))
     assert_that(otdata.code,
                 contains_string("ParametricCalculation("))
 
@@ -133,6 +139,8 @@ def _setup_and_check_ot(case, tmpdir, mem_limit=None, run=True):
                         osp.join(wrkdir, infile))
     try:
         results = context['_exec'](2.e11, -1000.)
+        sample = context['_exec_sample']([[2.e11, -1000.], [2.e11, -2000.],
+                                          [2.e11, -1000.]], max_workers=2)
     finally:
         os.chdir(prev)
 
@@ -140,6 +148,10 @@ def _setup_and_check_ot(case, tmpdir, mem_limit=None, run=True):
     assert_that(results[0], equal_to(0.5))
     assert_that(results[1], equal_to(0.))
     assert_that(round(results[2], 6), equal_to(-0.005373))
+    assert_that(sample.shape, equal_to((3, 3)))
+    assert_that(sample[0].tolist(), equal_to(results))
+    assert_that(sample[2].tolist(), equal_to(results))
+    assert_that(round(sample[1][2], 6), equal_to(-0.010746))
 
     # check that files are deleted in case of success and not in debug mode
     # it will fail in debug mode: useful to keep temporary files
@@ -245,6 +257,129 @@ def test_parametric_coverage(tmpdir):
     assert_that(calc.output_values(), has_length(0))
 
 
+def _fake_parametric(tmpdir, evaluated):
+    """Return stand-ins for the import of a parametric case and for its
+    execution, that computes the outputs in Python."""
+    def _import_case(history, export, replace=False, force_text=False):
+        evaluated.append(export)
+        case = history.create_case(replace=replace)
+        stage = case.create_stage("param")
+        stage.use_text_mode()
+        stage.set_text("DEBUT()\nFIN()")
+        info = stage.handle2info[91]
+        info.filename = osp.join(tmpdir, INPUTS)
+        info.attr = FileAttr.In
+        info = stage.handle2info[92]
+        info.filename = osp.join(tmpdir, OUTPUTS)
+        info.attr = FileAttr.Out
+        return case, {'memory': 512}
+
+    def _run(calc):
+        stage = calc._case[0]
+        assert_that(stage.handle2info[92].filename,
+                    equal_to(osp.join(calc.runcdir, OUTPUTS)))
+        with open(stage.handle2info[91].filename, 'rb') as pick:
+            pickle.load(pick)
+            values = pickle.load(pick)
+        evaluated.append(values)
+        if values[0] >= 0:
+            numpy.save(stage.handle2info[92].filename,
+                       numpy.array([[values[0] + values[1],
+                                     values[0] * values[1]]]))
+
+    return (patch("asterstudy.datamodel.History.import_case", _import_case),
+            patch("asterstudy.api.execution.Calculation.run", _run))
+
+
+class _Calculation(ParametricCalculation):
+    """Stand-in that fails for negative first inputs."""
+
+    state = property(lambda self: SO.Error if self.inputs[0] < 0
+                     else SO.Success)
+
+    def use_interactive(self):
+        pass
+
+
+@tempdir
+def test_parametric_run_many(tmpdir):
+    evaluated = []
+    samples = [[1., 2.], [3., 4.], [1., 2.], [-1., 2.]]
+    fake_import, fake_run = _fake_parametric(tmpdir, evaluated)
+    with fake_import, fake_run:
+        outputs, states = _Calculation.run_many(tmpdir, ["a", "b"], samples,
+                                                max_workers=2, cache=None)
+    # the case is imported once and each distinct point evaluated once
+    assert_that(evaluated, has_length(4))
+    assert_that(evaluated[0], ends_with("parametric.export"))
+    assert_that(outputs.shape, equal_to((4, 2)))
+    assert_that(outputs[:3].tolist(),
+                equal_to([[3., 2.], [7., 12.], [3., 2.]]))
+    assert_that(numpy.isnan(outputs[3]).all(), equal_to(True))
+    assert_that([SO.name(i) for i in states],
+                equal_to(["Success", "Success", "Success", "Error"]))
+
+
+@tempdir
+def test_parametric_cache(tmpdir):
+    cachedir = osp.join(tmpdir, "cache")
+    cache = ResultCache(cachedir)
+    evaluated = []
+    fake_import, fake_run = _fake_parametric(tmpdir, evaluated)
+    with fake_import, fake_run:
+        _Calculation.run_many(tmpdir, ["a", "b"], [[1., 2.], [-1., 2.]],
+                              cache=cache)
+        outputs, states = _Calculation.run_many(
+            tmpdir, ["a", "b"], [[1., 2.], [3., 4.], [-1., 2.]], cache=cache)
+        assert_that(evaluated, has_length(6))
+        assert_that(evaluated[4:], equal_to([[3., 4.], [-1., 2.]]))
+        assert_that(outputs[:2].tolist(), equal_to([[3., 2.], [7., 12.]]))
+        assert_that(states[0], equal_to(SO.Success))
+
+        # the parameters are part of the key
+        calc = _Calculation(tmpdir, ["a", "b"], [1., 2.])
+        calc.set_cache(cache)
+        calc.setup()
+        calc.use(version="testing")
+        calc.run()
+        assert_that(evaluated, has_length(8))
+        assert_that(calc.output_values(), equal_to([3., 2.]))
+
+        # as the content of the data files
+        with open(osp.join(tmpdir, "data.txt"), "w") as fdata:
+            fdata.write("data")
+        calc = _Calculation(tmpdir, ["a", "b"], [1., 2.])
+        calc.set_cache(cache)
+        calc.setup()
+        calc._case[0].handle2info[93].filename = osp.join(tmpdir, "data.txt")
+        calc._case[0].handle2info[93].attr = FileAttr.In
+        calc.run()
+        assert_that(evaluated, has_length(10))
+
+    # 4 failed and evaluated points, one hit, 3 distinct successful points
+    assert_that(cache.hits, equal_to(1))
+    assert_that(cache.misses, equal_to(6))
+    stats = ResultCache(cachedir).stats()
+    assert_that(stats, has_entries(hits=1, misses=6, entries=4))
+
+    # least recently used first
+    entries = cache.entries()
+    assert_that(entries, has_length(4))
+    os.utime(cache._filename(entries[-1][0]), (1, 1))
+    assert_that(cache.entries()[0][0], equal_to(entries[-1][0]))
+    assert_that(cache.prune(older_than=1), equal_to(1))
+    assert_that(cache.prune(max_size=entries[0][1] * 2.5 / 1024 ** 2),
+                equal_to(1))
+    assert_that(cache.entries(), has_length(2))
+
+    assert_that(result_cache.main(["--path", cachedir, "prune",
+                                   "--max-size", "0"]), equal_to(0))
+    assert_that(cache.entries(), empty())
+    result_cache.main(["--path", cachedir, "stats"])
+    result_cache.main(["--path", cachedir, "clear"])
+    assert_that(osp.exists(cachedir), equal_to(False))
+
+
 @tempdir
 def test_direct_runner(tmpdir):
     case = _setup_nominal(tmpdir)
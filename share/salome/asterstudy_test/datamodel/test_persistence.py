@@ -22,13 +22,17 @@ import os
 import re
 import unittest
 from tempfile import mkstemp
+from unittest.mock import patch
 
 from asterstudy.common import ConversionError, VersionError
 from asterstudy.datamodel.comm2study import comm2study
+from asterstudy.datamodel.command import NumericValues
 from asterstudy.datamodel.dataset import DataSet
-from asterstudy.datamodel.general import ConversionLevel
+from asterstudy.datamodel.general import ConversionLevel, Validity
 from asterstudy.datamodel.history import History
-from asterstudy.datamodel.serializer import JSONSerializer
+from asterstudy.datamodel.serializer import (JSONSerializer, document2json,
+                                             history2document, history2json,
+                                             json2history)
 from hamcrest import *
 from testutils import attr, tempdir
 
@@ -314,6 +318,189 @@ def test_recover_28495():
     assert_that(case.out_dir, none())
 
 
+def test_structured_commands():
+    history = History()
+    case = history.current_case
+    stage1 = case.create_stage('Stage_1')
+    text1 = """
+# read the mesh
+mesh = LIRE_MAILLAGE(UNITE=20, FORMAT='MED')
+
+coef = 2.5
+young = coef * 1.e5
+
+MACR_ADAP_MAIL(ADAPTATION='RAFFINEMENT_UNIFORME',
+               MAILLAGE_N=mesh,
+               MAILLAGE_NP1=CO('mesh2'))
+
+mater = DEFI_MATERIAU(ELAS=_F(E=young, NU=0.3))
+
+tab = CREA_TABLE(LISTE=(_F(PARA='X', LISTE_R=(0., 1.)),
+                        _F(PARA='Y', LISTE_I=(1, 2))))
+DETRUIRE(CONCEPT=_F(NOM=tab))
+"""
+    comm2study(text1, stage1)
+    stage1['mater'].active = False
+
+    stage2 = case.create_stage('Stage_2')
+    text2 = """
+model = AFFE_MODELE(MAILLAGE=mesh2,
+                    AFFE=_F(TOUT='OUI', PHENOMENE='MECANIQUE',
+                            MODELISATION='3D'))
+tab = CREA_TABLE(LISTE=_F(PARA='X', LISTE_R=(0., 1.)))
+"""
+    comm2study(text2, stage2)
+
+    bdocument = history2document(history)
+    bstages = bdocument.history.stages
+    assert_that(bstages[0].commands, has_length(len(stage1)))
+    assert_that(bstages[1].commands, has_length(len(stage2)))
+    jstext = document2json(bdocument)
+
+    # commands are restored without converting the text
+    with patch("asterstudy.datamodel.stage.comm2study") as mock:
+        history2 = json2history(jstext)
+        assert_that(mock.called, equal_to(False))
+    assert_that(history * history2, none())
+
+    restored = history2.current_case
+    assert_that(restored['Stage_1']['mater'].active, equal_to(False))
+    assert_that(restored['Stage_1']['young'].evaluation, equal_to(2.5e5))
+    model = restored['Stage_2']['model']
+    assert_that(model.depends_on(restored['Stage_1']['mesh2']),
+                equal_to(True))
+    assert_that(restored['Stage_2']['tab'].depends_on(
+        restored['Stage_1'][-1]), equal_to(True))
+    for orig, stage in zip(case, restored):
+        assert_that(stage.get_text(), equal_to(orig.get_text()))
+
+    # catalog version mismatch: the text is converted
+    jsversion = re.sub('"versionMinor": [0-9]+', '"versionMinor": 999', jstext)
+    with patch("asterstudy.datamodel.stage.comm2study") as mock:
+        json2history(jsversion, strict=ConversionLevel.NoFail)
+        assert_that(mock.call_count, equal_to(2))
+
+    # invalid structured storage: falls back to the text
+    bdocument.history.stages[1].commands[0].storage.keywords[0] \
+        .value.ref = 999
+    history3 = json2history(document2json(bdocument))
+    assert_that(history * history3, none())
+    assert_that(history3.current_case['Stage_2'].is_graphical_mode(),
+                equal_to(True))
+
+    # text stages and run cases are not stored as commands
+    stage2 = history2.current_case['Stage_2']
+    stage2.use_text_mode()
+    bdocument = history2document(history2)
+    assert_that(bdocument.history.stages[0].commands,
+                has_length(len(stage1)))
+    assert_that(bdocument.history.stages[1].commands, empty())
+
+
+def test_lazy_loading():
+    history = History()
+    case = history.current_case
+    texts = ["mesh = LIRE_MAILLAGE(UNITE=20, FORMAT='MED')",
+             "mesh2 = CREA_MAILLAGE(MAILLAGE=mesh, LINE_QUAD=_F(TOUT='OUI'))",
+             "mater = DEFI_MATERIAU(ELAS=_F(E=2.e11, NU=0.3))",
+             "DETRUIRE(CONCEPT=_F(NOM=mesh))"]
+    for i, text in enumerate(texts):
+        comm2study(text, case.create_stage('Stage_{0}'.format(i + 1)))
+    jstext = history2json(history)
+
+    history2 = json2history(jstext, lazy=True)
+    stages = list(history2.current_case)
+    assert_that([stage.is_loaded() for stage in stages],
+                equal_to([False] * 4))
+    assert_that(stages[1].is_graphical_mode(), equal_to(True))
+    assert_that(stages[1].is_loaded(), equal_to(False))
+
+    # accessing the commands loads the stage and the preceding ones
+    mesh2 = stages[1]['mesh2']
+    assert_that([stage.is_loaded() for stage in stages],
+                equal_to([True, True, False, False]))
+    assert_that(mesh2.depends_on(stages[0]['mesh']), equal_to(True))
+    assert_that(history2.load_stages(limit=0), equal_to(2))
+    assert_that(history2.load_stages(limit=1), equal_to(1))
+    assert_that(stages[3].check(), equal_to(Validity.Nothing))
+    assert_that(history2.load_stages(), equal_to(0))
+    assert_that([stage.is_loaded() for stage in stages],
+                equal_to([True] * 4))
+    assert_that(history * history2, none())
+
+    history3 = json2history(jstext, lazy=True)
+    history3.load_stages()
+    assert_that(history * history3, none())
+
+    # a stage that can not be converted is kept in text mode
+    bdocument = history2document(history)
+    del bdocument.history.stages[3].commands[:]
+    jsinvalid = document2json(bdocument)
+    error = ConversionError(SyntaxError("invalid"), "", 1, "")
+    with patch("asterstudy.datamodel.stage.comm2study", side_effect=error):
+        assert_that(calling(json2history).with_args(jsinvalid),
+                    raises(ConversionError))
+        history5 = json2history(jsinvalid, lazy=True)
+        assert_that(history5.load_stages(), equal_to(0))
+    assert_that(history5.current_case['Stage_4'].is_text_mode(),
+                equal_to(True))
+    assert_that(history5.current_case['Stage_3'].is_graphical_mode(),
+                equal_to(True))
+
+    an_outfile = mkstemp(prefix='asterstudy' + '-', suffix='.ajs')[1]
+    History.save(history, an_outfile)
+    history6 = History.load(an_outfile, lazy=True)
+    os.remove(an_outfile)
+    assert_that(history6.load_stages(limit=0), equal_to(4))
+    assert_that(history6.load_stages(), equal_to(0))
+    assert_that(history * history6, none())
+
+    # text stages are never deferred
+    case['Stage_3'].use_text_mode()
+    history4 = json2history(history2json(history), lazy=True)
+    assert_that(history4.current_case['Stage_3'].is_loaded(), equal_to(True))
+    assert_that(history4.current_case['Stage_3'].is_text_mode(),
+                equal_to(True))
+
+
+def test_numeric_values():
+    values = [0.1 * i for i in range(500)]
+    text = ("times = DEFI_LIST_REEL(VALE={0!r})\n"
+            "func = DEFI_FONCTION(NOM_PARA='INST', VALE={1!r})\n"
+            .format(values, tuple(range(200))))
+    with patch("asterstudy.datamodel.command.numeric.ARRAY_THRESHOLD", 1000):
+        reference = History().current_case.create_stage('Stage_1')
+        comm2study(text, reference)
+    assert_that(reference['times'].storage_nocopy['VALE'], instance_of(list))
+
+    history = History()
+    case = history.current_case
+    stage = case.create_stage('Stage_1')
+    comm2study(text, stage)
+    times = stage['times']
+    vale = times.storage_nocopy['VALE']
+    assert_that(vale, instance_of(NumericValues))
+    assert_that(vale, equal_to(values))
+    assert_that(vale.array.flags.writeable, equal_to(False))
+    # the values are shared by the copies
+    assert_that(times.storage['VALE'], same_instance(vale))
+    assert_that(stage.get_text(), equal_to(reference.get_text()))
+
+    times['VALE'] = [1., 2.]
+    assert_that(times.storage_nocopy['VALE'], equal_to([1., 2.]))
+    times['VALE'] = values
+    assert_that(times.storage_nocopy['VALE'], instance_of(NumericValues))
+
+    bdocument = history2document(history)
+    bvalues = [bcmd.storage.keywords[0].value
+               for bcmd in bdocument.history.stages[0].commands]
+    assert_that(bvalues[0].WhichOneof('value'), equal_to('aval'))
+    history2 = json2history(document2json(bdocument))
+    stage2 = history2.current_case['Stage_1']
+    assert_that(stage2['func']['VALE'].value, equal_to(tuple(range(200))))
+    assert_that(stage2.get_text(), equal_to(stage.get_text()))
+
+
 if __name__ == "__main__":
     import sys
     from testutils import get_test_suite
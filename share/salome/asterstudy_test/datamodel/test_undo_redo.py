@@ -455,6 +455,22 @@ class TestTransactionalUndoRedo(UndoRedoEngine):
         self.assertEqual(undo_redo.redo_messages, [])
         self.checkObject('x', 444, 654)
 
+#------------------------------------------------------------------------------
+class TestJournalUndoRedo(TestSimpleUndoRedo):
+    """Test case for simple undo/redo mechanism in journal mode."""
+
+    def setUp(self):
+        """Initial set-up for each test case."""
+        self._obj = UndoRedo(Test(), journal=True)
+
+#------------------------------------------------------------------------------
+class TestJournalTransactionalUndoRedo(TestTransactionalUndoRedo):
+    """Test case for transactional undo/redo mechanism in journal mode."""
+
+    def setUp(self):
+        """Initial set-up for each test case."""
+        self._obj = TransactionUndoRedo(Test(), journal=True)
+
 #------------------------------------------------------------------------------
 class TestHistoryUndoRedo(unittest.TestCase):
     """Test case for History undo/redo."""
@@ -510,6 +526,117 @@ def test_stage_with_python_variables():
         pass
 
 
+def _history_text(history):
+    """Return the content of the stages of the current case."""
+    return [(stage.name, stage.get_text(sort=False))
+            for stage in history.current_case.stages]
+
+
+def test_history_journal():
+    history = History()
+    undo_redo = UndoRedo(history, journal=True)
+    assert_that(undo_redo.journal, equal_to(True))
+    case = history.current_case
+    stage = case.create_stage('s1')
+    stage('DEFI_CONSTANTE', 'c1').init({'VALE': 1.})
+    undo_redo.commit("s1")
+    texts = [_history_text(history)]
+
+    cmd = stage['c1']
+    cmd['VALE'] = 2.
+    stage('DEFI_CONSTANTE', 'c2').init({'VALE': 3.})
+    undo_redo.commit("edit")
+    texts.append(_history_text(history))
+
+    stage['c2'].delete()
+    stage2 = case.create_stage('s2')
+    stage2('DEFI_CONSTANTE', 'c3').init({'VALE': 4.})
+    stage.name = 'first'
+    undo_redo.commit("delete")
+    texts.append(_history_text(history))
+    assert_that(undo_redo.model, same_instance(history))
+    assert_that(undo_redo.memory_usage, greater_than(0))
+
+    # uncommitted changes are reverted
+    stage2('DEFI_CONSTANTE', 'c4').init({'VALE': 5.})
+    undo_redo.revert()
+    assert_that(_history_text(history), equal_to(texts[2]))
+    assert_that(_history_text(undo_redo.last), equal_to(texts[2]))
+
+    undo_redo.undo(2)
+    assert_that(_history_text(history), equal_to(texts[0]))
+    assert_that(len(case.stages), equal_to(1))
+    assert_that(stage2.uid, is_not(is_in(history)))
+    assert_that(stage['c1'].storage['VALE'], equal_to(1.))
+
+    undo_redo.redo()
+    assert_that(_history_text(history), equal_to(texts[1]))
+    assert_that(stage['c2'].depends_on(stage['c1']), equal_to(False))
+    assert_that(stage['c2'].depends_on(stage.dataset), equal_to(True))
+
+    undo_redo.redo()
+    assert_that(_history_text(history), equal_to(texts[2]))
+    stage2 = case['s2']
+    assert_that(stage2['c3'].depends_on(case), equal_to(True))
+
+    # a copy of the last committed state
+    last = undo_redo.last
+    assert_that(last, is_not(same_instance(history)))
+    assert_that(_history_text(last), equal_to(texts[2]))
+    assert_that(last.current_case.stages[1].model, same_instance(last))
+
+    # oldest changes are forgotten
+    undo_redo.memory_limit = 0
+    assert_that(undo_redo.nb_undo, equal_to(0))
+    assert_that(undo_redo.memory_usage, equal_to(0))
+    assert_that(_history_text(history), equal_to(texts[2]))
+
+
+def test_transaction_journal():
+    history = History()
+    undo_redo = TransactionUndoRedo(history, journal=True)
+    stage = history.current_case.create_stage('s1')
+    texts = [_history_text(history)]
+
+    undo_redo.open("add")
+    stage('DEFI_CONSTANTE', 'c1').init({'VALE': 1.})
+    undo_redo.commit()
+    texts.append(_history_text(history))
+
+    undo_redo.open("abort")
+    stage['c1']['VALE'] = 2.
+    undo_redo.abort()
+    assert_that(_history_text(history), equal_to(texts[1]))
+
+    undo_redo.open("edit")
+    stage['c1']['VALE'] = 3.
+    undo_redo.commit()
+    texts.append(_history_text(history))
+
+    assert_that(undo_redo.undo(2), equal_to(0))
+    assert_that(_history_text(history), equal_to(texts[0]))
+    assert_that(undo_redo.redo_messages, equal_to(["add", "edit"]))
+    undo_redo.redo(2)
+    assert_that(_history_text(history), equal_to(texts[2]))
+    assert_that(undo_redo.undo_messages, equal_to(["edit", "add"]))
+
+    undo_redo.memory_limit = 0
+    assert_that(undo_redo.nb_undo, equal_to(0))
+
+
+def test_memory_limit():
+    undo_redo = UndoRedo(Test(), memory_limit=10 ** 6)
+    for i in range(5):
+        undo_redo.model.value = i
+        undo_redo.commit(str(i))
+    assert_that(undo_redo.nb_undo, equal_to(5))
+    size = undo_redo.memory_usage
+    undo_redo.memory_limit = size - 1
+    assert_that(undo_redo.nb_undo, equal_to(4))
+    undo_redo.undo(10)
+    assert_that(undo_redo.model.value, equal_to(0))
+
+
 def test_disable_undo_redo():
     def disabler():
         return True
@@ -547,6 +674,112 @@ def test_disable_undo_redo():
     assert_that(undo_redo.current_state, greater_than(_id))
 
 
+def _model_state(history):
+    """Return a summary of the stages and of the dependency index."""
+    from asterstudy.datamodel.dependency_index import create_dependency_index
+    state = []
+    for case in history.cases:
+        for stage in case.stages:
+            commands = []
+            if stage.is_graphical_mode():
+                commands = [(cmd.name, cmd.title, cmd.check(),
+                             sorted(node.uid for node in cmd.parent_nodes))
+                            for cmd in stage.sorted_commands]
+            state.append((case.name, stage.name, stage.is_text_mode(),
+                          stage.get_text(sort=False), commands))
+    # the index updated in place must be the same as a new one
+    index = create_dependency_index(type(history._deps))
+    index.rebuild(list(history._nodes.values()))
+    return state, history._deps.to_array().tolist(), index.to_array().tolist()
+
+
+def _check_mutations(journal):
+    undo_redo = UndoRedo(History(), journal=journal)
+    history = undo_redo.model
+    case = history.current_case
+    states = [_model_state(history)]
+
+    def commit():
+        undo_redo.commit()
+        states.append(_model_state(history))
+        assert_that(states[-1][1], equal_to(states[-1][2]))
+
+    stage = case.create_stage('s1')
+    mesh = stage('LIRE_MAILLAGE', 'mesh')
+    var = stage.add_variable('a', '1.')
+    cst = stage('DEFI_CONSTANTE', 'c1')
+    cst.init({'VALE': 1.})
+    commit()
+    cst['VALE'] = 2.
+    commit()
+    model = stage('AFFE_MODELE', 'model')
+    model.init({'MAILLAGE': mesh,
+                'AFFE': {'TOUT': 'OUI', 'PHENOMENE': 'MECANIQUE',
+                         'MODELISATION': '3D'}})
+    commit()
+    cst.rename('c2')
+    commit()
+    form = stage('FORMULE', 'form')
+    form.init({'NOM_PARA': 'INST', 'VALE': 'a * INST'})
+    commit()
+    var.update(expression='2.', name='b')
+    commit()
+    model['MAILLAGE'] = None
+    commit()
+    model.delete()
+    commit()
+    stage.add_comment('a comment')
+    commit()
+    stage.name = 'first'
+    commit()
+    stage2 = case.create_stage('s2')
+    stage2('DEFI_CONSTANTE', 'c3').init({'VALE': 3.})
+    commit()
+    stage2.use_text_mode()
+    commit()
+    stage2.set_text("c4 = DEFI_CONSTANTE(VALE=4.)")
+    commit()
+    stage2.use_graphical_mode()
+    commit()
+    history.create_case('other')
+    commit()
+    stage2.delete()
+    commit()
+
+    for index in range(len(states) - 2, -1, -1):
+        undo_redo.undo()
+        state = _model_state(undo_redo.model)
+        assert_that(state, equal_to(states[index]), str(index))
+    for index in range(1, len(states)):
+        undo_redo.redo()
+        state = _model_state(undo_redo.model)
+        assert_that(state, equal_to(states[index]), str(index))
+
+
+def test_mutations_journal():
+    _check_mutations(journal=True)
+
+
+def test_mutations_snapshot():
+    _check_mutations(journal=False)
+
+
+def test_transaction_snapshot_size():
+    undo_redo = TransactionUndoRedo(Test())
+    undo_redo.open("edit")
+    undo_redo.model.value = 1
+    undo_redo.commit()
+    assert_that(undo_redo.memory_usage, greater_than(0))
+
+    # the copies kept to be redone/undone are counted too
+    undo_redo.undo()
+    assert_that(undo_redo.nb_undo, equal_to(0))
+    assert_that(undo_redo.memory_usage, greater_than(0))
+    undo_redo.redo()
+    assert_that(undo_redo.memory_usage, greater_than(0))
+    assert_that(undo_redo.model.value, equal_to(1))
+
+
 if __name__ == "__main__":
     import sys
     from testutils import get_test_suite
@@ -29,13 +29,16 @@ from functools import partial
 import asterstudy
 from asterstudy.common import (CFG, AsterStudySession, ConfigurationError,
                                ConversionError, debug_caller, format_code,
+                               format_expr,
                                get_absolute_dirname, hms2s, is_localhost,
                                localhost_server, ping, recursive_items,
                                split_text, tail_file, bold, italic, underline,
                                preformat, font, image, href, div, clean_text,
                                is_child, is_subclass, contains_word, to_words,
                                from_words, hms2s, secs2hms, check_version,
-                               recursive_setter, make_dirs)
+                               recursive_setter, make_dirs, FileFollower,
+                               appended_lines, tail_offset)
+from asterstudy.common import utilities
 from asterstudy.common.conversion import ConversionReport
 from asterstudy.datamodel.aster_parser import change_text
 from asterstudy.datamodel.aster_syntax import import_aster
@@ -148,6 +151,38 @@ NbCouche = _CONVERT_VARIABLE(EXPR='5')
     assert_that(check_text_diff(changed, expected))
 
 
+def test_format_expr():
+    """Test for the formatting of the expressions of user variables"""
+    exprs = ["- 1.9510565E+00", "thetais + theta1",
+             "( - 1.0E+0 * RINT * RINT ) / ( REXT * REXT - RINT * RINT )",
+             "a0 + a1 * ( angle ) + a2 * ( angle ) ** 2.",
+             "- 179.77969072149318 - 60.581474521186365j ,",
+             "( 0.040 , )", "f ( a = - 1 , b = [ 1 , 2 ] ) [ 0 ] . real",
+             "'MULT_FRONT'", "2 ** - x * ~ y", "( 1 ,\n 2 )",
+             "f ( * a )", "f ( a , * b )", "f ( a , ** k )",
+             "f ( * a , ** k ) * 2",
+             # not supported by the tokenizer
+             "( 1 , 2 , )", "[ 1 , ]", "- None", "x if a else y",
+             "( _F ( TABLE_PARAM1 = 'value1' , TABLE_PARAM2 = 10 , "
+             "TABLE_PARAM3 = 12340.0 ) , )",
+             "% PARAM1 %", "a ="]
+    for expr in exprs:
+        try:
+            expected = format_code(expr)[:-1]
+        except SyntaxError:
+            expected = expr
+        assert_that(format_expr(expr), equal_to(expected))
+    assert_that(utilities._normalize_expr("a * ( b + 1 )"),
+                equal_to("a * (b + 1)"))
+    assert_that(utilities._normalize_expr("( 1 , 2 , )"), none())
+    assert_that(utilities._normalize_expr("% PARAM1 %"), none())
+    assert_that(utilities._normalize_expr("f(*a)"), none())
+    assert_that(utilities._normalize_expr("f(a, **k)"), none())
+    assert_that(utilities._normalize_expr("+".join(["a"] * 50)), none())
+
+    assert_that(CATA.command_names, has_item("DEFI_MATERIAU"))
+    assert_that(CATA.command_names, is_not(has_item("angle")))
+
 def test_parser_py():
     """Test for detection of Python code"""
     text = \
@@ -397,6 +432,51 @@ def test_tail():
     assert_that(text, is_not(contains_string("__main__")))
 
 
+def test_file_follower():
+    """Test for the reading of the lines appended to a file"""
+    tmpdir = tempfile.mkdtemp()
+    filename = osp.join(tmpdir, "output")
+    try:
+        follower = FileFollower(filename)
+        assert_that(follower.read(), empty())
+        with open(filename, "w") as fobj:
+            fobj.write("line 1\nline 2\nline")
+        assert_that(follower.read(), equal_to("line 1\nline 2\n"))
+        assert_that(follower.offset, equal_to(14))
+        with open(filename, "a") as fobj:
+            fobj.write(" 3\nline 4\n")
+        assert_that(follower.read(), equal_to("line 3\nline 4\n"))
+        assert_that(follower.read(), empty())
+        with open(filename, "a") as fobj:
+            fobj.write("end")
+        assert_that(follower.read(final=True), equal_to("end"))
+
+        with open(filename, "rb") as fobj:
+            assert_that(tail_offset(fobj, 2, blocksize=4), equal_to(21))
+            assert_that(tail_offset(fobj, 99), equal_to(0))
+        assert_that(FileFollower(filename, nbline=1).read(final=True),
+                    equal_to("end"))
+        assert_that(tail_file(filename, 2), equal_to("line 4\nend"))
+
+        # truncated file
+        with open(filename, "w") as fobj:
+            fobj.write("new\n")
+        assert_that(follower.read(), equal_to("new\n"))
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_appended_lines():
+    """Test for the lines appended between two tails"""
+    lines = ["line {0}".format(i) for i in range(10)]
+    assert_that(appended_lines([], lines[:3]), equal_to(lines[:3]))
+    assert_that(appended_lines(lines[:5], lines[2:8]), equal_to(lines[5:8]))
+    assert_that(appended_lines(lines[:5], lines[:5]), empty())
+    assert_that(appended_lines(lines[:3], lines[6:9]), equal_to(lines[6:9]))
+    same = ["="] * 4
+    assert_that(appended_lines(same, same + ["end"]), equal_to(["end"]))
+
+
 def test_debug_caller():
     stack = debug_caller()
     assert_that(stack, contains_string("test_debug_caller@test_utilities"))
@@ -0,0 +1,94 @@
+# coding=utf-8
+
+# Copyright 2016 EDF R&D
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License Version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, you may download a copy of license
+# from https://www.gnu.org/licenses/gpl-3.0.
+
+"""Automatic tests for the messages view of the Dashboard."""
+
+
+import unittest
+from unittest.mock import patch
+
+from asterstudy.datamodel import History
+from asterstudy.datamodel.result import (Message, MessageStore, MsgLevel,
+                                         MsgType)
+from asterstudy.gui.dashboard import DashboardMessages
+from common_test_gui import get_application
+import testutils.gui_utils
+from hamcrest import *
+
+
+def setup():
+    """required to create widgets"""
+    get_application()
+
+
+def _items(tree):
+    return [tree.topLevelItem(i).message()
+            for i in range(tree.topLevelItemCount())]
+
+
+def test_filtered_view():
+    history = History()
+    case = history.current_case
+    stage = case.create_stage('s1')
+    msglist = []
+    for i in range(100):
+        level = MsgLevel.Warn if i % 10 else MsgLevel.Error
+        msglist.append(Message(level, "Text {0}".format(i % 3),
+                               MsgType.Command, "{0}:1".format(i % 4),
+                               100 + i, i))
+    msglist.append(Message(MsgLevel.Error, "Runner", MsgType.Runner,
+                           "0:2", 1, 0))
+    store = MessageStore(msglist)
+
+    with patch.object(DashboardMessages.TreeWidget, 'dashboard') as dshbrd:
+        dshbrd.return_value.get_object.return_value = case
+        tree = DashboardMessages.TreeWidget()
+        with patch.object(MessageStore, 'indexes', autospec=True,
+                          side_effect=MessageStore.indexes) as indexes:
+            tree.setMessages(store)
+            # no level selected
+            assert_that(tree.topLevelItemCount(), equal_to(0))
+
+            tree.setLevels([MsgLevel.Error])
+            assert_that(indexes.call_count, equal_to(2))
+            # items are only created for the selected messages
+            assert_that(tree.topLevelItemCount(), equal_to(11))
+            assert_that(_items(tree),
+                        only_contains(has_property('level', MsgLevel.Error)))
+
+            tree.setFilter("Text 1")
+            assert_that(tree.topLevelItemCount(), equal_to(3))
+            tree.setFilter("")
+
+            tree.setSource(MsgType.Runner)
+            assert_that(tree.topLevelItemCount(), equal_to(1))
+            tree.setSource(None)
+
+            # messages of the runner are always displayed
+            tree.setStage(stage.uid)
+            assert_that(tree.topLevelItemCount(), equal_to(11))
+            tree.setStage(stage.uid + 1)
+            assert_that(_items(tree),
+                        contains(has_property('source', MsgType.Runner)))
+            assert_that(indexes.call_count, equal_to(8))
+
+
+if __name__ == "__main__":
+    import sys
+    from testutils import get_test_suite
+    RET = unittest.TextTestRunner(verbosity=2).run(get_test_suite(__name__))
+    sys.exit(not RET.wasSuccessful())